@@ -79,6 +79,7 @@ def _initialize_map() -> dict[str, Callable]:
         DagModel.get_paused_dag_ids,
         DagModel.get_current,
         DagFileProcessorManager.clear_nonexistent_import_errors,
+        DagFileProcessorManager.refresh_unchanged_dags,
         DagWarning.purge_inactive_dag_warnings,
         DatasetManager.register_dataset_change,
         FileTaskHandler._render_filename_db_access,
@@ -117,9 +118,11 @@ def _initialize_map() -> dict[str, Callable]:
         Trigger.bulk_fetch,
         Trigger.clean_unused,
         Trigger.submit_event,
+        Trigger.submit_events,
         Trigger.submit_failure,
         Trigger.ids_for_triggerer,
         Trigger.assign_unassigned,
+        Trigger.report_costs,
     ]
     return {f"{func.__module__}.{func.__qualname__}": func for func in functions}
 
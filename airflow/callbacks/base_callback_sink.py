@@ -20,6 +20,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from airflow.callbacks.callback_requests import CallbackRequest
 
 
@@ -29,3 +31,13 @@ class BaseCallbackSink:
     def send(self, callback: CallbackRequest) -> None:
         """Send callback for execution."""
         raise NotImplementedError()
+
+    def send_many(self, callbacks: Iterable[CallbackRequest]) -> None:
+        """
+        Send a batch of callbacks for execution.
+
+        Sinks which can send several callbacks at once should override this method, by default the
+        callbacks are sent one by one.
+        """
+        for callback in callbacks:
+            self.send(callback)
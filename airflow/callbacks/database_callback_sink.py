@@ -24,6 +24,8 @@ from airflow.models.db_callback_request import DbCallbackRequest
 from airflow.utils.session import NEW_SESSION, provide_session
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from sqlalchemy.orm import Session
 
     from airflow.callbacks.callback_requests import CallbackRequest
@@ -37,3 +39,8 @@ class DatabaseCallbackSink(BaseCallbackSink):
         """Send callback for execution."""
         db_callback = DbCallbackRequest(callback=callback, priority_weight=10)
         session.add(db_callback)
+
+    @provide_session
+    def send_many(self, callbacks: Iterable[CallbackRequest], session: Session = NEW_SESSION) -> None:
+        """Send a batch of callbacks for execution."""
+        session.add_all(DbCallbackRequest(callback=callback, priority_weight=10) for callback in callbacks)
@@ -49,6 +49,7 @@ from airflow.models.param import ParamsDict
 from airflow.models.taskinstance import TaskReturnCode
 from airflow.serialization.pydantic.taskinstance import TaskInstancePydantic
 from airflow.settings import IS_EXECUTOR_CONTAINER, IS_K8S_EXECUTOR_POD
+from airflow.stats import Stats
 from airflow.ti_deps.dep_context import DepContext
 from airflow.ti_deps.dependencies_deps import SCHEDULER_QUEUED_DEPS
 from airflow.typing_compat import Literal
@@ -340,6 +341,30 @@ def _run_raw_task(args, ti: TaskInstance) -> None | TaskReturnCode:
     )
 
 
+def _get_dag_to_run(args) -> DAG:
+    """
+    Load the DAG of the task to run, from its file or from the database.
+
+    The supervisor of a ``--local`` run loads the serialized DAG when
+    ``[core] task_supervisor_reads_serialized_dag`` is enabled, so that the DAG file is only parsed by
+    the ``--raw`` process running the task.
+    """
+    tags = {"dag_id": args.dag_id, "process": "raw" if args.raw else "supervisor" if args.local else "cli"}
+    if (
+        args.local
+        and not args.read_from_db
+        and conf.getboolean("core", "task_supervisor_reads_serialized_dag")
+    ):
+        try:
+            with Stats.timer("task_run.dag_load_duration", tags={**tags, "source": "db"}):
+                return get_dag(args.subdir, args.dag_id, from_db=True)
+        except AirflowException:
+            log.warning("Dag %r is not serialized yet; parsing its file", args.dag_id)
+    source = "db" if args.read_from_db else "file"
+    with Stats.timer("task_run.dag_load_duration", tags={**tags, "source": source}):
+        return get_dag(args.subdir, args.dag_id, args.read_from_db)
+
+
 def _extract_external_executor_id(args) -> str | None:
     if hasattr(args, "external_executor_id"):
         return getattr(args, "external_executor_id")
@@ -450,11 +475,14 @@ def task_run(args, dag: DAG | None = None) -> TaskReturnCode | None:
         print(f"Loading pickle id: {args.pickle}")
         _dag = get_dag_by_pickle(args.pickle)
     elif not dag:
-        _dag = get_dag(args.subdir, args.dag_id, args.read_from_db)
+        _dag = _get_dag_to_run(args)
     else:
         _dag = dag
     task = _dag.get_task(task_id=args.task_id)
-    ti, _ = _get_ti(task, args.map_index, exec_date_or_run_id=args.execution_date_or_run_id, pool=args.pool)
+    with Stats.timer("task_run.ti_load_duration", tags={"dag_id": args.dag_id}):
+        ti, _ = _get_ti(
+            task, args.map_index, exec_date_or_run_id=args.execution_date_or_run_id, pool=args.pool
+        )
     ti.init_run_context(raw=args.raw)
 
     hostname = get_hostname()
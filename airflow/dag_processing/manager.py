@@ -37,14 +37,14 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Iterator, NamedTuple, cast
 
 from setproctitle import setproctitle
-from sqlalchemy import delete, select, update
+from sqlalchemy import delete, func, select, update
 from tabulate import tabulate
 
 import airflow.models
 from airflow.api_internal.internal_api_call import internal_api_call
 from airflow.callbacks.callback_requests import CallbackRequest, SlaCallbackRequest
 from airflow.configuration import conf
-from airflow.dag_processing.processor import DagFileProcessorProcess
+from airflow.dag_processing.processor import DagFileProcessorProcess, DagFileProcessorWorkerPool
 from airflow.models.dag import DagModel
 from airflow.models.dagbag import DagPriorityParsingRequest
 from airflow.models.dagwarning import DagWarning
@@ -54,7 +54,8 @@ from airflow.models.serialized_dag import SerializedDagModel
 from airflow.secrets.cache import SecretCache
 from airflow.stats import Stats
 from airflow.utils import timezone
-from airflow.utils.file import list_py_file_paths, might_contain_dag
+from airflow.utils.file import get_dag_file_fingerprint, list_py_file_paths, might_contain_dag
+from airflow.utils.helpers import chunks
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.mixins import MultiprocessingStartMethodMixin
 from airflow.utils.net import get_hostname
@@ -406,12 +407,28 @@ class DagFileProcessorManager(LoggingMixin):
 
         # Map from file path to the processor
         self._processors: dict[str, DagFileProcessorProcess] = {}
+        # Long-lived workers the files are sent to, instead of starting a process per file
+        self._worker_pool: DagFileProcessorWorkerPool | None = None
+        if conf.getboolean("scheduler", "parsing_worker_pool"):
+            self._worker_pool = DagFileProcessorWorkerPool(
+                max_files_per_worker=conf.getint("scheduler", "parsing_worker_max_files"),
+                max_worker_rss=conf.getint("scheduler", "parsing_worker_max_rss"),
+            )
 
         self._num_run = 0
 
         # Map from file path to stats about the file
         self._file_stats: dict[str, DagFileStat] = {}
 
+        # Whether to skip parsing files which did not change since they were last parsed
+        self._skip_unchanged_files = conf.getboolean("scheduler", "parsing_skip_unchanged_files")
+        # Map from file path to the fingerprint of the file when it was last parsed without errors
+        self._file_fingerprints: dict[str, str] = {}
+        # Map from file path to the fingerprint of the file when its processor started
+        self._processing_file_fingerprints: dict[str, str | None] = {}
+        # Content hashes of the files and modules fingerprinted, reused while they are not modified
+        self._fingerprint_cache: dict = {}
+
         # Last time that the DAG dir was traversed to look for files
         self.last_dag_dir_refresh_time = timezone.make_aware(datetime.fromtimestamp(0))
         # Last time stats were printed
@@ -1016,6 +1033,8 @@ class DagFileProcessorManager(LoggingMixin):
         for key in to_remove:
             # Remove the stats for any dag files that don't exist anymore
             del self._file_stats[key]
+        for key in set(self._file_fingerprints).difference(self._file_paths):
+            del self._file_fingerprints[key]
 
         self._processors = filtered_processors
 
@@ -1048,6 +1067,11 @@ class DagFileProcessorManager(LoggingMixin):
             run_count=self.get_run_count(processor.file_path) + 1,
         )
         self._file_stats[processor.file_path] = stat
+        fingerprint = self._processing_file_fingerprints.pop(processor.file_path, None)
+        if fingerprint is not None and count_import_errors == 0:
+            self._file_fingerprints[processor.file_path] = fingerprint
+        else:
+            self._file_fingerprints.pop(processor.file_path, None)
         file_name = Path(processor.file_path).stem
         Stats.timing(f"dag_processing.last_duration.{file_name}", last_duration)
         Stats.timing("dag_processing.last_duration", last_duration, tags={"file_name": file_name})
@@ -1093,17 +1117,30 @@ class DagFileProcessorManager(LoggingMixin):
                 continue
 
             callback_to_execute_for_file = self._callback_to_execute[file_path]
-            processor = self._create_process(
-                file_path,
-                self._pickle_dags,
-                self._dag_ids,
-                self.get_dag_directory(),
-                callback_to_execute_for_file,
-            )
+            if self._worker_pool is not None:
+                processor = self._worker_pool.create_processor(
+                    file_path,
+                    self._pickle_dags,
+                    self._dag_ids,
+                    self.get_dag_directory(),
+                    callback_to_execute_for_file,
+                )
+            else:
+                processor = self._create_process(
+                    file_path,
+                    self._pickle_dags,
+                    self._dag_ids,
+                    self.get_dag_directory(),
+                    callback_to_execute_for_file,
+                )
 
             del self._callback_to_execute[file_path]
             Stats.incr("dag_processing.processes", tags={"file_path": file_path, "action": "start"})
 
+            if self._skip_unchanged_files:
+                # Fingerprint the file before parsing it, so changes made while parsing are not missed
+                self._processing_file_fingerprints[file_path] = self._get_file_fingerprint(file_path)
+
             processor.start()
             self.log.debug("Started a process (PID: %s) to generate tasks for %s", processor.pid, file_path)
             self._processors[file_path] = processor
@@ -1208,11 +1245,80 @@ class DagFileProcessorManager(LoggingMixin):
                 "Queuing the following files for processing:\n\t%s", "\n\t".join(files_paths_to_queue)
             )
 
+        if self._skip_unchanged_files:
+            files_paths_to_queue = self._skip_unchanged_file_paths(files_paths_to_queue)
+
         for file_path in files_paths_to_queue:
             self._file_stats.setdefault(file_path, DagFileProcessorManager.DEFAULT_FILE_STAT)
         self._add_paths_to_queue(files_paths_to_queue, False)
         Stats.incr("dag_processing.file_path_queue_update_count")
 
+    def _get_file_fingerprint(self, file_path: str) -> str | None:
+        search_paths = list(dict.fromkeys([self.get_dag_directory(), airflow.settings.DAGS_FOLDER]))
+        return get_dag_file_fingerprint(file_path, search_paths, self._fingerprint_cache)
+
+    def _skip_unchanged_file_paths(self, file_paths: list[str]) -> list[str]:
+        """
+        Filter out the files which did not change since they were last parsed without errors.
+
+        Skipped files are accounted for as if they had been parsed again, unless some of their DAGs were
+        deleted or deactivated in the meantime, in which case they are parsed again to restore them.
+
+        :param file_paths: the files to be queued
+        :return: the files which need to be parsed
+        """
+        unchanged_file_paths = {
+            file_path
+            for file_path in file_paths
+            if file_path in self._file_fingerprints
+            and self._file_fingerprints[file_path] == self._get_file_fingerprint(file_path)
+        }
+        if not unchanged_file_paths:
+            return file_paths
+
+        active_dag_counts = self.refresh_unchanged_dags(list(unchanged_file_paths))
+        now = timezone.utcnow()
+        skipped = 0
+        for file_path in unchanged_file_paths:
+            stat = self._file_stats[file_path]
+            if active_dag_counts.get(file_path, 0) != stat.num_dags:
+                unchanged_file_paths.discard(file_path)
+                continue
+            self._file_stats[file_path] = stat._replace(last_finish_time=now, run_count=stat.run_count + 1)
+            skipped += 1
+        Stats.incr("dag_processing.unchanged_files_skipped", skipped)
+        return [file_path for file_path in file_paths if file_path not in unchanged_file_paths]
+
+    @staticmethod
+    @internal_api_call
+    @provide_session
+    def refresh_unchanged_dags(file_paths: list[str], session: Session = NEW_SESSION) -> dict[str, int]:
+        """
+        Mark the active DAGs of files which are skipped because they did not change as just parsed.
+
+        :param file_paths: list of paths to DAG definition files which did not change
+        :param session: session for ORM operations
+        :return: the number of active DAGs defined in each file
+        """
+        active_dag_counts: dict[str, int] = {}
+        for file_paths_chunk in chunks(file_paths, 1000):
+            active_dag_counts.update(
+                session.execute(
+                    select(DagModel.fileloc, func.count())
+                    .where(DagModel.fileloc.in_(file_paths_chunk), DagModel.is_active)
+                    .group_by(DagModel.fileloc)
+                ).all()
+            )
+            # Keep the DAGs from being considered stale, they are still defined in their files
+            session.execute(
+                update(DagModel)
+                .where(DagModel.fileloc.in_(file_paths_chunk), DagModel.is_active)
+                .values(last_parsed_time=timezone.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+        session.commit()
+        return active_dag_counts
+
     def _kill_timed_out_processors(self):
         """Kill any file processors that timeout to defend against process hangs."""
         now = timezone.utcnow()
@@ -1235,6 +1341,8 @@ class DagFileProcessorManager(LoggingMixin):
                 # Clean up processor references
                 self.waitables.pop(processor.waitable_handle)
                 processors_to_remove.append(file_path)
+                self._processing_file_fingerprints.pop(file_path, None)
+                self._file_fingerprints.pop(file_path, None)
 
                 stat = DagFileStat(
                     num_dags=0,
@@ -1276,10 +1384,14 @@ class DagFileProcessorManager(LoggingMixin):
                 "dag_processing.processes", tags={"file_path": processor.file_path, "action": "terminate"}
             )
             processor.terminate()
+        if self._worker_pool is not None:
+            self._worker_pool.terminate()
 
     def end(self):
         """Kill all child processes on exit since we don't want to leave them as orphaned."""
         pids_to_kill = self.get_all_pids()
+        if self._worker_pool is not None:
+            pids_to_kill.extend(self._worker_pool.get_all_pids())
         if pids_to_kill:
             kill_child_processes_by_pids(pids_to_kill)
 
@@ -23,10 +23,12 @@ import signal
 import threading
 import time
 import zipfile
-from contextlib import redirect_stderr, redirect_stdout, suppress
+from collections import deque
+from contextlib import contextmanager, redirect_stderr, redirect_stdout, suppress
 from datetime import timedelta
 from typing import TYPE_CHECKING, Iterable, Iterator
 
+import psutil
 from setproctitle import setproctitle
 from sqlalchemy import delete, func, or_, select
 
@@ -170,18 +172,8 @@ class DagFileProcessorProcess(LoggingMixin, MultiprocessingStartMethodMixin):
             result_channel.send(result)
 
         try:
-            DAG_PROCESSOR_LOG_TARGET = conf.get_mandatory_value("logging", "DAG_PROCESSOR_LOG_TARGET")
-            if DAG_PROCESSOR_LOG_TARGET == "stdout":
-                with Stats.timer() as timer:
-                    _handle_dag_file_processing()
-            else:
-                # The following line ensures that stdout goes to the same destination as the logs. If stdout
-                # gets sent to logs and logs are sent to stdout, this leads to an infinite loop. This
-                # necessitates this conditional based on the value of DAG_PROCESSOR_LOG_TARGET.
-                with redirect_stdout(StreamLogWriter(log, logging.INFO)), redirect_stderr(
-                    StreamLogWriter(log, logging.WARNING)
-                ), Stats.timer() as timer:
-                    _handle_dag_file_processing()
+            with DagFileProcessorProcess._redirect_output_to_log(log), Stats.timer() as timer:
+                _handle_dag_file_processing()
             log.info("Processing %s took %.3f seconds", file_path, timer.duration)
         except Exception:
             # Log exceptions through the logging framework.
@@ -194,6 +186,22 @@ class DagFileProcessorProcess(LoggingMixin, MultiprocessingStartMethodMixin):
 
             result_channel.close()
 
+    @staticmethod
+    @contextmanager
+    def _redirect_output_to_log(log: logging.Logger) -> Iterator[None]:
+        """Send stdout and stderr of the DAG file being processed to the processor logs."""
+        DAG_PROCESSOR_LOG_TARGET = conf.get_mandatory_value("logging", "DAG_PROCESSOR_LOG_TARGET")
+        if DAG_PROCESSOR_LOG_TARGET == "stdout":
+            yield
+        else:
+            # The following line ensures that stdout goes to the same destination as the logs. If stdout
+            # gets sent to logs and logs are sent to stdout, this leads to an infinite loop. This
+            # necessitates this conditional based on the value of DAG_PROCESSOR_LOG_TARGET.
+            with redirect_stdout(StreamLogWriter(log, logging.INFO)), redirect_stderr(
+                StreamLogWriter(log, logging.WARNING)
+            ):
+                yield
+
     def start(self) -> None:
         """Launch the process and start processing the DAG."""
         if conf.getboolean("scheduler", "parsing_pre_import_modules", fallback=True):
@@ -389,6 +397,434 @@ class DagFileProcessorProcess(LoggingMixin, MultiprocessingStartMethodMixin):
                 _import_modules(path)
 
 
+class DagFileProcessorWorker(LoggingMixin, MultiprocessingStartMethodMixin):
+    """
+    Long-lived process parsing the DAG files it receives over a pipe, one file at a time.
+
+    The interpreter of the worker stays warm between files: Airflow and the modules imported by the DAG
+    files are only imported once, instead of once per file.
+
+    :param max_files: number of files to process before the worker should be recycled, 0 for no limit
+    :param max_rss: resident memory (in MiB) above which the worker should be recycled, 0 for no limit
+    """
+
+    # Counter that increments every time an instance of this class is created
+    class_creation_counter = 0
+
+    def __init__(self, max_files: int = 0, max_rss: int = 0):
+        super().__init__()
+        self._max_files = max_files
+        self._max_rss = max_rss
+
+        # The process that was launched to process the files.
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._parent_channel: MultiprocessingConnection | None = None
+        # Number of files sent to the worker.
+        self.files_processed = 0
+        # Resident memory of the worker (in bytes), as reported after processing its last file.
+        self.rss = 0
+        self._instance_id = DagFileProcessorWorker.class_creation_counter
+        DagFileProcessorWorker.class_creation_counter += 1
+
+    @staticmethod
+    def _run_worker(
+        channel: MultiprocessingConnection,
+        parent_channel: MultiprocessingConnection,
+        thread_name: str,
+    ) -> None:
+        """
+        Process the files received over the channel until told to stop.
+
+        Each request is a tuple of arguments for ``DagFileProcessor.process_file``, answered with a tuple
+        of the result and the resident memory of the worker. ``None`` stops the worker.
+
+        :param channel: the connection to receive files on and send results back
+        :param parent_channel: the parent end of the channel to close in the child
+        :param thread_name: the name to use for the process that is launched
+        """
+        # This helper runs in the newly created process
+        log: logging.Logger = logging.getLogger("airflow.processor")
+
+        # Since we share all open FDs from the parent, we need to close the parent side of the pipe here in
+        # the child, else it won't get closed properly until we exit.
+        parent_channel.close()
+        del parent_channel
+
+        # Re-configure the ORM engine as there are issues with multiple processes
+        settings.configure_orm()
+        threading.current_thread().name = thread_name
+        process = psutil.Process()
+
+        try:
+            while True:
+                try:
+                    request = channel.recv()
+                except EOFError:
+                    break
+                if request is None:
+                    break
+                file_path, pickle_dags, dag_ids, dag_directory, callback_requests = request
+
+                set_context(log, file_path)
+                setproctitle(f"airflow scheduler - DagFileProcessor {file_path}")
+                try:
+                    with DagFileProcessorProcess._redirect_output_to_log(log), Stats.timer() as timer:
+                        log.info("Started process (PID=%s) to work on %s", os.getpid(), file_path)
+                        dag_file_processor = DagFileProcessor(
+                            dag_ids=dag_ids, dag_directory=dag_directory, log=log
+                        )
+                        result: tuple[int, int] = dag_file_processor.process_file(
+                            file_path=file_path,
+                            pickle_dags=pickle_dags,
+                            callback_requests=callback_requests,
+                        )
+                    log.info("Processing %s took %.3f seconds", file_path, timer.duration)
+                except Exception:
+                    # Log exceptions through the logging framework.
+                    log.exception("Got an exception! Propagating...")
+                    raise
+                channel.send((result, process.memory_info().rss))
+        finally:
+            # We re-initialized the ORM within this Process above so we need to
+            # tear it down manually here
+            settings.dispose_orm()
+
+            channel.close()
+
+    def start(self) -> None:
+        """Launch the worker process."""
+        context = self._get_multiprocessing_context()
+
+        _parent_channel, _child_channel = context.Pipe()
+        process = context.Process(
+            target=type(self)._run_worker,
+            args=(_child_channel, _parent_channel, f"DagFileProcessorWorker{self._instance_id}"),
+            name=f"DagFileProcessorWorker{self._instance_id}-Process",
+        )
+        self._process = process
+        process.start()
+
+        # Close the child side of the pipe now the subprocess has started -- otherwise this would prevent it
+        # from closing in some cases
+        _child_channel.close()
+        del _child_channel
+
+        self._parent_channel = _parent_channel
+
+    def send_file(
+        self,
+        file_path: str,
+        pickle_dags: bool,
+        dag_ids: list[str] | None,
+        dag_directory: str,
+        callback_requests: list[CallbackRequest],
+    ) -> None:
+        """Ask the worker to process the given file."""
+        if self._parent_channel is None:
+            raise AirflowException("Tried to send a file before starting!")
+        self._parent_channel.send((file_path, pickle_dags, dag_ids, dag_directory, callback_requests))
+        self.files_processed += 1
+
+    def poll(self) -> bool:
+        """Whether the worker sent back a result or exited."""
+        if self._parent_channel is None:
+            raise AirflowException("Tried to poll before starting!")
+        return self._parent_channel.closed or self._parent_channel.poll()
+
+    def receive_result(self) -> tuple[int, int] | None:
+        """
+        Receive the result of the file being processed.
+
+        :return: the result of ``DagFileProcessor.process_file()``, or None if the worker exited
+        """
+        if self._process is None or self._parent_channel is None:
+            raise AirflowException("Tried to receive a result before starting!")
+        try:
+            result, self.rss = self._parent_channel.recv()
+            return result
+        except (EOFError, OSError):
+            # The worker exited while processing the file, give it some time to finish shutting down.
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                # Didn't shut down cleanly - kill it
+                self.kill()
+            self._parent_channel.close()
+            return None
+
+    @property
+    def needs_recycling(self) -> bool:
+        """Whether the worker has processed too many files or uses too much memory to be reused."""
+        if self._max_files and self.files_processed >= self._max_files:
+            return True
+        return bool(self._max_rss) and self.rss > self._max_rss * 1024 * 1024
+
+    @property
+    def is_alive(self) -> bool:
+        return (
+            self._process is not None
+            and self._process.is_alive()
+            and self._parent_channel is not None
+            and not self._parent_channel.closed
+        )
+
+    def stop(self) -> None:
+        """Ask the worker to exit once it is done with its current file, and wait for it."""
+        if self._process is None or self._parent_channel is None:
+            raise AirflowException("Tried to stop before starting!")
+        with suppress(OSError):
+            self._parent_channel.send(None)
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self.kill()
+        self._parent_channel.close()
+
+    def terminate(self, sigkill: bool = False) -> None:
+        """
+        Terminate (and then kill) the worker process.
+
+        :param sigkill: whether to issue a SIGKILL if SIGTERM doesn't work.
+        """
+        if self._process is None or self._parent_channel is None:
+            raise AirflowException("Tried to call terminate before starting!")
+
+        self._process.terminate()
+        # Arbitrarily wait 5s for the process to die
+        with suppress(TimeoutError):
+            self._process._popen.wait(5)  # type: ignore
+        if sigkill:
+            self.kill()
+        self._parent_channel.close()
+
+    def kill(self) -> None:
+        """Kill the worker process, and ensure consistent state."""
+        if self._process is None:
+            raise AirflowException("Tried to kill process before starting!")
+
+        if self._process.is_alive() and self._process.pid:
+            self.log.warning("Killing DagFileProcessorWorker (PID=%d)", self._process.pid)
+            os.kill(self._process.pid, signal.SIGKILL)
+
+            # Reap the spawned zombie. We active wait, because in Python 3.9 `waitpid` might lead to an
+            # exception, due to change in Python standard library and possibility of race condition
+            # see https://bugs.python.org/issue42558
+            while self._process._popen.poll() is None:  # type: ignore
+                time.sleep(0.001)
+        if self._parent_channel:
+            self._parent_channel.close()
+
+    @property
+    def pid(self) -> int:
+        """PID of the worker process."""
+        if self._process is None or self._process.pid is None:
+            raise AirflowException("Tried to get PID before starting!")
+        return self._process.pid
+
+    @property
+    def exit_code(self) -> int | None:
+        """Exit code of the worker process, None if it is still running."""
+        if self._process is None:
+            raise AirflowException("Tried to get exit code before starting!")
+        return self._process.exitcode
+
+    @property
+    def waitable_handle(self):
+        return self._parent_channel
+
+
+class PooledDagFileProcessorProcess(DagFileProcessorProcess):
+    """
+    Processes a DAG file in a worker of a DagFileProcessorWorkerPool.
+
+    It has the same interface as :class:`DagFileProcessorProcess`, so the manager can keep track of it, and
+    time it out, the same way. Killing it kills the worker, which the pool then replaces.
+
+    :param file_path: a Python file containing Airflow DAG definitions
+    :param pickle_dags: whether to serialize the DAG objects to the DB
+    :param dag_ids: If specified, only look at these DAG ID's
+    :param callback_requests: failure callback to execute
+    :param worker_pool: the pool to take a worker from
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        pickle_dags: bool,
+        dag_ids: list[str] | None,
+        dag_directory: str,
+        callback_requests: list[CallbackRequest],
+        worker_pool: DagFileProcessorWorkerPool,
+    ):
+        super().__init__(file_path, pickle_dags, dag_ids, dag_directory, callback_requests)
+        self._worker_pool = worker_pool
+        self._worker: DagFileProcessorWorker | None = None
+        self._exit_code: int | None = None
+
+    def start(self) -> None:
+        """Send the file to a worker of the pool."""
+        # Modules imported by the file stay imported in the worker, pre-importing them in the manager
+        # would only benefit the workers started afterward.
+        self._worker = self._worker_pool.acquire()
+        self._start_time = timezone.utcnow()
+        self._worker.send_file(
+            self.file_path, self._pickle_dags, self._dag_ids, self._dag_directory, self._callback_requests
+        )
+
+    def _receive_result(self) -> None:
+        if self._worker is None:
+            raise AirflowException("Tried to receive the result before starting!")
+        if not self._done:
+            self._finish(self._worker.receive_result())
+
+    def _finish(self, result: tuple[int, int] | None) -> None:
+        if self._worker is None:
+            raise AirflowException("Tried to finish before starting!")
+        self._result = result
+        self._done = True
+        self._exit_code = self._worker.exit_code
+        self._worker_pool.release(self._worker)
+
+    def kill(self) -> None:
+        """Kill the worker processing the file, and ensure consistent state."""
+        if self._worker is None:
+            raise AirflowException("Tried to kill before starting!")
+        self._worker.kill()
+        if not self._done:
+            self._finish(None)
+
+    def terminate(self, sigkill: bool = False) -> None:
+        """
+        Terminate (and then kill) the worker processing the file.
+
+        :param sigkill: whether to issue a SIGKILL if SIGTERM doesn't work.
+        """
+        if self._worker is None:
+            raise AirflowException("Tried to call terminate before starting!")
+        self._worker.terminate(sigkill)
+        if not self._done:
+            self._finish(None)
+
+    @property
+    def pid(self) -> int:
+        """PID of the worker processing the given file."""
+        if self._worker is None:
+            raise AirflowException("Tried to get PID before starting!")
+        return self._worker.pid
+
+    @property
+    def exit_code(self) -> int | None:
+        """
+        After the file is processed, this can be called to get the return code of the worker.
+
+        :return: the exit code of the worker if it exited while processing the file, None otherwise
+        """
+        if self._worker is None:
+            raise AirflowException("Tried to get exit code before starting!")
+        if not self.done:
+            raise AirflowException("Tried to call retcode before process was finished!")
+        self._receive_result()
+        return self._exit_code
+
+    @property
+    def done(self) -> bool:
+        """
+        Check if the worker is done processing this file.
+
+        The result is left in the pipe until it is read, so that the waitable handle stays ready for the
+        manager to collect it.
+
+        :return: whether the file is processed
+        """
+        if self._worker is None:
+            raise AirflowException("Tried to see if it's done before starting!")
+        return self._done or self._worker.poll()
+
+    @property
+    def result(self) -> tuple[int, int] | None:
+        """Result of running ``DagFileProcessor.process_file()``, the worker is given back to the pool."""
+        if not self.done:
+            raise AirflowException("Tried to get the result before it's done!")
+        self._receive_result()
+        return self._result
+
+    @property
+    def waitable_handle(self):
+        if self._worker is None:
+            raise AirflowException("Tried to get waitable handle before starting!")
+        return self._worker.waitable_handle
+
+
+class DagFileProcessorWorkerPool(LoggingMixin):
+    """
+    Pool of :class:`DagFileProcessorWorker` reused across DAG files.
+
+    Workers are started on demand and are replaced once they exited, processed ``max_files_per_worker``
+    files, or use more than ``max_worker_rss`` MiB of memory.
+
+    :param max_files_per_worker: number of files a worker processes before being recycled, 0 for no limit
+    :param max_worker_rss: resident memory (in MiB) above which a worker is recycled, 0 for no limit
+    """
+
+    def __init__(self, max_files_per_worker: int = 0, max_worker_rss: int = 0):
+        super().__init__()
+        self._max_files_per_worker = max_files_per_worker
+        self._max_worker_rss = max_worker_rss
+        self._idle_workers: deque[DagFileProcessorWorker] = deque()
+
+    def create_processor(
+        self,
+        file_path: str,
+        pickle_dags: bool,
+        dag_ids: list[str] | None,
+        dag_directory: str,
+        callback_requests: list[CallbackRequest],
+    ) -> PooledDagFileProcessorProcess:
+        """Create a processor running the given file in a worker of this pool."""
+        return PooledDagFileProcessorProcess(
+            file_path=file_path,
+            pickle_dags=pickle_dags,
+            dag_ids=dag_ids,
+            dag_directory=dag_directory,
+            callback_requests=callback_requests,
+            worker_pool=self,
+        )
+
+    def acquire(self) -> DagFileProcessorWorker:
+        """Take an idle worker from the pool, or start a new one if there is none."""
+        while self._idle_workers:
+            worker = self._idle_workers.popleft()
+            if worker.is_alive:
+                return worker
+        worker = DagFileProcessorWorker(max_files=self._max_files_per_worker, max_rss=self._max_worker_rss)
+        worker.start()
+        self.log.debug("Started DAG file processor worker (PID=%s)", worker.pid)
+        return worker
+
+    def release(self, worker: DagFileProcessorWorker) -> None:
+        """Give back a worker which is done with its file, recycling it if needed."""
+        if not worker.is_alive:
+            return
+        if worker.needs_recycling:
+            self.log.debug(
+                "Recycling DAG file processor worker (PID=%s) after %s files using %s bytes",
+                worker.pid,
+                worker.files_processed,
+                worker.rss,
+            )
+            Stats.incr("dag_processing.worker_recycled")
+            worker.stop()
+            return
+        self._idle_workers.append(worker)
+
+    def get_all_pids(self) -> list[int]:
+        """Get the PIDs of the idle workers."""
+        return [worker.pid for worker in self._idle_workers if worker.is_alive]
+
+    def terminate(self) -> None:
+        """Stop all idle workers."""
+        while self._idle_workers:
+            self._idle_workers.popleft().stop()
+
+
 class DagFileProcessor(LoggingMixin):
     """
     Process a Python file containing Airflow DAGs.
@@ -511,6 +511,17 @@ class BaseExecutor(LoggingMixin):
             raise ValueError("Callback sink is not ready.")
         self.callback_sink.send(request)
 
+    def send_callbacks(self, requests: Sequence[CallbackRequest]) -> None:
+        """Send a batch of callbacks for execution.
+
+        Provides a default implementation which sends the callbacks to the `callback_sink` object at once.
+
+        :param requests: Callback requests to be executed.
+        """
+        if not self.callback_sink:
+            raise ValueError("Callback sink is not ready.")
+        self.callback_sink.send_many(requests)
+
     @staticmethod
     def get_cli_commands() -> list[GroupCommand]:
         """Vends CLI commands to be included in Airflow CLI.
@@ -37,6 +37,7 @@ from typing import TYPE_CHECKING, Any, Optional, Tuple
 from setproctitle import getproctitle, setproctitle
 
 from airflow import settings
+from airflow.configuration import conf
 from airflow.exceptions import AirflowException
 from airflow.executors.base_executor import PARALLELISM, BaseExecutor
 from airflow.utils.log.logging_mixin import LoggingMixin
@@ -47,6 +48,8 @@ if TYPE_CHECKING:
     from queue import Queue
 
     from airflow.executors.base_executor import CommandType
+    from airflow.executors.task_zygote import TaskZygote
+    from airflow.jobs.heartbeat_multiplexer import HeartbeatMultiplexer
     from airflow.models.taskinstance import TaskInstanceStateType
     from airflow.models.taskinstancekey import TaskInstanceKey
 
@@ -63,12 +66,14 @@ class LocalWorkerBase(Process, LoggingMixin):
     Executes the given command and puts the result into a result queue when done, terminating execution.
 
     :param result_queue: the queue to store result state
+    :param zygote: the zygote forking the processes running the commands, if any
     """
 
-    def __init__(self, result_queue: Queue[TaskInstanceStateType]):
+    def __init__(self, result_queue: Queue[TaskInstanceStateType], zygote: TaskZygote | None = None):
         super().__init__(target=self.do_work)
         self.daemon: bool = True
         self.result_queue: Queue[TaskInstanceStateType] = result_queue
+        self.zygote: TaskZygote | None = zygote
 
     def run(self):
         # We know we've just started a new process, so lets disconnect from the metadata db now
@@ -92,7 +97,9 @@ class LocalWorkerBase(Process, LoggingMixin):
         if settings.EXECUTE_TASKS_NEW_PYTHON_INTERPRETER:
             state = self._execute_work_in_subprocess(command)
         else:
-            state = self._execute_work_in_fork(command)
+            state = self._execute_work_in_zygote(command) if self.zygote else None
+            if state is None:
+                state = self._execute_work_in_fork(command)
 
         self.result_queue.put((key, state))
         # Remove the command since the worker is done executing the task
@@ -106,6 +113,19 @@ class LocalWorkerBase(Process, LoggingMixin):
             self.log.error("Failed to execute task %s.", e)
             return TaskInstanceState.FAILED
 
+    def _execute_work_in_zygote(self, command: CommandType) -> TaskInstanceState | None:
+        if TYPE_CHECKING:
+            assert self.zygote
+
+        ret = self.zygote.run_command(command)
+        if ret is None:
+            # The zygote is not reachable, the command is forked from the worker instead
+            return None
+        if ret != 0:
+            self.log.error("Failed to execute task, the process exited with return code %s.", ret)
+            return TaskInstanceState.FAILED
+        return TaskInstanceState.SUCCESS
+
     def _execute_work_in_fork(self, command: CommandType) -> TaskInstanceState:
         pid = os.fork()
         if pid:
@@ -156,12 +176,17 @@ class LocalWorker(LocalWorkerBase):
     :param result_queue: queue where results of the tasks are put.
     :param key: key identifying task instance
     :param command: Command to execute
+    :param zygote: the zygote forking the processes running the commands, if any
     """
 
     def __init__(
-        self, result_queue: Queue[TaskInstanceStateType], key: TaskInstanceKey, command: CommandType
+        self,
+        result_queue: Queue[TaskInstanceStateType],
+        key: TaskInstanceKey,
+        command: CommandType,
+        zygote: TaskZygote | None = None,
     ):
-        super().__init__(result_queue)
+        super().__init__(result_queue, zygote=zygote)
         self.key: TaskInstanceKey = key
         self.command: CommandType = command
 
@@ -178,10 +203,16 @@ class QueuedLocalWorker(LocalWorkerBase):
 
     :param task_queue: queue from which worker reads tasks
     :param result_queue: queue where worker puts results after finishing tasks
+    :param zygote: the zygote forking the processes running the commands, if any
     """
 
-    def __init__(self, task_queue: Queue[ExecutorWorkType], result_queue: Queue[TaskInstanceStateType]):
-        super().__init__(result_queue=result_queue)
+    def __init__(
+        self,
+        task_queue: Queue[ExecutorWorkType],
+        result_queue: Queue[TaskInstanceStateType],
+        zygote: TaskZygote | None = None,
+    ):
+        super().__init__(result_queue=result_queue, zygote=zygote)
         self.task_queue = task_queue
 
     def do_work(self) -> None:
@@ -228,6 +259,8 @@ class LocalExecutor(BaseExecutor):
         self.workers_used: int = 0
         self.workers_active: int = 0
         self.impl: None | (LocalExecutor.UnlimitedParallelism | LocalExecutor.LimitedParallelism) = None
+        self.zygote: TaskZygote | None = None
+        self.heartbeat_multiplexer: HeartbeatMultiplexer | None = None
 
     class UnlimitedParallelism:
         """
@@ -262,7 +295,9 @@ class LocalExecutor(BaseExecutor):
             if TYPE_CHECKING:
                 assert self.executor.result_queue
 
-            local_worker = LocalWorker(self.executor.result_queue, key=key, command=command)
+            local_worker = LocalWorker(
+                self.executor.result_queue, key=key, command=command, zygote=self.executor.zygote
+            )
             self.executor.workers_used += 1
             self.executor.workers_active += 1
             local_worker.start()
@@ -302,7 +337,7 @@ class LocalExecutor(BaseExecutor):
 
             self.queue = self.executor.manager.Queue()
             self.executor.workers = [
-                QueuedLocalWorker(self.queue, self.executor.result_queue)
+                QueuedLocalWorker(self.queue, self.executor.result_queue, zygote=self.executor.zygote)
                 for _ in range(self.executor.parallelism)
             ]
 
@@ -361,6 +396,16 @@ class LocalExecutor(BaseExecutor):
         self.manager = Manager()
         setproctitle(old_proctitle)
         self.result_queue = self.manager.Queue()
+        if settings.EXECUTE_TASKS_IN_ZYGOTE:
+            from airflow.executors.task_zygote import TaskZygote
+
+            self.zygote = TaskZygote.start()
+        if conf.getboolean("scheduler", "task_heartbeat_multiplexer"):
+            from airflow.jobs.heartbeat_multiplexer import SOCKET_PATH_ENV, HeartbeatMultiplexer
+
+            self.heartbeat_multiplexer = HeartbeatMultiplexer.start()
+            # The processes running the tasks, started from this process, heartbeat through it
+            os.environ[SOCKET_PATH_ENV] = self.heartbeat_multiplexer.socket_path
         self.workers = []
         self.workers_used = 0
         self.workers_active = 0
@@ -406,6 +451,19 @@ class LocalExecutor(BaseExecutor):
         )
         self.impl.end()
         self.manager.shutdown()
+        self._stop_helpers()
 
     def terminate(self):
-        """Terminate the executor is not doing anything."""
+        """Terminate the executor, stopping its task zygote and heartbeat multiplexer if any."""
+        self._stop_helpers()
+
+    def _stop_helpers(self) -> None:
+        if self.zygote:
+            self.zygote.stop()
+            self.zygote = None
+        if self.heartbeat_multiplexer:
+            from airflow.jobs.heartbeat_multiplexer import SOCKET_PATH_ENV
+
+            os.environ.pop(SOCKET_PATH_ENV, None)
+            self.heartbeat_multiplexer.stop()
+            self.heartbeat_multiplexer = None
@@ -0,0 +1,246 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Zygote process forking the processes running the commands of executors.
+
+Forking the process running an ``airflow tasks run`` command from the executor worker still costs the
+imports and the initialization of the CLI, the models and the providers in every forked process. The
+zygote is started once with all of them loaded, and forks the processes running the commands it is
+sent over a Unix socket, so that they start with everything loaded already.
+
+Run ``python -m airflow.executors.task_zygote <socket path>`` to start a zygote, or use
+:meth:`TaskZygote.start`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import selectors
+import signal
+import socket
+import sys
+from typing import TYPE_CHECKING, Any
+
+from airflow.utils.socket_service import SocketService, listen
+
+if TYPE_CHECKING:
+    from airflow.executors.base_executor import CommandType
+
+log = logging.getLogger(__name__)
+
+# Seconds between the checks of the zygote that its parent process is still alive
+_PARENT_CHECK_INTERVAL = 1.0
+
+
+class TaskZygote(SocketService):
+    """
+    Handle on a zygote process, to start and stop it, and to run commands in processes it forks.
+
+    The handle can be passed to other processes, forked or not, to run commands in the same zygote.
+    Only the process which started the zygote can stop it, which terminates the processes it forked
+    that are still running.
+
+    :param socket_path: The path of the Unix socket the zygote listens on
+    """
+
+    module = "airflow.executors.task_zygote"
+    description = "task zygote"
+
+    def run_command(self, command: CommandType, *, external_executor_id: str | None = None) -> int | None:
+        """
+        Run an airflow command in a process forked by the zygote, and wait for it to exit.
+
+        The process gets the environment variables of the calling process.
+
+        :param command: The command to run, starting with ``airflow``
+        :param external_executor_id: The id of the command in the executor, passed to ``tasks run``
+        :return: The return code of the process, or None if the zygote could not be reached, in
+            which case the command was not run.
+        """
+        sock = self.connect()
+        if sock is None:
+            return None
+        try:
+            request = {
+                "command": list(command),
+                "external_executor_id": external_executor_id,
+                "env": dict(os.environ),
+            }
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as response_file:
+                response = response_file.readline()
+            if not response:
+                log.error("Task zygote exited while running %s", command)
+                return 1
+            return json.loads(response)["returncode"]
+        finally:
+            sock.close()
+
+
+def _preload() -> None:
+    """Import and initialize everything the forked processes need to run ``airflow tasks run``."""
+    import airflow.cli.commands.task_command
+    import airflow.jobs.local_task_job_runner
+    import airflow.models
+    from airflow.cli.cli_parser import get_parser
+    from airflow.providers_manager import ProvidersManager
+
+    airflow.models.import_all_models()
+    get_parser()
+    providers_manager = ProvidersManager()
+    providers_manager.initialize_providers_configuration()
+    providers_manager.initialize_providers_hooks()
+    providers_manager.initialize_providers_logging()
+    providers_manager.initialize_providers_secrets_backends()
+
+
+def _exit_code(status: int) -> int:
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _run_forked(request: dict[str, Any]) -> None:
+    """Run the requested command in the forked process, which exits with its return code."""
+    from setproctitle import setproctitle
+
+    from airflow import settings
+    from airflow.api_internal.internal_api_call import InternalApiConfig
+    from airflow.cli.cli_parser import get_parser
+    from airflow.sentry import Sentry
+
+    ret = 1
+    try:
+        os.environ.clear()
+        os.environ.update(request["env"])
+        if not InternalApiConfig.get_use_internal_api():
+            settings.engine.pool.dispose()
+            settings.engine.dispose()
+
+        command = request["command"]
+        # [1:] - remove "airflow" from the start of the command
+        args = get_parser().parse_args(command[1:])
+        args.shut_down_logging = False
+        if request["external_executor_id"]:
+            args.external_executor_id = request["external_executor_id"]
+        setproctitle(f"airflow task supervisor: {command}")
+        args.func(args)
+        ret = 0
+    except Exception:
+        log.exception("Failed to execute %s", request["command"])
+    finally:
+        try:
+            Sentry.flush()
+            logging.shutdown()
+        except Exception:
+            ret = 1
+        os._exit(ret)
+
+
+def serve(socket_path: str) -> None:
+    """
+    Load everything, then fork a process per command received on the socket until terminated.
+
+    Each connection sends a JSON request on a line, and receives the return code of the process as
+    a JSON response on a line once the process exits. The zygote stops, terminating the processes
+    still running, when it receives SIGTERM or when its parent process exits.
+    """
+    from setproctitle import setproctitle
+
+    setproctitle(f"airflow task zygote: {socket_path}")
+    _preload()
+
+    parent_pid = os.getppid()
+    listener = listen(socket_path)
+
+    # Wake up the selector when a process exits, or when the zygote is asked to stop
+    wakeup_read, wakeup_write = socket.socketpair()
+    wakeup_read.setblocking(False)
+    wakeup_write.setblocking(False)
+    signal.set_wakeup_fd(wakeup_write.fileno())
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ)
+    selector.register(wakeup_read, selectors.EVENT_READ)
+    connections: dict[int, socket.socket] = {}
+    while not stopping and os.getppid() == parent_pid:
+        for key, _ in selector.select(timeout=_PARENT_CHECK_INTERVAL):
+            if key.fileobj is wakeup_read:
+                while True:
+                    try:
+                        if not wakeup_read.recv(4096):
+                            break
+                    except BlockingIOError:
+                        break
+                continue
+            connection, _ = listener.accept()
+            try:
+                with connection.makefile("rb") as request_file:
+                    request = json.loads(request_file.readline())
+            except (OSError, ValueError):
+                log.exception("Could not read the request")
+                connection.close()
+                continue
+            pid = os.fork()
+            if pid == 0:
+                signal.set_wakeup_fd(-1)
+                for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+                    signal.signal(signum, signal.SIG_DFL)
+                selector.close()
+                for sock in (listener, wakeup_read, wakeup_write, connection, *connections.values()):
+                    sock.close()
+                _run_forked(request)
+            connections[pid] = connection
+        # Report the return codes of the processes which exited
+        while connections:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if not pid:
+                break
+            connection = connections.pop(pid, None)
+            if connection is None:
+                continue
+            try:
+                connection.sendall(json.dumps({"returncode": _exit_code(status)}).encode() + b"\n")
+            except OSError:
+                log.warning("Could not send the return code of process %d", pid)
+            finally:
+                connection.close()
+
+    for pid, connection in connections.items():
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(pid, signal.SIGTERM)
+        connection.close()
+    listener.close()
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1])
@@ -0,0 +1,311 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Heartbeat multiplexer recording the heartbeats of the tasks running on a host.
+
+Every ``LocalTaskJob`` supervising a task heartbeats on its own, with its own database connection. The
+heartbeat multiplexer is started once per host by the executor, and the supervisors send it their
+heartbeats over a Unix socket. It records the heartbeats received during an interval together, with
+a single connection, and sends back to each supervisor the state of its job and of its task instance,
+for the supervisor to terminate the task when it was killed or its state was changed externally.
+
+Run ``python -m airflow.jobs.heartbeat_multiplexer <socket path>`` to start a heartbeat multiplexer, or
+use :meth:`HeartbeatMultiplexer.start`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import selectors
+import signal
+import sys
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from sqlalchemy import select, update
+
+from airflow.utils.socket_service import SocketService, listen
+
+if TYPE_CHECKING:
+    import socket
+
+    from sqlalchemy.orm import Session
+
+    from airflow.models.taskinstancekey import TaskInstanceKey
+
+log = logging.getLogger(__name__)
+
+# Environment variable giving the socket path of the heartbeat multiplexer to the task processes
+SOCKET_PATH_ENV = "_AIRFLOW_HEARTBEAT_MULTIPLEXER_SOCKET"
+
+# Seconds to wait for the reply to a heartbeat, before heartbeating directly
+_REPLY_TIMEOUT = 30.0
+
+# Seconds to wait for a connection to send its heartbeat
+_REQUEST_TIMEOUT = 5.0
+
+# Seconds between the checks of the multiplexer that its parent process is still alive
+_PARENT_CHECK_INTERVAL = 1.0
+
+
+class HeartbeatReply(NamedTuple):
+    """State of a job and of its task instance, recorded with the heartbeat of the job."""
+
+    latest_heartbeat: datetime | None
+    job_state: str | None
+    ti_state: str | None
+    ti_hostname: str | None
+    ti_pid: int | None
+    error: str | None = None
+
+
+class HeartbeatMultiplexer(SocketService):
+    """
+    Handle on a heartbeat multiplexer, to start and stop it, and to heartbeat through it.
+
+    :param socket_path: The path of the Unix socket the multiplexer listens on
+    """
+
+    module = "airflow.jobs.heartbeat_multiplexer"
+    description = "heartbeat multiplexer"
+
+    @classmethod
+    def from_env(cls) -> HeartbeatMultiplexer | None:
+        """Return the heartbeat multiplexer of the executor which started this process, if any."""
+        socket_path = os.environ.get(SOCKET_PATH_ENV)
+        return cls(socket_path) if socket_path else None
+
+    def heartbeat(
+        self, job_id: int, ti_key: TaskInstanceKey | None, *, delay: float = 0
+    ) -> HeartbeatReply | None:
+        """
+        Record the heartbeat of a job, and wait for the multiplexer to record it in the database.
+
+        :param job_id: The id of the job heartbeating
+        :param ti_key: The key of the task instance run by the job, if any
+        :param delay: Seconds to wait before connecting to send the heartbeat, to keep the heart rate of
+            the job
+        :return: The state of the job and of the task instance once the heartbeat is recorded, or
+            None if the multiplexer could not be reached, in which case the job should heartbeat
+            directly.
+        """
+        # Wait before connecting, the multiplexer only accepts connections ready to send their request
+        time.sleep(delay)
+        sock = self.connect(timeout=_REPLY_TIMEOUT)
+        if sock is None:
+            return None
+        request = {"job_id": job_id, "ti": list(ti_key.primary) if ti_key else None}
+        try:
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reply_file:
+                reply = reply_file.readline()
+        except OSError:
+            log.warning("The heartbeat multiplexer did not reply", exc_info=True)
+            return None
+        finally:
+            sock.close()
+        if not reply:
+            log.warning("The heartbeat multiplexer closed the connection without replying")
+            return None
+        reply_dict = json.loads(reply)
+        if reply_dict["latest_heartbeat"]:
+            reply_dict["latest_heartbeat"] = datetime.fromisoformat(reply_dict["latest_heartbeat"])
+        return HeartbeatReply(**reply_dict)
+
+
+def record_heartbeats(requests: list[dict[str, Any]], *, session: Session) -> list[dict[str, Any]]:
+    """
+    Record the heartbeats of jobs at once, and read the state of the jobs and of their task instances.
+
+    :param requests: The heartbeat requests, with the id of the job and the key of its task instance
+    :param session: The database session
+    :return: The replies to the requests, in the same order
+    """
+    from airflow.jobs.job import Job
+    from airflow.models.taskinstance import TaskInstance as TI
+    from airflow.utils import timezone
+    from airflow.utils.sqlalchemy import tuple_in_condition
+
+    now = timezone.utcnow()
+    job_ids = {request["job_id"] for request in requests}
+    ti_keys = {tuple(request["ti"]) for request in requests if request["ti"]}
+
+    session.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids))
+        .values(latest_heartbeat=now)
+        .execution_options(synchronize_session=False)
+    )
+    job_states = dict(session.execute(select(Job.id, Job.state).where(Job.id.in_(job_ids))).all())
+    tis = {}
+    if ti_keys:
+        tis = {
+            (row.dag_id, row.task_id, row.run_id, row.map_index): row
+            for row in session.execute(
+                select(TI.dag_id, TI.task_id, TI.run_id, TI.map_index, TI.state, TI.hostname, TI.pid).where(
+                    tuple_in_condition((TI.dag_id, TI.task_id, TI.run_id, TI.map_index), ti_keys)
+                )
+            )
+        }
+    session.commit()
+
+    replies = []
+    for request in requests:
+        ti = tis.get(tuple(request["ti"])) if request["ti"] else None
+        replies.append(
+            {
+                "latest_heartbeat": now.isoformat() if request["job_id"] in job_states else None,
+                "job_state": job_states.get(request["job_id"]),
+                "ti_state": ti.state if ti else None,
+                "ti_hostname": ti.hostname if ti else None,
+                "ti_pid": ti.pid if ti else None,
+            }
+        )
+    return replies
+
+
+def _flush(pending: list[tuple[socket.socket, dict[str, Any]]]) -> None:
+    """Record the pending heartbeats, and send the replies."""
+    from airflow.stats import Stats
+    from airflow.utils.session import create_session
+
+    Stats.gauge("heartbeat_multiplexer.heartbeats", len(pending))
+    requests = [request for _, request in pending]
+    try:
+        with Stats.timer("heartbeat_multiplexer.flush_duration"), create_session() as session:
+            replies = record_heartbeats(requests, session=session)
+    except Exception as e:
+        # The tasks handle the failure like the failure of their own heartbeat
+        Stats.incr("heartbeat_multiplexer.flush_failure")
+        log.exception("Failed to record %d heartbeats", len(requests))
+        error = HeartbeatReply(None, None, None, None, None, error=str(e))._asdict()
+        replies = [error] * len(requests)
+    for (connection, request), reply in zip(pending, replies):
+        try:
+            connection.sendall(json.dumps(reply).encode() + b"\n")
+        except OSError:
+            log.warning("Could not send the reply to the heartbeat of job %s", request["job_id"])
+        finally:
+            connection.close()
+
+
+def serve(socket_path: str) -> None:
+    """
+    Record the heartbeats received on the socket every interval, until terminated.
+
+    Each connection sends a JSON heartbeat request on a line, and receives the JSON reply on a line
+    once the heartbeat is recorded. The requests are read as they arrive, so that a connection slow to
+    send its request does not delay the others. The multiplexer stops, recording the pending
+    heartbeats, when it receives SIGTERM or when its parent process exits.
+    """
+    from setproctitle import setproctitle
+
+    from airflow.configuration import conf
+
+    setproctitle(f"airflow heartbeat multiplexer: {socket_path}")
+    interval = conf.getfloat("scheduler", "task_heartbeat_multiplexer_interval")
+
+    parent_pid = os.getppid()
+    listener = listen(socket_path)
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ)
+    # Connections whose request is being read, with the bytes read so far and the deadline to read it
+    reading: dict[socket.socket, tuple[bytearray, float]] = {}
+    pending: list[tuple[socket.socket, dict[str, Any]]] = []
+    flush_at = 0.0
+
+    def drop(connection: socket.socket) -> None:
+        selector.unregister(connection)
+        del reading[connection]
+        connection.close()
+
+    while not stopping and os.getppid() == parent_pid:
+        wake_at = time.monotonic() + _PARENT_CHECK_INTERVAL
+        if pending:
+            wake_at = min(wake_at, flush_at)
+        wake_at = min([wake_at, *(deadline for _, deadline in reading.values())])
+        for key, _ in selector.select(timeout=max(0.0, wake_at - time.monotonic())):
+            if key.fileobj is listener:
+                connection, _ = listener.accept()
+                connection.setblocking(False)
+                selector.register(connection, selectors.EVENT_READ)
+                reading[connection] = (bytearray(), time.monotonic() + _REQUEST_TIMEOUT)
+                continue
+            connection = key.fileobj
+            buffer, _ = reading[connection]
+            try:
+                data = connection.recv(4096)
+            except BlockingIOError:
+                continue
+            except OSError:
+                log.exception("Could not read the heartbeat request")
+                drop(connection)
+                continue
+            if not data:
+                log.warning("A connection was closed before sending its heartbeat request")
+                drop(connection)
+                continue
+            buffer += data
+            if b"\n" not in data:
+                continue
+            try:
+                request = json.loads(buffer[: buffer.index(b"\n")])
+            except ValueError:
+                log.exception("Could not read the heartbeat request")
+                drop(connection)
+                continue
+            selector.unregister(connection)
+            del reading[connection]
+            connection.settimeout(_REQUEST_TIMEOUT)
+            if not pending:
+                flush_at = time.monotonic() + interval
+            pending.append((connection, request))
+        now = time.monotonic()
+        for connection, (_, deadline) in list(reading.items()):
+            if now >= deadline:
+                log.warning("No heartbeat request was received in %s seconds", _REQUEST_TIMEOUT)
+                drop(connection)
+        if pending and now >= flush_at:
+            _flush(pending)
+            pending = []
+
+    if pending:
+        _flush(pending)
+    for connection in list(reading):
+        drop(connection)
+    selector.close()
+    listener.close()
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1])
@@ -22,9 +22,12 @@ from typing import TYPE_CHECKING
 
 import psutil
 
+from airflow import settings
+from airflow.api_internal.internal_api_call import InternalApiConfig
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException
 from airflow.jobs.base_job_runner import BaseJobRunner
+from airflow.jobs.heartbeat_multiplexer import HeartbeatMultiplexer
 from airflow.jobs.job import perform_heartbeat
 from airflow.models.taskinstance import TaskReturnCode
 from airflow.stats import Stats
@@ -34,7 +37,7 @@ from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.net import get_hostname
 from airflow.utils.platform import IS_WINDOWS
 from airflow.utils.session import NEW_SESSION, provide_session
-from airflow.utils.state import TaskInstanceState
+from airflow.utils.state import JobState, TaskInstanceState
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
@@ -163,9 +166,16 @@ class LocalTaskJobRunner(BaseJobRunner, LoggingMixin):
             self.log.info("Task is not able to be run")
             return None
 
+        heartbeat_multiplexer = None
+        if not InternalApiConfig.get_use_internal_api():
+            heartbeat_multiplexer = HeartbeatMultiplexer.from_env()
+
         return_code = None
         try:
             self.task_runner.start()
+            if heartbeat_multiplexer:
+                # The heartbeats go through the multiplexer, release the connections while the task runs
+                settings.engine.dispose()
             local_task_job_heartbeat_sec = conf.getint("scheduler", "local_task_job_heartbeat_sec")
             if local_task_job_heartbeat_sec < 1:
                 heartbeat_time_limit = conf.getint("scheduler", "scheduler_zombie_task_threshold")
@@ -201,9 +211,10 @@ class LocalTaskJobRunner(BaseJobRunner, LoggingMixin):
                     self.handle_task_exit(return_code)
                     return return_code
 
-                perform_heartbeat(
-                    job=self.job, heartbeat_callback=self.heartbeat_callback, only_if_necessary=False
-                )
+                if not (heartbeat_multiplexer and self._heartbeat_through_multiplexer(heartbeat_multiplexer)):
+                    perform_heartbeat(
+                        job=self.job, heartbeat_callback=self.heartbeat_callback, only_if_necessary=False
+                    )
 
                 # If it's been too long since we've heartbeat, then it's possible that
                 # the scheduler rescheduled this task, so kill launched processes.
@@ -256,6 +267,49 @@ class LocalTaskJobRunner(BaseJobRunner, LoggingMixin):
             return
 
         self.task_instance.refresh_from_db()
+        self._check_task_instance_state(session=session)
+
+    def _heartbeat_through_multiplexer(self, heartbeat_multiplexer: HeartbeatMultiplexer) -> bool:
+        """
+        Heartbeat through the heartbeat multiplexer, which relays the state of the job and of the task.
+
+        Like :meth:`Job.heartbeat`, this waits to keep the heart rate of the job, and kills the job if
+        it is restarting.
+
+        :return: False if the multiplexer could not be reached, in which case the job did not heartbeat
+        """
+        job = self.job
+        delay = 0.0
+        if job.latest_heartbeat:
+            delay = max(0.0, job.heartrate - (timezone.utcnow() - job.latest_heartbeat).total_seconds())
+
+        reply = heartbeat_multiplexer.heartbeat(job.id, self.task_instance.key, delay=delay)
+        if reply is None:
+            return False
+        if reply.error:
+            Stats.incr("job_heartbeat_failure", 1, 1)
+            self.log.error("Job heartbeat failed with error: %s", reply.error)
+            return True
+
+        if reply.latest_heartbeat:
+            job.latest_heartbeat = reply.latest_heartbeat
+        if reply.job_state:
+            job.state = reply.job_state
+        if job.state == JobState.RESTARTING:
+            job.kill()
+
+        if self.terminating:
+            # ensure termination if processes are created later
+            self.task_runner.terminate()
+            return True
+        ti = self.task_instance
+        ti.state, ti.hostname, ti.pid = reply.ti_state, reply.ti_hostname, reply.ti_pid
+        self._check_task_instance_state()
+        return True
+
+    @provide_session
+    def _check_task_instance_state(self, session: Session = NEW_SESSION) -> None:
+        """Terminate the task if its state was changed externally, or if it is run by another job."""
         ti = self.task_instance
         if TYPE_CHECKING:
             assert ti.task
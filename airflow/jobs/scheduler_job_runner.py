@@ -21,6 +21,7 @@ import itertools
 import multiprocessing
 import os
 import signal
+import sqlite3
 import sys
 import time
 import warnings
@@ -34,16 +35,18 @@ from typing import TYPE_CHECKING, Any, Callable, Collection, Iterable, Iterator
 from sqlalchemy import and_, delete, func, not_, or_, select, text, update
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import lazyload, load_only, make_transient, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import expression
 
 from airflow import settings
 from airflow.callbacks.callback_requests import DagCallbackRequest, SlaCallbackRequest, TaskCallbackRequest
 from airflow.callbacks.pipe_callback_sink import PipeCallbackSink
 from airflow.configuration import conf
-from airflow.exceptions import RemovedInAirflow3Warning
+from airflow.exceptions import AirflowConfigException, RemovedInAirflow3Warning
 from airflow.executors.executor_loader import ExecutorLoader
 from airflow.jobs.base_job_runner import BaseJobRunner
 from airflow.jobs.job import Job, perform_heartbeat
+from airflow.listeners.listener import get_listener_manager
 from airflow.models.dag import DAG, DagModel
 from airflow.models.dagbag import DagBag
 from airflow.models.dagrun import DagRun
@@ -54,8 +57,12 @@ from airflow.models.dataset import (
     DatasetModel,
     TaskOutletDatasetReference,
 )
+from airflow.models.log import Log
+from airflow.models.scheduler_shard import NUM_SHARD_KEYS, SchedulerShard
 from airflow.models.serialized_dag import SerializedDagModel
+from airflow.models.taskfail import TaskFail
 from airflow.models.taskinstance import SimpleTaskInstance, TaskInstance
+from airflow.models.taskinstancecounter import COUNTED_STATES, TaskInstanceCounter
 from airflow.stats import Stats
 from airflow.ti_deps.dependencies_states import EXECUTION_STATES
 from airflow.timetables.simple import DatasetTriggeredTimetable
@@ -81,6 +88,7 @@ if TYPE_CHECKING:
 
     from sqlalchemy.engine import Result
     from sqlalchemy.orm import Query, Session
+    from sqlalchemy.sql import ColumnElement
 
     from airflow.dag_processing.manager import DagFileProcessorAgent
     from airflow.executors.base_executor import BaseExecutor
@@ -226,6 +234,39 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
         self.do_pickle = do_pickle
 
+        # In incremental scheduling mode, only DagRuns that were marked as "dirty" (because an event
+        # concerning them was observed) are re-evaluated on every loop. Everything else is picked up by
+        # a periodic sweep of DagRuns which were not examined for ``incremental_scheduling_sweep_interval``.
+        self._incremental_scheduling = conf.getboolean("scheduler", "incremental_scheduling")
+        self._incremental_scheduling_sweep_interval = conf.getfloat(
+            "scheduler", "incremental_scheduling_sweep_interval"
+        )
+        # (dag_id, run_id) -> monotonic time at which the DagRun was first marked dirty
+        self._dirty_dag_runs: dict[tuple[str, str], float] = {}
+        # Number of DagRuns examined by the last scheduler loop in incremental scheduling mode
+        self._num_dag_runs_examined = 0
+
+        # In sharded mode, the scheduler only schedules the DAGs of the shards it holds, which are claimed
+        # and rebalanced between the running schedulers on every heartbeat.
+        self._num_shards = conf.getint("scheduler", "num_shards")
+        if not 0 <= self._num_shards <= NUM_SHARD_KEYS:
+            raise AirflowConfigException(
+                f"[scheduler] num_shards must be between 0 and {NUM_SHARD_KEYS}, got {self._num_shards}"
+            )
+        self._shards: list[int] = []
+
+        # How many more candidate task instances than can be queued are fetched in the critical section,
+        # to find task instances to queue when the first candidates are starved by a limit
+        self._critical_section_prefetch_factor = conf.getint("scheduler", "critical_section_prefetch_factor")
+        if self._critical_section_prefetch_factor < 1:
+            raise AirflowConfigException(
+                "[scheduler] critical_section_prefetch_factor must be at least 1, "
+                f"got {self._critical_section_prefetch_factor}"
+            )
+
+        # The pool slots and the concurrency are read from counters maintained with the task instances
+        self._task_instance_counters = TaskInstanceCounter.enabled()
+
         if log:
             self._log = log
 
@@ -244,6 +285,22 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
     @provide_session
     def heartbeat_callback(self, session: Session = NEW_SESSION) -> None:
         Stats.incr("scheduler_heartbeat", 1, 1)
+        if self._num_shards:
+            self._claim_shards(session=session)
+
+    def _claim_shards(self, session: Session) -> None:
+        """Claim the shards of the DAGs to schedule, and release the ones to leave to other schedulers."""
+        shards = SchedulerShard.claim(self.job.id, self._num_shards, session=session)
+        if shards != self._shards:
+            self.log.info("Scheduling the DAGs of shards %s of %d", shards, self._num_shards)
+        self._shards = shards
+        Stats.gauge("scheduler.shards.held", len(shards))
+
+    def _shard_condition(self) -> ColumnElement[bool] | None:
+        """Return the condition on DagModel selecting the DAGs of the shards held, in sharded mode."""
+        if not self._num_shards:
+            return None
+        return SchedulerShard.dag_condition(self._shards, self._num_shards)
 
     def register_signals(self) -> None:
         """Register signals that stop child processes."""
@@ -286,6 +343,10 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         :param states: List of states to query for
         :return: Concurrency map
         """
+        if self._task_instance_counters and COUNTED_STATES.issuperset(states):
+            return ConcurrencyMap.from_concurrency_map(
+                TaskInstanceCounter.task_counts(states, session=session)
+            )
         ti_concurrency_query: Result = session.execute(
             select(TI.task_id, TI.run_id, TI.dag_id, func.count("*"))
             .where(TI.state.in_(states))
@@ -359,45 +420,95 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
         pool_num_starving_tasks: dict[str, int] = Counter()
 
-        for loop_count in itertools.count(start=1):
-            num_starved_pools = len(starved_pools)
-            num_starved_dags = len(starved_dags)
-            num_starved_tasks = len(starved_tasks)
-            num_starved_tasks_task_dagrun_concurrency = len(starved_tasks_task_dagrun_concurrency)
-
-            # Get task instances associated with scheduled
-            # DagRuns which are not backfilled, in the given states,
-            # and the dag is not paused
-            query = (
-                select(TI)
+        # The candidate task instances are fetched once, and the limits are evaluated in memory: the
+        # task instances which cannot be queued because of a limit are skipped rather than filtered out
+        # by another query, so that the pool rows are not locked for several round trips. The candidates
+        # of each DAG are ranked by priority, and the ones beyond the max_active_tasks of the DAG are not
+        # fetched, so that a few DAGs with many task instances do not fill the prefetched candidates.
+        # SQLite only supports window functions from 3.25.0, so with older versions the candidates are
+        # not ranked, and the max_active_tasks of the DAGs are only enforced in memory.
+        # The prefetched candidates can still all be starved by the limits of a few tasks with the highest
+        # priorities: when none of them could be queued, the candidates are fetched once more without the
+        # starved pools, DAGs and tasks.
+        prefetch_limit = max_tis * self._critical_section_prefetch_factor
+        shard_condition = self._shard_condition()
+        rank_by_dag = session.get_bind().dialect.name != "sqlite" or sqlite3.sqlite_version_info >= (3, 25, 0)
+        for _ in range(2):
+            num_starved = (
+                len(starved_pools)
+                + len(starved_dags)
+                + len(starved_tasks)
+                + len(starved_tasks_task_dagrun_concurrency)
+            )
+            columns = [TI.dag_id, TI.task_id, TI.run_id, TI.map_index]
+            if rank_by_dag:
+                columns += [
+                    DM.max_active_tasks,
+                    func.row_number()
+                    .over(
+                        partition_by=TI.dag_id,
+                        order_by=(-TI.priority_weight, DR.execution_date, TI.map_index),
+                    )
+                    .label("dag_rank"),
+                ]
+            candidates = (
+                select(*columns)
                 .with_hint(TI, "USE INDEX (ti_state)", dialect_name="mysql")
                 .join(TI.dag_run)
                 .where(DR.run_type != DagRunType.BACKFILL_JOB, DR.state == DagRunState.RUNNING)
                 .join(TI.dag_model)
                 .where(not_(DM.is_paused))
                 .where(TI.state == TaskInstanceState.SCHEDULED)
-                .options(selectinload(TI.dag_model))
-                .order_by(-TI.priority_weight, DR.execution_date, TI.map_index)
             )
 
+            if shard_condition is not None:
+                candidates = candidates.where(shard_condition)
+
             if starved_pools:
-                query = query.where(not_(TI.pool.in_(starved_pools)))
+                candidates = candidates.where(not_(TI.pool.in_(starved_pools)))
 
             if starved_dags:
-                query = query.where(not_(TI.dag_id.in_(starved_dags)))
+                candidates = candidates.where(not_(TI.dag_id.in_(starved_dags)))
 
             if starved_tasks:
-                task_filter = tuple_in_condition((TI.dag_id, TI.task_id), starved_tasks)
-                query = query.where(not_(task_filter))
+                candidates = candidates.where(
+                    not_(tuple_in_condition((TI.dag_id, TI.task_id), starved_tasks))
+                )
 
             if starved_tasks_task_dagrun_concurrency:
-                task_filter = tuple_in_condition(
-                    (TI.dag_id, TI.run_id, TI.task_id),
-                    starved_tasks_task_dagrun_concurrency,
+                candidates = candidates.where(
+                    not_(
+                        tuple_in_condition(
+                            (TI.dag_id, TI.run_id, TI.task_id), starved_tasks_task_dagrun_concurrency
+                        )
+                    )
                 )
-                query = query.where(not_(task_filter))
 
-            query = query.limit(max_tis)
+            candidates = candidates.subquery()
+
+            # Get task instances associated with scheduled
+            # DagRuns which are not backfilled, in the given states,
+            # and the dag is not paused
+            query = (
+                select(TI)
+                .join(
+                    candidates,
+                    and_(
+                        TI.dag_id == candidates.c.dag_id,
+                        TI.task_id == candidates.c.task_id,
+                        TI.run_id == candidates.c.run_id,
+                        TI.map_index == candidates.c.map_index,
+                    ),
+                )
+                .join(TI.dag_run)
+            )
+            if rank_by_dag:
+                query = query.where(candidates.c.dag_rank <= candidates.c.max_active_tasks)
+            query = (
+                query.options(selectinload(TI.dag_model))
+                .order_by(-TI.priority_weight, DR.execution_date, TI.map_index)
+                .limit(prefetch_limit)
+            )
 
             timer = Stats.timer("scheduler.critical_section_query_duration")
             timer.start()
@@ -414,20 +525,36 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             # TODO[HA]: This was wrong before anyway, as it only looked at a sub-set of dags, not everything.
             # Stats.gauge('scheduler.tasks.pending', len(task_instances_to_examine))
 
-            if not task_instances_to_examine:
+            if task_instances_to_examine:
+                # Put one task instance on each line
+                task_instance_str = "\n".join(f"\t{x!r}" for x in task_instances_to_examine)
+                self.log.info(
+                    "%s tasks up for execution:\n%s", len(task_instances_to_examine), task_instance_str
+                )
+            else:
                 self.log.debug("No tasks to consider for execution.")
-                break
-
-            # Put one task instance on each line
-            task_instance_str = "\n".join(f"\t{x!r}" for x in task_instances_to_examine)
-            self.log.info("%s tasks up for execution:\n%s", len(task_instances_to_examine), task_instance_str)
 
             for task_instance in task_instances_to_examine:
+                if len(executable_tis) >= max_tis:
+                    break
+
                 pool_name = task_instance.pool
+                dag_id = task_instance.dag_id
+
+                if (
+                    dag_id in starved_dags
+                    or (dag_id, task_instance.task_id) in starved_tasks
+                    or (dag_id, task_instance.run_id, task_instance.task_id)
+                    in starved_tasks_task_dagrun_concurrency
+                ):
+                    continue
 
                 pool_stats = pools.get(pool_name)
                 if not pool_stats:
-                    self.log.warning("Tasks using non-existent pool '%s' will not be scheduled", pool_name)
+                    if pool_name not in starved_pools:
+                        self.log.warning(
+                            "Tasks using non-existent pool '%s' will not be scheduled", pool_name
+                        )
                     starved_pools.add(pool_name)
                     continue
 
@@ -438,9 +565,10 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 open_slots = pool_stats["open"]
 
                 if open_slots <= 0:
-                    self.log.info(
-                        "Not scheduling since there are %s open slots in pool %s", open_slots, pool_name
-                    )
+                    if pool_name not in starved_pools:
+                        self.log.info(
+                            "Not scheduling since there are %s open slots in pool %s", open_slots, pool_name
+                        )
                     # Can't schedule any more since there are no more open slots.
                     pool_num_starving_tasks[pool_name] += 1
                     num_starving_tasks_total += 1
@@ -479,8 +607,6 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
                 # Check to make sure that the task max_active_tasks of the DAG hasn't been
                 # reached.
-                dag_id = task_instance.dag_id
-
                 current_active_tasks_per_dag = concurrency_map.dag_active_tasks_map[dag_id]
                 max_active_tasks_per_dag_limit = task_instance.dag_model.max_active_tasks
                 self.log.info(
@@ -517,6 +643,7 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                             .values(state=TaskInstanceState.FAILED)
                             .execution_options(synchronize_session="fetch")
                         )
+                        starved_dags.add(dag_id)
                         continue
 
                     task_concurrency_limit: int | None = None
@@ -532,8 +659,7 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
                         if current_task_concurrency >= task_concurrency_limit:
                             self.log.info(
-                                "Not executing %s since the task concurrency for"
-                                " this task has been reached.",
+                                "Not executing %s since the task concurrency for this task has been reached.",
                                 task_instance,
                             )
                             starved_tasks.add((task_instance.dag_id, task_instance.task_id))
@@ -571,22 +697,23 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
                 pool_stats["open"] = open_slots
 
-            is_done = executable_tis or len(task_instances_to_examine) < max_tis
-            # Check this to avoid accidental infinite loops
-            found_new_filters = (
-                len(starved_pools) > num_starved_pools
-                or len(starved_dags) > num_starved_dags
-                or len(starved_tasks) > num_starved_tasks
-                or len(starved_tasks_task_dagrun_concurrency) > num_starved_tasks_task_dagrun_concurrency
+            num_starved_after = (
+                len(starved_pools)
+                + len(starved_dags)
+                + len(starved_tasks)
+                + len(starved_tasks_task_dagrun_concurrency)
             )
-
-            if is_done or not found_new_filters:
+            if (
+                executable_tis
+                or len(task_instances_to_examine) < prefetch_limit
+                or num_starved_after == num_starved
+            ):
                 break
 
             self.log.info(
-                "Found no task instances to queue on query iteration %s "
+                "Found no task instances to queue among the %s prefetched candidates, "
                 "but there could be more candidate task instances to check.",
-                loop_count,
+                len(task_instances_to_examine),
             )
 
         for pool_name, num_starving_tasks in pool_num_starving_tasks.items():
@@ -680,12 +807,23 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         return len(queued_tis)
 
     def _process_executor_events(self, session: Session) -> int:
-        """Respond to executor events."""
+        """
+        Respond to executor events.
+
+        The events are handled in bulk: the external executor ids reported by queued and running events
+        are written with a single UPDATE, the DAGs of the task instances killed externally are loaded once
+        per DAG, the task instances killed externally which need no callback are failed with one UPDATE
+        per final state, and the failure callbacks are sent as a single batch.
+        """
         if not self._standalone_dag_processor and not self.processor_agent:
             raise ValueError("Processor agent is not started.")
         ti_primary_key_to_try_number_map: dict[tuple[str, str, str, int], int] = {}
         event_buffer = self.job.executor.get_event_buffer()
-        tis_with_right_state: list[TaskInstanceKey] = []
+        num_events = len(event_buffer)
+        if not num_events:
+            return 0
+        start_time = time.monotonic()
+        ti_keys_by_state: dict[TaskInstanceState, list[TaskInstanceKey]] = defaultdict(list)
 
         # Report execution
         for ti_key, (state, _) in event_buffer.items():
@@ -693,16 +831,24 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             ti_primary_key_to_try_number_map[ti_key.primary] = ti_key.try_number
 
             self.log.info("Received executor event with state %s for task instance %s", state, ti_key)
-            if state in (
+            if state not in (TaskInstanceState.QUEUED, TaskInstanceState.RUNNING):
+                self._mark_dag_run_dirty(ti_key.dag_id, ti_key.run_id)
+            ti_keys_by_state[state].append(ti_key)
+
+        tis_with_right_state: list[TaskInstanceKey] = [
+            ti_key
+            for state in (
                 TaskInstanceState.FAILED,
                 TaskInstanceState.SUCCESS,
                 TaskInstanceState.QUEUED,
                 TaskInstanceState.RUNNING,
-            ):
-                tis_with_right_state.append(ti_key)
+            )
+            for ti_key in ti_keys_by_state.get(state, ())
+        ]
 
         # Return if no finished tasks
         if not tis_with_right_state:
+            self._emit_executor_events_metrics(num_events, start_time)
             return len(event_buffer)
 
         # Check state of finished tasks
@@ -712,13 +858,15 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         # multi-schedulers
         tis_query: Query = with_row_locks(query, of=TI, session=session, skip_locked=True)
         tis: Iterator[TI] = session.scalars(tis_query)
+        external_executor_ids: list[tuple[TI, str]] = []
+        tis_killed_externally: list[tuple[TI, TaskInstanceState, str]] = []
         for ti in tis:
             try_number = ti_primary_key_to_try_number_map[ti.key.primary]
             buffer_key = ti.key.with_try_number(try_number)
             state, info = event_buffer.pop(buffer_key)
 
             if state in (TaskInstanceState.QUEUED, TaskInstanceState.RUNNING):
-                ti.external_executor_id = info
+                external_executor_ids.append((ti, info))
                 self.log.info("Setting external_id for %s to %s", ti, info)
                 continue
 
@@ -763,12 +911,14 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             # but that is handled by the zombie detection.
 
             ti_queued = ti.try_number == buffer_key.try_number and ti.state == TaskInstanceState.QUEUED
+            if not ti_queued:
+                continue
             ti_requeued = (
                 ti.queued_by_job_id != self.job.id  # Another scheduler has queued this task again
                 or self.job.executor.has_task(ti)  # This scheduler has this task already
             )
 
-            if ti_queued and not ti_requeued:
+            if not ti_requeued:
                 Stats.incr(
                     "scheduler.tasks.killed_externally",
                     tags={"dag_id": ti.dag_id, "task_id": ti.task_id},
@@ -778,28 +928,138 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     "task says it's %s. (Info: %s) Was the task killed externally?"
                 )
                 self._task_context_logger.error(msg, ti, state, ti.state, info, ti=ti)
+                tis_killed_externally.append((ti, state, msg % (ti, state, ti.state, info)))
+
+        if external_executor_ids:
+            session.bulk_update_mappings(
+                TI,
+                [
+                    {
+                        "dag_id": ti.dag_id,
+                        "task_id": ti.task_id,
+                        "run_id": ti.run_id,
+                        "map_index": ti.map_index,
+                        "external_executor_id": info,
+                    }
+                    for ti, info in external_executor_ids
+                ],
+            )
+            # The bulk update bypasses the unit of work, keep the task instances of the session in sync
+            for ti, info in external_executor_ids:
+                set_committed_value(ti, "external_executor_id", info)
 
-                # Get task from the Serialized DAG
-                try:
-                    dag = self.dagbag.get_dag(ti.dag_id)
-                    task = dag.get_task(ti.task_id)
-                except Exception:
-                    self.log.exception("Marking task instance %s as %s", ti, state)
-                    ti.set_state(state)
-                    continue
-                ti.task = task
-                if task.on_retry_callback or task.on_failure_callback:
-                    request = TaskCallbackRequest(
+        callback_requests = self._handle_tis_killed_externally(tis_killed_externally, session=session)
+        if callback_requests:
+            self._send_callbacks(callback_requests)
+
+        self._emit_executor_events_metrics(num_events, start_time)
+        return len(event_buffer)
+
+    def _handle_tis_killed_externally(
+        self, tis_killed_externally: list[tuple[TI, TaskInstanceState, str]], session: Session
+    ) -> list[TaskCallbackRequest]:
+        """
+        Fail the task instances killed externally, or return the callback requests which will fail them.
+
+        :param tis_killed_externally: the task instances, with their state reported by the executor and
+            the error message to fail them with
+        :return: the callback requests of the task instances which have a failure or retry callback
+        """
+        callback_requests: list[TaskCallbackRequest] = []
+        tis_to_fail: list[tuple[TI, str]] = []
+        dags: dict[str, DAG | None] = {}
+        for ti, state, error in tis_killed_externally:
+            # Get task from the Serialized DAG
+            try:
+                if ti.dag_id not in dags:
+                    dags[ti.dag_id] = self.dagbag.get_dag(ti.dag_id)
+                task = dags[ti.dag_id].get_task(ti.task_id)
+            except Exception:
+                self.log.exception("Marking task instance %s as %s", ti, state)
+                ti.set_state(state)
+                continue
+            ti.task = task
+            if task.on_retry_callback or task.on_failure_callback:
+                callback_requests.append(
+                    TaskCallbackRequest(
                         full_filepath=ti.dag_model.fileloc,
                         simple_task_instance=SimpleTaskInstance.from_ti(ti),
-                        msg=msg % (ti, state, ti.state, info),
+                        msg=error,
                         processor_subdir=ti.dag_model.processor_subdir,
                     )
-                    self.job.executor.send_callback(request)
-                else:
-                    ti.handle_failure(error=msg % (ti, state, ti.state, info), session=session)
+                )
+            elif task.email or dags[ti.dag_id].fail_stop:
+                # E-mail alerts and stopping the remaining tasks need the full failure handling
+                ti.handle_failure(error=error, session=session)
+            else:
+                tis_to_fail.append((ti, error))
+        self._fail_tis_killed_externally(tis_to_fail, session=session)
+        return callback_requests
 
-        return len(event_buffer)
+    def _fail_tis_killed_externally(self, tis_to_fail: list[tuple[TI, str]], session: Session) -> None:
+        """
+        Fail the task instances killed externally which need no callback, e-mail alert or fail-stop.
+
+        This does what ``TaskInstance.handle_failure`` does for them, but the task instances are moved to
+        their final state with one UPDATE per final state (and start date, from which the duration is
+        computed) instead of being refreshed and merged one by one.
+
+        :param tis_to_fail: the task instances, with the error message to fail them with
+        """
+        if not tis_to_fail:
+            return
+        end_date = timezone.utcnow()
+        tis_by_final_state: dict[tuple[TaskInstanceState, datetime | None], list[TI]] = defaultdict(list)
+        for ti, error in tis_to_fail:
+            get_listener_manager().hook.on_task_instance_failed(
+                previous_state=TaskInstanceState.RUNNING, task_instance=ti, error=error, session=session
+            )
+            Stats.incr(f"operator_failures_{ti.operator}", tags=ti.stats_tags)
+            Stats.incr("operator_failures", tags={**ti.stats_tags, "operator": ti.operator})
+            Stats.incr("ti_failures", tags=ti.stats_tags)
+            if ti.is_eligible_to_retry():
+                tis_by_final_state[TaskInstanceState.UP_FOR_RETRY, ti.start_date].append(ti)
+            else:
+                tis_by_final_state[TaskInstanceState.FAILED, ti.start_date].append(ti)
+
+        for (final_state, start_date), tis in tis_by_final_state.items():
+            values = {
+                "state": final_state,
+                "end_date": end_date,
+                "duration": (end_date - start_date).total_seconds() if start_date else None,
+                "next_method": None,
+                "next_kwargs": None,
+            }
+            session.execute(
+                update(TI)
+                .where(TI.filter_for_tis(tis))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            for ti in tis:
+                for key, value in values.items():
+                    set_committed_value(ti, key, value)
+                self.log.info("Marking task instance %s as %s", ti, final_state)
+                session.add(Log(TaskInstanceState.FAILED.value, ti))
+                session.add(TaskFail(ti=ti))
+
+    def _send_callbacks(self, requests: list[TaskCallbackRequest]) -> None:
+        """Send the callback requests to the executor as a single batch."""
+        try:
+            send_callbacks = self.job.executor.send_callbacks
+        except AttributeError:
+            # Executors which do not derive from BaseExecutor may not support sending batches
+            for request in requests:
+                self.job.executor.send_callback(request)
+        else:
+            send_callbacks(requests)
+
+    @staticmethod
+    def _emit_executor_events_metrics(num_events: int, start_time: float) -> None:
+        duration = time.monotonic() - start_time
+        Stats.gauge("scheduler.executor_events", num_events)
+        Stats.timing("scheduler.executor_events.duration", timedelta(seconds=duration))
+        Stats.timing("scheduler.executor_events.duration_per_event", timedelta(seconds=duration / num_events))
 
     def _execute(self) -> int | None:
         from airflow.dag_processing.manager import DagFileProcessorAgent
@@ -878,6 +1138,11 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     executor.end()
                 except Exception:
                     self.log.exception("Exception when executing Executor.end on %s", executor)
+            if self._num_shards:
+                try:
+                    SchedulerShard.release(self.job.id)
+                except Exception:
+                    self.log.exception("Exception when releasing the shards of the scheduler")
             if self.processor_agent:
                 try:
                     self.processor_agent.end()
@@ -935,9 +1200,20 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
         timers = EventScheduler()
 
+        if self._num_shards:
+            with create_session() as session:
+                self._claim_shards(session=session)
+
         # Check on start up, then every configured interval
         self.adopt_or_reset_orphaned_tasks()
 
+        if self._task_instance_counters:
+            self._reconcile_task_instance_counters()
+            timers.call_regular_interval(
+                conf.getfloat("scheduler", "task_instance_counters_reconcile_interval"),
+                self._reconcile_task_instance_counters,
+            )
+
         timers.call_regular_interval(
             conf.getfloat("scheduler", "orphaned_tasks_check_interval", fallback=300.0),
             self.adopt_or_reset_orphaned_tasks,
@@ -953,6 +1229,12 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             self._emit_pool_metrics,
         )
 
+        if self._incremental_scheduling:
+            timers.call_regular_interval(
+                conf.getfloat("scheduler", "pool_metrics_interval", fallback=5.0),
+                self._emit_skipped_dagruns_metrics,
+            )
+
         timers.call_regular_interval(
             conf.getfloat("scheduler", "zombie_detection_interval", fallback=10.0),
             self._find_zombies,
@@ -1064,7 +1346,11 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
             self._start_queued_dagruns(session)
             guard.commit()
-            dag_runs = self._get_next_dagruns_to_examine(DagRunState.RUNNING, session)
+            dag_runs: Iterable[DagRun]
+            if self._incremental_scheduling:
+                dag_runs = self._get_changed_dagruns_to_examine(session)
+            else:
+                dag_runs = self._get_next_dagruns_to_examine(DagRunState.RUNNING, session)
             # Bulk fetch the currently active dag runs for the dags we are
             # examining, rather than making one query per DagRun
 
@@ -1089,11 +1375,15 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             session.expunge_all()
             # END: schedule TIs
 
+            lock_timer = None
             if self.job.executor.slots_available <= 0:
                 # We know we can't do anything here, so don't even try!
                 self.log.debug("Executor full, skipping critical section")
                 num_queued_tis = 0
             else:
+                # The pool rows are locked until the transaction is committed
+                lock_timer = Stats.timer("scheduler.critical_section_lock_duration")
+                lock_timer.start()
                 try:
                     timer = Stats.timer("scheduler.critical_section_duration")
                     timer.start()
@@ -1107,6 +1397,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 except OperationalError as e:
                     timer.stop(send=False)
 
+                    lock_timer.stop(send=False)
+
                     if is_lock_not_available_error(error=e):
                         self.log.debug("Critical section lock held by another Scheduler")
                         Stats.incr("scheduler.critical_section_busy")
@@ -1115,18 +1407,66 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     raise
 
             guard.commit()
+            if lock_timer is not None:
+                lock_timer.stop(send=True)
 
         return num_queued_tis
 
     @retry_db_transaction
     def _get_next_dagruns_to_examine(self, state: DagRunState, session: Session) -> Query:
         """Get Next DagRuns to Examine with retries."""
-        return DagRun.next_dagruns_to_examine(state, session)
+        return DagRun.next_dagruns_to_examine(state, session, shard_condition=self._shard_condition())
+
+    def _mark_dag_run_dirty(self, dag_id: str, run_id: str) -> None:
+        """Record that a DagRun needs to be re-evaluated in incremental scheduling mode."""
+        if self._incremental_scheduling:
+            self._dirty_dag_runs.setdefault((dag_id, run_id), time.monotonic())
+
+    @retry_db_transaction
+    def _get_changed_dagruns_to_examine(self, session: Session) -> list[DagRun]:
+        """
+        Get the running DagRuns to examine in incremental scheduling mode, with retries.
+
+        DagRuns which are returned are removed from the dirty set; the ones which could not be
+        selected (e.g. because they are locked by another scheduler) stay dirty for the next loop.
+        """
+        now = time.monotonic()
+        sweep_interval = self._incremental_scheduling_sweep_interval
+        # Anything dirty for longer than the sweep interval is covered by the sweep itself (or belongs to
+        # a DagRun that is not running anymore), so there is no point in keeping track of it.
+        self._dirty_dag_runs = {
+            key: marked_at
+            for key, marked_at in self._dirty_dag_runs.items()
+            if now - marked_at < sweep_interval
+        }
+        dirty_keys = sorted(self._dirty_dag_runs, key=self._dirty_dag_runs.__getitem__)
+        dag_runs = DagRun.next_changed_dagruns_to_examine(
+            dirty_keys[: DagRun.DEFAULT_DAGRUNS_TO_EXAMINE],
+            stale_before=timezone.utcnow() - timedelta(seconds=sweep_interval),
+            session=session,
+            shard_condition=self._shard_condition(),
+        ).all()
+        for dag_run in dag_runs:
+            self._dirty_dag_runs.pop((dag_run.dag_id, dag_run.run_id), None)
+
+        self._num_dag_runs_examined = len(dag_runs)
+        Stats.gauge("scheduler.dagruns.examined", len(dag_runs))
+        Stats.gauge("scheduler.dagruns.dirty", len(self._dirty_dag_runs))
+        return dag_runs
+
+    @provide_session
+    def _emit_skipped_dagruns_metrics(self, session: Session = NEW_SESSION) -> None:
+        """Emit the number of running DagRuns the last loop did not examine in incremental scheduling mode."""
+        num_running = DagRun.count_running_dagruns(session, shard_condition=self._shard_condition())
+        num_skipped = max(num_running - self._num_dag_runs_examined, 0)
+        Stats.gauge("scheduler.dagruns.skipped", num_skipped)
 
     @retry_db_transaction
     def _create_dagruns_for_dags(self, guard: CommitProhibitorGuard, session: Session) -> None:
         """Find Dag Models needing DagRuns and Create Dag Runs with retries in case of OperationalError."""
-        query, dataset_triggered_dag_info = DagModel.dags_needing_dagruns(session)
+        query, dataset_triggered_dag_info = DagModel.dags_needing_dagruns(
+            session, shard_condition=self._shard_condition()
+        )
         all_dags_needing_dag_runs = set(query.all())
         dataset_triggered_dags = [
             dag for dag in all_dags_needing_dag_runs if dag.dag_id in dataset_triggered_dag_info
@@ -1403,6 +1743,7 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 active_runs_of_dags[dag_run.dag_id] += 1
                 _update_state(dag, dag_run)
                 dag_run.notify_dagrun_state_changed()
+                self._mark_dag_run_dirty(dag_run.dag_id, dag_run.run_id)
 
     @retry_db_transaction
     def _schedule_all_dag_runs(
@@ -1600,6 +1941,14 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             Stats.gauge("pool.deferred_slots", slot_stats["deferred"], tags={"pool_name": pool_name})
             Stats.gauge("pool.scheduled_slots", slot_stats["scheduled"], tags={"pool_name": pool_name})
 
+    @provide_session
+    def _reconcile_task_instance_counters(self, session: Session = NEW_SESSION) -> None:
+        """Correct the task instance counters with the task instances, for the changes not counted."""
+        corrections = TaskInstanceCounter.reconcile(session=session)
+        if corrections:
+            self.log.warning("Corrected %d task instance counters", corrections)
+        Stats.gauge("scheduler.task_instance_counters.corrections", corrections)
+
     @provide_session
     def adopt_or_reset_orphaned_tasks(self, session: Session = NEW_SESSION) -> int:
         """
@@ -17,8 +17,12 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
+import multiprocessing.connection
 import os
+import pickle
+import selectors
 import signal
 import sys
 import threading
@@ -27,17 +31,23 @@ import warnings
 from collections import deque
 from contextlib import suppress
 from copy import copy
+from datetime import datetime, timedelta
 from queue import SimpleQueue
-from typing import TYPE_CHECKING
+from traceback import format_exception
+from typing import TYPE_CHECKING, Coroutine
 
+from setproctitle import setproctitle
 from sqlalchemy import func, select
 
+from airflow import settings
 from airflow.configuration import conf
+from airflow.exceptions import AirflowConfigException
 from airflow.jobs.base_job_runner import BaseJobRunner
 from airflow.jobs.job import perform_heartbeat
-from airflow.models.trigger import Trigger
+from airflow.models.trigger import TRIGGER_NOTIFICATION_CHANNEL, Trigger
 from airflow.stats import Stats
-from airflow.triggers.base import TriggerEvent
+from airflow.triggers.base import BaseTrigger, TriggerEvent
+from airflow.triggers.temporal import DateTimeTrigger
 from airflow.typing_compat import TypedDict
 from airflow.utils import timezone
 from airflow.utils.log.file_task_handler import FileTaskHandler
@@ -52,15 +62,18 @@ from airflow.utils.log.trigger_handler import (
     ctx_trigger_end,
     ctx_trigger_id,
 )
+from airflow.utils.mixins import MultiprocessingStartMethodMixin
 from airflow.utils.module_loading import import_string
 from airflow.utils.session import NEW_SESSION, provide_session
 
 if TYPE_CHECKING:
+    from logging.handlers import QueueListener
+    from multiprocessing.connection import Connection
+
     from sqlalchemy.orm import Session
 
     from airflow.jobs.job import Job
     from airflow.models import TaskInstance
-    from airflow.triggers.base import BaseTrigger
 
 HANDLER_SUPPORTS_TRIGGERER = False
 """
@@ -83,6 +96,13 @@ logger = logging.getLogger(__name__)
 DISABLE_WRAPPER = conf.getboolean("logging", "disable_trigger_handler_wrapper", fallback=False)
 DISABLE_LISTENER = conf.getboolean("logging", "disable_trigger_handler_queue_listener", fallback=False)
 
+# Longest time the triggerer waits before polling the database for new triggers and events, and the
+# trigger runner before checking the requested and running triggers
+POLL_INTERVAL = 1.0
+
+# Longest time the timers of the temporal triggers sleep, so that they follow changes of the system clock
+TIMER_MAX_SLEEP = 60.0
+
 
 def configure_trigger_log_handler():
     """
@@ -249,6 +269,9 @@ class TriggererJobRunner(BaseJobRunner, LoggingMixin):
     It runs as two threads:
      - The main thread does DB calls/checkins
      - A subthread runs all the async code
+
+    With ``[triggerer] num_processes`` above 1, the async code runs in that many child processes
+    instead, each with its own subthread and event loop.
     """
 
     job_type = "TriggererJob"
@@ -267,6 +290,14 @@ class TriggererJobRunner(BaseJobRunner, LoggingMixin):
             raise ValueError(f"Capacity number {capacity} is invalid")
 
         self.health_check_threshold = conf.getint("triggerer", "triggerer_health_check_threshold")
+        self.event_batch_size = conf.getint("triggerer", "event_batch_size")
+        self.cost_report_interval = conf.getfloat("triggerer", "cost_report_interval")
+        self._last_cost_report = time.monotonic()
+        if self.event_batch_size < 1:
+            raise AirflowConfigException(
+                f"[triggerer] event_batch_size must be at least 1, got {self.event_batch_size}"
+            )
+        self.notification_listener: TriggerNotificationListener | None = None
 
         should_queue = True
         if DISABLE_WRAPPER:
@@ -286,8 +317,13 @@ class TriggererJobRunner(BaseJobRunner, LoggingMixin):
             self.log.warning("Skipping trigger logger queue listener; disabled by handler setting.")
         else:
             self.listener = setup_queue_listener()
-        # Set up runner async thread
-        self.trigger_runner = TriggerRunner()
+        # Set up runner async thread, or processes
+        num_processes = conf.getint("triggerer", "num_processes", fallback=1)
+        self.trigger_runner: TriggerRunner | MultiProcessTriggerRunner
+        if num_processes > 1:
+            self.trigger_runner = MultiProcessTriggerRunner(num_processes, listener=self.listener)
+        else:
+            self.trigger_runner = TriggerRunner()
 
     @provide_session
     def heartbeat_callback(self, session: Session = NEW_SESSION) -> None:
@@ -341,6 +377,9 @@ class TriggererJobRunner(BaseJobRunner, LoggingMixin):
 
             # Kick off runner thread
             self.trigger_runner.start()
+            if conf.getboolean("triggerer", "db_notifications"):
+                self.notification_listener = TriggerNotificationListener(self.trigger_runner.work_available)
+                self.notification_listener.start()
             # Start our own DB loop in the main thread
             self._run_trigger_loop()
         except Exception:
@@ -353,6 +392,8 @@ class TriggererJobRunner(BaseJobRunner, LoggingMixin):
             # to force-kill here.
             self.trigger_runner.stop = True
             self.trigger_runner.join(30)
+            if self.notification_listener:
+                self.notification_listener.stop = True
             self.log.info("Exited trigger loop")
         return None
 
@@ -370,11 +411,15 @@ class TriggererJobRunner(BaseJobRunner, LoggingMixin):
             self.handle_events()
             # Handle failed triggers
             self.handle_failed_triggers()
+            # Report the costs of the triggers, and balance them with the other triggerers
+            if time.monotonic() - self._last_cost_report >= self.cost_report_interval:
+                self.report_costs()
             perform_heartbeat(self.job, heartbeat_callback=self.heartbeat_callback, only_if_necessary=True)
             # Collect stats
             self.emit_metrics()
-            # Idle sleep
-            time.sleep(1)
+            # Idle until there are events or failed triggers to handle, or new triggers to load
+            self.trigger_runner.work_available.wait(POLL_INTERVAL)
+            self.trigger_runner.work_available.clear()
 
     def load_triggers(self):
         """Query the database for the triggers we're supposed to be running and update the runner."""
@@ -383,14 +428,30 @@ class TriggererJobRunner(BaseJobRunner, LoggingMixin):
         self.trigger_runner.update_triggers(set(ids))
 
     def handle_events(self):
-        """Dispatch outbound events to the Trigger model which pushes them to the relevant task instances."""
+        """
+        Dispatch outbound events to the Trigger model which pushes them to the relevant task instances.
+
+        The events are submitted in batches of ``[triggerer] event_batch_size``, each in one transaction.
+        """
         while self.trigger_runner.events:
-            # Get the event and its trigger ID
-            trigger_id, event = self.trigger_runner.events.popleft()
-            # Tell the model to wake up its tasks
-            Trigger.submit_event(trigger_id=trigger_id, event=event)
-            # Emit stat event
-            Stats.incr("triggers.succeeded")
+            # Get a batch of events and their trigger IDs
+            events = []
+            while self.trigger_runner.events and len(events) < self.event_batch_size:
+                events.append(self.trigger_runner.events.popleft())
+            fired_at = [self.trigger_runner.event_times.pop(trigger_id, None) for trigger_id, _ in events]
+            # Tell the model to wake up their tasks
+            start_time = time.monotonic()
+            Trigger.submit_events(events)
+            duration = time.monotonic() - start_time
+            # Emit stat events
+            Stats.incr("triggers.succeeded", len(events))
+            Stats.timing("triggers.submit_events.duration", timedelta(seconds=duration))
+            if duration > 0:
+                Stats.gauge("triggers.submit_events.throughput", len(events) / duration)
+            now = time.time()
+            for event_fired_at in fired_at:
+                if event_fired_at is not None:
+                    Stats.timing("triggers.resume_latency", timedelta(seconds=now - event_fired_at))
 
     def handle_failed_triggers(self):
         """
@@ -405,6 +466,19 @@ class TriggererJobRunner(BaseJobRunner, LoggingMixin):
             # Emit stat event
             Stats.incr("triggers.failed")
 
+    def report_costs(self):
+        """Report the costs of the running triggers, moving the costliest ones away if we are overloaded."""
+        self._last_cost_report = time.monotonic()
+        costs = self.trigger_runner.collect_costs()
+        Stats.gauge("triggers.cost", sum(cost for _, cost in costs), tags={"hostname": self.job.hostname})
+        moved_trigger_ids = Trigger.report_costs(
+            self.job.id, costs, self.capacity, self.health_check_threshold
+        )
+        if moved_trigger_ids:
+            self.log.info(
+                "Moved %d triggers to less loaded triggerers: %s", len(moved_trigger_ids), moved_trigger_ids
+            )
+
     def emit_metrics(self):
         Stats.gauge(f"triggers.running.{self.job.hostname}", len(self.trigger_runner.triggers))
         Stats.gauge(
@@ -415,9 +489,45 @@ class TriggererJobRunner(BaseJobRunner, LoggingMixin):
 class TriggerDetails(TypedDict):
     """Type class for the trigger details dictionary."""
 
-    task: asyncio.Task
+    # None for the temporal triggers, which fire from the timers of the runner rather than run
+    task: asyncio.Task | None
     name: str
     events: int
+    # CPU time spent running the trigger, in seconds
+    cpu_time: float
+
+
+class _CpuTimeMeter:
+    """Awaitable running a coroutine, adding the CPU time of each of its steps to the details of its trigger."""
+
+    def __init__(self, coro: Coroutine, details: TriggerDetails):
+        self.coro = coro
+        self.details = details
+
+    def __await__(self):
+        value, error = None, None
+        while True:
+            start = time.thread_time()
+            try:
+                if error is None:
+                    future = self.coro.send(value)
+                else:
+                    future = self.coro.throw(error)
+            except StopIteration as e:
+                return e.value
+            finally:
+                self.details["cpu_time"] += time.thread_time() - start
+            try:
+                value, error = (yield future), None
+            except GeneratorExit:
+                self.coro.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+
+async def _run_metered(coro: Coroutine, details: TriggerDetails):
+    return await _CpuTimeMeter(coro, details)
 
 
 class TriggerRunner(threading.Thread, LoggingMixin):
@@ -433,6 +543,9 @@ class TriggerRunner(threading.Thread, LoggingMixin):
     # Maps trigger IDs to their running tasks and other info
     triggers: dict[int, TriggerDetails]
 
+    # Heap of the temporal triggers, as (timestamp, trigger ID, moment) entries ordered by when they fire
+    timers: list[tuple[float, int, datetime]]
+
     # Cache for looking up triggers by classpath
     trigger_cache: dict[str, type[BaseTrigger]]
 
@@ -448,18 +561,37 @@ class TriggerRunner(threading.Thread, LoggingMixin):
     # Outbound queue of failed triggers
     failed_triggers: deque[tuple[int, BaseException]]
 
+    # Maps trigger IDs to the time their first event still in the outbound queue was fired at
+    event_times: dict[int, float]
+
+    # Set when there are events or failed triggers in the outbound queues
+    work_available: threading.Event
+
+    # Maps trigger IDs to their CPU time and cost when the costs were last collected
+    cost_snapshots: dict[int, tuple[float, float]]
+
     # Should-we-stop flag
     stop: bool = False
 
     def __init__(self):
         super().__init__()
         self.triggers = {}
+        self.timers = []
+        self.cost_snapshots = {}
+        self._costs_collected_at = time.monotonic()
         self.trigger_cache = {}
         self.to_create = deque()
         self.to_cancel = deque()
         self.events = deque()
         self.failed_triggers = deque()
+        self.event_times = {}
+        self.work_available = threading.Event()
         self.job_id = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._timers_changed: asyncio.Event | None = None
+        # Number of entries of cancelled triggers left in the timers heap
+        self._cancelled_timers = 0
 
     def run(self):
         """Sync entrypoint - just run a run in an async loop."""
@@ -471,16 +603,25 @@ class TriggerRunner(threading.Thread, LoggingMixin):
 
         Actual triggers run in their own separate coroutines.
         """
+        self._wakeup = asyncio.Event()
+        self._timers_changed = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
         watchdog = asyncio.create_task(self.block_watchdog())
+        timers = asyncio.create_task(self.run_timers())
         last_status = time.time()
         try:
             while not self.stop:
+                self._wakeup.clear()
                 # Run core logic
                 await self.create_triggers()
                 await self.cancel_triggers()
                 await self.cleanup_finished_triggers()
-                # Sleep for a bit
-                await asyncio.sleep(1)
+                if timers.done():
+                    # Re-raise the error which stopped the timers
+                    timers.result()
+                # Sleep until there are triggers to create or cancel, or a trigger exits
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), POLL_INTERVAL)
                 # Every minute, log status
                 if time.time() - last_status >= 60:
                     count = len(self.triggers)
@@ -489,6 +630,8 @@ class TriggerRunner(threading.Thread, LoggingMixin):
         except Exception:
             self.stop = True
             raise
+        finally:
+            timers.cancel()
         # Wait for watchdog to complete
         await watchdog
 
@@ -498,12 +641,19 @@ class TriggerRunner(threading.Thread, LoggingMixin):
             trigger_id, trigger_instance = self.to_create.popleft()
             if trigger_id not in self.triggers:
                 ti: TaskInstance = trigger_instance.task_instance
-                self.triggers[trigger_id] = {
-                    "task": asyncio.create_task(self.run_trigger(trigger_id, trigger_instance)),
-                    "name": f"{ti.dag_id}/{ti.run_id}/{ti.task_id}/{ti.map_index}/{ti.try_number} "
-                    f"(ID {trigger_id})",
-                    "events": 0,
-                }
+                name = (
+                    f"{ti.dag_id}/{ti.run_id}/{ti.task_id}/{ti.map_index}/{ti.try_number} (ID {trigger_id})"
+                )
+                details: TriggerDetails = {"task": None, "name": name, "events": 0, "cpu_time": 0.0}
+                self.triggers[trigger_id] = details
+                if self.fires_on_timer(trigger_instance):
+                    # Only keep the moment of temporal triggers, rather than a coroutine sleeping until then
+                    self.add_timer(trigger_id, trigger_instance.moment)
+                else:
+                    coro = self.run_trigger(trigger_id, trigger_instance)
+                    details["task"] = asyncio.create_task(_run_metered(coro, details))
+                    # Clean up the trigger as soon as it exits
+                    details["task"].add_done_callback(self._on_trigger_exit)
             else:
                 self.log.warning("Trigger %s had insertion attempted twice", trigger_id)
             await asyncio.sleep(0)
@@ -518,8 +668,18 @@ class TriggerRunner(threading.Thread, LoggingMixin):
             trigger_id = self.to_cancel.popleft()
             if trigger_id in self.triggers:
                 # We only delete if it did not exit already
-                self.triggers[trigger_id]["task"].cancel()
+                task = self.triggers[trigger_id]["task"]
+                if task is None:
+                    # The entry of the trigger is removed from the timers heap when it comes first
+                    del self.triggers[trigger_id]
+                    self._cancelled_timers += 1
+                else:
+                    task.cancel()
             await asyncio.sleep(0)
+        if self._cancelled_timers > len(self.timers) // 2:
+            self.timers = [timer for timer in self.timers if self._is_timer(timer[1])]
+            heapq.heapify(self.timers)
+            self._cancelled_timers = 0
 
     async def cleanup_finished_triggers(self):
         """
@@ -528,7 +688,7 @@ class TriggerRunner(threading.Thread, LoggingMixin):
         Optionally warn users if the exit was not normal.
         """
         for trigger_id, details in list(self.triggers.items()):
-            if details["task"].done():
+            if details["task"] is not None and details["task"].done():
                 # Check to see if it exited for good reasons
                 saved_exc = None
                 try:
@@ -557,6 +717,7 @@ class TriggerRunner(threading.Thread, LoggingMixin):
                         details["name"],
                     )
                     self.failed_triggers.append((trigger_id, saved_exc))
+                    self.work_available.set()
                 del self.triggers[trigger_id]
             await asyncio.sleep(0)
 
@@ -587,6 +748,54 @@ class TriggerRunner(threading.Thread, LoggingMixin):
                 )
                 Stats.incr("triggers.blocked_main_thread")
 
+    @staticmethod
+    def fires_on_timer(trigger: BaseTrigger) -> bool:
+        """Return whether the trigger only waits for its moment, and can fire from the timers heap."""
+        trigger_class = type(trigger)
+        return (
+            isinstance(trigger, DateTimeTrigger)
+            and trigger_class.run is DateTimeTrigger.run
+            and trigger_class.cleanup is BaseTrigger.cleanup
+        )
+
+    def _is_timer(self, trigger_id: int) -> bool:
+        details = self.triggers.get(trigger_id)
+        return details is not None and details["task"] is None
+
+    def add_timer(self, trigger_id: int, moment: datetime) -> None:
+        """Add a temporal trigger to the timers heap, waking up the timers if it fires first."""
+        timestamp = moment.timestamp()
+        if not self.timers or timestamp < self.timers[0][0]:
+            self._timers_changed.set()
+        heapq.heappush(self.timers, (timestamp, trigger_id, moment))
+
+    async def run_timers(self):
+        """
+        Fire the temporal triggers whose moment has passed, in batches.
+
+        A single coroutine sleeps until the first moment of the timers heap, instead of one coroutine
+        per trigger. Like :class:`~airflow.triggers.temporal.DateTimeTrigger`, it follows the system
+        clock rather than sleeping for the whole time until the moment.
+        """
+        while not self.stop:
+            self._timers_changed.clear()
+            now = time.time()
+            while self.timers and self.timers[0][0] <= now:
+                _, trigger_id, moment = heapq.heappop(self.timers)
+                if not self._is_timer(trigger_id):
+                    self._cancelled_timers = max(0, self._cancelled_timers - 1)
+                    continue
+                self.log.info("Trigger %s fired: %s", self.triggers[trigger_id]["name"], moment)
+                # Queue the event before removing the trigger, so that update_triggers always finds the
+                # trigger ID in one of them, like for the triggers run by a coroutine
+                self.event_times.setdefault(trigger_id, now)
+                self.events.append((trigger_id, TriggerEvent(moment)))
+                del self.triggers[trigger_id]
+                self.work_available.set()
+            delay = self.timers[0][0] - now if self.timers else TIMER_MAX_SLEEP
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._timers_changed.wait(), min(delay, TIMER_MAX_SLEEP))
+
     @staticmethod
     def set_individual_trigger_logging(trigger):
         """Configure trigger logging to allow individual files and stdout filtering."""
@@ -607,7 +816,9 @@ class TriggerRunner(threading.Thread, LoggingMixin):
             async for event in trigger.run():
                 self.log.info("Trigger %s fired: %s", self.triggers[trigger_id]["name"], event)
                 self.triggers[trigger_id]["events"] += 1
+                self.event_times.setdefault(trigger_id, time.time())
                 self.events.append((trigger_id, event))
+                self.work_available.set()
         except asyncio.CancelledError:
             if timeout := trigger.task_instance.trigger_timeout:
                 timeout = timeout.replace(tzinfo=timezone.utc) if not timeout.tzinfo else timeout
@@ -703,6 +914,45 @@ class TriggerRunner(threading.Thread, LoggingMixin):
             self.to_create.append((new_id, new_trigger_instance))
         # Enqueue orphaned triggers for cancellation
         self.to_cancel.extend(cancel_trigger_ids)
+        if self.to_create or self.to_cancel:
+            self.wake_up()
+
+    def collect_costs(self) -> list[tuple[int, float]]:
+        """
+        Return the cost of the running triggers, in CPU seconds per second, since the last collection.
+
+        This is the CPU time a trigger uses each time it wakes up multiplied by how often it wakes up,
+        smoothed with the cost of the previous collection. The temporal triggers firing from the timers
+        have no cost.
+        """
+        now = time.monotonic()
+        elapsed = now - self._costs_collected_at
+        self._costs_collected_at = now
+        if elapsed <= 0:
+            return []
+        snapshots = {}
+        for trigger_id, details in list(self.triggers.items()):
+            if details["task"] is None:
+                continue
+            cpu_time = details["cpu_time"]
+            previous_cpu_time, previous_cost = self.cost_snapshots.get(trigger_id, (0.0, None))
+            cost = (cpu_time - previous_cpu_time) / elapsed
+            if previous_cost is not None:
+                cost = (cost + previous_cost) / 2
+            snapshots[trigger_id] = (cpu_time, cost)
+        self.cost_snapshots = snapshots
+        return [(trigger_id, cost) for trigger_id, (_, cost) in snapshots.items()]
+
+    def _on_trigger_exit(self, task: asyncio.Task) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def wake_up(self) -> None:
+        """Wake up the async loop, from the main thread, to create and cancel the requested triggers."""
+        if self._loop is not None and self._wakeup is not None:
+            # The loop is closed once the runner stopped
+            with suppress(RuntimeError):
+                self._loop.call_soon_threadsafe(self._wakeup.set)
 
     def set_trigger_logging_metadata(self, ti: TaskInstance, trigger_id, trigger):
         """
@@ -728,3 +978,315 @@ class TriggerRunner(threading.Thread, LoggingMixin):
         if classpath not in self.trigger_cache:
             self.trigger_cache[classpath] = import_string(classpath)
         return self.trigger_cache[classpath]
+
+
+class TriggerNotificationListener(threading.Thread, LoggingMixin):
+    """
+    Wake up the triggerer as soon as triggers are created, rather than on its next poll of the database.
+
+    It listens on a dedicated connection to PostgreSQL for the notifications sent when triggers are
+    created, see :func:`airflow.models.trigger.notify_triggerers`. The triggerer keeps polling the
+    database on other databases, or when the connection fails.
+    """
+
+    # Should-we-stop flag
+    stop: bool = False
+
+    def __init__(self, wakeup: threading.Event):
+        super().__init__(name="TriggerNotificationListener", daemon=True)
+        self.wakeup = wakeup
+
+    def run(self) -> None:
+        if settings.engine is None or settings.engine.dialect.name != "postgresql":
+            self.log.info("Database notifications of new triggers are only supported by PostgreSQL")
+            return
+        connection = settings.engine.raw_connection()
+        try:
+            dbapi_connection = connection.dbapi_connection
+            if not hasattr(dbapi_connection, "notifies"):
+                self.log.warning("The database driver does not support notifications, polling for triggers")
+                return
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {TRIGGER_NOTIFICATION_CHANNEL}")
+            self.log.info("Listening for notifications of new triggers")
+            with selectors.DefaultSelector() as selector:
+                selector.register(dbapi_connection, selectors.EVENT_READ)
+                while not self.stop:
+                    if not selector.select(POLL_INTERVAL):
+                        continue
+                    dbapi_connection.poll()
+                    if dbapi_connection.notifies:
+                        dbapi_connection.notifies.clear()
+                        self.wakeup.set()
+        except Exception:
+            self.log.exception("Failed to listen for notifications of new triggers, polling for triggers")
+        finally:
+            # The connection was switched to autocommit, so it is not returned to the pool
+            connection.invalidate()
+
+
+class _RemoteTriggerError(Exception):
+    """The error of a trigger run in a child process, with the traceback it was raised with."""
+
+    @classmethod
+    def from_exception(cls, exc: BaseException) -> _RemoteTriggerError:
+        return cls("".join(format_exception(type(exc), exc, exc.__traceback__)).rstrip())
+
+
+class MultiProcessTriggerRunner(MultiprocessingStartMethodMixin, LoggingMixin):
+    """
+    Runtime environment for the triggers, spread over several child processes.
+
+    Each child process runs its own :class:`TriggerRunner`, so that triggers blocking their event loop
+    only delay the triggers of the same process. Triggers are spread over the processes by their ID.
+    It has the interface of :class:`TriggerRunner` used by the main thread of the triggerer:
+    :meth:`update_triggers` sends each process the IDs of its triggers, and a thread receives the
+    events and failures of the triggers as soon as the processes send them.
+    """
+
+    # Maps the IDs of the triggers running in the processes to the index of their process
+    triggers: dict[int, int]
+
+    # Outbound queue of events
+    events: deque[tuple[int, TriggerEvent]]
+
+    # Outbound queue of failed triggers
+    failed_triggers: deque[tuple[int, BaseException]]
+
+    # Maps trigger IDs to the time their first event still in the outbound queue was fired at
+    event_times: dict[int, float]
+
+    # Set when there are events or failed triggers in the outbound queues
+    work_available: threading.Event
+
+    # Should-we-stop flag
+    stop: bool = False
+
+    def __init__(self, num_processes: int, listener: QueueListener | None = None):
+        super().__init__()
+        self.num_processes = num_processes
+        self.listener = listener
+        self.triggers = {}
+        self.events = deque()
+        self.failed_triggers = deque()
+        self.event_times = {}
+        self.work_available = threading.Event()
+        self.job_id = None
+        self._processes: list = []
+        self._channels: list[Connection] = []
+        self._running_trigger_ids: list[list[int]] = [[] for _ in range(num_processes)]
+        self._costs: dict[int, float] = {}
+        self._receiver: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the child processes, and the thread receiving their events."""
+        context = self._get_multiprocessing_context()
+        forked = context.get_start_method() == "fork"
+        for index in range(self.num_processes):
+            parent_channel, child_channel = context.Pipe()
+            process = context.Process(
+                target=_run_trigger_runner_process,
+                args=(child_channel, self.job_id, index, self.listener if forked else None, not forked),
+                name=f"TriggerRunner-{index}",
+                daemon=True,
+            )
+            process.start()
+            # Close the child side of the pipe, so that it is closed when the child process exits
+            child_channel.close()
+            self._processes.append(process)
+            self._channels.append(parent_channel)
+        self._receiver = threading.Thread(target=self._receive, name="TriggerRunnerReceiver", daemon=True)
+        self._receiver.start()
+        self.log.info("Started %d trigger runner processes", self.num_processes)
+
+    def is_alive(self) -> bool:
+        return bool(self._processes) and all(process.is_alive() for process in self._processes)
+
+    def join(self, timeout: float | None = None) -> None:
+        """Stop the child processes, letting their triggers clean up, and wait for them to exit."""
+        for channel in self._channels:
+            with suppress(OSError):
+                channel.send(None)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()) if deadline is not None else None)
+            if process.is_alive():
+                self.log.warning("Trigger runner process %s did not exit, terminating it", process.name)
+                process.terminate()
+                process.join()
+        if self._receiver:
+            self._receiver.join()
+        for channel in self._channels:
+            channel.close()
+
+    def update_triggers(self, requested_trigger_ids: set[int]) -> None:
+        """
+        Send each process the IDs of the triggers it should run.
+
+        The triggers whose events or failures are still in the outbound queues have already finished in
+        their process, so they are left out: the process would otherwise create them again.
+        """
+        finished_trigger_ids = {trigger_id for trigger_id, _ in list(self.events)}.union(
+            trigger_id for trigger_id, _ in list(self.failed_triggers)
+        )
+        trigger_ids_by_process: list[set[int]] = [set() for _ in range(self.num_processes)]
+        for trigger_id in requested_trigger_ids - finished_trigger_ids:
+            trigger_ids_by_process[trigger_id % self.num_processes].add(trigger_id)
+        for process, channel, trigger_ids in zip(self._processes, self._channels, trigger_ids_by_process):
+            try:
+                channel.send(trigger_ids)
+            except OSError:
+                self.log.error("Trigger runner process %s has died!", process.name)
+
+    def _receive(self) -> None:
+        """Receive the events, failed triggers and running triggers sent by the processes, until they exit."""
+        channels = dict(zip(self._channels, range(self.num_processes)))
+        while channels:
+            for channel in multiprocessing.connection.wait(list(channels), POLL_INTERVAL):
+                try:
+                    message = channel.recv()
+                except (EOFError, OSError):
+                    del channels[channel]
+                    continue
+                self._handle_message(channels[channel], *message)
+
+    def _handle_message(
+        self,
+        index: int,
+        events: list[tuple[int, TriggerEvent]],
+        failed_triggers: list[tuple[int, BaseException]],
+        event_times: dict[int, float],
+        running_trigger_ids: list[int],
+        costs: list[tuple[int, float]] | None = None,
+    ) -> None:
+        if costs:
+            self._costs.update(costs)
+        for trigger_id, fired_at in event_times.items():
+            self.event_times.setdefault(trigger_id, fired_at)
+        self.events.extend(events)
+        self.failed_triggers.extend(failed_triggers)
+        self._running_trigger_ids[index] = running_trigger_ids
+        self.triggers = {
+            trigger_id: index
+            for index, trigger_ids in enumerate(self._running_trigger_ids)
+            for trigger_id in trigger_ids
+        }
+        if events or failed_triggers:
+            self.work_available.set()
+
+    def collect_costs(self) -> list[tuple[int, float]]:
+        """Return the costs of the running triggers last sent by the processes."""
+        running_trigger_ids = self.triggers
+        self._costs = {
+            trigger_id: cost for trigger_id, cost in self._costs.items() if trigger_id in running_trigger_ids
+        }
+        return list(self._costs.items())
+
+
+def _configure_child_logging(parent_listener: QueueListener | None, configure: bool) -> QueueListener | None:
+    """
+    Configure the logging of a trigger runner process, the same way as the triggerer's.
+
+    :param parent_listener: the queue listener of the triggerer, when the process is forked from it
+    :param configure: whether the process was spawned, and the logging has to be configured from scratch
+    """
+    if parent_listener is not None:
+        # The process was forked with the queue handler of the triggerer, but the thread of its
+        # listener was not, so the records have to be routed to a new listener
+        root_logger = logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            if isinstance(handler, LocalQueueHandler):
+                root_logger.removeHandler(handler)
+        for handler in parent_listener.handlers:
+            root_logger.addHandler(handler)
+        return setup_queue_listener()
+    if configure:
+        should_queue = True if DISABLE_WRAPPER else configure_trigger_log_handler()
+        if not DISABLE_LISTENER and should_queue is not False:
+            return setup_queue_listener()
+    return None
+
+
+def _run_trigger_runner_process(
+    channel: Connection,
+    job_id: int | None,
+    index: int,
+    parent_listener: QueueListener | None,
+    configure_logging: bool,
+) -> None:
+    """Run the triggers sent by a :class:`MultiProcessTriggerRunner` in a child process."""
+    # The triggerer stops the child processes itself, on the signals it receives
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    setproctitle(f"airflow triggerer -- trigger runner {index}")
+    listener = _configure_child_logging(parent_listener, configure_logging)
+    # Re-configure the ORM engine as there are issues with multiple processes
+    settings.configure_orm()
+
+    trigger_runner = TriggerRunner()
+    trigger_runner.job_id = job_id
+    trigger_runner.start()
+    running_trigger_ids: list[int] = []
+    # The triggers whose events or failures were sent, which the triggerer may still request until it
+    # has received and handled them
+    finished_trigger_ids: set[int] = set()
+    cost_report_interval = conf.getfloat("triggerer", "cost_report_interval")
+    last_cost_report = time.monotonic()
+    try:
+        while trigger_runner.is_alive():
+            # Send the events as soon as they are fired, and check for new trigger IDs in between
+            trigger_runner.work_available.wait(0.05)
+            trigger_runner.work_available.clear()
+            if channel.poll():
+                trigger_ids = channel.recv()
+                if trigger_ids is None:
+                    break
+                finished_trigger_ids &= trigger_ids
+                trigger_runner.update_triggers(trigger_ids - finished_trigger_ids)
+
+            events = []
+            while trigger_runner.events:
+                events.append(trigger_runner.events.popleft())
+            event_times = {
+                trigger_id: trigger_runner.event_times.pop(trigger_id)
+                for trigger_id, _ in events
+                if trigger_id in trigger_runner.event_times
+            }
+            failed_triggers = []
+            while trigger_runner.failed_triggers:
+                trigger_id, exc = trigger_runner.failed_triggers.popleft()
+                # Tracebacks cannot be pickled, so the error is sent with its formatted traceback
+                failed_triggers.append((trigger_id, _RemoteTriggerError.from_exception(exc) if exc else None))
+            costs = []
+            if time.monotonic() - last_cost_report >= cost_report_interval:
+                costs = trigger_runner.collect_costs()
+                last_cost_report = time.monotonic()
+            if (
+                not events
+                and not failed_triggers
+                and not costs
+                and list(trigger_runner.triggers) == running_trigger_ids
+            ):
+                continue
+            running_trigger_ids = list(trigger_runner.triggers)
+            finished_trigger_ids.update(trigger_id for trigger_id, _ in events)
+            finished_trigger_ids.update(trigger_id for trigger_id, _ in failed_triggers)
+            try:
+                channel.send((events, failed_triggers, event_times, running_trigger_ids, costs))
+            except (pickle.PicklingError, AttributeError, TypeError):
+                # Fail the triggers whose events cannot be sent, rather than all the triggers of the process
+                for trigger_id, event in events[:]:
+                    try:
+                        pickle.dumps(event)
+                    except Exception as e:
+                        events.remove((trigger_id, event))
+                        failed_triggers.append((trigger_id, _RemoteTriggerError.from_exception(e)))
+                channel.send((events, failed_triggers, event_times, running_trigger_ids, costs))
+    finally:
+        trigger_runner.stop = True
+        trigger_runner.join(30)
+        if listener:
+            listener.stop()
+        settings.dispose_orm()
+        channel.close()
@@ -0,0 +1,64 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add serialized_task table.
+
+Revision ID: ce5441e2f01e
+Revises: c4602ba06b4b
+Create Date: 2024-06-10 10:21:36.512345
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+import sqlalchemy_jsonfield
+from alembic import op
+
+from airflow.settings import json
+
+# revision identifiers, used by Alembic.
+revision = "ce5441e2f01e"
+down_revision = "c4602ba06b4b"
+branch_labels = None
+depends_on = None
+airflow_version = "2.10.0"
+
+
+def upgrade():
+    """Apply Add serialized_task table."""
+    op.create_table(
+        "serialized_task",
+        sa.Column("dag_id", sa.String(length=250), nullable=False),
+        sa.Column("task_id", sa.String(length=250), nullable=False),
+        sa.Column("data", sqlalchemy_jsonfield.JSONField(json=json), nullable=True),
+        sa.Column("data_compressed", sa.LargeBinary(), nullable=True),
+        sa.Column("task_hash", sa.String(length=32), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["dag_id"],
+            ["serialized_dag.dag_id"],
+            name="serialized_task_dag_id_fkey",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("dag_id", "task_id", name="serialized_task_pkey"),
+    )
+
+
+def downgrade():
+    """Unapply Add serialized_task table."""
+    op.drop_table("serialized_task")
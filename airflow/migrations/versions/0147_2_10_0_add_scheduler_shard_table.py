@@ -0,0 +1,84 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add scheduler_shard table and shard_key to dag table.
+
+Revision ID: a6f4224e7aab
+Revises: ce5441e2f01e
+Create Date: 2024-06-14 09:12:48.301957
+
+"""
+
+from __future__ import annotations
+
+import zlib
+
+import sqlalchemy as sa
+from alembic import op
+
+from airflow.utils.sqlalchemy import UtcDateTime
+
+# revision identifiers, used by Alembic.
+revision = "a6f4224e7aab"
+down_revision = "ce5441e2f01e"
+branch_labels = None
+depends_on = None
+airflow_version = "2.10.0"
+
+# Same as airflow.models.scheduler_shard.NUM_SHARD_KEYS at the time of this migration
+NUM_SHARD_KEYS = 1024
+
+# Number of DAG rows updated by each executemany call
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    """Apply Add scheduler_shard table and shard_key to dag table."""
+    op.create_table(
+        "scheduler_shard",
+        sa.Column("shard", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=True),
+        sa.Column("claimed_at", UtcDateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("shard", name="scheduler_shard_pkey"),
+    )
+    with op.batch_alter_table("dag") as batch_op:
+        batch_op.add_column(sa.Column("shard_key", sa.Integer(), nullable=True))
+
+    dag = sa.table("dag", sa.column("dag_id", sa.String), sa.column("shard_key", sa.Integer))
+    conn = op.get_bind()
+    dag_ids = conn.execute(sa.select(dag.c.dag_id)).scalars().all()
+    update_shard_key = (
+        dag.update()
+        .where(dag.c.dag_id == sa.bindparam("b_dag_id"))
+        .values(shard_key=sa.bindparam("b_shard_key"))
+    )
+    for start in range(0, len(dag_ids), BATCH_SIZE):
+        conn.execute(
+            update_shard_key,
+            [
+                {"b_dag_id": dag_id, "b_shard_key": zlib.crc32(dag_id.encode("utf-8")) % NUM_SHARD_KEYS}
+                for dag_id in dag_ids[start : start + BATCH_SIZE]
+            ],
+        )
+
+
+def downgrade():
+    """Unapply Add scheduler_shard table and shard_key to dag table."""
+    with op.batch_alter_table("dag") as batch_op:
+        batch_op.drop_column("shard_key")
+    op.drop_table("scheduler_shard")
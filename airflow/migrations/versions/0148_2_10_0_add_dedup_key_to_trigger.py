@@ -0,0 +1,51 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add dedup_key to trigger table.
+
+Revision ID: 3b8e4f9c1d27
+Revises: a6f4224e7aab
+Create Date: 2024-06-17 15:40:12.084512
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b8e4f9c1d27"
+down_revision = "a6f4224e7aab"
+branch_labels = None
+depends_on = None
+airflow_version = "2.10.0"
+
+
+def upgrade():
+    """Apply Add dedup_key to trigger table."""
+    with op.batch_alter_table("trigger") as batch_op:
+        batch_op.add_column(sa.Column("dedup_key", sa.String(length=64), nullable=True))
+        batch_op.create_index("idx_trigger_dedup_key", ["dedup_key"], unique=False)
+
+
+def downgrade():
+    """Unapply Add dedup_key to trigger table."""
+    with op.batch_alter_table("trigger") as batch_op:
+        batch_op.drop_index("idx_trigger_dedup_key")
+        batch_op.drop_column("dedup_key")
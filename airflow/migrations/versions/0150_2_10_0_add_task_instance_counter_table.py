@@ -0,0 +1,61 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add task_instance_counter table.
+
+Revision ID: 8e1f3c5a9b62
+Revises: 5d2c7e81f0a4
+Create Date: 2024-06-21 14:05:12.618420
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+from airflow.migrations.db_types import StringID
+
+# revision identifiers, used by Alembic.
+revision = "8e1f3c5a9b62"
+down_revision = "5d2c7e81f0a4"
+branch_labels = None
+depends_on = None
+airflow_version = "2.10.0"
+
+
+def upgrade():
+    """Apply Add task_instance_counter table."""
+    op.create_table(
+        "task_instance_counter",
+        sa.Column("dag_id", StringID(), nullable=False),
+        sa.Column("run_id", StringID(), nullable=False),
+        sa.Column("task_id", StringID(), nullable=False),
+        sa.Column("pool", sa.String(length=256), nullable=False),
+        sa.Column("state", sa.String(length=20), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("slots", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "dag_id", "run_id", "task_id", "pool", "state", name="task_instance_counter_pkey"
+        ),
+    )
+
+
+def downgrade():
+    """Unapply Add task_instance_counter table."""
+    op.drop_table("task_instance_counter")
@@ -62,7 +62,9 @@ def import_all_models():
     import airflow.models.dagwarning
     import airflow.models.dataset
     import airflow.models.errors
+    import airflow.models.scheduler_shard
     import airflow.models.serialized_dag
+    import airflow.models.taskinstancecounter
     import airflow.models.tasklog
 
 
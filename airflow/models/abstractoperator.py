@@ -298,15 +298,19 @@ class AbstractOperator(Templater, DAGNode):
         Relevant in this case means, the setup has a teardown that is downstream of ``self``,
         or the setup has no teardowns.
         """
-        downstream_teardown_ids = {
-            x.task_id for x in self.get_flat_relatives(upstream=False) if x.is_teardown
-        }
+        # Computed lazily; walking the downstream relatives is expensive on big DAGs
+        # and not needed at all when there are no upstream setups with teardowns.
+        downstream_teardown_ids: set[str] | None = None
         for task in self.get_flat_relatives(upstream=True):
             if not task.is_setup:
                 continue
             has_no_teardowns = not any(True for x in task.downstream_list if x.is_teardown)
+            if not has_no_teardowns and downstream_teardown_ids is None:
+                downstream_teardown_ids = {
+                    x.task_id for x in self.get_flat_relatives(upstream=False) if x.is_teardown
+                }
             # if task has no teardowns or has teardowns downstream of self
-            if has_no_teardowns or task.downstream_task_ids.intersection(downstream_teardown_ids):
+            if has_no_teardowns or task.downstream_task_ids.intersection(downstream_teardown_ids or ()):
                 yield task
                 for t in task.downstream_list:
                     if t.is_teardown and t != self:
@@ -432,6 +436,7 @@ class AbstractOperator(Templater, DAGNode):
         from airflow.task.priority_strategy import (
             _AbsolutePriorityWeightStrategy,
             _DownstreamPriorityWeightStrategy,
+            _total_priority_weight,
             _UpstreamPriorityWeightStrategy,
         )
 
@@ -443,13 +448,7 @@ class AbstractOperator(Templater, DAGNode):
             upstream = True
         else:
             upstream = False
-        dag = self.get_dag()
-        if dag is None:
-            return self.priority_weight
-        return self.priority_weight + sum(
-            dag.task_dict[task_id].priority_weight
-            for task_id in self.get_flat_relative_ids(upstream=upstream)
-        )
+        return _total_priority_weight(self, upstream=upstream)
 
     @cached_property
     def operator_extra_link_dict(self) -> dict[str, Any]:
@@ -629,7 +628,7 @@ class AbstractOperator(Templater, DAGNode):
 
         if total_length is None or total_length < 1:
             # Nothing to fixup.
-            indexes_to_map: Iterable[int] = ()
+            indexes_to_map: Sequence[int] = ()
         else:
             # Only create "missing" ones.
             current_max_mapping = session.scalar(
@@ -641,14 +640,33 @@ class AbstractOperator(Templater, DAGNode):
             )
             indexes_to_map = range(current_max_mapping + 1, total_length)
 
-        for index in indexes_to_map:
-            # TODO: Make more efficient with bulk_insert_mappings/bulk_save_mappings.
-            ti = TaskInstance(self, run_id=run_id, map_index=index, state=state)
-            self.log.debug("Expanding TIs upserted %s", ti)
-            task_instance_mutation_hook(ti)
-            ti = session.merge(ti)
-            ti.refresh_from_task(self)  # session.merge() loses task information.
-            all_expanded_tis.append(ti)
+        if indexes_to_map and getattr(task_instance_mutation_hook, "is_noop", False):
+            # Without a mutation hook to apply, insert the rows in bulk, and load them back at once
+            inserted = TaskInstance.bulk_insert(
+                TaskInstance.insert_mappings(run_id, self, indexes_to_map, state=state), session=session
+            )
+            self.log.debug("Expanding TIs inserted %d task instances", inserted)
+            expanded_tis = session.scalars(
+                select(TaskInstance)
+                .where(
+                    TaskInstance.dag_id == self.dag_id,
+                    TaskInstance.task_id == self.task_id,
+                    TaskInstance.run_id == run_id,
+                    TaskInstance.map_index >= indexes_to_map[0],
+                )
+                .order_by(TaskInstance.map_index)
+            )
+            for ti in expanded_tis:
+                ti.task = self
+                all_expanded_tis.append(ti)
+        else:
+            for index in indexes_to_map:
+                ti = TaskInstance(self, run_id=run_id, map_index=index, state=state)
+                self.log.debug("Expanding TIs upserted %s", ti)
+                task_instance_mutation_hook(ti)
+                ti = session.merge(ti)
+                ti.refresh_from_task(self)  # session.merge() loses task information.
+                all_expanded_tis.append(ti)
 
         # Coerce the None case to 0 -- these two are almost treated identically,
         # except the unmapped ti (if exists) is marked to different states.
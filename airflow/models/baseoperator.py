@@ -1153,6 +1153,8 @@ class BaseOperator(AbstractOperator, metaclass=BaseOperatorMeta):
 
     def __setattr__(self, key, value):
         super().__setattr__(key, value)
+        if key == "priority_weight" and self.has_dag():
+            self.dag._priority_weight_index = None
         if self.__from_mapped or self._lock_for_execution:
             return  # Skip any custom behavior for validation and during execute.
         if key in self.__init_kwargs:
@@ -103,6 +103,7 @@ from airflow.models.dagpickle import DagPickle
 from airflow.models.dagrun import RUN_ID_REGEX, DagRun
 from airflow.models.dataset import DatasetDagRunQueue, DatasetModel
 from airflow.models.param import DagParam, ParamsDict
+from airflow.models.scheduler_shard import dag_shard_key
 from airflow.models.taskinstance import (
     Context,
     TaskInstance,
@@ -147,6 +148,7 @@ if TYPE_CHECKING:
     from pendulum.tz.timezone import FixedTimezone, Timezone
     from sqlalchemy.orm.query import Query
     from sqlalchemy.orm.session import Session
+    from sqlalchemy.sql import ColumnElement
 
     from airflow.decorators import TaskDecoratorCollection
     from airflow.models.dagbag import DagBag
@@ -154,6 +156,7 @@ if TYPE_CHECKING:
     from airflow.models.slamiss import SlaMiss
     from airflow.serialization.pydantic.dag import DagModelPydantic
     from airflow.serialization.pydantic.dag_run import DagRunPydantic
+    from airflow.task.priority_strategy import PriorityWeightIndex
     from airflow.typing_compat import Literal
     from airflow.utils.task_group import TaskGroup
 
@@ -479,6 +482,9 @@ class DAG(LoggingMixin):
 
     parent_dag: DAG | None = None  # Gets set when DAGs are loaded
 
+    # Built on first use, reset when the tasks, their dependencies or their priority weights change
+    _priority_weight_index: PriorityWeightIndex | None = None
+
     # NOTE: When updating arguments here, please also keep arguments in @dag()
     # below in sync. (Search for 'def dag(' in this file.)
     def __init__(
@@ -2636,8 +2642,21 @@ class DAG(LoggingMixin):
         if len(dag.tasks) < len(self.tasks):
             dag.partial = True
 
+        dag._priority_weight_index = None
         return dag
 
+    def get_priority_weight_index(self) -> PriorityWeightIndex:
+        """
+        Return the upstream and downstream closures of the tasks, and the sums of their priority weights.
+
+        :meta private:
+        """
+        if self._priority_weight_index is None:
+            from airflow.task.priority_strategy import PriorityWeightIndex
+
+            self._priority_weight_index = PriorityWeightIndex.build(self)
+        return self._priority_weight_index
+
     def has_task(self, task_id: str):
         return task_id in self.task_dict
 
@@ -2752,6 +2771,8 @@ class DAG(LoggingMixin):
         ) or task_id in self._task_group.used_group_ids:
             raise DuplicateTaskIdFound(f"Task id '{task_id}' has already been added to the DAG")
         else:
+            if task_id not in self.task_dict:
+                self._priority_weight_index = None
             self.task_dict[task_id] = task
             task.dag = self
             # Add task_id to used_group_ids to prevent group_id and task_id collisions.
@@ -2772,6 +2793,7 @@ class DAG(LoggingMixin):
         # This is "private" as removing could leave a hole in dependencies if done incorrectly, and this
         # doesn't guard against that
         task = self.task_dict.pop(task_id)
+        self._priority_weight_index = None
         tg = getattr(task, "task_group", None)
         if tg:
             tg._remove(task)
@@ -3656,6 +3678,11 @@ class DagModel(Base):
     # Earliest time at which this ``next_dagrun`` can be created.
     next_dagrun_create_after = Column(UtcDateTime)
 
+    # Shard of the DAG when running schedulers in sharded mode, see SchedulerShard.
+    shard_key = Column(
+        Integer, default=lambda context: dag_shard_key(context.get_current_parameters()["dag_id"])
+    )
+
     __table_args__ = (
         Index("idx_root_dag_id", root_dag_id, unique=False),
         Index("idx_next_dagrun_create_after", next_dagrun_create_after, unique=False),
@@ -3853,13 +3880,18 @@ class DagModel(Base):
                 dag_model.is_active = False
 
     @classmethod
-    def dags_needing_dagruns(cls, session: Session) -> tuple[Query, dict[str, tuple[datetime, datetime]]]:
+    def dags_needing_dagruns(
+        cls, session: Session, shard_condition: ColumnElement[bool] | None = None
+    ) -> tuple[Query, dict[str, tuple[datetime, datetime]]]:
         """
         Return (and lock) a list of Dag objects that are due to create a new DagRun.
 
         This will return a resultset of rows that is row-level-locked with a "SELECT ... FOR UPDATE" query,
         you should ensure that any scheduling decisions are made in a single transaction -- as soon as the
         transaction is committed it will be unlocked.
+
+        :param shard_condition: in sharded mode, the condition selecting the DAGs of the shards held by
+            the scheduler
         """
         from airflow.models.serialized_dag import SerializedDagModel
 
@@ -3930,6 +3962,8 @@ class DagModel(Base):
             .order_by(cls.next_dagrun_create_after)
             .limit(cls.NUM_DAGS_PER_DAGRUN_QUERY)
         )
+        if shard_condition is not None:
+            query = query.where(shard_condition)
 
         return (
             session.scalars(with_row_locks(query, of=cls, session=session, skip_locked=True)),
@@ -44,6 +44,7 @@ from airflow.exceptions import (
     AirflowClusterPolicyError,
     AirflowClusterPolicySkipDag,
     AirflowClusterPolicyViolation,
+    AirflowConfigException,
     AirflowDagCycleException,
     AirflowDagDuplicatedIdException,
     RemovedInAirflow3Warning,
@@ -163,6 +164,19 @@ class DagBag(LoggingMixin):
         self.dags_last_fetched: dict[str, datetime] = {}
         # Only used by SchedulerJob to compare the dag_hash to identify change in DAGs
         self.dags_hash: dict[str, str] = {}
+        # Only used by read_dags_from_db=True with a bounded cache. The DAGs loaded from the DB
+        # are ordered from the least to the most recently used, with their use count.
+        self.dags_uses: dict[str, int] = {}
+        self.dags_size: dict[str, int] = {}
+        self.dag_cache_max_dags = conf.getint("core", "dagbag_cache_max_dags")
+        self.dag_cache_max_size = conf.getint("core", "dagbag_cache_max_size") * 1024 * 1024
+        self.dag_cache_policy = conf.get("core", "dagbag_cache_policy").lower()
+        if self.dag_cache_policy not in ("lru", "lfu"):
+            raise AirflowConfigException(
+                f"Invalid value for [core] dagbag_cache_policy: {self.dag_cache_policy!r}, "
+                "expected one of 'lru' and 'lfu'"
+            )
+        self.dag_cache_is_bounded = bool(self.dag_cache_max_dags or self.dag_cache_max_size)
 
         self.dagbag_import_error_tracebacks = conf.getboolean("core", "dagbag_import_error_tracebacks")
         self.dagbag_import_error_traceback_depth = conf.getint("core", "dagbag_import_error_traceback_depth")
@@ -215,9 +229,17 @@ class DagBag(LoggingMixin):
 
             if dag_id not in self.dags:
                 # Load from DB if not (yet) in the bag
+                if self.dag_cache_is_bounded:
+                    Stats.incr("dagbag.cache_miss")
                 self._add_dag_from_db(dag_id=dag_id, session=session)
                 return self.dags.get(dag_id)
 
+            if self.dag_cache_is_bounded:
+                Stats.incr("dagbag.cache_hit")
+                if dag_id in self.dags_uses:
+                    # Move the DAG to the most recently used end
+                    self.dags_uses[dag_id] = self.dags_uses.pop(dag_id) + 1
+
             # If DAG is in the DagBag, check the following
             # 1. if time has come to check if DAG is updated (controlled by min_serialized_dag_fetch_secs)
             # 2. check the last_updated and hash columns in SerializedDag table to see if
@@ -237,9 +259,7 @@ class DagBag(LoggingMixin):
                 )
                 if not sd_latest_version_and_updated_datetime:
                     self.log.warning("Serialized DAG %s no longer exists", dag_id)
-                    del self.dags[dag_id]
-                    del self.dags_last_fetched[dag_id]
-                    del self.dags_hash[dag_id]
+                    self._remove_dag_from_db_cache(dag_id)
                     return None
 
                 sd_latest_version, sd_last_updated_datetime = sd_latest_version_and_updated_datetime
@@ -303,6 +323,41 @@ class DagBag(LoggingMixin):
         self.dags[dag.dag_id] = dag
         self.dags_last_fetched[dag.dag_id] = timezone.utcnow()
         self.dags_hash[dag.dag_id] = row.dag_hash
+        if self.dag_cache_is_bounded:
+            self.dags_uses[dag.dag_id] = self.dags_uses.pop(dag.dag_id, 1)
+            if self.dag_cache_max_size:
+                # Estimated from the serialized DAG as stored, to not walk the deserialized objects
+                self.dags_size[dag.dag_id] = SerializedDagModel.get_stored_size(dag_id, session=session)
+            self._evict_dags_from_db_cache(keep_dag_id=dag.dag_id)
+            Stats.gauge("dagbag.cached_dags", len(self.dags_uses))
+
+    def _evict_dags_from_db_cache(self, keep_dag_id: str) -> None:
+        """Evict the DAGs loaded from the DB exceeding the bounds of the cache, except the given one."""
+        cache_size = sum(self.dags_size.values())
+        while len(self.dags_uses) > 1 and (
+            (self.dag_cache_max_dags and len(self.dags_uses) > self.dag_cache_max_dags)
+            or (self.dag_cache_max_size and cache_size > self.dag_cache_max_size)
+        ):
+            candidates = (dag_id for dag_id in self.dags_uses if dag_id != keep_dag_id)
+            if self.dag_cache_policy == "lfu":
+                # Ties are broken by evicting the least recently used DAG
+                dag_id = min(candidates, key=self.dags_uses.__getitem__)
+            else:
+                dag_id = next(candidates)
+            self.log.debug("Evicting DAG %s from the DagBag", dag_id)
+            cache_size -= self.dags_size.get(dag_id, 0)
+            self._remove_dag_from_db_cache(dag_id)
+            Stats.incr("dagbag.cache_eviction")
+
+    def _remove_dag_from_db_cache(self, dag_id: str) -> None:
+        """Remove a DAG loaded from the DB, along with its subdags."""
+        dag = self.dags.pop(dag_id, None)
+        for subdag in dag.subdags if dag else ():
+            self.dags.pop(subdag.dag_id, None)
+        self.dags_last_fetched.pop(dag_id, None)
+        self.dags_hash.pop(dag_id, None)
+        self.dags_uses.pop(dag_id, None)
+        self.dags_size.pop(dag_id, None)
 
     def process_file(self, filepath, only_if_updated=True, safe_mode=True):
         """Given a path to a python module or zip file, import the module and look for dag objects within."""
@@ -22,7 +22,7 @@ import struct
 from datetime import datetime
 from typing import TYPE_CHECKING, Collection, Iterable
 
-from sqlalchemy import BigInteger, Column, String, Text, delete, select
+from sqlalchemy import BigInteger, Column, String, Text, delete, select, update
 from sqlalchemy.dialects.mysql import MEDIUMTEXT
 from sqlalchemy.sql.expression import literal
 
@@ -79,19 +79,13 @@ class DagCode(Base):
         """
         filelocs = set(filelocs)
         filelocs_to_hashes = {fileloc: DagCode.dag_fileloc_hash(fileloc) for fileloc in filelocs}
-        existing_orm_dag_codes = session.scalars(
-            select(DagCode)
+        # The source code is only loaded for the files which were modified
+        existing_orm_dag_codes = session.execute(
+            select(DagCode.fileloc, DagCode.fileloc_hash, DagCode.last_updated)
             .filter(DagCode.fileloc_hash.in_(filelocs_to_hashes.values()))
             .with_for_update(of=DagCode)
         ).all()
 
-        if existing_orm_dag_codes:
-            existing_orm_dag_codes_map = {
-                orm_dag_code.fileloc: orm_dag_code for orm_dag_code in existing_orm_dag_codes
-            }
-        else:
-            existing_orm_dag_codes_map = {}
-
         existing_orm_dag_codes_by_fileloc_hashes = {orm.fileloc_hash: orm for orm in existing_orm_dag_codes}
         existing_orm_filelocs = {orm.fileloc for orm in existing_orm_dag_codes_by_fileloc_hashes.values()}
         if not existing_orm_filelocs.issubset(filelocs):
@@ -120,10 +114,19 @@ class DagCode(Base):
             )
 
             if file_mod_time > current_version.last_updated:
-                orm_dag_code = existing_orm_dag_codes_map[fileloc]
-                orm_dag_code.last_updated = file_mod_time
-                orm_dag_code.source_code = cls._get_code_from_file(orm_dag_code.fileloc)
-                session.merge(orm_dag_code)
+                values = {"last_updated": file_mod_time}
+                source_code = cls._get_code_from_file(fileloc)
+                # Files are often touched without being changed, e.g. when the DAGs folder is synced
+                if source_code != session.scalar(
+                    select(DagCode.source_code).where(DagCode.fileloc_hash == current_version.fileloc_hash)
+                ):
+                    values["source_code"] = source_code
+                session.execute(
+                    update(DagCode)
+                    .where(DagCode.fileloc_hash == current_version.fileloc_hash)
+                    .values(values)
+                    .execution_options(synchronize_session=False)
+                )
 
     @classmethod
     @provide_session
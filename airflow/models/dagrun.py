@@ -21,7 +21,18 @@ import itertools
 import os
 import warnings
 from collections import defaultdict
-from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, NamedTuple, Sequence, TypeVar, overload
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Sequence,
+    TypeVar,
+    overload,
+)
 
 import re2
 from sqlalchemy import (
@@ -74,6 +85,7 @@ if TYPE_CHECKING:
     from datetime import datetime
 
     from sqlalchemy.orm import Query, Session
+    from sqlalchemy.sql import ColumnElement
 
     from airflow.models.dag import DAG
     from airflow.models.operator import Operator
@@ -385,6 +397,7 @@ class DagRun(Base, LoggingMixin):
         state: DagRunState,
         session: Session,
         max_number: int | None = None,
+        shard_condition: ColumnElement[bool] | None = None,
     ) -> Query:
         """
         Return the next DagRuns that the scheduler should attempt to schedule.
@@ -393,6 +406,8 @@ class DagRun(Base, LoggingMixin):
         query, you should ensure that any scheduling decisions are made in a single transaction -- as soon as
         the transaction is committed it will be unlocked.
 
+        :param shard_condition: in sharded mode, the condition on ``DagModel`` selecting the DAGs of the
+            shards held by the scheduler
         """
         from airflow.models.dag import DagModel
 
@@ -407,6 +422,8 @@ class DagRun(Base, LoggingMixin):
             .join(DagModel, DagModel.dag_id == cls.dag_id)
             .where(DagModel.is_paused == false(), DagModel.is_active == true())
         )
+        if shard_condition is not None:
+            query = query.where(shard_condition)
         if state == DagRunState.QUEUED:
             # For dag runs in the queued state, we check if they have reached the max_active_runs limit
             # and if so we drop them
@@ -431,6 +448,101 @@ class DagRun(Base, LoggingMixin):
             with_row_locks(query.limit(max_number), of=cls, session=session, skip_locked=True)
         )
 
+    @classmethod
+    def next_changed_dagruns_to_examine(
+        cls,
+        dirty_keys: Collection[tuple[str, str]],
+        stale_before: datetime,
+        session: Session,
+        max_number: int | None = None,
+        shard_condition: ColumnElement[bool] | None = None,
+    ) -> Query:
+        """
+        Return the next running DagRuns that may have changed since they were last examined.
+
+        This is the incremental counterpart of :meth:`next_dagruns_to_examine`. A running DagRun is
+        selected when any of the following holds:
+
+        * its ``(dag_id, run_id)`` is in ``dirty_keys``, i.e. the caller observed an event for it;
+        * it has never been examined (``last_scheduling_decision`` is NULL), e.g. it was just started
+          or cleared;
+        * it has task instances waiting on time rather than on an event (up for retry or reschedule);
+        * it was last examined before ``stale_before``, which acts as a periodic full sweep.
+
+        Dirty DagRuns are returned first. Rows are locked the same way as in
+        :meth:`next_dagruns_to_examine`, and ``shard_condition`` is applied the same way.
+        """
+        from airflow.models.dag import DagModel
+
+        if max_number is None:
+            max_number = cls.DEFAULT_DAGRUNS_TO_EXAMINE
+
+        waiting_on_time = (
+            select(TI.run_id)
+            .where(
+                TI.dag_id == cls.dag_id,
+                TI.run_id == cls.run_id,
+                TI.state.in_((TaskInstanceState.UP_FOR_RETRY, TaskInstanceState.UP_FOR_RESCHEDULE)),
+            )
+            .exists()
+        )
+        conditions = [
+            cls.last_scheduling_decision.is_(None),
+            cls.last_scheduling_decision < stale_before,
+            waiting_on_time,
+        ]
+        order_by = []
+        if dirty_keys:
+            is_dirty = tuple_in_condition((cls.dag_id, cls.run_id), dirty_keys)
+            conditions.append(is_dirty)
+            order_by.append(case((is_dirty, 0), else_=1))
+
+        query = (
+            select(cls)
+            .with_hint(cls, "USE INDEX (idx_dag_run_running_dags)", dialect_name="mysql")
+            .where(cls.state == DagRunState.RUNNING, cls.run_type != DagRunType.BACKFILL_JOB)
+            .join(DagModel, DagModel.dag_id == cls.dag_id)
+            .where(DagModel.is_paused == false(), DagModel.is_active == true())
+            .where(or_(*conditions))
+            .order_by(
+                *order_by,
+                nulls_first(cls.last_scheduling_decision, session=session),
+                cls.execution_date,
+            )
+        )
+        if shard_condition is not None:
+            query = query.where(shard_condition)
+
+        if not settings.ALLOW_FUTURE_EXEC_DATES:
+            query = query.where(DagRun.execution_date <= func.now())
+
+        return session.scalars(
+            with_row_locks(query.limit(max_number), of=cls, session=session, skip_locked=True)
+        )
+
+    @classmethod
+    def count_running_dagruns(
+        cls, session: Session, shard_condition: ColumnElement[bool] | None = None
+    ) -> int:
+        """
+        Return the number of running non-backfill DagRuns of active, unpaused DAGs.
+
+        :param shard_condition: in sharded mode, the condition on ``DagModel`` selecting the DAGs of the
+            shards held by the scheduler
+        """
+        from airflow.models.dag import DagModel
+
+        query = (
+            select(func.count())
+            .select_from(cls)
+            .join(DagModel, DagModel.dag_id == cls.dag_id)
+            .where(cls.state == DagRunState.RUNNING, cls.run_type != DagRunType.BACKFILL_JOB)
+            .where(DagModel.is_paused == false(), DagModel.is_active == true())
+        )
+        if shard_condition is not None:
+            query = query.where(shard_condition)
+        return session.scalar(query) or 0
+
     @classmethod
     @provide_session
     def find(
@@ -1064,11 +1176,16 @@ class DagRun(Base, LoggingMixin):
                 if new_tis is not None:
                     additional_tis.extend(new_tis)
                     expansion_happened = True
+                    # Task instances were added to the run, the cached per-task counts are stale
+                    dep_context.reset_ti_counts_by_task()
             if new_tis is None and schedulable.state in SCHEDULEABLE_STATES:
                 # It's enough to revise map index once per task id,
                 # checking the map index for each mapped task significantly slows down scheduling
                 if schedulable.task.task_id not in revised_map_index_task_ids:
-                    ready_tis.extend(self._revise_map_indexes_if_mapped(schedulable.task, session=session))
+                    revised_tis = list(self._revise_map_indexes_if_mapped(schedulable.task, session=session))
+                    if revised_tis:
+                        dep_context.reset_ti_counts_by_task()
+                    ready_tis.extend(revised_tis)
                     revised_map_index_task_ids.add(schedulable.task.task_id)
                 ready_tis.append(schedulable)
 
@@ -1321,8 +1438,7 @@ class DagRun(Base, LoggingMixin):
 
             def create_ti_mapping(task: Operator, indexes: Iterable[int]) -> Iterator[dict[str, Any]]:
                 created_counts[task.task_type] += 1
-                for map_index in indexes:
-                    yield TI.insert_mapping(self.run_id, task, map_index=map_index)
+                yield from TI.insert_mappings(self.run_id, task, indexes)
 
             creator = create_ti_mapping
 
@@ -1451,9 +1567,28 @@ class DagRun(Base, LoggingMixin):
             )
             session.flush()
 
-        for index in range(total_length):
-            if index in existing_indexes:
-                continue
+        missing_indexes = [index for index in range(total_length) if index not in existing_indexes]
+        if missing_indexes and getattr(task_instance_mutation_hook, "is_noop", False):
+            # Without a mutation hook to apply, insert the rows in bulk, and load them back at once
+            TI.bulk_insert(TI.insert_mappings(self.run_id, task, missing_indexes), session=session)
+            created_tis = session.scalars(
+                select(TI)
+                .where(
+                    TI.dag_id == self.dag_id,
+                    TI.task_id == task.task_id,
+                    TI.run_id == self.run_id,
+                    TI.map_index >= missing_indexes[0],
+                )
+                .order_by(TI.map_index)
+            )
+            missing = set(missing_indexes)
+            for ti in created_tis:
+                if ti.map_index in missing:
+                    ti.task = task
+                    yield ti
+            return
+
+        for index in missing_indexes:
             ti = TI(task, run_id=self.run_id, map_index=index, state=None)
             self.log.debug("Expanding TIs upserted %s", ti)
             task_instance_mutation_hook(ti)
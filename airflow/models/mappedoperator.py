@@ -546,6 +546,8 @@ class MappedOperator(AbstractOperator):
     @priority_weight.setter
     def priority_weight(self, value: int) -> None:
         self.partial_kwargs["priority_weight"] = value
+        if self.dag is not None:
+            self.dag._priority_weight_index = None
 
     @property
     def weight_rule(self) -> PriorityWeightStrategy:  # type: ignore[override]
@@ -166,6 +166,7 @@ class Pool(Base):
         :param session: SQLAlchemy ORM Session
         """
         from airflow.models.taskinstance import TaskInstance  # Avoid circular import
+        from airflow.models.taskinstancecounter import TaskInstanceCounter
 
         pools: dict[str, PoolStats] = {}
         pool_includes_deferred: dict[str, bool] = {}
@@ -188,11 +189,14 @@ class Pool(Base):
             TaskInstanceState.DEFERRED,
             TaskInstanceState.SCHEDULED,
         }
-        state_count_by_pool = session.execute(
-            select(TaskInstance.pool, TaskInstance.state, func.sum(TaskInstance.pool_slots))
-            .filter(TaskInstance.state.in_(allowed_execution_states))
-            .group_by(TaskInstance.pool, TaskInstance.state)
-        )
+        if TaskInstanceCounter.enabled():
+            state_count_by_pool = TaskInstanceCounter.pool_slots(session=session)
+        else:
+            state_count_by_pool = session.execute(
+                select(TaskInstance.pool, TaskInstance.state, func.sum(TaskInstance.pool_slots))
+                .filter(TaskInstance.state.in_(allowed_execution_states))
+                .group_by(TaskInstance.pool, TaskInstance.state)
+            )
 
         # calculate queued and running metrics
         for pool_name, state, count in state_count_by_pool:
@@ -0,0 +1,151 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import zlib
+from datetime import timedelta
+from typing import TYPE_CHECKING, Collection
+
+from sqlalchemy import Column, Integer, and_, delete, false, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from airflow.configuration import conf
+from airflow.models.base import Base
+from airflow.utils import timezone
+from airflow.utils.session import NEW_SESSION, provide_session
+from airflow.utils.sqlalchemy import UtcDateTime, with_row_locks
+from airflow.utils.state import JobState
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+    from sqlalchemy.sql import ColumnElement
+
+# Number of shard keys the DAGs are spread over, the upper bound of [scheduler] num_shards
+NUM_SHARD_KEYS = 1024
+
+
+def dag_shard_key(dag_id: str) -> int:
+    """Return the shard key of a DAG: a stable hash of its dag_id in ``range(NUM_SHARD_KEYS)``."""
+    return zlib.crc32(dag_id.encode("utf-8")) % NUM_SHARD_KEYS
+
+
+class SchedulerShard(Base):
+    """
+    Lease of a shard of the DAGs by a scheduler, in sharded multi-scheduler mode.
+
+    The shard keys of the DAGs are split in ``[scheduler] num_shards`` contiguous ranges. Each scheduler
+    only creates and examines the DagRuns, and queues the task instances, of the DAGs of the shards it
+    holds, so schedulers stop competing for the same rows.
+    """
+
+    __tablename__ = "scheduler_shard"
+
+    shard = Column(Integer, primary_key=True, autoincrement=False)
+    job_id = Column(Integer, nullable=True)
+    claimed_at = Column(UtcDateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<SchedulerShard: {self.shard} held by job {self.job_id}>"
+
+    @staticmethod
+    def shard_key_range(shard: int, num_shards: int) -> tuple[int, int]:
+        """Return the ``[start, end)`` range of the shard keys of a shard."""
+        return shard * NUM_SHARD_KEYS // num_shards, (shard + 1) * NUM_SHARD_KEYS // num_shards
+
+    @classmethod
+    def dag_condition(cls, shards: Collection[int], num_shards: int) -> ColumnElement[bool]:
+        """Return the condition on ``DagModel`` selecting the DAGs of the given shards."""
+        from airflow.models.dag import DagModel
+
+        conditions = []
+        for shard in sorted(shards):
+            start, end = cls.shard_key_range(shard, num_shards)
+            conditions.append(and_(DagModel.shard_key >= start, DagModel.shard_key < end))
+        if 0 in shards:
+            # DAGs written before sharding existed, until they are parsed again
+            conditions.append(DagModel.shard_key.is_(None))
+        return or_(false(), *conditions)
+
+    @classmethod
+    @provide_session
+    def claim(cls, job_id: int, num_shards: int, session: Session = NEW_SESSION) -> list[int]:
+        """
+        Claim and release shards so that they are balanced between the running schedulers.
+
+        Shards are assigned round-robin to the schedulers which heartbeat, ordered by job id. A scheduler
+        only claims the shards assigned to it which are free or held by a scheduler which stopped
+        heartbeating, and releases the shards it holds which are assigned to another scheduler. A shard
+        is therefore never held by two running schedulers, but it can be held by none until the
+        scheduler it is assigned to claims it.
+
+        :param job_id: the job id of the scheduler
+        :param num_shards: the number of shards the DAGs are split in
+        :return: the shards held by the scheduler
+        """
+        from airflow.jobs.job import Job
+
+        existing_shards = set(session.scalars(select(cls.shard)))
+        if missing_shards := set(range(num_shards)) - existing_shards:
+            try:
+                session.execute(insert(cls), [{"shard": shard} for shard in sorted(missing_shards)])
+                session.flush()
+            except IntegrityError:
+                # Another scheduler created them at the same time, claim them next time
+                session.rollback()
+                return []
+        if any(shard >= num_shards for shard in existing_shards):
+            session.execute(delete(cls).where(cls.shard >= num_shards))
+
+        shards = session.scalars(with_row_locks(select(cls).order_by(cls.shard), session=session)).all()
+        health_check_threshold = conf.getint("scheduler", "scheduler_health_check_threshold")
+        alive_job_ids = set(
+            session.scalars(
+                select(Job.id).where(
+                    Job.job_type == "SchedulerJob",
+                    Job.state == JobState.RUNNING,
+                    Job.latest_heartbeat > timezone.utcnow() - timedelta(seconds=health_check_threshold),
+                )
+            )
+        )
+        alive_job_ids.add(job_id)
+        schedulers = sorted(alive_job_ids)
+
+        held_shards = []
+        for shard in shards:
+            assigned_job_id = schedulers[shard.shard % len(schedulers)]
+            if shard.job_id == job_id and assigned_job_id != job_id:
+                shard.job_id = None
+                shard.claimed_at = None
+            elif shard.job_id == job_id:
+                held_shards.append(shard.shard)
+            elif assigned_job_id == job_id and shard.job_id not in alive_job_ids:
+                shard.job_id = job_id
+                shard.claimed_at = timezone.utcnow()
+                held_shards.append(shard.shard)
+        return held_shards
+
+    @classmethod
+    @provide_session
+    def release(cls, job_id: int, session: Session = NEW_SESSION) -> None:
+        """Release the shards held by a scheduler, so that the other schedulers claim them right away."""
+        session.execute(
+            update(cls)
+            .where(cls.job_id == job_id)
+            .values(job_id=None, claimed_at=None)
+            .execution_options(synchronize_session=False)
+        )
@@ -25,8 +25,24 @@ from datetime import timedelta
 from typing import TYPE_CHECKING, Collection
 
 import sqlalchemy_jsonfield
-from sqlalchemy import BigInteger, Column, Index, LargeBinary, String, and_, exc, or_, select
-from sqlalchemy.orm import backref, foreign, relationship
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    ForeignKeyConstraint,
+    Index,
+    LargeBinary,
+    PrimaryKeyConstraint,
+    String,
+    Text,
+    and_,
+    cast,
+    delete,
+    exc,
+    insert,
+    or_,
+    select,
+)
+from sqlalchemy.orm import backref, foreign, relationship, selectinload
 from sqlalchemy.sql.expression import func, literal
 
 from airflow.api_internal.internal_api_call import internal_api_call
@@ -35,10 +51,21 @@ from airflow.models.base import ID_LEN, Base
 from airflow.models.dag import DagModel
 from airflow.models.dagcode import DagCode
 from airflow.models.dagrun import DagRun
-from airflow.serialization.serialized_objects import DagDependency, SerializedDAG
-from airflow.settings import COMPRESS_SERIALIZED_DAGS, MIN_SERIALIZED_DAG_UPDATE_INTERVAL, json
+from airflow.serialization import codec
+from airflow.serialization.enums import Encoding
+from airflow.serialization.serialized_objects import DagDependency, LazyEncodedTasks, SerializedDAG
+from airflow.settings import (
+    CHUNK_SERIALIZED_DAGS,
+    COMPRESS_SERIALIZED_DAGS,
+    LAZY_DESERIALIZE_DAG_TASKS,
+    MIN_SERIALIZED_DAG_UPDATE_INTERVAL,
+    SERIALIZED_DAG_COMPRESSION,
+    SERIALIZED_DAG_FORMAT,
+    json,
+)
 from airflow.utils import timezone
 from airflow.utils.hashlib_wrapper import md5
+from airflow.utils.helpers import chunks
 from airflow.utils.session import NEW_SESSION, provide_session
 from airflow.utils.sqlalchemy import UtcDateTime
 
@@ -52,6 +79,68 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+# Key replacing the tasks of the DAG-level data of DAGs whose tasks are stored in the serialized_task table
+CHUNKED_TASK_IDS_KEY = "chunked_task_ids"
+# Key of the downstream task ids of the tasks stored in the serialized_task table, for the tasks to be
+# deserialized lazily without decoding all of them first
+CHUNKED_TASK_DOWNSTREAM_IDS_KEY = "chunked_task_downstream_ids"
+
+
+def _stores_encoded_data() -> bool:
+    """Whether serialized data is written to the ``data_compressed`` column rather than the JSON one."""
+    return COMPRESS_SERIALIZED_DAGS or SERIALIZED_DAG_FORMAT != "json"
+
+
+def _encode_data(data: dict, data_json: bytes) -> bytes:
+    """Encode serialized data for the ``data_compressed`` column with the configured codec."""
+    compression = SERIALIZED_DAG_COMPRESSION if COMPRESS_SERIALIZED_DAGS else "none"
+    if SERIALIZED_DAG_FORMAT == "json" and compression == "zlib":
+        # Written without a codec header, so that older Airflow versions can still read it
+        return zlib.compress(data_json)
+    return codec.encode(data, SERIALIZED_DAG_FORMAT, compression)
+
+
+def _decode_data(data_compressed: bytes) -> dict:
+    """Decode the ``data_compressed`` column, whichever codec it was written with."""
+    if codec.has_header(data_compressed):
+        return codec.decode(data_compressed)
+    return json.loads(zlib.decompress(data_compressed))
+
+
+class SerializedTaskModel(Base):
+    """A table for the serialized tasks of DAGs stored with ``[core] chunk_serialized_dags``.
+
+    Each task is stored in its own row, next to a hash of its serialized form, so that only the tasks
+    which changed are written again when a DAG changes.
+    """
+
+    __tablename__ = "serialized_task"
+
+    dag_id = Column(String(ID_LEN), nullable=False)
+    task_id = Column(String(ID_LEN), nullable=False)
+    _data = Column("data", sqlalchemy_jsonfield.JSONField(json=json), nullable=True)
+    _data_compressed = Column("data_compressed", LargeBinary, nullable=True)
+    task_hash = Column(String(32), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("dag_id", "task_id", name="serialized_task_pkey"),
+        ForeignKeyConstraint(
+            [dag_id],
+            ["serialized_dag.dag_id"],
+            name="serialized_task_dag_id_fkey",
+            ondelete="CASCADE",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<SerializedTask: {self.dag_id}.{self.task_id}>"
+
+    @property
+    def data(self) -> dict | None:
+        if self._data_compressed:
+            return _decode_data(self._data_compressed)
+        return self._data
+
 
 class SerializedDagModel(Base):
     """A table for serialized DAGs.
@@ -102,6 +191,12 @@ class SerializedDagModel(Base):
         backref=backref("serialized_dag", uselist=False, innerjoin=True),
     )
 
+    serialized_tasks = relationship(
+        SerializedTaskModel,
+        primaryjoin=dag_id == foreign(SerializedTaskModel.dag_id),  # type: ignore
+        viewonly=True,
+    )
+
     load_op_links = True
 
     def __init__(self, dag: DAG, processor_subdir: str | None = None) -> None:
@@ -116,16 +211,74 @@ class SerializedDagModel(Base):
 
         self.dag_hash = md5(dag_data_json).hexdigest()
 
-        if COMPRESS_SERIALIZED_DAGS:
+        # serve as cache so no need to decompress and load, when accessing data field
+        # when COMPRESS_SERIALIZED_DAGS is True
+        self.__data_cache = dag_data
+
+        # Rows of the serialized_task table to write along with this one, when storing tasks separately
+        self._task_rows: list[dict] | None = None
+        if CHUNK_SERIALIZED_DAGS:
+            dag_data, self._task_rows = self._split_tasks(dag_data)
+            dag_data_json = json.dumps(dag_data, sort_keys=True).encode("utf-8")
+
+        if _stores_encoded_data():
             self._data = None
-            self._data_compressed = zlib.compress(dag_data_json)
+            self._data_compressed = _encode_data(dag_data, dag_data_json)
         else:
             self._data = dag_data
             self._data_compressed = None
 
-        # serve as cache so no need to decompress and load, when accessing data field
-        # when COMPRESS_SERIALIZED_DAGS is True
-        self.__data_cache = dag_data
+    def _split_tasks(self, dag_data: dict) -> tuple[dict, list[dict]]:
+        """Split the serialized tasks from the DAG-level data, and prepare a serialized_task row for each."""
+        task_rows = []
+        for task in dag_data["dag"]["tasks"]:
+            task_json = json.dumps(task, sort_keys=True).encode("utf-8")
+            task_rows.append(
+                {
+                    "dag_id": self.dag_id,
+                    "task_id": task[Encoding.VAR]["task_id"],
+                    "task_hash": md5(task_json).hexdigest(),
+                    "data": None if _stores_encoded_data() else task,
+                    "data_compressed": _encode_data(task, task_json) if _stores_encoded_data() else None,
+                }
+            )
+        dag_level_data = {k: v for k, v in dag_data["dag"].items() if k != "tasks"}
+        dag_level_data[CHUNKED_TASK_IDS_KEY] = [row["task_id"] for row in task_rows]
+        dag_level_data[CHUNKED_TASK_DOWNSTREAM_IDS_KEY] = {
+            task[Encoding.VAR]["task_id"]: task[Encoding.VAR]["downstream_task_ids"]
+            for task in dag_data["dag"]["tasks"]
+            if task[Encoding.VAR].get("downstream_task_ids")
+        }
+        return {**dag_data, "dag": dag_level_data}, task_rows
+
+    def _write_serialized_tasks(self, session: Session) -> None:
+        """Write the serialized tasks which changed, and delete the ones which are gone."""
+        table = SerializedTaskModel.__table__
+        task_rows = self._task_rows or []
+        existing_task_hashes = dict(
+            session.execute(
+                select(SerializedTaskModel.task_id, SerializedTaskModel.task_hash).where(
+                    SerializedTaskModel.dag_id == self.dag_id
+                )
+            ).all()
+        )
+        changed_rows = [
+            row for row in task_rows if existing_task_hashes.get(row["task_id"]) != row["task_hash"]
+        ]
+        new_task_ids = {row["task_id"] for row in task_rows}
+        task_ids_to_delete = [task_id for task_id in existing_task_hashes if task_id not in new_task_ids] + [
+            row["task_id"] for row in changed_rows if row["task_id"] in existing_task_hashes
+        ]
+        log.debug(
+            "Writing %d and deleting %d serialized tasks of DAG %s",
+            len(changed_rows),
+            len(task_ids_to_delete),
+            self.dag_id,
+        )
+        for task_ids in chunks(task_ids_to_delete, 1000):
+            session.execute(delete(table).where(table.c.dag_id == self.dag_id, table.c.task_id.in_(task_ids)))
+        if changed_rows:
+            session.execute(insert(table), changed_rows)
 
     def __repr__(self) -> str:
         return f"<SerializedDag: {self.dag_id}>"
@@ -179,6 +332,10 @@ class SerializedDagModel(Base):
 
         log.debug("Writing Serialized DAG: %s to the DB", dag.dag_id)
         session.merge(new_serialized_dag)
+        if new_serialized_dag._task_rows is not None:
+            # The DAG row needs to exist before its tasks are written
+            session.flush()
+            new_serialized_dag._write_serialized_tasks(session)
         log.debug("DAG: %s written to the DB", dag.dag_id)
         return True
 
@@ -190,7 +347,7 @@ class SerializedDagModel(Base):
         :param session: ORM Session
         :returns: a dict of DAGs read from database
         """
-        serialized_dags = session.scalars(select(cls))
+        serialized_dags = session.scalars(select(cls).options(selectinload(cls.serialized_tasks)))
 
         dags = {}
         for row in serialized_dags:
@@ -212,24 +369,60 @@ class SerializedDagModel(Base):
     def data(self) -> dict | None:
         # use __data_cache to avoid decompress and loads
         if not hasattr(self, "__data_cache") or self.__data_cache is None:
-            if self._data_compressed:
-                self.__data_cache = json.loads(zlib.decompress(self._data_compressed))
-            else:
-                self.__data_cache = self._data
+            self.__data_cache = self._dag_level_data()
+            if self.__data_cache and CHUNKED_TASK_IDS_KEY in self.__data_cache["dag"]:
+                self.__data_cache = self._with_serialized_tasks(self.__data_cache)
 
         return self.__data_cache
 
+    def _dag_level_data(self) -> dict | None:
+        """Decode the data of the ``serialized_dag`` row, without the tasks stored in the serialized_task table."""
+        if self._data_compressed:
+            return _decode_data(self._data_compressed)
+        return self._data
+
+    def _with_serialized_tasks(self, data: dict) -> dict:
+        """Put the tasks stored in the serialized_task table back in the DAG-level data."""
+        serialized_tasks = {task.task_id: task.data for task in self.serialized_tasks}
+        dag_data = dict(data["dag"])
+        dag_data.pop(CHUNKED_TASK_DOWNSTREAM_IDS_KEY, None)
+        try:
+            dag_data["tasks"] = [serialized_tasks[task_id] for task_id in dag_data.pop(CHUNKED_TASK_IDS_KEY)]
+        except KeyError as e:
+            raise ValueError(f"missing serialized task {e} of DAG {self.dag_id}")
+        return {**data, "dag": dag_data}
+
+    def _with_lazy_serialized_tasks(self, data: dict) -> dict:
+        """Put the tasks stored in the serialized_task table in the DAG-level data, decoded when accessed."""
+        serialized_tasks = {task.task_id: task for task in self.serialized_tasks}
+        dag_data = dict(data["dag"])
+        task_ids = dag_data.pop(CHUNKED_TASK_IDS_KEY)
+        missing_task_ids = set(task_ids).difference(serialized_tasks)
+        if missing_task_ids:
+            raise ValueError(f"missing serialized tasks {sorted(missing_task_ids)} of DAG {self.dag_id}")
+        dag_data["tasks"] = LazyEncodedTasks(
+            task_ids=task_ids,
+            downstream_task_ids=dag_data.pop(CHUNKED_TASK_DOWNSTREAM_IDS_KEY),
+            load=lambda task_id: serialized_tasks[task_id].data,
+        )
+        return {**data, "dag": dag_data}
+
     @property
     def dag(self) -> SerializedDAG:
         """The DAG deserialized from the ``data`` column."""
         SerializedDAG._load_operator_extra_links = self.load_op_links
+        if LAZY_DESERIALIZE_DAG_TASKS:
+            # The tasks stored in the serialized_task table are only decoded when accessed
+            dag_level_data = self._dag_level_data()
+            if isinstance(dag_level_data, dict) and CHUNKED_TASK_DOWNSTREAM_IDS_KEY in dag_level_data["dag"]:
+                return SerializedDAG.from_dict(self._with_lazy_serialized_tasks(dag_level_data), lazy=True)
         if isinstance(self.data, dict):
             data = self.data
         elif isinstance(self.data, str):
             data = json.loads(self.data)
         else:
             raise ValueError("invalid or missing serialized DAG data")
-        return SerializedDAG.from_dict(data)
+        return SerializedDAG.from_dict(data, lazy=LAZY_DESERIALIZE_DAG_TASKS)
 
     @classmethod
     @provide_session
@@ -372,6 +565,29 @@ class SerializedDagModel(Base):
         """
         return session.scalar(select(cls.dag_hash).where(cls.dag_id == dag_id))
 
+    @classmethod
+    @provide_session
+    def get_stored_size(cls, dag_id: str, session: Session = NEW_SESSION) -> int:
+        """
+        Get the size of a serialized DAG as stored in the database, with its serialized tasks.
+
+        The size is computed by the database, so that the serialized data is not encoded again for it.
+
+        :param dag_id: DAG ID
+        :param session: ORM Session
+        :return: The size in bytes, or 0 if the DAG is not found
+        """
+
+        def stored_length(model):
+            return func.coalesce(func.length(model._data_compressed), func.length(cast(model._data, Text)), 0)
+
+        tasks_size = (
+            select(func.coalesce(func.sum(stored_length(SerializedTaskModel)), 0))
+            .where(SerializedTaskModel.dag_id == dag_id)
+            .scalar_subquery()
+        )
+        return int(session.scalar(select(stored_length(cls) + tasks_size).where(cls.dag_id == dag_id)) or 0)
+
     @classmethod
     def get_latest_version_hash_and_updated_datetime(
         cls,
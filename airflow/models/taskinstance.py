@@ -31,7 +31,7 @@ from collections import defaultdict
 from contextlib import nullcontext
 from datetime import timedelta
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Callable, Collection, Generator, Iterable, Mapping, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Collection, Generator, Iterable, Iterator, Mapping, Tuple
 from urllib.parse import quote
 
 import dill
@@ -55,15 +55,17 @@ from sqlalchemy import (
     delete,
     false,
     func,
+    insert,
     inspect,
     or_,
     text,
     update,
 )
+from sqlalchemy.event import listens_for
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.ext.mutable import MutableDict
-from sqlalchemy.orm import lazyload, reconstructor, relationship
+from sqlalchemy.orm import Session as SASession, lazyload, reconstructor, relationship
 from sqlalchemy.orm.attributes import NO_VALUE, set_committed_value
 from sqlalchemy.sql.expression import case, select
 
@@ -149,6 +151,8 @@ if TYPE_CHECKING:
     from pathlib import PurePath
     from types import TracebackType
 
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.orm import Mapper, ORMExecuteState
     from sqlalchemy.orm.session import Session
     from sqlalchemy.sql.elements import BooleanClauseList
     from sqlalchemy.sql.expression import ColumnOperators
@@ -1579,10 +1583,15 @@ def _defer_task(
 ) -> TaskInstancePydantic | TaskInstance:
     from airflow.models.trigger import Trigger
 
-    # First, make the trigger entry
+    # First, make the trigger entry, unless an identical trigger can be shared
     trigger_row = Trigger.from_object(exception.trigger)
-    session.add(trigger_row)
-    session.flush()
+    trigger_id = None
+    if trigger_row.dedup_key:
+        trigger_id = Trigger.get_shared_trigger_id(trigger_row.dedup_key, session=session)
+    if trigger_id is None:
+        session.add(trigger_row)
+        session.flush()
+        trigger_id = trigger_row.id
 
     ti = _coalesce_to_orm_ti(ti=ti, session=session)  # ensure orm obj in case it's pydantic
 
@@ -1593,7 +1602,7 @@ def _defer_task(
     # Keep an eye on the logic in `check_and_change_state_before_execution()`
     # depending on self.next_method semantics
     ti.state = TaskInstanceState.DEFERRED
-    ti.trigger_id = trigger_row.id
+    ti.trigger_id = trigger_id
     ti.next_method = exception.method_name
     ti.next_kwargs = exception.kwargs or {}
 
@@ -1928,6 +1937,79 @@ class TaskInstance(Base, LoggingMixin):
             "_task_display_property_value": task.task_display_name,
         }
 
+    @staticmethod
+    def insert_mappings(
+        run_id: str, task: Operator, map_indexes: Iterable[int], *, state: str | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Insert mappings of the task instances of a task, one per map index.
+
+        The built-in priority weight strategies do not depend on the map index, so the mapping is only
+        built once for them, and copied for each map index.
+
+        :meta private:
+        """
+        from airflow.task.priority_strategy import airflow_priority_weight_strategies_classes
+
+        if type(task.weight_rule) not in airflow_priority_weight_strategies_classes:
+            for map_index in map_indexes:
+                yield {**TaskInstance.insert_mapping(run_id, task, map_index=map_index), "state": state}
+            return
+        mapping: dict[str, Any] | None = None
+        for map_index in map_indexes:
+            if mapping is None:
+                mapping = {**TaskInstance.insert_mapping(run_id, task, map_index=map_index), "state": state}
+            yield {**mapping, "map_index": map_index}
+
+    @staticmethod
+    def bulk_insert(mappings: Iterable[dict[str, Any]], *, session: Session) -> int:
+        """Insert task instances from their insert mappings, in batches, without creating ORM objects.
+
+        The mappings are consumed lazily, ``[scheduler] mapped_task_expansion_batch_size`` at a time.
+        The task instance counters are updated for the task instances inserted in a counted state,
+        when they are enabled.
+
+        :return: the number of task instances inserted
+        :meta private:
+        """
+        from airflow.models.taskinstancecounter import COUNTED_STATES, CounterKey, TaskInstanceCounter
+
+        batch_size = max(conf.getint("scheduler", "mapped_task_expansion_batch_size"), 1)
+        counters_enabled = TaskInstanceCounter.enabled()
+        # Core inserts are keyed by column name, not by the name of the mapped attribute, and do not
+        # ignore the keys that are not columns, like bulk_insert_mappings does
+        column_names = {attr.key: attr.columns[0].name for attr in inspect(TaskInstance).column_attrs}
+        stmt = insert(TaskInstance.__table__)
+        inserted = 0
+        mappings = iter(mappings)
+        while True:
+            batch = list(itertools.islice(mappings, batch_size))
+            if not batch:
+                break
+            session.execute(
+                stmt,
+                [
+                    {column_names[key]: value for key, value in mapping.items() if key in column_names}
+                    for mapping in batch
+                ],
+            )
+            inserted += len(batch)
+            if counters_enabled:
+                deltas: dict[CounterKey, tuple[int, int]] = defaultdict(lambda: (0, 0))
+                for mapping in batch:
+                    if mapping.get("state") not in COUNTED_STATES:
+                        continue
+                    key = CounterKey(
+                        mapping["dag_id"],
+                        mapping["run_id"],
+                        mapping["task_id"],
+                        mapping["pool"],
+                        mapping["state"],
+                    )
+                    count, slots = deltas[key]
+                    deltas[key] = (count + 1, slots + mapping["pool_slots"])
+                TaskInstanceCounter.apply_deltas(session.connection(), deltas)
+        return inserted
+
     @reconstructor
     def init_on_load(self) -> None:
         """Initialize the attributes that aren't stored in the DB."""
@@ -3953,6 +4035,47 @@ class SimpleTaskInstance:
         return cls(**obj_dict, start_date=start_date, end_date=end_date, key=ti_key)
 
 
+@listens_for(TaskInstance, "after_insert")
+def count_inserted_task_instance(mapper: Mapper, connection: Connection, target: TaskInstance) -> None:
+    """Count the task instance inserted in the task instance counters, when they are enabled."""
+    from airflow.models.taskinstancecounter import TaskInstanceCounter, count_inserted
+
+    if TaskInstanceCounter.enabled():
+        count_inserted(connection, target)
+
+
+@listens_for(TaskInstance, "after_update")
+def count_updated_task_instance(mapper: Mapper, connection: Connection, target: TaskInstance) -> None:
+    """Move the task instance updated between the task instance counters, when they are enabled."""
+    from airflow.models.taskinstancecounter import TaskInstanceCounter, count_updated
+
+    if TaskInstanceCounter.enabled():
+        count_updated(connection, target)
+
+
+@listens_for(TaskInstance, "after_delete")
+def count_deleted_task_instance(mapper: Mapper, connection: Connection, target: TaskInstance) -> None:
+    """Stop counting the task instance deleted in the task instance counters, when they are enabled."""
+    from airflow.models.taskinstancecounter import TaskInstanceCounter, count_deleted
+
+    if TaskInstanceCounter.enabled():
+        count_deleted(connection, target)
+
+
+@listens_for(SASession, "do_orm_execute")
+def count_bulk_task_instance_changes(orm_execute_state: ORMExecuteState):
+    """Count the task instances changed by bulk statements, when the task instance counters are enabled."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    if orm_execute_state.statement.table.name != TaskInstance.__tablename__:
+        return None
+    from airflow.models.taskinstancecounter import TaskInstanceCounter, count_bulk_changes
+
+    if TaskInstanceCounter.enabled():
+        return count_bulk_changes(orm_execute_state)
+    return None
+
+
 class TaskInstanceNote(TaskInstanceDependencies):
     """For storage of arbitrary notes concerning the task instance."""
 
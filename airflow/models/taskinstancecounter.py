@@ -0,0 +1,303 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple
+
+from sqlalchemy import Column, Integer, String, delete, func, inspect, select
+from sqlalchemy.sql.elements import BindParameter
+
+from airflow.configuration import conf
+from airflow.models.base import Base, StringID
+from airflow.models.taskinstance import TaskInstance
+from airflow.utils.session import NEW_SESSION, provide_session
+from airflow.utils.sqlalchemy import with_row_locks
+from airflow.utils.state import TaskInstanceState
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.orm import ORMExecuteState, Session
+
+log = logging.getLogger(__name__)
+
+# States of the task instances counted, for the pool slots and the concurrency limits
+COUNTED_STATES = frozenset(
+    {
+        TaskInstanceState.SCHEDULED,
+        TaskInstanceState.QUEUED,
+        TaskInstanceState.RUNNING,
+        TaskInstanceState.DEFERRED,
+    }
+)
+
+# Columns of task instances whose changes change the counters
+_COUNTED_COLUMNS = frozenset({"state", "pool", "pool_slots"})
+
+
+class CounterKey(NamedTuple):
+    """Key of a task instance counter."""
+
+    dag_id: str
+    run_id: str
+    task_id: str
+    pool: str
+    state: str
+
+
+class TaskInstanceCounter(Base):
+    """
+    Number of task instances, and of pool slots they use, of a task of a DAG run in a pool and a state.
+
+    Only the states of :data:`COUNTED_STATES` are counted. The counters are updated in the same
+    transaction as the task instances, when ``[scheduler] task_instance_counters`` is enabled, so that
+    the scheduler reads the pool slots and the concurrency of the tasks from them instead of aggregating
+    the ``task_instance`` table. Changes made without the ORM, like cascading deletes, are not counted:
+    the scheduler reconciles the counters with the task instances regularly.
+    """
+
+    __tablename__ = "task_instance_counter"
+
+    dag_id = Column(StringID(), primary_key=True)
+    run_id = Column(StringID(), primary_key=True)
+    task_id = Column(StringID(), primary_key=True)
+    pool = Column(String(256), primary_key=True)
+    state = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    slots = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<TaskInstanceCounter: {self.dag_id}.{self.task_id} {self.run_id} {self.pool} {self.state}: "
+            f"{self.count} task instances, {self.slots} slots>"
+        )
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether the task instance counters are maintained and used."""
+        return conf.getboolean("scheduler", "task_instance_counters")
+
+    @classmethod
+    def apply_deltas(cls, connection: Connection, deltas: dict[CounterKey, tuple[int, int]]) -> None:
+        """
+        Add the changes of the number of task instances and of pool slots to the counters.
+
+        The counters are updated in the order of their keys, so that concurrent transactions lock
+        them in the same order.
+        """
+        rows = [
+            {**key._asdict(), "count": count, "slots": slots}
+            for key, (count, slots) in sorted(deltas.items())
+            if count or slots
+        ]
+        if not rows:
+            return
+        table = cls.__table__
+        dialect_name = connection.dialect.name
+        if dialect_name == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+
+            stmt = insert(table)
+            stmt = stmt.on_duplicate_key_update(
+                count=table.c["count"] + stmt.inserted["count"],
+                slots=table.c.slots + stmt.inserted.slots,
+            )
+        else:
+            if dialect_name == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[column.name for column in table.primary_key],
+                set_={
+                    "count": table.c["count"] + stmt.excluded["count"],
+                    "slots": table.c.slots + stmt.excluded.slots,
+                },
+            )
+        connection.execute(stmt, rows)
+
+    @classmethod
+    @provide_session
+    def pool_slots(cls, session: Session = NEW_SESSION) -> list[tuple[str, str, int]]:
+        """Return the number of slots used by the task instances, as ``(pool, state, slots)`` rows."""
+        query = select(cls.pool, cls.state, func.sum(cls.slots)).group_by(cls.pool, cls.state)
+        return [(pool, state, int(slots)) for pool, state, slots in session.execute(query)]
+
+    @classmethod
+    @provide_session
+    def task_counts(
+        cls, states: Iterable[TaskInstanceState], session: Session = NEW_SESSION
+    ) -> dict[tuple[str, str, str], int]:
+        """Return the number of task instances in the given states, by DAG id, run id and task id."""
+        query = (
+            select(cls.dag_id, cls.run_id, cls.task_id, func.sum(cls.count))
+            .where(cls.state.in_(states))
+            .group_by(cls.dag_id, cls.run_id, cls.task_id)
+        )
+        return {
+            (dag_id, run_id, task_id): int(count)
+            for dag_id, run_id, task_id, count in session.execute(query)
+            if count
+        }
+
+    @classmethod
+    @provide_session
+    def reconcile(cls, session: Session = NEW_SESSION) -> int:
+        """
+        Correct the counters with the actual task instances.
+
+        The counters are locked before the task instances are counted, so that the changes of concurrent
+        transactions are either counted from the task instances, or added to the corrected counters
+        once they are committed. Empty counters are deleted.
+
+        :return: the number of counters corrected
+        """
+        counted = {
+            CounterKey(*row[:5]): (row.count, row.slots)
+            for row in session.execute(
+                with_row_locks(
+                    select(cls.dag_id, cls.run_id, cls.task_id, cls.pool, cls.state, cls.count, cls.slots),
+                    session=session,
+                )
+            )
+        }
+        actual = {
+            CounterKey(*row[:5]): (int(row[5]), int(row[6] or 0))
+            for row in session.execute(_aggregate_task_instances())
+        }
+        deltas = {}
+        for key in counted.keys() | actual.keys():
+            count, slots = actual.get(key, (0, 0))
+            counted_count, counted_slots = counted.get(key, (0, 0))
+            if (count, slots) != (counted_count, counted_slots):
+                deltas[key] = (count - counted_count, slots - counted_slots)
+        cls.apply_deltas(session.connection(), deltas)
+        session.execute(delete(cls).where(cls.count == 0, cls.slots == 0))
+        return len(deltas)
+
+
+def _aggregate_task_instances(whereclause: Any = None, *, counted_only: bool = True):
+    TI = TaskInstance
+    query = select(
+        TI.dag_id, TI.run_id, TI.task_id, TI.pool, TI.state, func.count(), func.sum(TI.pool_slots)
+    ).group_by(TI.dag_id, TI.run_id, TI.task_id, TI.pool, TI.state)
+    if counted_only:
+        query = query.where(TI.state.in_(COUNTED_STATES))
+    if whereclause is not None:
+        query = query.where(whereclause)
+    return query
+
+
+def _key(ti: TaskInstance, **changes) -> CounterKey:
+    return CounterKey(
+        ti.dag_id, ti.run_id, ti.task_id, changes.get("pool", ti.pool), changes.get("state", ti.state)
+    )
+
+
+def count_inserted(connection: Connection, ti: TaskInstance) -> None:
+    """Count a task instance inserted by a flush."""
+    if ti.state in COUNTED_STATES:
+        TaskInstanceCounter.apply_deltas(connection, {_key(ti): (1, ti.pool_slots or 1)})
+
+
+def count_deleted(connection: Connection, ti: TaskInstance) -> None:
+    """Stop counting a task instance deleted by a flush."""
+    state, pool, pool_slots = _previous_values(ti)
+    if state in COUNTED_STATES:
+        TaskInstanceCounter.apply_deltas(connection, {_key(ti, state=state, pool=pool): (-1, -pool_slots)})
+
+
+def count_updated(connection: Connection, ti: TaskInstance) -> None:
+    """Move a task instance updated by a flush between the counters."""
+    state, pool, pool_slots = _previous_values(ti)
+    old_key = _key(ti, state=state, pool=pool)
+    new_key = _key(ti)
+    if old_key == new_key and pool_slots == ti.pool_slots:
+        return
+    deltas: dict[CounterKey, tuple[int, int]] = defaultdict(lambda: (0, 0))
+    if state in COUNTED_STATES:
+        deltas[old_key] = (-1, -pool_slots)
+    if ti.state in COUNTED_STATES:
+        count, slots = deltas[new_key]
+        deltas[new_key] = (count + 1, slots + ti.pool_slots)
+    TaskInstanceCounter.apply_deltas(connection, deltas)
+
+
+def _previous_values(ti: TaskInstance) -> tuple[str | None, str, int]:
+    """Return the state, pool and pool slots of a task instance before the changes being flushed."""
+    attrs = inspect(ti).attrs
+
+    def previous(name):
+        history = attrs[name].history
+        if history.deleted:
+            return history.deleted[0]
+        return getattr(ti, name)
+
+    return previous("state"), previous("pool"), previous("pool_slots")
+
+
+def count_bulk_changes(orm_execute_state: ORMExecuteState):
+    """
+    Count the changes of task instances made by a bulk ``UPDATE`` or ``DELETE`` statement.
+
+    The affected task instances are counted by key before the statement is executed, and the counters
+    are updated after it. The counters are left to the reconciliation when the new values are not
+    literal values.
+    """
+    statement = orm_execute_state.statement
+    deleted = orm_execute_state.is_delete
+    changes: dict[str, Any] = {}
+    if not deleted:
+        for column, value in statement._ordered_values or statement._values.items():
+            name = getattr(column, "key", column)
+            if name not in _COUNTED_COLUMNS:
+                continue
+            if not isinstance(value, BindParameter):
+                log.debug("Not counting task instances updated to %s = %s", name, value)
+                return None
+            changes[name] = value.value
+        if not changes:
+            return None
+    session = orm_execute_state.session
+    # Task instances updated to a counted state are counted whatever their previous state
+    previous = session.execute(
+        _aggregate_task_instances(
+            statement.whereclause, counted_only=changes.get("state") not in COUNTED_STATES
+        )
+    ).all()
+    result = orm_execute_state.invoke_statement()
+    deltas: dict[CounterKey, tuple[int, int]] = defaultdict(lambda: (0, 0))
+    for dag_id, run_id, task_id, pool, state, count, slots in previous:
+        slots = int(slots or 0)
+        if state in COUNTED_STATES:
+            key = CounterKey(dag_id, run_id, task_id, pool, state)
+            old_count, old_slots = deltas[key]
+            deltas[key] = (old_count - count, old_slots - slots)
+        if deleted:
+            continue
+        new_state = changes.get("state", state)
+        if new_state in COUNTED_STATES:
+            key = CounterKey(dag_id, run_id, task_id, changes.get("pool", pool), new_state)
+            new_slots = changes["pool_slots"] * count if "pool_slots" in changes else slots
+            old_count, old_slots = deltas[key]
+            deltas[key] = (old_count + count, old_slots + new_slots)
+    TaskInstanceCounter.apply_deltas(session.connection(), deltas)
+    return result
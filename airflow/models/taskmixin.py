@@ -252,6 +252,7 @@ class DAGNode(DependencyMixin, metaclass=ABCMeta):
                 task.upstream_task_ids.add(self.node_id)
                 if edge_modifier:
                     edge_modifier.add_edge_info(self.dag, self.node_id, task.node_id)
+        dag._priority_weight_index = None
 
     def set_downstream(
         self,
@@ -17,14 +17,33 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
+import json
 from traceback import format_exception
 from typing import TYPE_CHECKING, Any, Iterable
 
-from sqlalchemy import Column, Integer, String, Text, delete, func, or_, select, update
-from sqlalchemy.orm import joinedload, relationship
+from sqlalchemy import (
+    Column,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    bindparam,
+    delete,
+    event,
+    func,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.orm import joinedload, lazyload, load_only, noload, relationship
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql.functions import coalesce
 
 from airflow.api_internal.internal_api_call import internal_api_call
+from airflow.configuration import conf
 from airflow.models.base import Base
 from airflow.models.taskinstance import TaskInstance
 from airflow.utils import timezone
@@ -34,10 +53,14 @@ from airflow.utils.sqlalchemy import UtcDateTime, with_row_locks
 from airflow.utils.state import TaskInstanceState
 
 if TYPE_CHECKING:
-    from sqlalchemy.orm import Session
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.orm import Mapper, Session
     from sqlalchemy.sql import Select
 
-    from airflow.triggers.base import BaseTrigger
+    from airflow.triggers.base import BaseTrigger, TriggerEvent
+
+# PostgreSQL channel notified of the creation of triggers, see [triggerer] db_notifications
+TRIGGER_NOTIFICATION_CHANNEL = "airflow_triggers"
 
 
 class Trigger(Base):
@@ -66,6 +89,12 @@ class Trigger(Base):
     encrypted_kwargs = Column("kwargs", Text, nullable=False)
     created_date = Column(UtcDateTime, nullable=False)
     triggerer_id = Column(Integer, nullable=True)
+    # Hash of the classpath and kwargs of shareable triggers, to defer task instances on identical triggers
+    dedup_key = Column(String(64), nullable=True)
+    # CPU seconds per second the trigger used in its triggerer, as last reported by the triggerer
+    cost = Column(Float, nullable=True)
+
+    __table_args__ = (Index("idx_trigger_dedup_key", dedup_key),)
 
     triggerer_job = relationship(
         "Job",
@@ -81,11 +110,13 @@ class Trigger(Base):
         classpath: str,
         kwargs: dict[str, Any],
         created_date: datetime.datetime | None = None,
+        dedup_key: str | None = None,
     ) -> None:
         super().__init__()
         self.classpath = classpath
         self.encrypted_kwargs = self._encrypt_kwargs(kwargs)
         self.created_date = created_date or timezone.utcnow()
+        self.dedup_key = dedup_key
 
     @property
     def kwargs(self) -> dict[str, Any]:
@@ -139,7 +170,35 @@ class Trigger(Base):
     def from_object(cls, trigger: BaseTrigger) -> Trigger:
         """Alternative constructor that creates a trigger row based directly off of a Trigger object."""
         classpath, kwargs = trigger.serialize()
-        return cls(classpath=classpath, kwargs=kwargs)
+        dedup_key = cls.compute_dedup_key(classpath, kwargs) if trigger.shareable else None
+        return cls(classpath=classpath, kwargs=kwargs, dedup_key=dedup_key)
+
+    @staticmethod
+    def compute_dedup_key(classpath: str, kwargs: dict[str, Any]) -> str:
+        """Return the hash identifying the triggers with the given classpath and kwargs."""
+        from airflow.serialization.serialized_objects import BaseSerialization
+
+        serialized = json.dumps([classpath, BaseSerialization.serialize(kwargs)], sort_keys=True)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get_shared_trigger_id(cls, dedup_key: str, session: Session) -> int | None:
+        """
+        Return the ID of an existing trigger a task instance can be deferred on, rather than a new one.
+
+        Only triggers on which a task instance is still deferred are returned. The row of that task
+        instance is locked until the caller commits, so that the trigger cannot be deleted as unused
+        before the caller defers its task instance on it.
+
+        :param dedup_key: the dedup key of the trigger the task instance is deferred on
+        """
+        query = (
+            select(TaskInstance.trigger_id)
+            .join(cls, cls.id == TaskInstance.trigger_id)
+            .where(cls.dedup_key == dedup_key, TaskInstance.state == TaskInstanceState.DEFERRED)
+            .limit(1)
+        )
+        return session.scalar(with_row_locks(query, of=TaskInstance, session=session, skip_locked=True))
 
     @classmethod
     @internal_api_call
@@ -149,13 +208,21 @@ class Trigger(Base):
         stmt = (
             select(cls)
             .where(cls.id.in_(ids))
-            .options(
-                joinedload(cls.task_instance)
-                .joinedload(TaskInstance.trigger)
-                .joinedload(Trigger.triggerer_job)
-            )
+            .options(lazyload(cls.task_instance), joinedload(cls.triggerer_job))
         )
-        return {obj.id: obj for obj in session.scalars(stmt)}
+        triggers = {obj.id: obj for obj in session.scalars(stmt)}
+        # Shared triggers have several task instances, they are loaded with the first one only
+        task_instances: dict[int, TaskInstance | None] = dict.fromkeys(triggers)
+        for task_instance in session.scalars(
+            select(TaskInstance)
+            .where(TaskInstance.trigger_id.in_(triggers))
+            .order_by(TaskInstance.dag_id, TaskInstance.run_id, TaskInstance.task_id, TaskInstance.map_index)
+        ):
+            if task_instances[task_instance.trigger_id] is None:
+                task_instances[task_instance.trigger_id] = task_instance
+        for trigger_id, task_instance in task_instances.items():
+            set_committed_value(triggers[trigger_id], "task_instance", task_instance)
+        return triggers
 
     @classmethod
     @internal_api_call
@@ -197,19 +264,46 @@ class Trigger(Base):
     @provide_session
     def submit_event(cls, trigger_id, event, session: Session = NEW_SESSION) -> None:
         """Take an event from an instance of itself, and trigger all dependent tasks to resume."""
+        cls.submit_events([(trigger_id, event)], session=session)
+
+    @classmethod
+    @internal_api_call
+    @provide_session
+    def submit_events(
+        cls, events: Iterable[tuple[int, TriggerEvent]], session: Session = NEW_SESSION
+    ) -> None:
+        """
+        Take a batch of events from triggers, and trigger all their dependent tasks to resume.
+
+        The deferred task instances of all the triggers are loaded in a single query, and updated in
+        the same transaction. Only the first event of a trigger resumes its task instances, as with
+        :meth:`submit_event`.
+
+        :param events: the ``(trigger_id, event)`` pairs to submit
+        """
+        payloads: dict[int, Any] = {}
+        for trigger_id, trigger_event in events:
+            payloads.setdefault(trigger_id, trigger_event.payload)
+        if not payloads:
+            return
         for task_instance in session.scalars(
-            select(TaskInstance).where(
-                TaskInstance.trigger_id == trigger_id, TaskInstance.state == TaskInstanceState.DEFERRED
+            select(TaskInstance)
+            .where(TaskInstance.trigger_id.in_(payloads), TaskInstance.state == TaskInstanceState.DEFERRED)
+            .options(
+                load_only(TaskInstance.trigger_id, TaskInstance.state, TaskInstance.next_kwargs),
+                noload("*"),
             )
         ):
             # Add the event's payload into the kwargs for the task
             next_kwargs = task_instance.next_kwargs or {}
-            next_kwargs["event"] = event.payload
+            next_kwargs["event"] = payloads[task_instance.trigger_id]
             task_instance.next_kwargs = next_kwargs
             # Remove ourselves as its trigger
             task_instance.trigger_id = None
             # Finally, mark it as scheduled so it gets re-queued
             task_instance.state = TaskInstanceState.SCHEDULED
+        # Update all the task instances at once
+        session.flush()
 
     @classmethod
     @internal_api_call
@@ -263,36 +357,171 @@ class Trigger(Base):
         Takes a triggerer_id, the capacity for that triggerer and the Triggerer job heartrate
         health check threshold, and assigns unassigned triggers until that capacity is reached,
         or there are no more unassigned triggers.
-        """
-        from airflow.jobs.job import Job  # To avoid circular import
 
+        Triggers whose cost is known, because they already ran on a triggerer, are only assigned while
+        the total cost of the triggers of the triggerer stays within ``[triggerer] cost_imbalance_tolerance``
+        of the mean cost of the triggerers, or if the triggerer has the lowest total cost.
+        """
         count = session.scalar(select(func.count(cls.id)).filter(cls.triggerer_id == triggerer_id))
         capacity -= count
 
         if capacity <= 0:
             return
 
-        alive_triggerer_ids = select(Job.id).where(
-            Job.end_date.is_(None),
-            Job.latest_heartbeat > timezone.utcnow() - datetime.timedelta(seconds=health_check_threshold),
-            Job.job_type == "TriggererJob",
-        )
+        alive_triggerer_ids = cls._alive_triggerer_ids(health_check_threshold)
 
         # Find triggers who do NOT have an alive triggerer_id, and then assign
         # up to `capacity` of those to us.
         trigger_ids_query = cls.get_sorted_triggers(
             capacity=capacity, alive_triggerer_ids=alive_triggerer_ids, session=session
         )
-        if trigger_ids_query:
+        trigger_ids = [i.id for i in trigger_ids_query]
+        costs = dict(
+            session.execute(select(cls.id, cls.cost).where(cls.id.in_(trigger_ids), cls.cost > 0)).all()
+        )
+        if costs:
+            loads, max_load = cls._triggerer_loads(triggerer_id, alive_triggerer_ids, session=session)
+            assigned_ids = []
+            for trigger_id in trigger_ids:
+                cost = costs.get(trigger_id, 0.0)
+                if (
+                    cost
+                    and loads[triggerer_id] + cost > max_load
+                    and loads[triggerer_id] > min(loads.values())
+                ):
+                    # Leave it to a less loaded triggerer
+                    continue
+                loads[triggerer_id] += cost
+                assigned_ids.append(trigger_id)
+            trigger_ids = assigned_ids
+        if trigger_ids:
             session.execute(
                 update(cls)
-                .where(cls.id.in_([i.id for i in trigger_ids_query]))
+                .where(cls.id.in_(trigger_ids))
                 .values(triggerer_id=triggerer_id)
                 .execution_options(synchronize_session=False)
             )
 
         session.commit()
 
+    @classmethod
+    @internal_api_call
+    @provide_session
+    def report_costs(
+        cls,
+        triggerer_id: int,
+        costs: list[tuple[int, float]],
+        capacity: int,
+        health_check_threshold: float,
+        session: Session = NEW_SESSION,
+    ) -> list[int]:
+        """
+        Record the costs of the triggers of a triggerer, and move triggers away from it if it is overloaded.
+
+        A triggerer is overloaded when the total cost of its triggers is over the mean cost of the
+        triggerers by more than ``[triggerer] cost_imbalance_tolerance``. Its costliest triggers are then
+        moved to the least loaded triggerers, as long as this does not overload them, until it is not
+        overloaded anymore. No triggerer is overloaded by a move, so triggers are not moved back and forth.
+
+        :param triggerer_id: the job id of the triggerer
+        :param costs: the ``(trigger_id, cost)`` pairs of the triggers of the triggerer, in CPU seconds per
+            second
+        :param capacity: the capacity of the triggerer, triggers are only moved to triggerers running fewer
+            triggers than this
+        :param health_check_threshold: the health check threshold of the triggerers
+        :return: the IDs of the triggers moved to other triggerers
+        """
+        if costs:
+            session.execute(
+                update(cls.__table__)
+                .where(
+                    cls.__table__.c.id == bindparam("trigger_id"),
+                    cls.__table__.c.triggerer_id == triggerer_id,
+                )
+                .values(cost=bindparam("trigger_cost")),
+                [{"trigger_id": trigger_id, "trigger_cost": cost} for trigger_id, cost in costs],
+            )
+
+        alive_triggerer_ids = cls._alive_triggerer_ids(health_check_threshold)
+        loads, max_load = cls._triggerer_loads(triggerer_id, alive_triggerer_ids, session=session)
+        if loads[triggerer_id] <= max_load or len(loads) < 2:
+            session.commit()
+            return []
+
+        counts = dict(
+            session.execute(
+                select(cls.triggerer_id, func.count(cls.id))
+                .where(cls.triggerer_id.in_(list(loads)))
+                .group_by(cls.triggerer_id)
+            ).all()
+        )
+        moves: dict[int, list[int]] = {}
+        for trigger_id, cost in session.execute(
+            select(cls.id, cls.cost)
+            .where(cls.triggerer_id == triggerer_id, cls.cost > 0)
+            .order_by(cls.cost.desc())
+        ):
+            if loads[triggerer_id] <= max_load:
+                break
+            targets = [
+                target_id
+                for target_id in loads
+                if target_id != triggerer_id and counts.get(target_id, 0) < capacity
+            ]
+            if not targets:
+                break
+            target_id = min(targets, key=loads.__getitem__)
+            if loads[target_id] + cost > max_load or loads[target_id] + cost > loads[triggerer_id] - cost:
+                # Moving it would overload the target, try a cheaper trigger
+                continue
+            moves.setdefault(target_id, []).append(trigger_id)
+            loads[target_id] += cost
+            loads[triggerer_id] -= cost
+            counts[target_id] = counts.get(target_id, 0) + 1
+        for target_id, trigger_ids in moves.items():
+            session.execute(
+                update(cls)
+                .where(cls.id.in_(trigger_ids), cls.triggerer_id == triggerer_id)
+                .values(triggerer_id=target_id)
+                .execution_options(synchronize_session=False)
+            )
+        session.commit()
+        return [trigger_id for trigger_ids in moves.values() for trigger_id in trigger_ids]
+
+    @staticmethod
+    def _alive_triggerer_ids(health_check_threshold: float) -> Select:
+        from airflow.jobs.job import Job  # To avoid circular import
+
+        return select(Job.id).where(
+            Job.end_date.is_(None),
+            Job.latest_heartbeat > timezone.utcnow() - datetime.timedelta(seconds=health_check_threshold),
+            Job.job_type == "TriggererJob",
+        )
+
+    @classmethod
+    def _triggerer_loads(
+        cls, triggerer_id: int, alive_triggerer_ids: Select, session: Session
+    ) -> tuple[dict[int, float], float]:
+        """
+        Return the total cost of the triggers of each alive triggerer, and the highest balanced total cost.
+
+        The highest balanced total cost is the mean total cost, counting the triggers without an alive
+        triggerer, increased by ``[triggerer] cost_imbalance_tolerance``.
+        """
+        loads = dict.fromkeys(session.scalars(alive_triggerer_ids), 0.0)
+        loads[triggerer_id] = 0.0
+        unassigned_cost = 0.0
+        for assigned_triggerer_id, cost in session.execute(
+            select(cls.triggerer_id, func.sum(cls.cost)).where(cls.cost > 0).group_by(cls.triggerer_id)
+        ):
+            if assigned_triggerer_id in loads:
+                loads[assigned_triggerer_id] = cost
+            else:
+                unassigned_cost += cost
+        tolerance = conf.getfloat("triggerer", "cost_imbalance_tolerance")
+        mean_load = (sum(loads.values()) + unassigned_cost) / len(loads)
+        return loads, mean_load * (1 + tolerance)
+
     @classmethod
     def get_sorted_triggers(cls, capacity: int, alive_triggerer_ids: list[int] | Select, session: Session):
         """Get sorted triggers based on capacity and alive triggerer ids.
@@ -311,3 +540,15 @@ class Trigger(Base):
             skip_locked=True,
         )
         return session.execute(query).all()
+
+
+@event.listens_for(Trigger, "after_insert")
+def notify_triggerers(mapper: Mapper, connection: Connection, target: Trigger) -> None:
+    """
+    Notify the triggerers listening for new triggers, on PostgreSQL.
+
+    The notification is only delivered when the transaction creating the trigger commits, and the
+    notifications of a transaction are delivered once.
+    """
+    if connection.dialect.name == "postgresql" and conf.getboolean("triggerer", "db_notifications"):
+        connection.execute(text(f"NOTIFY {TRIGGER_NOTIFICATION_CHANNEL}"))
@@ -46,6 +46,7 @@ from airflow.api_internal.internal_api_call import internal_api_call
 from airflow.configuration import conf
 from airflow.exceptions import RemovedInAirflow3Warning
 from airflow.models.base import COLLATION_ARGS, ID_LEN, TaskInstanceDependencies
+from airflow.serialization import codec
 from airflow.utils import timezone
 from airflow.utils.db import LazySelectSequence
 from airflow.utils.helpers import exactly_one, is_container
@@ -669,7 +670,11 @@ class BaseXCom(TaskInstanceDependencies, LoggingMixin):
         """Serialize XCom value to str or pickled object."""
         if conf.getboolean("core", "enable_xcom_pickling"):
             return pickle.dumps(value)
+        xcom_format = conf.get("core", "xcom_serialization_format", fallback="json")
         try:
+            if xcom_format != "json":
+                encoder = XComEncoder()
+                return codec.encode(encoder.prepare(value), xcom_format, default=encoder.default)
             return json.dumps(value, cls=XComEncoder).encode("UTF-8")
         except (ValueError, TypeError) as ex:
             log.error(
@@ -690,6 +695,8 @@ class BaseXCom(TaskInstanceDependencies, LoggingMixin):
 
         if result.value is None:
             return None
+        if codec.has_header(result.value):
+            return codec.decode(result.value, object_hook=object_hook or XComDecoder().object_hook)
         if conf.getboolean("core", "enable_xcom_pickling"):
             try:
                 return pickle.loads(result.value)
@@ -30,6 +30,7 @@ import operator
 import time
 from collections import Counter
 from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
 from multiprocessing import cpu_count
 from typing import TYPE_CHECKING, Any, Optional, Sequence, Tuple
 
@@ -67,9 +68,10 @@ if TYPE_CHECKING:
 
     from celery import Task
 
-    from airflow.executors.base_executor import CommandType, TaskTuple
+    from airflow.executors.base_executor import CommandType, EventBufferValueType, TaskTuple
     from airflow.models.taskinstance import TaskInstance
     from airflow.models.taskinstancekey import TaskInstanceKey
+    from airflow.providers.celery.executors.celery_executor_utils import CeleryTaskEventListener
 
     # Task instance that is sent over Celery queues
     # TaskInstanceKey, Command, queue_name, CallableTask
@@ -243,9 +245,36 @@ class CeleryExecutor(BaseExecutor):
         self.tasks = {}
         self.task_publish_retries: Counter[TaskInstanceKey] = Counter()
         self.task_publish_max_retries = conf.getint("celery", "task_publish_max_retries")
+        self.task_publish_in_batch = conf.getboolean("celery", "task_publish_in_batch", fallback=False)
+        self.task_event_listener: CeleryTaskEventListener | None = None
+        self.task_state_silence_timeout = conf.getfloat("celery", "task_state_silence_timeout", fallback=60.0)
+        # When the state of the tasks was last polled from the result backend, or when they were sent
+        self.task_state_polled_at: dict[TaskInstanceKey, float] = {}
+        # When the tasks waiting to be published were queued to the executor
+        self.task_queued_at: dict[TaskInstanceKey, float] = {}
 
     def start(self) -> None:
         self.log.debug("Starting Celery Executor using %s processes for syncing", self._sync_parallelism)
+        if conf.getboolean("celery", "sync_task_state_from_events", fallback=False):
+            from airflow.providers.celery.executors.celery_executor_utils import (
+                CeleryTaskEventListener,
+                app,
+            )
+
+            self.task_event_listener = CeleryTaskEventListener(app)
+            self.task_event_listener.start()
+
+    def queue_command(
+        self,
+        task_instance: TaskInstance,
+        command: CommandType,
+        priority: int = 1,
+        queue: str | None = None,
+    ):
+        newly_queued = task_instance.key not in self.queued_tasks
+        super().queue_command(task_instance, command, priority=priority, queue=queue)
+        if newly_queued:
+            self.task_queued_at[task_instance.key] = time.monotonic()
 
     def _num_tasks_per_send_process(self, to_send_count: int) -> int:
         """
@@ -265,8 +294,14 @@ class CeleryExecutor(BaseExecutor):
         # for all tasks.
         cached_celery_backend = first_task.backend
 
+        start_time = time.monotonic()
         key_and_async_results = self._send_tasks_to_celery(task_tuples_to_send)
+        duration = time.monotonic() - start_time
         self.log.debug("Sent all tasks.")
+        Stats.timing("celery.task_publish.duration", timedelta(seconds=duration))
+        if duration > 0:
+            Stats.gauge("celery.task_publish.throughput", len(task_tuples_to_send) / duration)
+        published_at = time.monotonic()
         from airflow.providers.celery.executors.celery_executor_utils import ExceptionWithTraceback
 
         for key, _, result in key_and_async_results:
@@ -286,10 +321,13 @@ class CeleryExecutor(BaseExecutor):
                     continue
             self.queued_tasks.pop(key)
             self.task_publish_retries.pop(key, None)
+            queued_at = self.task_queued_at.pop(key, None)
             if isinstance(result, ExceptionWithTraceback):
                 self.log.error("%s: %s\n%s\n", CELERY_SEND_ERR_MSG_HEADER, result.exception, result.traceback)
                 self.event_buffer[key] = (TaskInstanceState.FAILED, None)
             elif result is not None:
+                if queued_at is not None:
+                    Stats.timing("celery.task_publish.latency", timedelta(seconds=published_at - queued_at))
                 result.backend = cached_celery_backend
                 self.running.add(key)
                 self.tasks[key] = result
@@ -299,11 +337,24 @@ class CeleryExecutor(BaseExecutor):
                 # which point we don't need the ID anymore anyway
                 self.event_buffer[key] = (TaskInstanceState.QUEUED, result.task_id)
 
-                # If the task runs _really quickly_ we may already have a result!
-                self.update_task_state(key, result.state, getattr(result, "info", None))
+                if self.task_event_listener is None:
+                    # If the task runs _really quickly_ we may already have a result!
+                    self.update_task_state(key, result.state, getattr(result, "info", None))
+
+        if len(self.task_queued_at) > len(self.queued_tasks):
+            # The base executor drops still-running tasks from queued_tasks without publishing them
+            for key in self.task_queued_at.keys() - self.queued_tasks.keys():
+                del self.task_queued_at[key]
 
     def _send_tasks_to_celery(self, task_tuples_to_send: list[TaskInstanceInCelery]):
-        from airflow.providers.celery.executors.celery_executor_utils import send_task_to_executor
+        from airflow.providers.celery.executors.celery_executor_utils import (
+            send_task_to_executor,
+            send_tasks_to_executor_in_batch,
+        )
+
+        if self.task_publish_in_batch:
+            # Publish all the tasks with one broker connection, in the main thread.
+            return send_tasks_to_executor_in_batch(task_tuples_to_send)
 
         if len(task_tuples_to_send) == 1 or self._sync_parallelism == 1:
             # One tuple, or max one process -> send it in the main thread.
@@ -335,15 +386,49 @@ class CeleryExecutor(BaseExecutor):
 
     def update_all_task_states(self) -> None:
         """Update states of the tasks."""
-        self.log.debug("Inquiring about %s celery task(s)", len(self.tasks))
-        state_and_info_by_celery_task_id = self.bulk_state_fetcher.get_many(self.tasks.values())
+        if self.task_event_listener is not None:
+            state_and_info_by_celery_task_id = self._get_task_states_from_events()
+        else:
+            self.log.debug("Inquiring about %s celery task(s)", len(self.tasks))
+            state_and_info_by_celery_task_id = self.bulk_state_fetcher.get_many(self.tasks.values())
+            self.log.debug("Inquiries completed.")
 
-        self.log.debug("Inquiries completed.")
         for key, async_result in list(self.tasks.items()):
-            state, info = state_and_info_by_celery_task_id.get(async_result.task_id)
+            state, info = state_and_info_by_celery_task_id.get(async_result.task_id, (None, None))
             if state:
                 self.update_task_state(key, state, info)
 
+    def _get_task_states_from_events(self) -> dict[str, EventBufferValueType]:
+        """
+        Get the states of the tasks from their task events.
+
+        The states of the tasks without any event for longer than ``task_state_silence_timeout`` are
+        polled from the result backend, as their events may have been lost.
+        """
+        if TYPE_CHECKING:
+            assert self.task_event_listener
+
+        now = time.monotonic()
+        state_and_info_by_celery_task_id: dict[str, EventBufferValueType] = {}
+        silent_tasks = []
+        for key, async_result in self.tasks.items():
+            event = self.task_event_listener.states.get(async_result.task_id)
+            heard_at = self.task_state_polled_at.setdefault(key, now)
+            if event:
+                state_and_info_by_celery_task_id[async_result.task_id] = (event.state, event.info)
+                heard_at = max(heard_at, event.received_at)
+            if now - heard_at > self.task_state_silence_timeout:
+                silent_tasks.append(async_result)
+                self.task_state_polled_at[key] = now
+
+        Stats.gauge("celery.task_state_sync.polled_tasks", len(silent_tasks))
+        if silent_tasks:
+            self.log.debug("Inquiring about %s silent celery task(s)", len(silent_tasks))
+            state_and_info_by_celery_task_id.update(self.bulk_state_fetcher.get_many(silent_tasks))
+            self.log.debug("Inquiries completed.")
+        self.task_event_listener.prune(keep=(async_result.task_id for async_result in self.tasks.values()))
+        return state_and_info_by_celery_task_id
+
     def change_state(
         self, key: TaskInstanceKey, state: TaskInstanceState, info=None, remove_running=True
     ) -> None:
@@ -354,6 +439,7 @@ class CeleryExecutor(BaseExecutor):
             # TODO: Remove when min airflow version >= 2.9.2
             super().change_state(key, state, info)
         self.tasks.pop(key, None)
+        self.task_state_polled_at.pop(key, None)
 
     def update_task_state(self, key: TaskInstanceKey, state: str, info: Any) -> None:
         """Update state of a single task."""
@@ -374,9 +460,15 @@ class CeleryExecutor(BaseExecutor):
             while any(task.state not in celery_states.READY_STATES for task in self.tasks.values()):
                 time.sleep(5)
         self.sync()
+        self._stop_task_event_listener()
 
     def terminate(self):
-        pass
+        self._stop_task_event_listener()
+
+    def _stop_task_event_listener(self) -> None:
+        if self.task_event_listener is not None:
+            self.task_event_listener.stop()
+            self.task_event_listener = None
 
     def try_adopt_task_instances(self, tis: Sequence[TaskInstance]) -> Sequence[TaskInstance]:
         # See which of the TIs are still alive (or have finished even!)
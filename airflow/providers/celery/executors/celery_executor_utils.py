@@ -27,15 +27,21 @@ import logging
 import math
 import os
 import subprocess
+import threading
+import time
 import traceback
 import warnings
 from concurrent.futures import ProcessPoolExecutor
-from typing import TYPE_CHECKING, Any, Mapping, MutableMapping, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, MutableMapping, NamedTuple, Optional, Tuple
 
 from celery import Celery, Task, states as celery_states
 from celery.backends.base import BaseKeyValueStoreBackend
 from celery.backends.database import DatabaseBackend, Task as TaskDb, retry, session_cleanup
-from celery.signals import import_modules as celery_import_modules
+from celery.signals import (
+    import_modules as celery_import_modules,
+    worker_init as celery_worker_init,
+    worker_shutdown as celery_worker_shutdown,
+)
 from setproctitle import setproctitle
 from sqlalchemy import select
 
@@ -51,6 +57,14 @@ from airflow.utils.net import get_hostname
 from airflow.utils.providers_configuration_loader import providers_configuration_loaded
 from airflow.utils.timeout import timeout
 
+try:
+    from airflow.executors.task_zygote import TaskZygote
+    from airflow.jobs.heartbeat_multiplexer import SOCKET_PATH_ENV, HeartbeatMultiplexer
+except ImportError:
+    # Airflow versions before 2.10 have no task zygote nor heartbeat multiplexer
+    TaskZygote = None  # type: ignore[assignment,misc]
+    HeartbeatMultiplexer = None  # type: ignore[assignment,misc]
+
 log = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
@@ -68,6 +82,12 @@ CELERY_FETCH_ERR_MSG_HEADER = "Error fetching Celery task state"
 
 celery_configuration = None
 
+# The zygote forking the processes running the tasks of this worker, if any
+_task_zygote: TaskZygote | None = None
+
+# The multiplexer of the heartbeats of the tasks of this worker, if any
+_heartbeat_multiplexer: HeartbeatMultiplexer | None = None
+
 
 @providers_configuration_loaded
 def _get_celery_app() -> Celery:
@@ -122,6 +142,33 @@ def on_celery_import_modules(*args, **kwargs):
         import kubernetes.client  # noqa: F401
 
 
+@celery_worker_init.connect
+def on_celery_worker_init(*args, **kwargs):
+    """Start the zygote and the heartbeat multiplexer of the tasks, if enabled, before the pool starts."""
+    global _task_zygote, _heartbeat_multiplexer
+
+    if TaskZygote is not None and getattr(settings, "EXECUTE_TASKS_IN_ZYGOTE", False):
+        _task_zygote = TaskZygote.start()
+    if HeartbeatMultiplexer is not None and conf.getboolean("scheduler", "task_heartbeat_multiplexer"):
+        _heartbeat_multiplexer = HeartbeatMultiplexer.start()
+        # The processes running the tasks, started from the pool processes, heartbeat through it
+        os.environ[SOCKET_PATH_ENV] = _heartbeat_multiplexer.socket_path
+
+
+@celery_worker_shutdown.connect
+def on_celery_worker_shutdown(*args, **kwargs):
+    """Stop the zygote and the heartbeat multiplexer of the tasks, if any."""
+    global _task_zygote, _heartbeat_multiplexer
+
+    if _task_zygote is not None:
+        _task_zygote.stop()
+        _task_zygote = None
+    if _heartbeat_multiplexer is not None:
+        os.environ.pop(SOCKET_PATH_ENV, None)
+        _heartbeat_multiplexer.stop()
+        _heartbeat_multiplexer = None
+
+
 @app.task
 def execute_command(command_to_exec: CommandType) -> None:
     """Execute command."""
@@ -132,13 +179,26 @@ def execute_command(command_to_exec: CommandType) -> None:
         try:
             if settings.EXECUTE_TASKS_NEW_PYTHON_INTERPRETER:
                 _execute_in_subprocess(command_to_exec, celery_task_id)
-            else:
+            elif not (_task_zygote and _execute_in_zygote(_task_zygote, command_to_exec, celery_task_id)):
                 _execute_in_fork(command_to_exec, celery_task_id)
         except Exception:
             Stats.incr("celery.execute_command.failure")
             raise
 
 
+def _execute_in_zygote(
+    zygote: TaskZygote, command_to_exec: CommandType, celery_task_id: str | None = None
+) -> bool:
+    """Run the command in a process forked by the zygote; return False if the zygote is not reachable."""
+    ret = zygote.run_command(command_to_exec, external_executor_id=celery_task_id)
+    if ret is None:
+        return False
+    if ret != 0:
+        msg = f"Celery command failed on host: {get_hostname()} with celery_task_id {celery_task_id} (Return Code: {ret})"
+        raise AirflowException(msg)
+    return True
+
+
 def _execute_in_fork(command_to_exec: CommandType, celery_task_id: str | None = None) -> None:
     pid = os.fork()
     if pid:
@@ -225,6 +285,31 @@ def send_task_to_executor(
     return key, command, result
 
 
+def send_tasks_to_executor_in_batch(
+    task_tuples: list[TaskInstanceInCelery],
+) -> list[tuple[TaskInstanceKey, CommandType, AsyncResult | ExceptionWithTraceback]]:
+    """
+    Send tasks to executor, publishing them one after the other with the same producer.
+
+    The producer, and its broker connection and channel, are acquired once from the producer pool
+    of the Celery app, which keeps them open between the calls, instead of once per task. When
+    publishing a task fails, the producer is released and another one is acquired for the next tasks.
+    """
+    results: list[tuple[TaskInstanceKey, CommandType, AsyncResult | ExceptionWithTraceback]] = []
+    while len(results) < len(task_tuples):
+        key, command, _, task_to_run = task_tuples[len(results)]
+        try:
+            with task_to_run.app.producer_or_acquire() as producer:
+                for key, command, queue, task_to_run in task_tuples[len(results) :]:
+                    with timeout(seconds=OPERATION_TIMEOUT):
+                        result = task_to_run.apply_async(args=[command], queue=queue, producer=producer)
+                    results.append((key, command, result))
+        except (Exception, AirflowTaskTimeout) as e:
+            exception_traceback = f"Celery Task ID: {key}\n{traceback.format_exc()}"
+            results.append((key, command, ExceptionWithTraceback(e, exception_traceback)))
+    return results
+
+
 def fetch_celery_task_state(async_result: AsyncResult) -> tuple[str, str | ExceptionWithTraceback, Any]:
     """
     Fetch and return the state of the given celery task.
@@ -336,3 +421,87 @@ class BulkStateFetcher(LoggingMixin):
                 else:
                     states_and_info_by_task_id[task_id] = state_or_exception, info
         return states_and_info_by_task_id
+
+
+class TaskEventState(NamedTuple):
+    """State of a Celery task, from the last task event received for it."""
+
+    state: str
+    info: Any
+    received_at: float
+
+
+class CeleryTaskEventListener(LoggingMixin):
+    """
+    Records the state of the Celery tasks from the task events sent by the workers.
+
+    The events are received in a thread, with a connection to the broker of its own, and the last
+    state of each task is kept in :attr:`states`, by Celery task id.
+
+    :param celery_app: The Celery app whose task events are received
+    """
+
+    # Celery states of the tasks after each type of task event
+    EVENT_STATES = {
+        "task-received": celery_states.PENDING,
+        "task-started": celery_states.STARTED,
+        "task-succeeded": celery_states.SUCCESS,
+        "task-failed": celery_states.FAILURE,
+        "task-revoked": celery_states.REVOKED,
+    }
+
+    # Seconds to wait before connecting again to the broker after losing the connection
+    RECONNECT_INTERVAL = 5.0
+
+    def __init__(self, celery_app: Celery):
+        super().__init__()
+        self.celery_app = celery_app
+        self.states: dict[str, TaskEventState] = {}
+        self._receiver = None
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="celery-task-events", daemon=True)
+
+    def start(self) -> None:
+        """Start receiving the task events."""
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop receiving the task events."""
+        self._stopping.set()
+        if self._receiver is not None:
+            self._receiver.should_stop = True
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        handlers = {event_type: self.on_event for event_type in self.EVENT_STATES}
+        while not self._stopping.is_set():
+            try:
+                with self.celery_app.connection_for_read() as connection:
+                    self._receiver = self.celery_app.events.Receiver(connection, handlers=handlers)
+                    self._receiver.capture(limit=None, timeout=None, wakeup=False)
+            except Exception:
+                self.log.exception("Lost the connection receiving the Celery task events, reconnecting")
+                self._stopping.wait(self.RECONNECT_INTERVAL)
+
+    def on_event(self, event: dict[str, Any]) -> None:
+        """Record the state of the task of an event."""
+        task_id = event["uuid"]
+        state = self.EVENT_STATES[event["type"]]
+        previous = self.states.get(task_id)
+        if (
+            previous
+            and previous.state in celery_states.READY_STATES
+            and state not in celery_states.READY_STATES
+        ):
+            # The events of a task can arrive out of order, a finished task stays finished
+            return
+        info = event.get("exception") if state == celery_states.FAILURE else None
+        self.states[task_id] = TaskEventState(state, info, time.monotonic())
+
+    def prune(self, keep: Iterable[str]) -> None:
+        """Forget the state of the tasks, except the ones given, of the events received so far."""
+        keep = set(keep)
+        # The keys are copied at once, as the events are recorded by another thread
+        for task_id in list(self.states):
+            if task_id not in keep:
+                self.states.pop(task_id, None)
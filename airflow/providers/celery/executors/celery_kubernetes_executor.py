@@ -259,6 +259,16 @@ class CeleryKubernetesExecutor(LoggingMixin):
             raise ValueError("Callback sink is not ready.")
         self.callback_sink.send(request)
 
+    def send_callbacks(self, requests: Sequence[CallbackRequest]) -> None:
+        """
+        Send a batch of callbacks for execution.
+
+        :param requests: Callback requests to be executed.
+        """
+        if not self.callback_sink:
+            raise ValueError("Callback sink is not ready.")
+        self.callback_sink.send_many(requests)
+
     @staticmethod
     def get_cli_commands() -> list:
         return CeleryExecutor.get_cli_commands() + KubernetesExecutor.get_cli_commands()
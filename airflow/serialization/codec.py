@@ -0,0 +1,154 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Binary encodings of JSON-compatible data, used to store serialized DAGs and XComs.
+
+Encoded data starts with a header naming the format and the compression it was written with, so
+that data written with any codec can be decoded regardless of the codec currently configured. Data
+without the header was written before codecs existed, and has to be decoded by the caller.
+
+The ``orjson``, ``msgpack`` and ``zstd`` codecs require the optional ``orjson``, ``msgpack`` and
+``zstandard`` packages, installed with the ``serialization`` extra.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Neither JSON text, nor a zlib stream, nor a pickle can start with a NUL byte
+MAGIC = b"\x00AF"
+HEADER_LENGTH = len(MAGIC) + 2
+
+FORMATS = ("json", "orjson", "msgpack")
+COMPRESSIONS = ("none", "zlib", "zstd")
+
+_FORMAT_IDS = {name: index for index, name in enumerate(FORMATS)}
+_COMPRESSION_IDS = {name: index for index, name in enumerate(COMPRESSIONS)}
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson
+    else 0
+)
+
+
+def _check_available(format: str, compression: str) -> None:
+    if format not in _FORMAT_IDS:
+        raise ValueError(f"unknown serialization format {format!r}, expected one of {FORMATS}")
+    if compression not in _COMPRESSION_IDS:
+        raise ValueError(f"unknown compression {compression!r}, expected one of {COMPRESSIONS}")
+    if format == "orjson" and orjson is None:
+        raise RuntimeError("the orjson format requires the orjson package, please install it")
+    if format == "msgpack" and msgpack is None:
+        raise RuntimeError("the msgpack format requires the msgpack package, please install it")
+    if compression == "zstd" and zstandard is None:
+        raise RuntimeError("the zstd compression requires the zstandard package, please install it")
+
+
+def has_header(data: bytes) -> bool:
+    """Whether the data was encoded by :func:`encode`, rather than written by an older Airflow."""
+    return data[: len(MAGIC)] == MAGIC
+
+
+def encode(
+    obj: Any,
+    format: str = "json",
+    compression: str = "none",
+    *,
+    default: Callable[[Any], Any] | None = None,
+) -> bytes:
+    """
+    Encode JSON-compatible data in the given format, and compress it.
+
+    :param obj: the data to encode
+    :param format: one of ``json``, ``orjson`` and ``msgpack``
+    :param compression: one of ``none``, ``zlib`` and ``zstd``
+    :param default: called with the objects which cannot be encoded natively, it returns an
+        encodable representation of the object, like the ``default`` argument of ``json.dumps``.
+        Dates and dataclasses are always passed to it.
+    """
+    _check_available(format, compression)
+    if format == "orjson":
+        payload = orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS)
+    elif format == "msgpack":
+        payload = msgpack.packb(obj, default=default, use_bin_type=True)
+    else:
+        payload = json.dumps(obj, default=default).encode("utf-8")
+
+    if compression == "zlib":
+        payload = zlib.compress(payload)
+    elif compression == "zstd":
+        payload = zstandard.ZstdCompressor().compress(payload)
+
+    return MAGIC + bytes((_FORMAT_IDS[format], _COMPRESSION_IDS[compression])) + payload
+
+
+def decode(data: bytes, *, object_hook: Callable[[dict], Any] | None = None) -> Any:
+    """
+    Decode data encoded by :func:`encode`, whatever the codec it was encoded with.
+
+    :param data: the encoded data, starting with its header
+    :param object_hook: called with every decoded dict, from the innermost, and its return value
+        is used instead of the dict, like the ``object_hook`` argument of ``json.loads``.
+    """
+    if not has_header(data):
+        raise ValueError("the data was not encoded with a serialization codec")
+    try:
+        format = FORMATS[data[len(MAGIC)]]
+        compression = COMPRESSIONS[data[len(MAGIC) + 1]]
+    except IndexError:
+        raise ValueError("the data was encoded with an unknown serialization codec")
+    _check_available(format, compression)
+
+    payload = memoryview(data)[HEADER_LENGTH:]
+    if compression == "zlib":
+        payload = zlib.decompress(payload)
+    elif compression == "zstd":
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+
+    if format == "msgpack":
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False, object_hook=object_hook)
+    if format == "orjson":
+        obj = orjson.loads(payload)
+        return _apply_object_hook(obj, object_hook) if object_hook else obj
+    return json.loads(bytes(payload), object_hook=object_hook)
+
+
+def _apply_object_hook(obj: Any, object_hook: Callable[[dict], Any]) -> Any:
+    """Replace the dicts of decoded data by the result of ``object_hook``, from the innermost."""
+    if isinstance(obj, dict):
+        return object_hook({key: _apply_object_hook(value, object_hook) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return [_apply_object_hook(value, object_hook) for value in obj]
+    return obj
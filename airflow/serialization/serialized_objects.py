@@ -28,7 +28,7 @@ import weakref
 from dataclasses import dataclass
 from inspect import signature
 from textwrap import dedent
-from typing import TYPE_CHECKING, Any, Collection, Iterable, Mapping, NamedTuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Collection, Iterable, Mapping, NamedTuple, Union
 
 import attrs
 import lazy_object_proxy
@@ -62,6 +62,7 @@ from airflow.serialization.pydantic.taskinstance import TaskInstancePydantic
 from airflow.serialization.pydantic.tasklog import LogTemplatePydantic
 from airflow.settings import _ENABLE_AIP_44, DAGS_FOLDER, json
 from airflow.task.priority_strategy import (
+    PriorityWeightIndex,
     PriorityWeightStrategy,
     airflow_priority_weight_strategies,
     airflow_priority_weight_strategies_classes,
@@ -363,6 +364,100 @@ class _ExpandInputRef(NamedTuple):
         return create_expand_input(self.key, value)
 
 
+_NOT_LOADED = object()
+
+
+class _LazyDict(dict):
+    """
+    Dict whose values are only deserialized when they are first accessed.
+
+    All the keys are present from the start, and ``load`` is called to get the value of a key the
+    first time it is looked up. Copying, pickling or comparing the dict loads all of its values.
+    """
+
+    def __init__(self, keys: Iterable[str], load: Callable[[str], Any]) -> None:
+        super().__init__(dict.fromkeys(keys, _NOT_LOADED))
+        self._load = load
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+        if value is _NOT_LOADED:
+            value = self._load(key)
+            super().__setitem__(key, value)
+        return value
+
+    def __iter__(self):
+        # Overriding __iter__ keeps dict() and ** from copying the placeholders of the values
+        return super().__iter__()
+
+    def is_loaded(self, key: str) -> bool:
+        return super().__getitem__(key) is not _NOT_LOADED
+
+    def _load_all(self) -> None:
+        for key in list(self):
+            self[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def values(self):  # type: ignore[override]
+        self._load_all()
+        return super().values()
+
+    def items(self):  # type: ignore[override]
+        self._load_all()
+        return super().items()
+
+    def pop(self, key: str, *args: Any) -> Any:
+        if key in self:
+            self[key]
+        return super().pop(key, *args)
+
+    def popitem(self) -> tuple[str, Any]:
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return super().setdefault(key, default)
+
+    def copy(self) -> dict[str, Any]:  # type: ignore[override]
+        return dict(self.items())
+
+    def __eq__(self, other: object) -> bool:
+        self._load_all()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        self._load_all()
+        return super().__ne__(other)
+
+    def __repr__(self) -> str:
+        self._load_all()
+        return super().__repr__()
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+
+class LazyEncodedTasks(NamedTuple):
+    """
+    Encoded tasks of a DAG which are only decoded when their task is first deserialized.
+
+    Passed as the ``tasks`` of an encoded DAG deserialized lazily, for the tasks stored apart from
+    the DAG to only be decoded when accessed.
+
+    :param task_ids: The ids of the tasks, in the order of the DAG
+    :param downstream_task_ids: The downstream task ids of the tasks which have any
+    :param load: Returns the encoded task of a task id
+    """
+
+    task_ids: list[str]
+    downstream_task_ids: dict[str, list[str]]
+    load: Callable[[str], dict[str, Any]]
+
+
 _orm_to_model = {
     Job: JobPydantic,
     TaskInstance: TaskInstancePydantic,
@@ -1218,12 +1313,15 @@ class SerializedBaseOperator(BaseOperator, BaseSerialization):
         setattr(op, "next_method", encoded_op.get("next_method", None))
 
     @staticmethod
-    def set_task_dag_references(task: Operator, dag: DAG) -> None:
+    def set_task_dag_references(task: Operator, dag: DAG, *, update_downstream: bool = True) -> None:
         """Handle DAG references on an operator.
 
         The operator should have been mostly populated earlier by calling
         ``populate_operator``. This function further fixes object references
         that were not possible before the task's containing DAG is hydrated.
+
+        :param update_downstream: whether to add the operator to the upstream task ids of its
+            downstream tasks. Tasks loaded lazily get their upstream task ids up front instead.
         """
         task.dag = dag
 
@@ -1239,6 +1337,8 @@ class SerializedBaseOperator(BaseOperator, BaseSerialization):
             if isinstance(kwargs_ref := getattr(task, k, None), _ExpandInputRef):
                 setattr(task, k, kwargs_ref.deref(dag))
 
+        if not update_downstream:
+            return
         for task_id in task.downstream_task_ids:
             # Bypass set_upstream etc here - it does more than we want
             dag.task_dict[task_id].upstream_task_ids.add(task.task_id)
@@ -1514,6 +1614,9 @@ class SerializedDAG(DAG, BaseSerialization):
 
             # Edge info in the JSON exactly matches our internal structure
             serialized_dag["edge_info"] = dag.edge_info
+            # Building the index is only worth it when a task reads it, through its weight rule
+            if PriorityWeightIndex.is_used(dag):
+                serialized_dag["priority_weight_index"] = dag.get_priority_weight_index().serialize()
             serialized_dag["params"] = cls._serialize_params_dict(dag.params)
 
             # has_on_*_callback are only stored if the value is True, as the default is False
@@ -1528,24 +1631,36 @@ class SerializedDAG(DAG, BaseSerialization):
             raise SerializationError(f"Failed to serialize DAG {dag.dag_id!r}: {e}")
 
     @classmethod
-    def deserialize_dag(cls, encoded_dag: dict[str, Any]) -> SerializedDAG:
-        """Deserializes a DAG from a JSON object."""
+    def deserialize_dag(cls, encoded_dag: dict[str, Any], lazy: bool = False) -> SerializedDAG:
+        """
+        Deserializes a DAG from a JSON object.
+
+        :param encoded_dag: the serialized DAG
+        :param lazy: only deserialize each task the first time it is accessed. The DAG-level attributes,
+            the task groups and the dependencies between tasks are still deserialized up front. The
+            tasks of the encoded DAG can then be :class:`LazyEncodedTasks`, to only decode them then too.
+        """
         dag = SerializedDAG(dag_id=encoded_dag["_dag_id"])
+        # The task group of each task loaded lazily, filled in when deserializing the task groups
+        lazy_task_groups: dict[str, TaskGroup] | None = {} if lazy else None
 
         for k, v in encoded_dag.items():
             if k == "_downstream_task_ids":
                 v = set(v)
             elif k == "tasks":
                 SerializedBaseOperator._load_operator_extra_links = cls._load_operator_extra_links
-                tasks = {}
-                for obj in v:
-                    if obj.get(Encoding.TYPE) == DAT.OP:
-                        deser = SerializedBaseOperator.deserialize_operator(obj[Encoding.VAR])
-                        tasks[deser.task_id] = deser
-                    else:  # todo: remove in Airflow 3.0 (backcompat for pre-2.10)
-                        tasks[obj["task_id"]] = SerializedBaseOperator.deserialize_operator(obj)
+                if lazy_task_groups is not None:
+                    v = cls._deserialize_tasks_lazily(v, dag, lazy_task_groups)
+                else:
+                    tasks = {}
+                    for obj in v:
+                        if obj.get(Encoding.TYPE) == DAT.OP:
+                            deser = SerializedBaseOperator.deserialize_operator(obj[Encoding.VAR])
+                            tasks[deser.task_id] = deser
+                        else:  # todo: remove in Airflow 3.0 (backcompat for pre-2.10)
+                            tasks[obj["task_id"]] = SerializedBaseOperator.deserialize_operator(obj)
+                    v = tasks
                 k = "task_dict"
-                v = tasks
             elif k == "timezone":
                 v = cls._deserialize_timezone(v)
             elif k == "dagrun_timeout":
@@ -1555,6 +1670,9 @@ class SerializedDAG(DAG, BaseSerialization):
             elif k == "edge_info":
                 # Value structure matches exactly
                 pass
+            elif k == "priority_weight_index":
+                v = PriorityWeightIndex.deserialize(v)
+                k = "_priority_weight_index"
             elif k == "timetable":
                 v = decode_timetable(v)
             elif k == "weight_rule":
@@ -1584,6 +1702,7 @@ class SerializedDAG(DAG, BaseSerialization):
                 None,
                 dag.task_dict,
                 dag,
+                lazy_task_groups=lazy_task_groups,
             )
         else:
             # This must be old data that had no task_group. Create a root TaskGroup and add
@@ -1602,11 +1721,70 @@ class SerializedDAG(DAG, BaseSerialization):
         for k in keys_to_set_none:
             setattr(dag, k, None)
 
-        for task in dag.task_dict.values():
-            SerializedBaseOperator.set_task_dag_references(task, dag)
+        if lazy_task_groups is None:
+            for task in dag.task_dict.values():
+                SerializedBaseOperator.set_task_dag_references(task, dag)
 
         return dag
 
+    @classmethod
+    def _deserialize_tasks_lazily(
+        cls,
+        encoded_tasks: list[dict[str, Any]] | LazyEncodedTasks,
+        dag: SerializedDAG,
+        task_groups: dict[str, TaskGroup],
+    ) -> dict[str, Operator]:
+        """
+        Prepare the task dict of a DAG whose tasks are only deserialized when first accessed.
+
+        The upstream task ids of the tasks are computed up front, so that loading a task does not
+        require loading its upstream tasks.
+        """
+        load_operator_extra_links = cls._load_operator_extra_links
+        encoded_ops: dict[str, dict[str, Any]]
+        upstream_task_ids: dict[str, set[str]] = collections.defaultdict(set)
+        if isinstance(encoded_tasks, LazyEncodedTasks):
+            encoded_ops = _LazyDict(encoded_tasks.task_ids, encoded_tasks.load)
+            for task_id, downstream_task_ids in encoded_tasks.downstream_task_ids.items():
+                for downstream_task_id in downstream_task_ids:
+                    upstream_task_ids[downstream_task_id].add(task_id)
+        else:
+            encoded_ops = {}
+            for obj in encoded_tasks:
+                encoded_op = cls._unwrap_encoded_task(obj)
+                encoded_ops[encoded_op["task_id"]] = obj
+                downstream_task_ids = encoded_op.get(
+                    "downstream_task_ids", encoded_op.get("_downstream_task_ids")
+                )
+                for downstream_task_id in downstream_task_ids or ():
+                    upstream_task_ids[downstream_task_id].add(encoded_op["task_id"])
+
+        def load_task(task_id: str) -> Operator:
+            SerializedBaseOperator._load_operator_extra_links = load_operator_extra_links
+            # The encoded task is only forgotten once deserialized, so that a failure is raised again
+            # rather than a KeyError the next time the task is accessed
+            task = SerializedBaseOperator.deserialize_operator(cls._unwrap_encoded_task(encoded_ops[task_id]))
+            task.upstream_task_ids.update(upstream_task_ids.get(task_id, ()))
+            if task_id in task_groups:
+                task.task_group = weakref.proxy(task_groups[task_id])
+            # Added before setting its DAG, which would otherwise add the task to the DAG again
+            tasks[task_id] = task
+            SerializedBaseOperator.set_task_dag_references(task, dag, update_downstream=False)
+            del encoded_ops[task_id]
+            upstream_task_ids.pop(task_id, None)
+            task_groups.pop(task_id, None)
+            return task
+
+        tasks = _LazyDict(list(encoded_ops), load_task)
+        return tasks
+
+    @staticmethod
+    def _unwrap_encoded_task(obj: dict[str, Any]) -> dict[str, Any]:
+        if obj.get(Encoding.TYPE) == DAT.OP:
+            return obj[Encoding.VAR]
+        # todo: remove in Airflow 3.0 (backcompat for pre-2.10)
+        return obj
+
     @classmethod
     def _is_excluded(cls, var: Any, attrname: str, op: DAGNode):
         # {} is explicitly different from None in the case of DAG-level access control
@@ -1625,12 +1803,17 @@ class SerializedDAG(DAG, BaseSerialization):
         return json_dict
 
     @classmethod
-    def from_dict(cls, serialized_obj: dict) -> SerializedDAG:
-        """Deserializes a python dict in to the DAG and operators it contains."""
+    def from_dict(cls, serialized_obj: dict, lazy: bool = False) -> SerializedDAG:
+        """
+        Deserializes a python dict in to the DAG and operators it contains.
+
+        :param serialized_obj: the serialized DAG
+        :param lazy: only deserialize each operator the first time it is accessed
+        """
         ver = serialized_obj.get("__version", "<not present>")
         if ver != cls.SERIALIZER_VERSION:
             raise ValueError(f"Unsure how to deserialize version {ver!r}")
-        return cls.deserialize_dag(serialized_obj["dag"])
+        return cls.deserialize_dag(serialized_obj["dag"], lazy=lazy)
 
 
 class TaskGroupSerialization(BaseSerialization):
@@ -1677,8 +1860,15 @@ class TaskGroupSerialization(BaseSerialization):
         parent_group: TaskGroup | None,
         task_dict: dict[str, Operator],
         dag: SerializedDAG,
+        *,
+        lazy_task_groups: dict[str, TaskGroup] | None = None,
     ) -> TaskGroup:
-        """Deserializes a TaskGroup from a JSON object."""
+        """
+        Deserializes a TaskGroup from a JSON object.
+
+        :param lazy_task_groups: when the tasks of the DAG are loaded lazily, the task group of each
+            task is recorded in it rather than loading the task to set its reference.
+        """
         group_id = cls.deserialize(encoded_group["_group_id"])
         kwargs = {
             key: cls.deserialize(encoded_group[key])
@@ -1701,14 +1891,30 @@ class TaskGroupSerialization(BaseSerialization):
             task.task_group = weakref.proxy(group)
             return task
 
-        group.children = {
-            label: (
-                set_ref(task_dict[val])
-                if _type == DAT.OP
-                else cls.deserialize_task_group(val, group, task_dict, dag=dag)
-            )
-            for label, (_type, val) in encoded_group["children"].items()
-        }
+        if lazy_task_groups is None:
+            group.children = {
+                label: (
+                    set_ref(task_dict[val])
+                    if _type == DAT.OP
+                    else cls.deserialize_task_group(val, group, task_dict, dag=dag)
+                )
+                for label, (_type, val) in encoded_group["children"].items()
+            }
+        else:
+            child_task_ids = {
+                label: val for label, (_type, val) in encoded_group["children"].items() if _type == DAT.OP
+            }
+            children = _LazyDict(encoded_group["children"], lambda label: task_dict[child_task_ids[label]])
+            for label, (_type, val) in encoded_group["children"].items():
+                if _type != DAT.OP:
+                    children[label] = cls.deserialize_task_group(
+                        val, group, task_dict, dag=dag, lazy_task_groups=lazy_task_groups
+                    )
+                elif isinstance(task_dict, _LazyDict) and not task_dict.is_loaded(val):
+                    lazy_task_groups[val] = group
+                else:
+                    set_ref(task_dict[val])
+            group.children = children
         group.upstream_group_ids.update(cls.deserialize(encoded_group["upstream_group_ids"]))
         group.downstream_group_ids.update(cls.deserialize(encoded_group["downstream_group_ids"]))
         group.upstream_task_ids.update(cls.deserialize(encoded_group["upstream_task_ids"]))
@@ -627,6 +627,17 @@ MIN_SERIALIZED_DAG_UPDATE_INTERVAL = conf.getint("core", "min_serialized_dag_upd
 # If set to True, serialized DAGs is compressed before writing to DB,
 COMPRESS_SERIALIZED_DAGS = conf.getboolean("core", "compress_serialized_dags", fallback=False)
 
+# Format in which serialized DAGs are written to the DB, and their compression when compressed.
+SERIALIZED_DAG_FORMAT = conf.get("core", "serialized_dag_format", fallback="json")
+SERIALIZED_DAG_COMPRESSION = conf.get("core", "serialized_dag_compression", fallback="zlib")
+
+# If set to True, the tasks of serialized DAGs are stored separately, so that only the tasks
+# which changed are written to the DB when a DAG changes.
+CHUNK_SERIALIZED_DAGS = conf.getboolean("core", "chunk_serialized_dags", fallback=False)
+
+# If set to True, the tasks of DAGs loaded from the DB are only deserialized when they are accessed.
+LAZY_DESERIALIZE_DAG_TASKS = conf.getboolean("core", "lazy_deserialize_dag_tasks", fallback=False)
+
 # Fetching serialized DAG can not be faster than a minimum interval to reduce database
 # read rate. This config controls when your DAGs are updated in the Webserver
 MIN_SERIALIZED_DAG_FETCH_INTERVAL = conf.getint("core", "min_serialized_dag_fetch_interval", fallback=10)
@@ -639,6 +650,12 @@ EXECUTE_TASKS_NEW_PYTHON_INTERPRETER = not CAN_FORK or conf.getboolean(
     fallback=False,
 )
 
+EXECUTE_TASKS_IN_ZYGOTE = (
+    CAN_FORK
+    and not EXECUTE_TASKS_NEW_PYTHON_INTERPRETER
+    and conf.getboolean("core", "execute_tasks_in_zygote", fallback=False)
+)
+
 ALLOW_FUTURE_EXEC_DATES = conf.getboolean("scheduler", "allow_trigger_in_future", fallback=False)
 
 # Whether or not to check each dagrun against defined SLAs
@@ -19,12 +19,16 @@
 
 from __future__ import annotations
 
+import sys
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import TYPE_CHECKING, Any
 
-from airflow.exceptions import AirflowException
+from airflow.exceptions import AirflowDagCycleException, AirflowException
 
 if TYPE_CHECKING:
+    from airflow.models.dag import DAG
+    from airflow.models.operator import Operator
     from airflow.models.taskinstance import TaskInstance
 
 
@@ -86,13 +90,7 @@ class _DownstreamPriorityWeightStrategy(PriorityWeightStrategy):
     def get_weight(self, ti: TaskInstance) -> int:
         if TYPE_CHECKING:
             assert ti.task
-        dag = ti.task.get_dag()
-        if dag is None:
-            return ti.task.priority_weight
-        return ti.task.priority_weight + sum(
-            dag.task_dict[task_id].priority_weight
-            for task_id in ti.task.get_flat_relative_ids(upstream=False)
-        )
+        return _total_priority_weight(ti.task, upstream=False)
 
 
 class _UpstreamPriorityWeightStrategy(PriorityWeightStrategy):
@@ -101,12 +99,176 @@ class _UpstreamPriorityWeightStrategy(PriorityWeightStrategy):
     def get_weight(self, ti: TaskInstance):
         if TYPE_CHECKING:
             assert ti.task
-        dag = ti.task.get_dag()
-        if dag is None:
-            return ti.task.priority_weight
-        return ti.task.priority_weight + sum(
-            dag.task_dict[task_id].priority_weight for task_id in ti.task.get_flat_relative_ids(upstream=True)
+        return _total_priority_weight(ti.task, upstream=True)
+
+
+if sys.version_info >= (3, 10):
+
+    def _popcount(value: int) -> int:
+        return value.bit_count()
+
+else:
+
+    def _popcount(value: int) -> int:
+        return bin(value).count("1")
+
+
+class PriorityWeightIndex:
+    """
+    Upstream and downstream closures of the tasks of a DAG, and the sum of their priority weights.
+
+    Walking the upstream or downstream tasks of every task of a DAG is quadratic in the number of tasks
+    on deep DAGs, so the closures are computed once per DAG, as bitsets propagated in topological
+    order, and stored in the serialized DAG. Only the number of tasks and the sum of the priority
+    weights of each closure are kept, the task itself excluded. The sums are computed from one bitset
+    per bit of the priority weights, so their cost does not depend on the number of distinct weights.
+
+    :meta private:
+    """
+
+    def __init__(
+        self,
+        topological_order: list[str],
+        upstream_counts: list[int],
+        downstream_counts: list[int],
+        upstream_weights: list[int],
+        downstream_weights: list[int],
+    ) -> None:
+        self.topological_order = topological_order
+        self._position = {task_id: i for i, task_id in enumerate(topological_order)}
+        self._upstream_counts = upstream_counts
+        self._downstream_counts = downstream_counts
+        self._upstream_weights = upstream_weights
+        self._downstream_weights = downstream_weights
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._position
+
+    @staticmethod
+    def is_used(dag: DAG) -> bool:
+        """Whether the weight of a task of the DAG depends on its upstream or downstream tasks."""
+        return not all(
+            isinstance(task.weight_rule, _AbsolutePriorityWeightStrategy) for task in dag.task_dict.values()
+        )
+
+    @classmethod
+    def build(cls, dag: DAG) -> PriorityWeightIndex:
+        """Compute the closures of the tasks of a DAG."""
+        tasks = dag.task_dict
+        order = cls._topological_order(dag)
+        position = {task_id: i for i, task_id in enumerate(order)}
+        # The weights are summed as the minimum weight times the number of tasks, plus the weights
+        # above the minimum, bit by bit: bit_planes[b] is the bitset of the tasks whose weight above
+        # the minimum has the bit b set
+        task_weights = [tasks[task_id].priority_weight for task_id in order]
+        min_weight = min(task_weights, default=0)
+        bit_planes = [0] * max((weight - min_weight).bit_length() for weight in task_weights or [0])
+        for i, weight in enumerate(task_weights):
+            weight -= min_weight
+            while weight:
+                bit = weight.bit_length() - 1
+                bit_planes[bit] |= 1 << i
+                weight ^= 1 << bit
+
+        def closures(relative_ids: list[set[str]], positions: range) -> tuple[list[int], list[int]]:
+            # Tasks are visited after their relatives, so the closure of a task is the union of the
+            # closures of its direct relatives and of the relatives themselves
+            bitsets = [0] * len(order)
+            counts = [0] * len(order)
+            weights = [0] * len(order)
+            for i in positions:
+                bitset = 0
+                for relative_id in relative_ids[i]:
+                    j = position[relative_id]
+                    bitset |= bitsets[j] | (1 << j)
+                bitsets[i] = bitset
+                counts[i] = _popcount(bitset)
+                weights[i] = min_weight * counts[i] + sum(
+                    _popcount(bitset & plane) << bit for bit, plane in enumerate(bit_planes)
+                )
+            return counts, weights
+
+        upstream_ids = [tasks[task_id].upstream_task_ids & position.keys() for task_id in order]
+        downstream_ids = [tasks[task_id].downstream_task_ids & position.keys() for task_id in order]
+        upstream_counts, upstream_weights = closures(upstream_ids, range(len(order)))
+        downstream_counts, downstream_weights = closures(downstream_ids, range(len(order) - 1, -1, -1))
+        return cls(order, upstream_counts, downstream_counts, upstream_weights, downstream_weights)
+
+    @staticmethod
+    def _topological_order(dag: DAG) -> list[str]:
+        tasks = dag.task_dict
+        # Counted from the downstream edges, the ones followed below, in case a task removed from the
+        # DAG left the upstream and downstream edges out of sync
+        num_upstreams = dict.fromkeys(tasks, 0)
+        for task in tasks.values():
+            for downstream_id in task.downstream_task_ids:
+                if downstream_id in num_upstreams:
+                    num_upstreams[downstream_id] += 1
+        ready = deque(task_id for task_id, count in num_upstreams.items() if not count)
+        order = []
+        while ready:
+            task_id = ready.popleft()
+            order.append(task_id)
+            for downstream_id in tasks[task_id].downstream_task_ids:
+                if downstream_id not in num_upstreams:
+                    continue
+                num_upstreams[downstream_id] -= 1
+                if not num_upstreams[downstream_id]:
+                    ready.append(downstream_id)
+        if len(order) != len(tasks):
+            raise AirflowDagCycleException(f"A cyclic dependency occurred in dag: {dag.dag_id}")
+        return order
+
+    def upstream_count(self, task_id: str) -> int:
+        """Return the number of upstream tasks of a task, transitively."""
+        return self._upstream_counts[self._position[task_id]]
+
+    def downstream_count(self, task_id: str) -> int:
+        """Return the number of downstream tasks of a task, transitively."""
+        return self._downstream_counts[self._position[task_id]]
+
+    def upstream_weight(self, task_id: str) -> int:
+        """Return the sum of the priority weights of the upstream tasks of a task, transitively."""
+        return self._upstream_weights[self._position[task_id]]
+
+    def downstream_weight(self, task_id: str) -> int:
+        """Return the sum of the priority weights of the downstream tasks of a task, transitively."""
+        return self._downstream_weights[self._position[task_id]]
+
+    def serialize(self) -> dict[str, list]:
+        return {
+            "topological_order": self.topological_order,
+            "upstream_counts": self._upstream_counts,
+            "downstream_counts": self._downstream_counts,
+            "upstream_weights": self._upstream_weights,
+            "downstream_weights": self._downstream_weights,
+        }
+
+    @classmethod
+    def deserialize(cls, data: dict[str, list]) -> PriorityWeightIndex:
+        return cls(
+            data["topological_order"],
+            data["upstream_counts"],
+            data["downstream_counts"],
+            data["upstream_weights"],
+            data["downstream_weights"],
+        )
+
+
+def _total_priority_weight(task: Operator, *, upstream: bool) -> int:
+    """Return the priority weight of a task plus the weights of its upstream or downstream tasks."""
+    dag = task.get_dag()
+    if dag is None:
+        return task.priority_weight
+    index = dag.get_priority_weight_index()
+    if task.task_id not in index:
+        return task.priority_weight + sum(
+            dag.task_dict[task_id].priority_weight
+            for task_id in task.get_flat_relative_ids(upstream=upstream)
         )
+    if upstream:
+        return task.priority_weight + index.upstream_weight(task.task_id)
+    return task.priority_weight + index.downstream_weight(task.task_id)
 
 
 airflow_priority_weight_strategies: dict[str, type[PriorityWeightStrategy]] = {
@@ -30,6 +30,7 @@ from setproctitle import setproctitle
 
 from airflow.api_internal.internal_api_call import InternalApiConfig
 from airflow.models.taskinstance import TaskReturnCode
+from airflow.serialization.serialized_objects import SerializedDAG
 from airflow.settings import CAN_FORK
 from airflow.stats import Stats
 from airflow.task.task_runner.base_task_runner import BaseTaskRunner
@@ -49,6 +50,10 @@ class StandardTaskRunner(BaseTaskRunner):
         if TYPE_CHECKING:
             assert self._task_instance.task
         self.dag = self._task_instance.task.dag
+        if isinstance(self.dag, SerializedDAG):
+            # The supervisor loaded the serialized DAG, the forked process must parse the DAG file to get
+            # the operators to execute
+            self.dag = None
 
     def start(self):
         if CAN_FORK and not self.run_as_user:
@@ -17,9 +17,11 @@
 # under the License.
 from __future__ import annotations
 
+from collections import defaultdict
 from typing import TYPE_CHECKING
 
 import attr
+from sqlalchemy import func, select
 
 from airflow.exceptions import TaskNotFound
 from airflow.utils.state import State
@@ -27,6 +29,7 @@ from airflow.utils.state import State
 if TYPE_CHECKING:
     from sqlalchemy.orm.session import Session
 
+    from airflow.models.dag import DAG
     from airflow.models.dagrun import DagRun
     from airflow.models.taskinstance import TaskInstance
 
@@ -84,6 +87,12 @@ class DepContext:
     have_changed_ti_states: bool = False
     """Have any of the TIs state's been changed as a result of evaluating dependencies"""
 
+    _finished_tis_by_task: dict[str, list[TaskInstance]] | None = attr.ib(default=None, init=False)
+    _grouped_finished_tis: list[TaskInstance] | None = attr.ib(default=None, init=False)
+    _ti_counts_by_task: dict[str, int] | None = attr.ib(default=None, init=False)
+    _counted_run: tuple[str, str] | None = attr.ib(default=None, init=False)
+    _dags_with_setups: dict[str, bool] = attr.ib(factory=dict, init=False)
+
     def ensure_finished_tis(self, dag_run: DagRun, session: Session) -> list[TaskInstance]:
         """
         Ensure finished_tis is populated if it's currently None, which allows running tasks without dag_run.
@@ -104,3 +113,63 @@ class DepContext:
         else:
             finished_tis = self.finished_tis
         return finished_tis
+
+    def ensure_finished_tis_by_task(self, dag_run: DagRun, session: Session) -> dict[str, list[TaskInstance]]:
+        """
+        Group the finished task instances of the run by task id.
+
+        This allows dependencies that look at the upstream task instances of a task (e.g. trigger
+        rules) to only go through those, instead of through every finished task instance of the run.
+
+        :param dag_run: The DagRun for which to find finished tasks
+        :return: A mapping from task id to its finished task instances
+        """
+        finished_tis = self.ensure_finished_tis(dag_run, session)
+        if self._finished_tis_by_task is None or self._grouped_finished_tis is not finished_tis:
+            finished_tis_by_task: dict[str, list[TaskInstance]] = defaultdict(list)
+            for ti in finished_tis:
+                finished_tis_by_task[ti.task_id].append(ti)
+            self._finished_tis_by_task = finished_tis_by_task
+            self._grouped_finished_tis = finished_tis
+        return self._finished_tis_by_task
+
+    def ensure_ti_counts_by_task(self, dag_run: DagRun, session: Session) -> dict[str, int]:
+        """
+        Count the task instances of the run (in any state), per task id, in a single grouped query.
+
+        The result is cached until :meth:`reset_ti_counts_by_task` is called, which must happen whenever
+        task instances are added to or removed from the run, e.g. after expanding a mapped task.
+
+        :param dag_run: The DagRun for which to count task instances
+        :return: A mapping from task id to the number of its task instances
+        """
+        if self._ti_counts_by_task is None or self._counted_run != (dag_run.dag_id, dag_run.run_id):
+            from airflow.models.taskinstance import TaskInstance
+
+            self._ti_counts_by_task = dict(
+                session.execute(
+                    select(TaskInstance.task_id, func.count(TaskInstance.task_id))
+                    .where(TaskInstance.dag_id == dag_run.dag_id, TaskInstance.run_id == dag_run.run_id)
+                    .group_by(TaskInstance.task_id)
+                ).all()
+            )
+            self._counted_run = (dag_run.dag_id, dag_run.run_id)
+        return self._ti_counts_by_task
+
+    def reset_ti_counts_by_task(self) -> None:
+        """Forget the task instance counts cached by :meth:`ensure_ti_counts_by_task`."""
+        self._ti_counts_by_task = None
+
+    def dag_has_setup_tasks(self, dag: DAG) -> bool:
+        """
+        Whether the DAG has any setup task, computed once per DAG.
+
+        Looking for the upstream setups of a task walks all its upstream relatives, which
+        is not needed at all for the (many) DAGs that do not use setups.
+
+        :param dag: The DAG to look for setup tasks in
+        """
+        has_setups = self._dags_with_setups.get(dag.dag_id)
+        if has_setups is None:
+            has_setups = self._dags_with_setups[dag.dag_id] = any(task.is_setup for task in dag.tasks)
+        return has_setups
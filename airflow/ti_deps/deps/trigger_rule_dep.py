@@ -34,6 +34,7 @@ if TYPE_CHECKING:
     from sqlalchemy.sql.expression import ColumnOperators
 
     from airflow import DAG
+    from airflow.models.operator import Operator
     from airflow.models.taskinstance import TaskInstance
     from airflow.ti_deps.dep_context import DepContext
     from airflow.ti_deps.deps.base_ti_dep import TIDepStatus
@@ -230,6 +231,40 @@ class TriggerRuleDep(BaseTIDep):
                 else:
                     yield and_(TaskInstance.task_id == upstream_id, TaskInstance.map_index == map_indexes)
 
+        def _calculate_upstream_states(relevant_tasks: dict[str, Operator]) -> _UpstreamTIStates:
+            """Calculate the states of the relevant finished upstream tis of the current ti.
+
+            Finished tis are grouped by task id once per dag run, so only the tis of the
+            upstream tasks are looked at rather than every finished ti of the dag run.
+            """
+            finished_tis_by_task = dep_context.ensure_finished_tis_by_task(ti.get_dagrun(session), session)
+            finished_upstream_tis = (
+                finished_ti
+                for upstream_id in relevant_tasks
+                for finished_ti in finished_tis_by_task.get(upstream_id, ())
+                if _is_relevant_upstream(upstream=finished_ti, relevant_ids=relevant_tasks.keys())
+            )
+            return _UpstreamTIStates.calculate(finished_upstream_tis)
+
+        def _count_upstream_tis(relevant_tasks: dict[str, Operator]) -> dict[str, int]:
+            """Count the relevant upstream tis of the current ti, per upstream task id."""
+            if TYPE_CHECKING:
+                assert ti.task
+
+            # Optimization: If the current task is not in a mapped task group, it depends
+            # on all tis of its upstreams, which are counted once per dag run.
+            if ti.task.get_closest_mapped_task_group() is None:
+                ti_counts = dep_context.ensure_ti_counts_by_task(ti.get_dagrun(session), session)
+                return {task_id: ti_counts[task_id] for task_id in relevant_tasks if task_id in ti_counts}
+            return dict(
+                session.execute(
+                    select(TaskInstance.task_id, func.count(TaskInstance.task_id))
+                    .where(TaskInstance.dag_id == ti.dag_id, TaskInstance.run_id == ti.run_id)
+                    .where(or_(*_iter_upstream_conditions(relevant_tasks=relevant_tasks)))
+                    .group_by(TaskInstance.task_id)
+                ).all()
+            )
+
         def _evaluate_setup_constraint(*, relevant_setups) -> Iterator[tuple[TIDepStatus, bool]]:
             """Evaluate whether ``ti``'s trigger rule was met.
 
@@ -243,12 +278,7 @@ class TriggerRuleDep(BaseTIDep):
             task = ti.task
 
             indirect_setups = {k: v for k, v in relevant_setups.items() if k not in task.upstream_task_ids}
-            finished_upstream_tis = (
-                x
-                for x in dep_context.ensure_finished_tis(ti.get_dagrun(session), session)
-                if _is_relevant_upstream(upstream=x, relevant_ids=indirect_setups.keys())
-            )
-            upstream_states = _UpstreamTIStates.calculate(finished_upstream_tis)
+            upstream_states = _calculate_upstream_states(indirect_setups)
 
             # all of these counts reflect indirect setups which are relevant for this ti
             success = upstream_states.success
@@ -262,13 +292,7 @@ class TriggerRuleDep(BaseTIDep):
             if not any(t.get_needs_expansion() for t in indirect_setups.values()):
                 upstream = len(indirect_setups)
             else:
-                task_id_counts = session.execute(
-                    select(TaskInstance.task_id, func.count(TaskInstance.task_id))
-                    .where(TaskInstance.dag_id == ti.dag_id, TaskInstance.run_id == ti.run_id)
-                    .where(or_(*_iter_upstream_conditions(relevant_tasks=indirect_setups)))
-                    .group_by(TaskInstance.task_id)
-                ).all()
-                upstream = sum(count for _, count in task_id_counts)
+                upstream = sum(_count_upstream_tis(indirect_setups).values())
 
             new_state = None
             changed = False
@@ -334,12 +358,7 @@ class TriggerRuleDep(BaseTIDep):
             upstream_tasks = {t.task_id: t for t in task.upstream_list}
             trigger_rule = task.trigger_rule
 
-            finished_upstream_tis = (
-                finished_ti
-                for finished_ti in dep_context.ensure_finished_tis(ti.get_dagrun(session), session)
-                if _is_relevant_upstream(upstream=finished_ti, relevant_ids=ti.task.upstream_task_ids)
-            )
-            upstream_states = _UpstreamTIStates.calculate(finished_upstream_tis)
+            upstream_states = _calculate_upstream_states(upstream_tasks)
 
             success = upstream_states.success
             skipped = upstream_states.skipped
@@ -356,14 +375,9 @@ class TriggerRuleDep(BaseTIDep):
                 upstream = len(upstream_tasks)
                 upstream_setup = sum(1 for x in upstream_tasks.values() if x.is_setup)
             else:
-                task_id_counts = session.execute(
-                    select(TaskInstance.task_id, func.count(TaskInstance.task_id))
-                    .where(TaskInstance.dag_id == ti.dag_id, TaskInstance.run_id == ti.run_id)
-                    .where(or_(*_iter_upstream_conditions(relevant_tasks=upstream_tasks)))
-                    .group_by(TaskInstance.task_id)
-                ).all()
-                upstream = sum(count for _, count in task_id_counts)
-                upstream_setup = sum(c for t, c in task_id_counts if upstream_tasks[t].is_setup)
+                task_id_counts = _count_upstream_tis(upstream_tasks)
+                upstream = sum(task_id_counts.values())
+                upstream_setup = sum(c for t, c in task_id_counts.items() if upstream_tasks[t].is_setup)
 
             upstream_done = done >= upstream
 
@@ -557,8 +571,9 @@ class TriggerRuleDep(BaseTIDep):
         if TYPE_CHECKING:
             assert ti.task
 
-        if not ti.task.is_teardown:
-            # a teardown cannot have any indirect setups
+        dag = ti.task.get_dag()
+        # a teardown cannot have any indirect setups
+        if not ti.task.is_teardown and dag and dep_context.dag_has_setup_tasks(dag):
             relevant_setups = {t.task_id: t for t in ti.task.get_upstreams_only_setups()}
             if relevant_setups:
                 for status, changed in _evaluate_setup_constraint(relevant_setups=relevant_setups):
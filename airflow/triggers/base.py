@@ -36,6 +36,11 @@ class BaseTrigger(abc.ABC, LoggingMixin):
     let them be re-instantiated elsewhere.
     """
 
+    #: Whether task instances deferred on identical triggers - with the same classpath and kwargs - share
+    #: a single running trigger, whose events resume all of them. Only set it on triggers which do not
+    #: depend on the task instance they run for.
+    shareable: bool = False
+
     def __init__(self, **kwargs):
         # these values are set by triggerer when preparing to run the instance
         # when run, they are injected into logger record.
@@ -34,8 +34,13 @@ class DateTimeTrigger(BaseTrigger):
     a few seconds.
 
     The provided datetime MUST be in UTC.
+
+    The triggerer does not run :meth:`run` for these triggers, unless a subclass overrides it, but
+    keeps their moment in a heap of timers and fires the ones whose moment passed in batches.
     """
 
+    shareable = True
+
     def __init__(self, moment: datetime.datetime):
         super().__init__()
         if not isinstance(moment, datetime.datetime):
@@ -228,13 +228,17 @@ def get_dag(subdir: str | None, dag_id: str, from_db: bool = False) -> DAG:
     dags folder.
     """
     from airflow.models import DagBag
+    from airflow.utils.types import NOTSET
 
     if from_db:
         dagbag = DagBag(read_dags_from_db=True)
         dag = dagbag.get_dag(dag_id)  # get_dag loads from the DB as requested
     else:
         first_path = process_subdir(subdir)
-        dagbag = DagBag(first_path)
+        # When given the DAG file, only import it, not the example DAGs as well
+        dagbag = DagBag(
+            first_path, include_examples=False if first_path and os.path.isfile(first_path) else NOTSET
+        )
         dag = dagbag.dags.get(dag_id)  # avoids db calls made in get_dag
     if not dag:
         if from_db:
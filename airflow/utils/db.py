@@ -118,7 +118,7 @@ _REVISION_HEADS_MAP = {
     "2.8.1": "88344c1d9134",
     "2.9.0": "1949afb29106",
     "2.9.2": "686269002441",
-    "2.10.0": "c4602ba06b4b",
+    "2.10.0": "8e1f3c5a9b62",
 }
 
 
@@ -24,7 +24,7 @@ import os
 import zipfile
 from io import TextIOWrapper
 from pathlib import Path
-from typing import Generator, NamedTuple, Pattern, Protocol, overload
+from typing import Generator, Iterable, NamedTuple, Pattern, Protocol, overload
 
 import re2
 from pathspec.patterns import GitWildMatchPattern
@@ -389,3 +389,155 @@ def get_unique_dag_module_name(file_path: str) -> str:
         org_mod_name = Path(file_path).stem
         return MODIFIED_DAG_MODULE_NAME.format(path_hash=path_hash, module_name=org_mod_name)
     raise ValueError("file_path should be a string to generate unique module name")
+
+
+# Calls and names which make the result of parsing a file depend on more than its source code:
+# the current time, environment variables, Airflow Variables or the content of other files.
+_DYNAMIC_CALL_NAMES = frozenset(
+    {
+        "days_ago",
+        "getenv",
+        "glob",
+        "iglob",
+        "iterdir",
+        "listdir",
+        "now",
+        "open",
+        "read_bytes",
+        "read_text",
+        "scandir",
+        "time",
+        "today",
+        "utcnow",
+        "walk",
+    }
+)
+_DYNAMIC_NAMES = frozenset({"environ", "Variable"})
+
+
+class _SourceInfo(NamedTuple):
+    """Content hash and inputs of a Python file, valid as long as its modification time and size match."""
+
+    mtime_ns: int
+    size: int
+    digest: str
+    has_dynamic_inputs: bool
+    local_imports: list[str]
+
+
+def _has_dynamic_inputs(module: ast.Module) -> bool:
+    for node in ast.walk(module):
+        if isinstance(node, ast.Call):
+            func = node.func
+            name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+            if name in _DYNAMIC_CALL_NAMES:
+                return True
+        elif isinstance(node, ast.Name) and node.id in _DYNAMIC_NAMES:
+            return True
+        elif isinstance(node, ast.Attribute) and node.attr in _DYNAMIC_NAMES:
+            return True
+    return False
+
+
+def _find_local_module_files(parts: list[str], search_paths: Iterable[str]) -> Generator[str, None, None]:
+    for search_path in search_paths:
+        # Importing a module also runs the __init__ of the packages containing it
+        for i in range(1, len(parts) + 1):
+            init_file = Path(search_path, *parts[:i], "__init__.py")
+            if init_file.is_file():
+                yield os.fspath(init_file)
+        module_file = Path(search_path, *parts[:-1], f"{parts[-1]}.py")
+        if module_file.is_file():
+            yield os.fspath(module_file)
+
+
+def _find_local_imports(module: ast.Module, file_path: str, search_paths: Iterable[str]) -> list[str]:
+    local_imports: list[str] = []
+    for node in ast.walk(module):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                local_imports.extend(_find_local_module_files(alias.name.split("."), search_paths))
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parents = Path(file_path).parents
+                if node.level > len(parents):
+                    continue
+                roots: Iterable[str] = [os.fspath(parents[node.level - 1])]
+            else:
+                roots = search_paths
+            parts = node.module.split(".") if node.module else []
+            if parts:
+                local_imports.extend(_find_local_module_files(parts, roots))
+            # The imported names may be modules of the package as well
+            for alias in node.names:
+                local_imports.extend(_find_local_module_files([*parts, alias.name], roots))
+    return local_imports
+
+
+def _get_source_info(
+    file_path: str, search_paths: Iterable[str], cache: dict[str, _SourceInfo]
+) -> _SourceInfo | None:
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    info = cache.get(file_path)
+    if info is not None and info.mtime_ns == stat.st_mtime_ns and info.size == stat.st_size:
+        return info
+
+    content = Path(file_path).read_bytes()
+    try:
+        parsed = ast.parse(content)
+    except (SyntaxError, ValueError):
+        # Parsing the file fails the same way until its content changes
+        has_dynamic_inputs, local_imports = False, []
+    else:
+        has_dynamic_inputs = _has_dynamic_inputs(parsed)
+        local_imports = _find_local_imports(parsed, file_path, search_paths)
+    info = _SourceInfo(
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        digest=hashlib.sha256(content).hexdigest(),
+        has_dynamic_inputs=has_dynamic_inputs,
+        local_imports=local_imports,
+    )
+    cache[file_path] = info
+    return info
+
+
+def get_dag_file_fingerprint(
+    file_path: str, search_paths: Iterable[str], cache: dict[str, _SourceInfo] | None = None
+) -> str | None:
+    """
+    Hash the content of a DAG file and of the local modules it imports, recursively.
+
+    Modules are local when they are found in one of the ``search_paths``, or next to the file for relative
+    imports. Installed packages are not hashed.
+
+    :param file_path: the path to the DAG file
+    :param search_paths: the directories to look for the imported modules in
+    :param cache: if passed, used to only read again the files whose modification time or size changed
+        since the last call with the same cache
+    :return: the fingerprint of the file, or None if parsing the file may give a different result even
+        when the fingerprint does not change: the file is a zip archive, is missing, or it or one of its
+        local modules reads the current time, environment variables, Airflow Variables or other files.
+    """
+    if zipfile.is_zipfile(file_path):
+        return None
+    if cache is None:
+        cache = {}
+    fingerprint = hashlib.sha256()
+    to_visit = [file_path]
+    visited = set()
+    while to_visit:
+        path = to_visit.pop()
+        if path in visited:
+            continue
+        visited.add(path)
+        info = _get_source_info(path, search_paths, cache)
+        if info is None or info.has_dynamic_inputs:
+            return None
+        fingerprint.update(path.encode("utf-8"))
+        fingerprint.update(info.digest.encode("utf-8"))
+        to_visit.extend(info.local_imports)
+    return fingerprint.hexdigest()
@@ -93,6 +93,10 @@ class XComEncoder(json.JSONEncoder):
             return super().default(o)
 
     def encode(self, o: Any) -> str:
+        return super().encode(self.prepare(o))
+
+    def prepare(self, o: Any) -> Any:
+        """Check the top-level object to serialize, and serialize it if it is a tuple."""
         # checked here and in serialize
         if isinstance(o, dict) and (CLASSNAME in o or SCHEMA_ID in o):
             raise AttributeError(f"reserved key {CLASSNAME} found in dict to serialize")
@@ -101,7 +105,7 @@ class XComEncoder(json.JSONEncoder):
         if isinstance(o, tuple):
             o = self.default(o)
 
-        return super().encode(o)
+        return o
 
 
 class XComDecoder(json.JSONDecoder):
@@ -0,0 +1,134 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Helper processes serving the other processes of a host over a Unix socket."""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+from airflow.exceptions import AirflowException
+
+log = logging.getLogger(__name__)
+
+# Seconds to wait for a service to be ready to serve
+STARTUP_TIMEOUT = 120.0
+
+
+class SocketService:
+    """
+    Handle on a helper process serving requests over a Unix socket, to start and stop it, and to connect to it.
+
+    The process is started by running ``python -m <module> <socket path> [args]``. The module must bind
+    the socket to ``<socket path>.tmp`` with :func:`listen`, which renames it to its path once it is
+    ready to serve.
+
+    The handle can be passed to other processes, forked or not, to connect to the same service. Only
+    the process which started the service can stop it.
+
+    :param socket_path: The path of the Unix socket the service listens on
+    """
+
+    # Module run by the service process
+    module: str
+    # Name of the service in the logs
+    description: str
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._process: subprocess.Popen | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"socket_path": self.socket_path, "_process": None}
+
+    @classmethod
+    def start(cls, *args: str, timeout: float = STARTUP_TIMEOUT):
+        """
+        Start a service process, and wait until it is ready to serve.
+
+        :param args: The arguments passed to the module after the socket path
+        :param timeout: Seconds to wait for the service to be ready
+        """
+        socket_dir = tempfile.mkdtemp(prefix=f"airflow-{cls.module.rpartition('.')[2]}-")
+        service = cls(os.path.join(socket_dir, "service.sock"))
+        service._process = subprocess.Popen(
+            [sys.executable, "-m", cls.module, service.socket_path, *args], close_fds=True
+        )
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(service.socket_path):
+            if service._process.poll() is not None:
+                service._cleanup()
+                raise AirflowException(
+                    f"The {cls.description} exited with return code {service._process.returncode}"
+                )
+            if time.monotonic() > deadline:
+                service.stop()
+                raise AirflowException(f"The {cls.description} was not ready after {timeout} seconds")
+            time.sleep(0.01)
+        log.info("Started %s %d listening on %s", cls.description, service._process.pid, service.socket_path)
+        return service
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the service process, if it was started by this process."""
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        self._process = None
+        self._cleanup()
+
+    def _cleanup(self) -> None:
+        shutil.rmtree(os.path.dirname(self.socket_path), ignore_errors=True)
+
+    def connect(self, timeout: float | None = None) -> socket.socket | None:
+        """
+        Connect to the service.
+
+        :param timeout: Timeout of the operations on the socket, blocking without timeout if None
+        :return: The connected socket, or None if the service is not reachable
+        """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            log.warning("The %s is not reachable on %s", self.description, self.socket_path, exc_info=True)
+            sock.close()
+            return None
+        return sock
+
+
+def listen(socket_path: str) -> socket.socket:
+    """Listen on the socket path, which is created once the socket listens, for the handle to wait on."""
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(f"{socket_path}.tmp")
+    listener.listen(128)
+    os.rename(f"{socket_path}.tmp", socket_path)
+    return listener
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import gc
+import os
+import statistics
+import time
+import tracemalloc
+from unittest import mock
+
+import rich_click as click
+
+DAG_ID = "perf_mapped_task_expansion"
+
+
+def build_dag():
+    """Build a DAG of a task whose output is mapped over by a downstream task."""
+    from airflow.models.dag import DAG
+    from airflow.operators.bash import BashOperator
+    from airflow.utils import timezone
+
+    with DAG(DAG_ID, schedule=None, start_date=timezone.datetime(2024, 1, 1)) as dag:
+        upstream = BashOperator(task_id="upstream", bash_command="echo")
+        BashOperator.partial(task_id="mapped").expand(bash_command=upstream.output)
+    return dag
+
+
+def expand(dag, length: int, bulk: bool, trace_memory: bool) -> tuple[float, int]:
+    """
+    Expand the mapped task of a new DAG run to ``length`` task instances.
+
+    The changes are rolled back, so that the database is left as it was. The ORM path is forced by
+    a mutation hook that does nothing.
+
+    :return: the expansion time, and the peak memory allocated during the expansion if traced
+    """
+    from airflow.models.taskmap import TaskMap
+    from airflow.settings import Session
+    from airflow.utils import timezone
+    from airflow.utils.state import DagRunState
+    from airflow.utils.types import DagRunType
+
+    session = Session()
+    try:
+        now = timezone.utcnow()
+        dag_run = dag.create_dagrun(
+            run_type=DagRunType.MANUAL,
+            execution_date=now,
+            data_interval=(now, now),
+            state=DagRunState.RUNNING,
+            session=session,
+        )
+        session.add(
+            TaskMap(
+                dag_id=DAG_ID,
+                task_id="upstream",
+                run_id=dag_run.run_id,
+                map_index=-1,
+                length=length,
+                keys=None,
+            )
+        )
+        session.flush()
+
+        def hook(ti):
+            pass
+
+        hook.is_noop = bulk
+        with mock.patch("airflow.settings.task_instance_mutation_hook", hook):
+            gc.collect()
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            expanded_tis, _ = dag.get_task("mapped").expand_mapped_task(dag_run.run_id, session=session)
+            session.flush()
+            duration = time.perf_counter() - start
+            peak = 0
+            if trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        if len(expanded_tis) != length:
+            raise click.ClickException(f"Expanded {len(expanded_tis)} task instances instead of {length}")
+        return duration, peak
+    finally:
+        session.rollback()
+        session.close()
+
+
+@click.command()
+@click.option(
+    "--lengths", default="10000,50000,100000", help="comma separated numbers of task instances to expand"
+)
+@click.option("--orm/--no-orm", default=True, help="also time the expansion through ORM objects")
+@click.option("--trace-memory", is_flag=True, help="trace the peak memory allocated, which slows down")
+@click.option("--repeat", default=3, help="number of times to run test, to reduce variance")
+def main(lengths, orm, trace_memory, repeat):
+    """
+    Measure the time to expand a mapped task to many task instances, in bulk and through ORM objects.
+
+    This runs against the database configured in Airflow, which must be initialized.
+    """
+    os.environ["AIRFLOW__CORE__UNIT_TEST_MODE"] = "True"
+
+    dag = build_dag()
+    paths = {"bulk": True, "orm": False} if orm else {"bulk": True}
+    print(f"{'task instances':>16} {'path':>6} {'time':>10} {'peak memory':>14}")
+    for length in map(int, lengths.split(",")):
+        for path, bulk in paths.items():
+            results = [expand(dag, length, bulk, trace_memory) for _ in range(repeat)]
+            duration = statistics.mean(duration for duration, _ in results)
+            peak = max(peak for _, peak in results)
+            memory = f"{peak / 2**20:>12.1f}MB" if trace_memory else f"{'-':>14}"
+            print(f"{length:>16,} {path:>6} {duration:>9.4f}s {memory}")
+
+
+if __name__ == "__main__":
+    main()
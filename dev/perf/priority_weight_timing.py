@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import gc
+import os
+import random
+import statistics
+import time
+
+import rich_click as click
+
+DAG_ID = "perf_priority_weight"
+
+
+def build_dag(num_tasks: int, shape: str, weights: str):
+    """
+    Build a synthetic DAG with ``num_tasks`` tasks.
+
+    A ``chain`` DAG is a single line of tasks. A ``diamond`` DAG is a line of diamonds, each of a task
+    fanning out to 10 parallel tasks that fan in to the first task of the next diamond.
+
+    The priority weights are random between 1 and 5 with ``random``, all different with ``distinct``,
+    and all 1 with ``equal``.
+    """
+    from airflow.models.dag import DAG
+    from airflow.operators.empty import EmptyOperator
+    from airflow.utils import timezone
+
+    rng = random.Random(42)
+    dag = DAG(DAG_ID, schedule=None, start_date=timezone.datetime(2024, 1, 1))
+    if weights == "distinct":
+        priority_weights = rng.sample(range(1, 10 * num_tasks), num_tasks)
+    elif weights == "equal":
+        priority_weights = [1] * num_tasks
+    else:
+        priority_weights = [rng.randint(1, 5) for _ in range(num_tasks)]
+    tasks = [
+        EmptyOperator(task_id=f"task_{i}", priority_weight=weight, dag=dag)
+        for i, weight in enumerate(priority_weights)
+    ]
+    if shape == "chain":
+        for upstream, downstream in zip(tasks, tasks[1:]):
+            upstream.set_downstream(downstream)
+    else:
+        width = 10
+        for head in range(0, num_tasks, width + 1):
+            middle = tasks[head + 1 : head + 1 + width]
+            tasks[head].set_downstream(middle)
+            tail = head + 1 + width
+            if tail < num_tasks:
+                for task in middle:
+                    task.set_downstream(tasks[tail])
+    return dag
+
+
+def legacy_weight(dag, task) -> int:
+    """Return the downstream priority weight of a task by walking its downstream tasks."""
+    return task.priority_weight + sum(
+        dag.task_dict[task_id].priority_weight for task_id in task.get_flat_relative_ids(upstream=False)
+    )
+
+
+def timed(func, repeat: int) -> tuple[float, object]:
+    times = []
+    for _ in range(repeat):
+        gc.disable()
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+        gc.enable()
+    return statistics.mean(times), result
+
+
+@click.command()
+@click.option("--num-tasks", default=20_000, help="number of tasks in the synthetic DAG")
+@click.option("--shape", type=click.Choice(["chain", "diamond"]), default="chain", help="shape of the DAG")
+@click.option(
+    "--weights",
+    type=click.Choice(["random", "distinct", "equal"]),
+    default="random",
+    help="priority weights of the tasks",
+)
+@click.option("--sample", default=100, help="number of tasks whose weight is computed by the legacy walk")
+@click.option("--repeat", default=3, help="number of times to run test, to reduce variance")
+def main(num_tasks, shape, weights, sample, repeat):
+    """
+    Measure the time to compute the downstream priority weights of all the tasks of a DAG.
+
+    The legacy walk of the downstream tasks is timed on the first ``sample`` tasks, the ones with the
+    most downstream tasks, and extrapolated to the whole DAG as an upper bound. The priority weight
+    index is timed when built, when serialized and deserialized with the DAG, and when read for all
+    the tasks.
+    """
+    os.environ["AIRFLOW__CORE__UNIT_TEST_MODE"] = "True"
+
+    from airflow.serialization.serialized_objects import SerializedDAG
+    from airflow.task.priority_strategy import PriorityWeightIndex
+
+    dag = build_dag(num_tasks, shape, weights)
+    tasks = dag.tasks
+
+    legacy_time, legacy_weights = timed(lambda: [legacy_weight(dag, task) for task in tasks[:sample]], 1)
+    build_time, index = timed(lambda: PriorityWeightIndex.build(dag), repeat)
+    dag._priority_weight_index = index
+    read_time, index_weights = timed(lambda: [task.priority_weight_total for task in tasks], repeat)
+    if index_weights[:sample] != legacy_weights:
+        raise click.ClickException("The weights read from the index differ from the legacy weights")
+
+    serialize_time, serialized = timed(lambda: SerializedDAG.to_dict(dag), repeat)
+    deserialize_time, deserialized = timed(lambda: SerializedDAG.from_dict(serialized), repeat)
+    if deserialized._priority_weight_index is None:
+        raise click.ClickException("The priority weight index is not stored in the serialized DAG")
+
+    print(f"{num_tasks} tasks {shape} DAG, {weights} weights:")
+    print(f"{'legacy walk (upper bound)':>32} {legacy_time * len(tasks) / sample:>9.4f}s")
+    print(f"{'index build':>32} {build_time:>9.4f}s")
+    print(f"{'index read, all tasks':>32} {read_time:>9.4f}s")
+    print(f"{'DAG serialization':>32} {serialize_time:>9.4f}s")
+    print(f"{'DAG deserialization':>32} {deserialize_time:>9.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import gc
+import os
+import statistics
+import time
+
+import rich_click as click
+
+DAG_ID = "perf_serialization_codecs"
+
+
+def build_dag(num_tasks: int):
+    """Build a synthetic DAG with ``num_tasks`` tasks, split in chained layers of 100 tasks."""
+    from airflow.models.dag import DAG
+    from airflow.operators.bash import BashOperator
+    from airflow.utils import timezone
+
+    dag = DAG(DAG_ID, schedule=None, start_date=timezone.datetime(2024, 1, 1))
+    tasks = [
+        BashOperator(task_id=f"task_{i}", bash_command=f"echo {i}", retries=i % 3, dag=dag)
+        for i in range(num_tasks)
+    ]
+    for i in range(100, num_tasks):
+        tasks[i].set_upstream(tasks[i - 100])
+    return dag
+
+
+def example_dags():
+    """Return the example DAGs shipped with Airflow."""
+    from airflow.models.dagbag import DagBag
+
+    dagbag = DagBag(include_examples=True, read_dags_from_db=False, dag_folder=os.devnull)
+    return list(dagbag.dags.values())
+
+
+def time_codec(serialized_dags: list[dict], format: str, compression: str, repeat: int):
+    """Return the mean encode and decode times of the DAGs, and the size of the encoded DAGs."""
+    from airflow.serialization import codec
+
+    encode_times, decode_times = [], []
+    for _ in range(repeat):
+        gc.disable()
+        start = time.perf_counter()
+        encoded = [codec.encode(data, format, compression) for data in serialized_dags]
+        encode_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for data in encoded:
+            codec.decode(data)
+        decode_times.append(time.perf_counter() - start)
+        gc.enable()
+    return statistics.mean(encode_times), statistics.mean(decode_times), sum(len(data) for data in encoded)
+
+
+def available_codecs():
+    from airflow.serialization import codec
+
+    missing = set()
+    if codec.orjson is None:
+        missing.add("orjson")
+    if codec.msgpack is None:
+        missing.add("msgpack")
+    if codec.zstandard is None:
+        missing.add("zstd")
+    for format in codec.FORMATS:
+        for compression in codec.COMPRESSIONS:
+            if format in missing or compression in missing:
+                print(f"Skipping {format}/{compression}, its package is not installed")
+                continue
+            yield format, compression
+
+
+@click.command()
+@click.option("--num-tasks", default=10_000, help="number of tasks in the synthetic DAG")
+@click.option("--repeat", default=3, help="number of times to run test, to reduce variance")
+def main(num_tasks, repeat):
+    """
+    Measure the encode and decode time, and the size, of serialized DAGs with each codec.
+
+    The serialized DAGs are those of the example DAGs, and of a synthetic DAG of ``num_tasks``
+    BashOperators. Codecs whose package is not installed are skipped.
+    """
+    os.environ["AIRFLOW__CORE__UNIT_TEST_MODE"] = "True"
+
+    from airflow.serialization.serialized_objects import SerializedDAG
+
+    inputs = {
+        "example DAGs": [SerializedDAG.to_dict(dag) for dag in example_dags()],
+        f"{num_tasks} tasks DAG": [SerializedDAG.to_dict(build_dag(num_tasks))],
+    }
+    codecs = list(available_codecs())
+    for name, serialized_dags in inputs.items():
+        print()
+        print(f"{name}:")
+        print(f"{'codec':>16} {'encode':>10} {'decode':>10} {'size':>12}")
+        for format, compression in codecs:
+            encode_time, decode_time, size = time_codec(serialized_dags, format, compression, repeat)
+            print(f"{format + '/' + compression:>16} {encode_time:>9.4f}s {decode_time:>9.4f}s {size:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import rich_click as click
+
+
+def timed(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.mean(times)
+
+
+@click.command()
+@click.option("--command", default="airflow version", help="the airflow command to run")
+@click.option("--repeat", default=10, help="number of times to run test, to reduce variance")
+def main(command, repeat):
+    """
+    Measure the time to start a process running an airflow command, with and without a task zygote.
+
+    A new Python interpreter, as used with ``execute_tasks_new_python_interpreter``, imports and
+    initializes everything for each command. A process forked by the zygote starts with all of it
+    loaded. The startup time of the zygote itself is paid once by the executor.
+    """
+    os.environ["AIRFLOW__CORE__UNIT_TEST_MODE"] = "True"
+
+    from airflow.executors.task_zygote import TaskZygote
+
+    argv = command.split()
+
+    def run_in_interpreter():
+        subprocess.run([sys.executable, "-m", "airflow", *argv[1:]], check=True, stdout=subprocess.DEVNULL)
+
+    zygotes = []
+    startup_time = timed(lambda: zygotes.append(TaskZygote.start()), 1)
+    zygote = zygotes[0]
+    try:
+
+        def run_in_zygote():
+            if zygote.run_command(argv) != 0:
+                raise click.ClickException(f"{command} failed in the task zygote")
+
+        run_in_zygote()
+        zygote_time = timed(run_in_zygote, repeat)
+    finally:
+        zygote.stop()
+    interpreter_time = timed(run_in_interpreter, repeat)
+
+    print(f"{command}:")
+    print(f"{'zygote startup, once':>32} {startup_time:>9.4f}s")
+    print(f"{'new interpreter, per command':>32} {interpreter_time:>9.4f}s")
+    print(f"{'forked by zygote, per command':>32} {zygote_time:>9.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import gc
+import os
+import statistics
+import time
+
+import rich_click as click
+
+DAG_ID = "perf_trigger_rule_dep"
+
+
+def build_dag(num_tasks: int, shape: str):
+    """
+    Build a synthetic DAG with ``num_tasks`` tasks.
+
+    * ``fan-in``: the first half of the tasks are upstreams of each of the first 100 tasks
+      of the second half (capped to keep the number of edges reasonable).
+    * ``layers``: tasks are split in layers of 100 tasks, each task depending on every
+      task of the previous layer.
+    """
+    from airflow.models.dag import DAG
+    from airflow.operators.empty import EmptyOperator
+    from airflow.utils import timezone
+
+    dag = DAG(DAG_ID, schedule=None, start_date=timezone.datetime(2024, 1, 1))
+    tasks = [EmptyOperator(task_id=f"task_{i}", dag=dag) for i in range(num_tasks)]
+    if shape == "fan-in":
+        upstreams, downstreams = tasks[: num_tasks // 2], tasks[num_tasks // 2 :]
+        for downstream in downstreams[:100]:
+            downstream.set_upstream(upstreams)
+    else:
+        layer_size = 100
+        layers = [tasks[i : i + layer_size] for i in range(0, num_tasks, layer_size)]
+        for previous_layer, layer in zip(layers, layers[1:]):
+            for task in layer:
+                task.set_upstream(previous_layer)
+    return dag
+
+
+def create_dag_run(dag, session):
+    """Create a running DagRun where the first half of the tasks have succeeded."""
+    from sqlalchemy import delete, update
+
+    from airflow.models.dagrun import DagRun
+    from airflow.models.taskinstance import TaskInstance
+    from airflow.utils import timezone
+    from airflow.utils.state import DagRunState, TaskInstanceState
+    from airflow.utils.types import DagRunType
+
+    session.execute(delete(TaskInstance).where(TaskInstance.dag_id == dag.dag_id))
+    session.execute(delete(DagRun).where(DagRun.dag_id == dag.dag_id))
+    execution_date = timezone.utcnow()
+    dag_run = dag.create_dagrun(
+        run_type=DagRunType.MANUAL,
+        execution_date=execution_date,
+        data_interval=(execution_date, execution_date),
+        state=DagRunState.RUNNING,
+        session=session,
+    )
+    half = [task.task_id for task in dag.tasks[: len(dag.tasks) // 2]]
+    session.execute(
+        update(TaskInstance)
+        .where(TaskInstance.dag_id == dag.dag_id, TaskInstance.task_id.in_(half))
+        .values(state=TaskInstanceState.SUCCESS)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    return dag_run
+
+
+@click.command()
+@click.option("--num-tasks", default=10_000, help="number of tasks in the synthetic DAG")
+@click.option("--shape", type=click.Choice(["fan-in", "layers"]), default="fan-in", help="DAG shape")
+@click.option("--repeat", default=3, help="number of times to run test, to reduce variance")
+def main(num_tasks, shape, repeat):
+    """
+    Measure how long the scheduler takes to make scheduling decisions for a wide DagRun.
+
+    This times ``DagRun.task_instance_scheduling_decisions``, which evaluates the trigger rule
+    of every schedulable task instance of the run, on a synthetic DAG where half of the tasks
+    have already succeeded. Changes to the decisions are rolled back after each repetition.
+    """
+    os.environ["AIRFLOW__CORE__UNIT_TEST_MODE"] = "True"
+
+    from airflow.utils.session import create_session
+
+    dag = build_dag(num_tasks, shape)
+    with create_session() as session:
+        dag.sync_to_db(session=session)
+        dag_run = create_dag_run(dag, session)
+
+        times = []
+        for count in range(repeat):
+            dag_run = session.merge(dag_run)
+            dag_run.dag = dag
+            gc.disable()
+            start = time.perf_counter()
+            decision = dag_run.task_instance_scheduling_decisions(session=session)
+            times.append(time.perf_counter() - start)
+            gc.enable()
+            print(
+                f"Run {count + 1} time: {times[-1]:.5f} "
+                f"({len(decision.schedulable_tis)} schedulable of {len(decision.tis)} tis)"
+            )
+            session.rollback()
+
+    print()
+    print(f"Scheduling decisions for a {shape} DAG with {num_tasks} tasks: ", end="")
+    if len(times) > 1:
+        print(f"{statistics.mean(times):.4f}s (±{statistics.stdev(times):.3f}s)")
+    else:
+        print(f"{times[0]:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -139,6 +139,12 @@ CORE_EXTRAS: dict[str, list[str]] = {
         # See https://github.com/getsentry/sentry-python/issues/2473
         "sentry-sdk>=1.32.0,!=1.33.0",
     ],
+    "serialization": [
+        # Faster formats and compression for serialized DAGs and XComs
+        "msgpack>=1.0.0",
+        "orjson>=3.9.0",
+        "zstandard>=0.22.0",
+    ],
     "statsd": [
         "statsd>=3.3.0",
     ],
@@ -44,6 +44,7 @@ from airflow.exceptions import AirflowException, DagRunNotFound
 from airflow.models import DagBag, DagRun, Pool, TaskInstance
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.operators.bash import BashOperator
+from airflow.serialization.serialized_objects import SerializedDAG
 from airflow.utils import timezone
 from airflow.utils.session import create_session
 from airflow.utils.state import State, TaskInstanceState
@@ -320,6 +321,40 @@ class TestCliTasks:
         )
         assert ("Filling up the DagBag from" in caplog.text) != from_db
 
+    @pytest.mark.parametrize("local", [True, False])
+    @conf_vars({("core", "task_supervisor_reads_serialized_dag"): "True"})
+    @mock.patch("airflow.cli.commands.task_command._run_task_by_selected_method")
+    def test_run_supervisor_reads_serialized_dag(self, mock_run_task, caplog, local):
+        """
+        Test that only the supervisor of a local run reads the serialized dag
+        """
+        task0_id = self.dag.task_ids[0]
+        args0 = ["tasks", "run", self.dag_id, task0_id, self.run_id] + (["--local"] if local else ["--raw"])
+        task_command.task_run(self.parser.parse_args(args0))
+        dag = mock_run_task.call_args.args[1]
+        assert isinstance(dag, SerializedDAG) == local
+        assert ("Filling up the DagBag from" in caplog.text) != local
+
+    @conf_vars({("core", "task_supervisor_reads_serialized_dag"): "True"})
+    @mock.patch("airflow.cli.commands.task_command._run_task_by_selected_method")
+    def test_run_supervisor_parses_dag_not_serialized(self, mock_run_task, caplog):
+        """
+        Test that the supervisor parses the dag file when the dag is not serialized
+        """
+        task0_id = self.dag.task_ids[0]
+        args0 = ["tasks", "run", "--ignore-all-dependencies", "--local", self.dag_id, task0_id, self.run_id]
+        with mock.patch(
+            "airflow.cli.commands.task_command.get_dag",
+            side_effect=[AirflowException("not found"), self.dag],
+        ) as mock_get_dag:
+            task_command.task_run(self.parser.parse_args(args0))
+        assert mock_get_dag.call_args_list == [
+            mock.call(mock.ANY, self.dag_id, from_db=True),
+            mock.call(mock.ANY, self.dag_id, False),
+        ]
+        assert "is not serialized yet" in caplog.text
+        assert mock_run_task.call_args.args[1] is self.dag
+
     @mock.patch("airflow.cli.commands.task_command.LocalTaskJobRunner")
     def test_run_raises_when_theres_no_dagrun(self, mock_local_job):
         """
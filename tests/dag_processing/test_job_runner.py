@@ -189,6 +189,99 @@ class TestDagProcessorJobRunner:
         child_pipe.close()
         parent_pipe.close()
 
+    @conf_vars({("core", "load_examples"): "False", ("scheduler", "parsing_worker_pool"): "True"})
+    def test_parse_file_with_worker_pool(self, tmp_path):
+        path_to_parse = tmp_path / "temp_dag.py"
+        path_to_parse.write_text("an invalid airflow DAG")
+
+        child_pipe, parent_pipe = multiprocessing.Pipe()
+
+        async_mode = "sqlite" not in conf.get("database", "sql_alchemy_conn")
+        manager = DagProcessorJobRunner(
+            job=Job(),
+            processor=DagFileProcessorManager(
+                dag_directory=path_to_parse.parent,
+                max_runs=1,
+                processor_timeout=timedelta(days=365),
+                signal_conn=child_pipe,
+                dag_ids=[],
+                pickle_dags=False,
+                async_mode=async_mode,
+            ),
+        )
+
+        with create_session() as session:
+            self.run_processor_manager_one_loop(manager, parent_pipe)
+
+            import_errors = session.query(ParseImportError).all()
+            assert len(import_errors) == 1
+            assert manager.processor.get_run_count(str(path_to_parse)) == 1
+            session.rollback()
+
+        # The worker stays around once the file is parsed, until the manager terminates
+        worker_pids = manager.processor._worker_pool.get_all_pids()
+        assert len(worker_pids) == 1
+        manager.processor.terminate()
+        assert manager.processor._worker_pool.get_all_pids() == []
+
+        child_pipe.close()
+        parent_pipe.close()
+
+    @conf_vars({("core", "load_examples"): "False", ("scheduler", "parsing_skip_unchanged_files"): "True"})
+    def test_unchanged_file_is_not_parsed_again(self, tmp_path):
+        path_to_parse = tmp_path / "temp_dag.py"
+        path_to_parse.write_text(
+            textwrap.dedent(
+                """\
+                from airflow.models.dag import DAG
+
+                dag = DAG("test_unchanged_file", schedule=None)
+                """
+            )
+        )
+        file_path = os.fspath(path_to_parse)
+
+        child_pipe, parent_pipe = multiprocessing.Pipe()
+        async_mode = "sqlite" not in conf.get("database", "sql_alchemy_conn")
+        manager = DagProcessorJobRunner(
+            job=Job(),
+            processor=DagFileProcessorManager(
+                dag_directory=tmp_path,
+                max_runs=1,
+                processor_timeout=timedelta(days=365),
+                signal_conn=child_pipe,
+                dag_ids=[],
+                pickle_dags=False,
+                async_mode=async_mode,
+            ),
+        )
+        self.run_processor_manager_one_loop(manager, parent_pipe)
+        processor = manager.processor
+        assert processor.get_run_count(file_path) == 1
+        assert file_path in processor._file_fingerprints
+
+        processor._max_runs = 3
+        later = timezone.utcnow() + timedelta(seconds=processor._file_process_interval + 1)
+        with time_machine.travel(later, tick=False), mock.patch(
+            "airflow.dag_processing.manager.Stats.incr"
+        ) as mock_incr:
+            processor.prepare_file_path_queue()
+        assert processor._file_path_queue == deque()
+        assert processor.get_run_count(file_path) == 2
+        assert processor.get_last_finish_time(file_path) == later
+        mock_incr.assert_any_call("dag_processing.unchanged_files_skipped", 1)
+        with create_session() as session:
+            assert session.get(DagModel, "test_unchanged_file").last_parsed_time == later
+
+        # The file is parsed again once it changes
+        path_to_parse.write_text(path_to_parse.read_text() + "# changed\n")
+        with time_machine.travel(later + timedelta(seconds=processor._file_process_interval + 1)):
+            processor.prepare_file_path_queue()
+        assert processor._file_path_queue == deque([file_path])
+
+        child_pipe.close()
+        parent_pipe.close()
+
     @conf_vars({("core", "load_examples"): "False"})
     def test_max_runs_when_no_files(self, tmp_path):
         child_pipe, parent_pipe = multiprocessing.Pipe()
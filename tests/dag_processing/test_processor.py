@@ -20,21 +20,28 @@ from __future__ import annotations
 import datetime
 import os
 import sys
+import time
 from unittest import mock
 from unittest.mock import MagicMock, patch
 from zipfile import ZipFile
 
+import psutil
 import pytest
 
 from airflow import settings
 from airflow.callbacks.callback_requests import TaskCallbackRequest
 from airflow.configuration import TEST_DAGS_FOLDER, conf
 from airflow.dag_processing.manager import DagFileProcessorAgent
-from airflow.dag_processing.processor import DagFileProcessor, DagFileProcessorProcess
+from airflow.dag_processing.processor import (
+    DagFileProcessor,
+    DagFileProcessorProcess,
+    DagFileProcessorWorkerPool,
+)
 from airflow.models import DagBag, DagModel, SlaMiss, TaskInstance
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.models.taskinstance import SimpleTaskInstance
 from airflow.operators.empty import EmptyOperator
+from airflow.stats import Stats
 from airflow.utils import timezone
 from airflow.utils.session import create_session
 from airflow.utils.state import State
@@ -1009,6 +1016,93 @@ class TestDagFileProcessor:
         processor.start()
 
 
+@pytest.mark.usefixtures("disable_load_example")
+class TestDagFileProcessorWorkerPool:
+    @pytest.fixture(autouse=True)
+    def per_test(self):
+        clear_db_dags()
+        clear_db_import_errors()
+        clear_db_serialized_dags()
+        self.worker_pool = None
+        yield
+        if self.worker_pool:
+            self.worker_pool.terminate()
+
+    @staticmethod
+    def _process(worker_pool, file_path):
+        processor = worker_pool.create_processor(
+            file_path=file_path,
+            pickle_dags=False,
+            dag_ids=None,
+            dag_directory=os.path.dirname(file_path),
+            callback_requests=[],
+        )
+        processor.start()
+        while not processor.done:
+            time.sleep(0.01)
+        # Reading the result gives the worker back to the pool
+        processor.result
+        return processor
+
+    def test_workers_are_reused_then_recycled(self, tmp_path):
+        dag_file = (tmp_path / TEMP_DAG_FILENAME).as_posix()
+        with open(dag_file, "w") as f:
+            f.write(PARSEABLE_DAG_FILE_CONTENTS)
+        self.worker_pool = DagFileProcessorWorkerPool(max_files_per_worker=2)
+
+        first = self._process(self.worker_pool, dag_file)
+        second = self._process(self.worker_pool, dag_file)
+        assert first.result == second.result == (0, 0)
+        assert first.pid == second.pid
+        assert first.exit_code is None
+
+        # The worker was recycled after processing two files
+        with mock.patch.object(Stats, "incr") as mock_incr:
+            third = self._process(self.worker_pool, dag_file)
+        assert third.pid != first.pid
+        assert not psutil.pid_exists(first.pid)
+        mock_incr.assert_not_called()
+        assert self.worker_pool.get_all_pids() == [third.pid]
+
+    def test_recycle_on_rss(self, tmp_path):
+        dag_file = (tmp_path / TEMP_DAG_FILENAME).as_posix()
+        with open(dag_file, "w") as f:
+            f.write(PARSEABLE_DAG_FILE_CONTENTS)
+        # Any process uses more than 1 MiB
+        self.worker_pool = DagFileProcessorWorkerPool(max_worker_rss=1)
+
+        with mock.patch.object(Stats, "incr") as mock_incr:
+            first = self._process(self.worker_pool, dag_file)
+        mock_incr.assert_called_once_with("dag_processing.worker_recycled")
+        assert self.worker_pool.get_all_pids() == []
+        assert self._process(self.worker_pool, dag_file).pid != first.pid
+
+    def test_killed_worker_is_replaced(self, tmp_path):
+        dag_file = (tmp_path / TEMP_DAG_FILENAME).as_posix()
+        with open(dag_file, "w") as f:
+            f.write("import time\nimport airflow.models.dag\ntime.sleep(600)\n")
+        self.worker_pool = DagFileProcessorWorkerPool()
+
+        processor = self.worker_pool.create_processor(
+            file_path=dag_file,
+            pickle_dags=False,
+            dag_ids=None,
+            dag_directory=str(tmp_path),
+            callback_requests=[],
+        )
+        processor.start()
+        assert not processor.done
+        processor.kill()
+        assert processor.done
+        assert processor.result is None
+        assert processor.exit_code == -9
+        assert self.worker_pool.get_all_pids() == []
+
+        with open(dag_file, "w") as f:
+            f.write(PARSEABLE_DAG_FILE_CONTENTS)
+        assert self._process(self.worker_pool, dag_file).result == (0, 0)
+
+
 class TestProcessorAgent:
     @pytest.fixture(autouse=True)
     def per_test(self):
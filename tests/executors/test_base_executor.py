@@ -316,6 +316,21 @@ def test_base_executor_cannot_send_callback():
         executor.send_callback(cbr)
 
 
+def test_base_executor_cannot_send_callbacks():
+    cbr = CallbackRequest("some_file_path_for_callback")
+    executor = BaseExecutor()
+    with pytest.raises(ValueError):
+        executor.send_callbacks([cbr])
+
+
+def test_base_executor_send_callbacks():
+    cbrs = [CallbackRequest("some_file_path_for_callback"), CallbackRequest("other_file_path_for_callback")]
+    executor = BaseExecutor()
+    executor.callback_sink = mock.MagicMock()
+    executor.send_callbacks(cbrs)
+    executor.callback_sink.send_many.assert_called_once_with(cbrs)
+
+
 def test_parser_and_formatter_class():
     executor = BaseExecutor()
     parser = executor._get_parser()
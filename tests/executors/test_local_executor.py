@@ -26,6 +26,7 @@ import pytest
 from airflow import settings
 from airflow.exceptions import AirflowException
 from airflow.executors.local_executor import LocalExecutor
+from airflow.executors.task_zygote import TaskZygote
 from airflow.utils.state import State
 
 pytestmark = pytest.mark.db_test
@@ -127,6 +128,31 @@ class TestLocalExecutor:
     def test_execution_limited_parallelism_fork(self):
         self.execution_parallelism_fork(parallelism=2)
 
+    @pytest.mark.parametrize("parallelism", [0, 2])
+    @mock.patch.object(settings, "EXECUTE_TASKS_IN_ZYGOTE", True)
+    @mock.patch.object(settings, "EXECUTE_TASKS_NEW_PYTHON_INTERPRETER", False)
+    @mock.patch("airflow.cli.commands.task_command.task_run")
+    def test_execution_zygote(self, mock_run, parallelism):
+        success_command = ["airflow", "tasks", "run", "success", "some_parameter", "2020-10-07"]
+        fail_command = ["airflow", "tasks", "run", "failure", "some_parameter", "2020-10-07"]
+        # The commands must not be forked from the workers
+        mock_run.side_effect = AirflowException("Command forked from the worker")
+        zygote = mock.MagicMock(spec=TaskZygote)
+        zygote.run_command.side_effect = lambda command: 0 if command == success_command else 1
+
+        with mock.patch.object(TaskZygote, "start", return_value=zygote):
+            self._test_execute(parallelism, success_command, fail_command)
+        zygote.stop.assert_called_once_with()
+
+    @mock.patch.object(settings, "EXECUTE_TASKS_IN_ZYGOTE", True)
+    @mock.patch.object(settings, "EXECUTE_TASKS_NEW_PYTHON_INTERPRETER", False)
+    def test_execution_zygote_not_reachable_forks_from_worker(self):
+        zygote = mock.MagicMock(spec=TaskZygote)
+        zygote.run_command.return_value = None
+
+        with mock.patch.object(TaskZygote, "start", return_value=zygote):
+            self.execution_parallelism_fork(parallelism=2)
+
     @mock.patch("airflow.executors.local_executor.LocalExecutor.sync")
     @mock.patch("airflow.executors.base_executor.BaseExecutor.trigger_tasks")
     @mock.patch("airflow.executors.base_executor.Stats.gauge")
@@ -0,0 +1,67 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import os
+import pickle
+
+import pytest
+
+from airflow.executors.task_zygote import TaskZygote
+
+
+@pytest.fixture(scope="module")
+def zygote():
+    zygote = TaskZygote.start()
+    yield zygote
+    zygote.stop()
+
+
+class TestTaskZygote:
+    def test_run_command(self, zygote):
+        assert zygote.run_command(["airflow", "version"]) == 0
+
+    def test_run_command_failure(self, zygote):
+        assert zygote.run_command(["airflow", "not-a-command"]) == 1
+
+    def test_run_command_in_parallel(self, zygote):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            returncodes = list(pool.map(zygote.run_command, [["airflow", "version"]] * 4))
+        assert returncodes == [0] * 4
+
+    def test_run_command_from_copy(self, zygote):
+        copy = pickle.loads(pickle.dumps(zygote))
+        assert copy.run_command(["airflow", "version"]) == 0
+        # Only the process which started the zygote stops it
+        copy.stop()
+        assert os.path.exists(zygote.socket_path)
+
+    def test_run_command_not_reachable(self, tmp_path):
+        assert TaskZygote(str(tmp_path / "zygote.sock")).run_command(["airflow", "version"]) is None
+
+    def test_stop(self):
+        zygote = TaskZygote.start()
+        socket_dir = os.path.dirname(zygote.socket_path)
+        assert os.path.exists(zygote.socket_path)
+
+        zygote.stop()
+
+        assert not os.path.exists(socket_dir)
+        assert zygote.run_command(["airflow", "version"]) is None
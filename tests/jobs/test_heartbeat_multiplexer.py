@@ -0,0 +1,142 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import datetime
+import os
+import socket
+import time
+from unittest import mock
+
+import pytest
+
+from airflow.jobs.heartbeat_multiplexer import (
+    _REQUEST_TIMEOUT,
+    SOCKET_PATH_ENV,
+    HeartbeatMultiplexer,
+    record_heartbeats,
+)
+from airflow.jobs.job import Job
+from airflow.operators.empty import EmptyOperator
+from airflow.utils import timezone
+from airflow.utils.state import JobState, State
+from tests.test_utils import db
+
+pytestmark = pytest.mark.db_test
+
+OLD_HEARTBEAT = timezone.datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def job(session):
+    job = Job(job_type="LocalTaskJob", state=JobState.RUNNING, latest_heartbeat=OLD_HEARTBEAT)
+    session.add(job)
+    session.commit()
+    yield job
+    db.clear_db_jobs()
+
+
+@pytest.fixture
+def ti(dag_maker, session):
+    with dag_maker("test_heartbeat_multiplexer"):
+        EmptyOperator(task_id="op")
+    ti = dag_maker.create_dagrun().get_task_instance(task_id="op", session=session)
+    ti.state = State.RUNNING
+    ti.hostname = "host"
+    ti.pid = 42
+    session.commit()
+    return ti
+
+
+def test_record_heartbeats(job, ti, session):
+    replies = record_heartbeats(
+        [{"job_id": job.id, "ti": list(ti.key.primary)}, {"job_id": -1, "ti": None}], session=session
+    )
+
+    session.refresh(job)
+    assert job.latest_heartbeat > OLD_HEARTBEAT
+    assert replies == [
+        {
+            "latest_heartbeat": job.latest_heartbeat.isoformat(),
+            "job_state": JobState.RUNNING,
+            "ti_state": State.RUNNING,
+            "ti_hostname": "host",
+            "ti_pid": 42,
+        },
+        {"latest_heartbeat": None, "job_state": None, "ti_state": None, "ti_hostname": None, "ti_pid": None},
+    ]
+
+
+class TestHeartbeatMultiplexer:
+    def test_heartbeat(self, job, ti, session):
+        multiplexer = HeartbeatMultiplexer.start()
+        try:
+            reply = multiplexer.heartbeat(job.id, ti.key)
+        finally:
+            multiplexer.stop()
+
+        session.refresh(job)
+        assert reply.error is None
+        assert reply.latest_heartbeat == job.latest_heartbeat
+        assert reply.latest_heartbeat > OLD_HEARTBEAT
+        assert isinstance(reply.latest_heartbeat, datetime.datetime)
+        assert (reply.job_state, reply.ti_state, reply.ti_hostname, reply.ti_pid) == (
+            JobState.RUNNING,
+            State.RUNNING,
+            "host",
+            42,
+        )
+        assert not os.path.exists(multiplexer.socket_path)
+
+    def test_heartbeat_not_delayed_by_slow_connection(self, job, ti):
+        multiplexer = HeartbeatMultiplexer.start()
+        try:
+            # A connection which does not send its request does not block the others
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as slow_connection:
+                slow_connection.connect(multiplexer.socket_path)
+                start = time.monotonic()
+                reply = multiplexer.heartbeat(job.id, ti.key)
+                elapsed = time.monotonic() - start
+        finally:
+            multiplexer.stop()
+
+        assert reply is not None
+        assert reply.error is None
+        assert elapsed < _REQUEST_TIMEOUT
+
+    def test_heartbeat_waits_before_connecting(self, tmp_path):
+        multiplexer = HeartbeatMultiplexer(str(tmp_path / "service.sock"))
+        calls = mock.Mock()
+        with mock.patch("airflow.jobs.heartbeat_multiplexer.time.sleep", calls.sleep), mock.patch.object(
+            multiplexer, "connect", calls.connect
+        ):
+            calls.connect.return_value = None
+            assert multiplexer.heartbeat(1, None, delay=2.5) is None
+
+        assert calls.mock_calls == [mock.call.sleep(2.5), mock.call.connect(timeout=mock.ANY)]
+
+    def test_heartbeat_not_reachable(self, tmp_path):
+        multiplexer = HeartbeatMultiplexer(str(tmp_path / "service.sock"))
+
+        assert multiplexer.heartbeat(1, None) is None
+
+    def test_from_env(self):
+        with mock.patch.dict(os.environ, {SOCKET_PATH_ENV: "/tmp/service.sock"}):
+            assert HeartbeatMultiplexer.from_env().socket_path == "/tmp/service.sock"
+        with mock.patch.dict(os.environ, clear=True):
+            assert HeartbeatMultiplexer.from_env() is None
@@ -35,6 +35,7 @@ import pytest
 from airflow import settings
 from airflow.exceptions import AirflowException
 from airflow.executors.sequential_executor import SequentialExecutor
+from airflow.jobs.heartbeat_multiplexer import HeartbeatMultiplexer, HeartbeatReply
 from airflow.jobs.job import Job, run_job
 from airflow.jobs.local_task_job_runner import SIGSEGV_MESSAGE, LocalTaskJobRunner
 from airflow.jobs.scheduler_job_runner import SchedulerJobRunner
@@ -48,7 +49,7 @@ from airflow.task.task_runner.standard_task_runner import StandardTaskRunner
 from airflow.utils import timezone
 from airflow.utils.net import get_hostname
 from airflow.utils.session import create_session
-from airflow.utils.state import State
+from airflow.utils.state import JobState, State
 from airflow.utils.timeout import timeout
 from airflow.utils.types import DagRunType
 from tests.test_utils import db
@@ -172,6 +173,49 @@ class TestLocalTaskJob:
         assert not job1.task_runner.run_as_user
         job_runner.heartbeat_callback()
 
+    def test_localtaskjob_heartbeat_through_multiplexer(self, dag_maker):
+        with dag_maker("test_localtaskjob_heartbeat_through_multiplexer"):
+            op1 = EmptyOperator(task_id="op1")
+
+        ti = dag_maker.create_dagrun().get_task_instance(task_id=op1.task_id)
+        job1 = Job(dag_id=ti.dag_id, executor=SequentialExecutor())
+        job1.id = 7
+        job_runner = LocalTaskJobRunner(job=job1, task_instance=ti, ignore_ti_state=True)
+        ti.task = op1
+        job_runner.task_runner = StandardTaskRunner(job_runner)
+        job_runner.task_runner.process = mock.Mock(pid=1)
+        multiplexer = mock.MagicMock(spec=HeartbeatMultiplexer)
+        now = timezone.utcnow()
+
+        def reply(ti_state=State.RUNNING, ti_hostname=get_hostname(), error=None):
+            return HeartbeatReply(now, JobState.RUNNING, ti_state, ti_hostname, 1, error=error)
+
+        multiplexer.heartbeat.return_value = reply()
+        assert job_runner._heartbeat_through_multiplexer(multiplexer)
+        multiplexer.heartbeat.assert_called_once_with(7, ti.key, delay=mock.ANY)
+        assert job1.latest_heartbeat == now
+        assert (ti.state, ti.pid) == (State.RUNNING, 1)
+
+        multiplexer.heartbeat.return_value = reply(ti_hostname="blablabla")
+        with pytest.raises(AirflowException, match="Hostname of job runner does not match"):
+            job_runner._heartbeat_through_multiplexer(multiplexer)
+
+        # The job did not heartbeat, the task is not checked
+        job1.latest_heartbeat = None
+        multiplexer.heartbeat.return_value = reply(ti_hostname="blablabla", error="Database is down")
+        assert job_runner._heartbeat_through_multiplexer(multiplexer)
+        assert job1.latest_heartbeat is None
+
+        multiplexer.heartbeat.return_value = None
+        assert not job_runner._heartbeat_through_multiplexer(multiplexer)
+
+        multiplexer.heartbeat.return_value = reply(ti_state=State.SUCCESS)
+        with mock.patch.object(job_runner.task_runner, "return_code", return_value=None):
+            job_runner._heartbeat_through_multiplexer(multiplexer)
+            assert not job_runner.terminating
+            job_runner._heartbeat_through_multiplexer(multiplexer)
+            assert job_runner.terminating
+
     @mock.patch("subprocess.check_call")
     @mock.patch("airflow.jobs.local_task_job_runner.psutil")
     def test_localtaskjob_heartbeat_with_run_as_user(self, psutil_mock, _, dag_maker):
@@ -41,7 +41,7 @@ from airflow.callbacks.pipe_callback_sink import PipeCallbackSink
 from airflow.dag_processing.manager import DagFileProcessorAgent
 from airflow.datasets import Dataset
 from airflow.datasets.manager import DatasetManager
-from airflow.exceptions import AirflowException
+from airflow.exceptions import AirflowConfigException, AirflowException
 from airflow.executors.base_executor import BaseExecutor
 from airflow.executors.executor_constants import MOCK_EXECUTOR
 from airflow.executors.executor_loader import ExecutorLoader
@@ -54,9 +54,13 @@ from airflow.models.dagbag import DagBag
 from airflow.models.dagrun import DagRun
 from airflow.models.dataset import DatasetDagRunQueue, DatasetEvent, DatasetModel
 from airflow.models.db_callback_request import DbCallbackRequest
+from airflow.models.log import Log
 from airflow.models.pool import Pool
+from airflow.models.scheduler_shard import dag_shard_key
 from airflow.models.serialized_dag import SerializedDagModel
+from airflow.models.taskfail import TaskFail
 from airflow.models.taskinstance import SimpleTaskInstance, TaskInstance, TaskInstanceKey
+from airflow.models.taskinstancecounter import TaskInstanceCounter
 from airflow.operators.bash import BashOperator
 from airflow.operators.empty import EmptyOperator
 from airflow.serialization.serialized_objects import SerializedDAG
@@ -405,7 +409,7 @@ class TestSchedulerJob:
             "finished (failed) although the task says it's queued. (Info: None) "
             "Was the task killed externally?",
         )
-        scheduler_job.executor.callback_sink.send.assert_called_once_with(task_callback)
+        scheduler_job.executor.callback_sink.send_many.assert_called_once_with([task_callback])
         scheduler_job.executor.callback_sink.reset_mock()
         mock_stats_incr.assert_called_once_with(
             "scheduler.tasks.killed_externally",
@@ -509,6 +513,153 @@ class TestSchedulerJob:
         scheduler_job.executor.callback_sink.send.assert_not_called()
         mock_stats_incr.assert_not_called()
 
+    def test_process_executor_events_sets_external_executor_ids(self, dag_maker, session):
+        with dag_maker(dag_id="test_process_executor_events_sets_external_executor_ids", session=session):
+            EmptyOperator(task_id="queued_task")
+            EmptyOperator(task_id="running_task")
+        dr = dag_maker.create_dagrun()
+        queued_ti = dr.get_task_instance("queued_task", session=session)
+        running_ti = dr.get_task_instance("running_task", session=session)
+        queued_ti.state = State.QUEUED
+        running_ti.state = State.RUNNING
+        session.commit()
+
+        executor = MockExecutor(do_update=False)
+        self.job_runner = SchedulerJobRunner(Job(executor=executor))
+        self.job_runner.processor_agent = mock.MagicMock()
+        executor.event_buffer[queued_ti.key] = State.QUEUED, "queued-id"
+        executor.event_buffer[running_ti.key] = State.RUNNING, "running-id"
+
+        assert self.job_runner._process_executor_events(session=session) == 0
+        # The task instances of the session are kept in sync with the bulk update
+        assert queued_ti.external_executor_id == "queued-id"
+        assert running_ti.external_executor_id == "running-id"
+        assert not session.dirty
+        session.commit()
+        session.expunge_all()
+
+        assert {
+            ti.task_id: (ti.state, ti.external_executor_id)
+            for ti in session.scalars(select(TaskInstance).where(TaskInstance.dag_id == dr.dag_id))
+        } == {
+            "queued_task": (State.QUEUED, "queued-id"),
+            "running_task": (State.RUNNING, "running-id"),
+        }
+
+    @mock.patch("airflow.jobs.scheduler_job_runner.TaskCallbackRequest")
+    @mock.patch("airflow.jobs.scheduler_job_runner.Stats.timing")
+    def test_process_executor_events_killed_externally_in_bulk(
+        self, mock_stats_timing, mock_task_callback, dag_maker, session
+    ):
+        with dag_maker(dag_id="test_process_executor_events_killed_externally_in_bulk", session=session):
+            EmptyOperator(task_id="task_1", on_failure_callback=lambda x: print("hi"))
+            EmptyOperator(task_id="task_2", on_failure_callback=lambda x: print("hi"))
+            EmptyOperator(task_id="task_3")
+        dr = dag_maker.create_dagrun()
+        tis = dr.get_task_instances(session=session)
+        for ti in tis:
+            ti.state = State.QUEUED
+        session.commit()
+
+        executor = MockExecutor(do_update=False)
+        scheduler_job = Job(executor=executor)
+        self.job_runner = SchedulerJobRunner(scheduler_job)
+        self.job_runner.processor_agent = mock.MagicMock()
+        for ti in tis:
+            executor.event_buffer[ti.key] = State.FAILED, None
+
+        with mock.patch.object(
+            self.job_runner.dagbag, "get_dag", wraps=self.job_runner.dagbag.get_dag
+        ) as mock_get_dag:
+            self.job_runner._process_executor_events(session=session)
+        session.commit()
+
+        # The DAG is loaded once for all the task instances killed externally
+        mock_get_dag.assert_called_once_with(dr.dag_id)
+        # The callbacks are sent as a single batch
+        scheduler_job.executor.callback_sink.send.assert_not_called()
+        scheduler_job.executor.callback_sink.send_many.assert_called_once()
+        assert len(scheduler_job.executor.callback_sink.send_many.call_args.args[0]) == 2
+        assert {
+            call.kwargs["simple_task_instance"].task_id for call in mock_task_callback.call_args_list
+        } == {"task_1", "task_2"}
+        states = {ti.task_id: ti.state for ti in dr.get_task_instances(session=session)}
+        assert states == {"task_1": State.QUEUED, "task_2": State.QUEUED, "task_3": State.FAILED}
+        mock_stats_timing.assert_has_calls(
+            [
+                mock.call("scheduler.executor_events.duration", mock.ANY),
+                mock.call("scheduler.executor_events.duration_per_event", mock.ANY),
+            ]
+        )
+
+    def test_process_executor_events_killed_externally_fails_in_bulk(self, dag_maker, session):
+        with dag_maker(
+            dag_id="test_process_executor_events_killed_externally_fails_in_bulk", session=session
+        ):
+            EmptyOperator(task_id="no_retry_1")
+            EmptyOperator(task_id="no_retry_2")
+            EmptyOperator(task_id="retry_1", retries=1)
+            EmptyOperator(task_id="retry_2", retries=1)
+            EmptyOperator(task_id="email", email="test@example.com")
+        dr = dag_maker.create_dagrun()
+        tis = dr.get_task_instances(session=session)
+        for ti in tis:
+            ti.state = State.QUEUED
+            ti.next_method = "resume"
+        session.commit()
+
+        executor = MockExecutor(do_update=False)
+        self.job_runner = SchedulerJobRunner(Job(executor=executor))
+        self.job_runner.processor_agent = mock.MagicMock()
+        for ti in tis:
+            executor.event_buffer[ti.key] = State.FAILED, None
+
+        with mock.patch.object(
+            TaskInstance, "handle_failure", autospec=True, side_effect=TaskInstance.handle_failure
+        ) as mock_handle_failure, mock.patch.object(
+            session, "execute", wraps=session.execute
+        ) as mock_execute:
+            self.job_runner._process_executor_events(session=session)
+
+        # Only the task instance which sends an e-mail alert is failed one by one
+        assert [call.args[0].task_id for call in mock_handle_failure.call_args_list] == ["email"]
+        # One UPDATE per final state for the others
+        bulk_updates = [
+            call.args[0]
+            for call in mock_execute.call_args_list
+            if getattr(call.args[0], "is_update", False) and call.args[0].table.name == "task_instance"
+        ]
+        assert len(bulk_updates) == 2
+        # The task instances of the session are in their final state
+        assert {ti.task_id: (ti.state, ti.next_method) for ti in tis if ti.task_id != "email"} == {
+            "no_retry_1": (State.FAILED, None),
+            "no_retry_2": (State.FAILED, None),
+            "retry_1": (State.UP_FOR_RETRY, None),
+            "retry_2": (State.UP_FOR_RETRY, None),
+        }
+        assert all(ti.end_date for ti in tis)
+        session.commit()
+        session.expunge_all()
+
+        assert {
+            ti.task_id: (ti.state, ti.next_method, ti.end_date is not None)
+            for ti in session.scalars(select(TaskInstance).where(TaskInstance.dag_id == dr.dag_id))
+        } == {
+            "no_retry_1": (State.FAILED, None, True),
+            "no_retry_2": (State.FAILED, None, True),
+            "retry_1": (State.UP_FOR_RETRY, None, True),
+            "retry_2": (State.UP_FOR_RETRY, None, True),
+            "email": (State.FAILED, None, True),
+        }
+        # The failures are recorded as if the task instances were failed one by one
+        bulk_failed = {"no_retry_1", "no_retry_2", "retry_1", "retry_2"}
+        assert bulk_failed <= set(
+            session.scalars(select(TaskFail.task_id).where(TaskFail.dag_id == dr.dag_id))
+        )
+        assert bulk_failed <= set(
+            session.scalars(select(Log.task_id).where(Log.dag_id == dr.dag_id, Log.event == "failed"))
+        )
+
     def test_execute_task_instances_is_paused_wont_execute(self, session, dag_maker):
         dag_id = "SchedulerJobTest.test_execute_task_instances_is_paused_wont_execute"
         task_id_1 = "dummy_task"
@@ -824,6 +975,128 @@ class TestSchedulerJob:
         assert [ti.key for ti in res] == [tis[1].key]
         session.rollback()
 
+    @conf_vars({("scheduler", "critical_section_prefetch_factor"): "1"})
+    def test_find_executable_task_instances_single_query(self, dag_maker):
+        """
+        The task instances of a DAG beyond its max_active_tasks are not fetched, so that the lower
+        priority task instances of other DAGs are queued without querying again.
+        """
+        dag_id_1 = "SchedulerJobTest.test_find_executable_task_instances_single_query-a"
+        dag_id_2 = "SchedulerJobTest.test_find_executable_task_instances_single_query-b"
+        session = settings.Session()
+        with dag_maker(dag_id=dag_id_1, max_active_tasks=1, session=session):
+            for i in range(3):
+                EmptyOperator(task_id=f"task-{i}", priority_weight=10 - i)
+        dr1 = dag_maker.create_dagrun()
+
+        with dag_maker(dag_id=dag_id_2, max_active_tasks=16, session=session):
+            EmptyOperator(task_id="task", priority_weight=1)
+        dr2 = dag_maker.create_dagrun()
+
+        dr1 = session.merge(dr1, load=False)
+
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+
+        for ti in dr1.task_instances + dr2.task_instances:
+            ti.state = State.SCHEDULED
+            session.merge(ti)
+        session.flush()
+
+        with mock.patch.object(session, "scalars", wraps=session.scalars) as mock_scalars:
+            res = self.job_runner._executable_task_instances_to_queued(max_tis=2, session=session)
+        assert sorted((ti.dag_id, ti.task_id) for ti in res) == [(dag_id_1, "task-0"), (dag_id_2, "task")]
+        assert mock_scalars.call_count == 1
+        session.rollback()
+
+    @conf_vars({("scheduler", "critical_section_prefetch_factor"): "2"})
+    def test_find_executable_task_instances_prefetch_starved_by_task_concurrency(self, dag_maker):
+        """
+        When all the prefetched candidates are starved by the max_active_tis_per_dag of their task, the
+        candidates are fetched once more without that task, so that lower priority task instances are queued.
+        """
+        dag_id_1 = "SchedulerJobTest.test_find_executable_task_instances_prefetch_starved-a"
+        dag_id_2 = "SchedulerJobTest.test_find_executable_task_instances_prefetch_starved-b"
+        session = settings.Session()
+        with dag_maker(dag_id=dag_id_1, max_active_runs=16, session=session):
+            EmptyOperator(task_id="limited", priority_weight=100, max_active_tis_per_dag=1)
+        dag_runs = [dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED)]
+        for _ in range(9):
+            dag_runs.append(dag_maker.create_dagrun_after(dag_runs[-1], run_type=DagRunType.SCHEDULED))
+
+        with dag_maker(dag_id=dag_id_2, session=session):
+            EmptyOperator(task_id="task", priority_weight=1)
+        dr2 = dag_maker.create_dagrun()
+
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+
+        for i, dr in enumerate(dag_runs):
+            ti = dr.get_task_instance("limited", session)
+            ti.state = State.RUNNING if i == 0 else State.SCHEDULED
+        dr2.get_task_instance("task", session).state = State.SCHEDULED
+        session.flush()
+
+        with mock.patch.object(session, "scalars", wraps=session.scalars) as mock_scalars:
+            res = self.job_runner._executable_task_instances_to_queued(max_tis=2, session=session)
+        assert [(ti.dag_id, ti.task_id) for ti in res] == [(dag_id_2, "task")]
+        assert mock_scalars.call_count == 2
+        session.rollback()
+
+    @mock.patch("sqlite3.sqlite_version_info", (3, 24, 0))
+    def test_find_executable_task_instances_without_window_functions(self, dag_maker, session):
+        """
+        SQLite before 3.25.0 has no window functions, so the candidates are not ranked within their DAG,
+        and the max_active_tasks of the DAG is only enforced in memory.
+        """
+        if session.get_bind().dialect.name != "sqlite":
+            pytest.skip("Window functions are only unavailable on older SQLite versions")
+        dag_id_1 = "SchedulerJobTest.test_find_executable_task_instances_without_window_functions-a"
+        dag_id_2 = "SchedulerJobTest.test_find_executable_task_instances_without_window_functions-b"
+        with dag_maker(dag_id=dag_id_1, max_active_tasks=1, session=session):
+            for i in range(3):
+                EmptyOperator(task_id=f"task-{i}", priority_weight=10 - i)
+        dr1 = dag_maker.create_dagrun()
+
+        with dag_maker(dag_id=dag_id_2, max_active_tasks=16, session=session):
+            EmptyOperator(task_id="task", priority_weight=1)
+        dr2 = dag_maker.create_dagrun()
+
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+
+        for ti in dr1.task_instances + dr2.task_instances:
+            ti.state = State.SCHEDULED
+        session.flush()
+
+        with mock.patch.object(session, "scalars", wraps=session.scalars) as mock_scalars:
+            res = self.job_runner._executable_task_instances_to_queued(max_tis=2, session=session)
+        assert sorted((ti.dag_id, ti.task_id) for ti in res) == [(dag_id_1, "task-0"), (dag_id_2, "task")]
+        assert "row_number" not in str(mock_scalars.call_args_list[0].args[0])
+        session.rollback()
+
+    def test_critical_section_prefetch_factor_must_be_positive(self):
+        with conf_vars({("scheduler", "critical_section_prefetch_factor"): "0"}):
+            with pytest.raises(AirflowConfigException, match="critical_section_prefetch_factor"):
+                SchedulerJobRunner(job=Job(), subdir=os.devnull)
+
+    @mock.patch("airflow.jobs.scheduler_job_runner.Stats.timer")
+    def test_critical_section_lock_duration(self, mock_timer, dag_maker, session):
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+        scheduler_job.executor = MockExecutor(do_update=False)
+        self.job_runner.processor_agent = mock.MagicMock(spec=DagFileProcessorAgent)
+
+        with dag_maker(session=session):
+            EmptyOperator(task_id="task")
+        dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED)
+
+        self.job_runner._do_scheduling(session)
+
+        mock_timer.assert_any_call("scheduler.critical_section_lock_duration")
+        lock_timer = mock_timer.return_value
+        lock_timer.stop.assert_any_call(send=True)
+
     def test_find_executable_task_instances_order_priority_with_pools(self, dag_maker):
         """
         The scheduler job should pick tasks with higher priority for execution
@@ -1133,6 +1406,43 @@ class TestSchedulerJob:
         assert 0 == len(res)
         session.rollback()
 
+    @conf_vars({("scheduler", "task_instance_counters"): "True"})
+    def test_find_executable_task_instances_with_task_instance_counters(self, dag_maker):
+        dag_id = "SchedulerJobTest.test_find_executable_task_instances_with_task_instance_counters"
+        session = settings.Session()
+        with dag_maker(dag_id=dag_id, max_active_tasks=2, session=session):
+            EmptyOperator(task_id="dummy", pool_slots=3)
+
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+
+        dr1 = dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED)
+        dr2 = dag_maker.create_dagrun_after(dr1, run_type=DagRunType.SCHEDULED)
+        dr3 = dag_maker.create_dagrun_after(dr2, run_type=DagRunType.SCHEDULED)
+
+        ti1 = dr1.task_instances[0]
+        ti2 = dr2.task_instances[0]
+        ti3 = dr3.task_instances[0]
+        ti1.state = State.RUNNING
+        ti2.state = State.SCHEDULED
+        ti3.state = State.SCHEDULED
+        session.merge(ti1)
+        session.merge(ti2)
+        session.merge(ti3)
+        session.flush()
+
+        res = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
+
+        assert [ti.key for ti in res] == [ti2.key]
+        # The task instances queued in bulk are counted
+        assert Pool.slots_stats(session=session)["default_pool"]["queued"] == 3
+        assert TaskInstanceCounter.reconcile(session=session) == 0
+
+        res = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
+
+        assert 0 == len(res)
+        session.rollback()
+
     def test_find_executable_task_instances_concurrency_queued(self, dag_maker):
         dag_id = "SchedulerJobTest.test_find_executable_task_instances_concurrency_queued"
         with dag_maker(dag_id=dag_id, max_active_tasks=3):
@@ -3780,6 +4090,40 @@ class TestSchedulerJob:
 
         assert dag.get_last_dagrun().creating_job_id == scheduler_job.id
 
+    @conf_vars({("scheduler", "num_shards"): "4"})
+    def test_sharded_scheduler_only_schedules_dags_of_its_shards(self, dag_maker, session):
+        # The shard keys of the DAGs are in shards 1 and 0 of 4
+        own_dag_id, other_dag_id = "test_sharding_dag_1", "test_sharding_dag_2"
+        assert (dag_shard_key(own_dag_id), dag_shard_key(other_dag_id)) == (488, 82)
+
+        dag_models = {}
+        for dag_id in (own_dag_id, other_dag_id):
+            with dag_maker(dag_id=dag_id, session=session):
+                EmptyOperator(task_id="dummy")
+            dag_models[dag_id] = dag_maker.dag_model
+        session.commit()
+
+        scheduler_job = Job(executor=self.null_exec)
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+        self.job_runner.processor_agent = mock.MagicMock()
+        self.job_runner._shards = [1]
+
+        self.job_runner._create_dagruns_for_dags(session, session)
+        session.flush()
+        assert {dr.dag_id for dr in session.query(DagRun)} == {own_dag_id}
+
+        dr = dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED)
+        assert dr.dag_id == other_dag_id
+        for dag_run in session.query(DagRun):
+            dag_run.state = DagRunState.RUNNING
+            for ti in dag_run.get_task_instances(session=session):
+                ti.state = State.SCHEDULED
+        session.flush()
+
+        res = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
+        assert [ti.dag_id for ti in res] == [own_dag_id]
+        session.rollback()
+
     @pytest.mark.need_serialized_dag
     def test_create_dag_runs_datasets(self, session, dag_maker):
         """
@@ -4232,6 +4576,55 @@ class TestSchedulerJob:
         ti.refresh_from_db(session=session)
         assert ti.state == State.QUEUED
 
+    @conf_vars({("scheduler", "incremental_scheduling"): "True"})
+    def test_do_schedule_incremental_only_examines_changed_dagruns(self, session, dag_maker):
+        with dag_maker(
+            dag_id="test_do_schedule_incremental", start_date=DEFAULT_DATE, schedule=None, session=session
+        ):
+            BashOperator(task_id="task1", bash_command="true")
+            BashOperator(task_id="task2", bash_command="true")
+
+        run1 = dag_maker.create_dagrun(run_id="run1", state=State.RUNNING, execution_date=DEFAULT_DATE)
+        run2 = dag_maker.create_dagrun(
+            run_id="run2", state=State.RUNNING, execution_date=DEFAULT_DATE + timedelta(days=1)
+        )
+        session.commit()
+
+        scheduler_job = Job(executor=MockExecutor(do_update=False))
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, subdir=os.devnull)
+        self.job_runner.processor_agent = mock.MagicMock(spec=DagFileProcessorAgent)
+
+        def examined_run_ids():
+            with mock.patch.object(
+                self.job_runner, "_schedule_dag_run", wraps=self.job_runner._schedule_dag_run
+            ) as schedule_dag_run:
+                self.job_runner._do_scheduling(session)
+            return {c.args[0].run_id for c in schedule_dag_run.call_args_list}
+
+        # Never examined before, so both are picked up
+        assert examined_run_ids() == {"run1", "run2"}
+        # Nothing changed
+        with mock.patch("airflow.jobs.scheduler_job_runner.Stats.gauge") as mock_gauge:
+            assert examined_run_ids() == set()
+            self.job_runner._emit_skipped_dagruns_metrics(session=session)
+        mock_gauge.assert_any_call("scheduler.dagruns.examined", 0)
+        mock_gauge.assert_any_call("scheduler.dagruns.skipped", 2)
+
+        # An executor event marks only the affected run as dirty
+        ti = run2.get_task_instance("task1", session=session)
+        ti.set_state(State.SUCCESS, session=session)
+        session.commit()
+        scheduler_job.executor.event_buffer[ti.key] = State.SUCCESS, None
+        self.job_runner._process_executor_events(session=session)
+        assert self.job_runner._dirty_dag_runs.keys() == {(run2.dag_id, run2.run_id)}
+        assert examined_run_ids() == {"run2"}
+        assert not self.job_runner._dirty_dag_runs
+
+        # Runs not examined for longer than the sweep interval are examined again
+        session.merge(run1).last_scheduling_decision = timezone.utcnow() - timedelta(hours=1)
+        session.commit()
+        assert examined_run_ids() == {"run1"}
+
     def test_more_runs_are_not_created_when_max_active_runs_is_reached(self, dag_maker, caplog):
         """
         This tests that when max_active_runs is reached, _create_dag_runs doesn't create
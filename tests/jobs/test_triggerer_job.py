@@ -22,15 +22,22 @@ import datetime
 import importlib
 import time
 from threading import Thread
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import aiofiles
 import pendulum
 import pytest
 
 from airflow.config_templates import airflow_local_settings
+from airflow.exceptions import AirflowConfigException
 from airflow.jobs.job import Job
-from airflow.jobs.triggerer_job_runner import TriggererJobRunner, TriggerRunner, setup_queue_listener
+from airflow.jobs.triggerer_job_runner import (
+    MultiProcessTriggerRunner,
+    TriggererJobRunner,
+    TriggerRunner,
+    _run_metered,
+    setup_queue_listener,
+)
 from airflow.logging_config import configure_logging
 from airflow.models import DagModel, DagRun, TaskInstance, Trigger
 from airflow.models.baseoperator import BaseOperator
@@ -47,6 +54,7 @@ from airflow.utils.session import create_session
 from airflow.utils.state import State, TaskInstanceState
 from airflow.utils.types import DagRunType
 from tests.core.test_logging_config import reset_logging
+from tests.test_utils.config import conf_vars
 from tests.test_utils.db import clear_db_dags, clear_db_runs
 
 pytestmark = pytest.mark.db_test
@@ -633,6 +641,127 @@ def test_trigger_firing(session):
         job_runner.trigger_runner.join(30)
 
 
+def test_trigger_runner_wakes_up_for_new_triggers(session):
+    """
+    Checks that the trigger runner starts new triggers, and reports their events, without waiting
+    for its next poll.
+    """
+    trigger_runner = TriggerRunner()
+    trigger_runner.start()
+    try:
+        # Let the runner go idle, then request a trigger which fires immediately
+        time.sleep(0.2)
+        create_trigger_in_db(session, SuccessTrigger())
+        trigger_runner.update_triggers({1})
+        assert trigger_runner.work_available.wait(0.5)
+        assert list(trigger_runner.events) == [(1, TriggerEvent(True))]
+        assert 1 in trigger_runner.event_times
+    finally:
+        trigger_runner.stop = True
+        trigger_runner.join(30)
+
+
+@pytest.mark.parametrize(
+    "trigger, fires_on_timer",
+    [
+        (DateTimeTrigger(timezone.datetime(2024, 1, 1)), True),
+        (TimeDeltaTrigger(datetime.timedelta(days=1)), True),
+        (TimeDeltaTrigger_(datetime.timedelta(days=1), filename="unused"), False),
+        (SuccessTrigger(), False),
+    ],
+)
+def test_fires_on_timer(trigger, fires_on_timer):
+    assert TriggerRunner.fires_on_timer(trigger) is fires_on_timer
+
+
+def test_temporal_triggers_fire_from_timers():
+    """Checks that temporal triggers fire from the timers heap, and can be cancelled, without a coroutine."""
+    past = timezone.utcnow() - datetime.timedelta(seconds=1)
+    soon = timezone.utcnow() + datetime.timedelta(seconds=0.5)
+    trigger_runner = TriggerRunner()
+    for trigger_id, moment in [(1, past), (2, soon), (3, past + datetime.timedelta(days=7))]:
+        trigger = DateTimeTrigger(moment)
+        trigger.task_instance = MagicMock()
+        trigger_runner.to_create.append((trigger_id, trigger))
+    trigger_runner.start()
+    try:
+        for _ in range(10):
+            if trigger_runner.events and len(trigger_runner.triggers) == 2:
+                break
+            time.sleep(0.05)
+        assert list(trigger_runner.events) == [(1, TriggerEvent(past))]
+        assert {trigger_id: details["task"] for trigger_id, details in trigger_runner.triggers.items()} == {
+            2: None,
+            3: None,
+        }
+
+        # Triggers added while the timers sleep fire on time
+        trigger_runner.work_available.clear()
+        assert trigger_runner.work_available.wait(2)
+        assert list(trigger_runner.events) == [(1, TriggerEvent(past)), (2, TriggerEvent(soon))]
+
+        trigger_runner.to_cancel.append(3)
+        trigger_runner.wake_up()
+        for _ in range(30):
+            if not trigger_runner.triggers:
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("TriggerRunner never cancelled the temporal trigger")
+        assert not trigger_runner.timers
+    finally:
+        trigger_runner.stop = True
+        trigger_runner.join(30)
+
+
+@patch("airflow.jobs.triggerer_job_runner.Stats.timing")
+@patch("airflow.models.trigger.Trigger.submit_events")
+def test_handle_events_emits_resume_latency(mock_submit_events, mock_timing):
+    job_runner = TriggererJobRunner(Job())
+    job_runner.trigger_runner.events.append((1, TriggerEvent(True)))
+    job_runner.trigger_runner.event_times[1] = time.time() - 2
+
+    job_runner.handle_events()
+
+    mock_submit_events.assert_called_once_with([(1, TriggerEvent(True))])
+    mock_timing.assert_any_call("triggers.resume_latency", ANY)
+    resume_latency = next(
+        call.args[1] for call in mock_timing.call_args_list if call.args[0] == "triggers.resume_latency"
+    )
+    assert resume_latency >= datetime.timedelta(seconds=2)
+    assert not job_runner.trigger_runner.event_times
+
+
+@conf_vars({("triggerer", "event_batch_size"): "2"})
+@patch("airflow.jobs.triggerer_job_runner.Stats")
+@patch("airflow.models.trigger.Trigger.submit_events")
+def test_handle_events_in_batches(mock_submit_events, mock_stats):
+    job_runner = TriggererJobRunner(Job())
+    events = [(trigger_id, TriggerEvent(trigger_id)) for trigger_id in range(5)]
+    job_runner.trigger_runner.events.extend(events)
+
+    job_runner.handle_events()
+
+    assert [call.args[0] for call in mock_submit_events.call_args_list] == [
+        events[:2],
+        events[2:4],
+        events[4:],
+    ]
+    assert not job_runner.trigger_runner.events
+    assert [call.args for call in mock_stats.incr.call_args_list] == [
+        ("triggers.succeeded", 2),
+        ("triggers.succeeded", 2),
+        ("triggers.succeeded", 1),
+    ]
+    mock_stats.timing.assert_any_call("triggers.submit_events.duration", ANY)
+
+
+@conf_vars({("triggerer", "event_batch_size"): "0"})
+def test_invalid_event_batch_size():
+    with pytest.raises(AirflowConfigException, match="event_batch_size"):
+        TriggererJobRunner(Job())
+
+
 def test_trigger_failing(session):
     """
     Checks that when a trigger fails, it correctly makes it into the
@@ -667,6 +796,187 @@ def test_trigger_failing(session):
         job_runner.trigger_runner.join(30)
 
 
+def test_timers_queue_the_event_before_removing_the_trigger():
+    """Checks that a fired temporal trigger is always either running or in the events queue."""
+    trigger_runner = TriggerRunner()
+
+    class CheckedTriggers(dict):
+        def __delitem__(self, trigger_id):
+            assert [event_trigger_id for event_trigger_id, _ in trigger_runner.events] == [trigger_id]
+            super().__delitem__(trigger_id)
+
+    moment = timezone.utcnow() - datetime.timedelta(seconds=1)
+    trigger_runner.triggers = CheckedTriggers({1: {"task": None, "name": "timer", "events": 0}})
+    trigger_runner.timers = [(moment.timestamp(), 1, moment)]
+
+    async def fire_timers():
+        trigger_runner._timers_changed = asyncio.Event()
+        run_timers = asyncio.create_task(trigger_runner.run_timers())
+        for _ in range(100):
+            if trigger_runner.work_available.is_set() or run_timers.done():
+                break
+            await asyncio.sleep(0.01)
+        trigger_runner.stop = True
+        trigger_runner._timers_changed.set()
+        await run_timers
+
+    asyncio.run(fire_timers())
+    assert not trigger_runner.triggers
+    assert list(trigger_runner.events) == [(1, TriggerEvent(moment))]
+
+
+@conf_vars({("triggerer", "num_processes"): "2"})
+@pytest.mark.parametrize(
+    "trigger, check",
+    [
+        pytest.param(
+            SuccessTrigger(), lambda runner: list(runner.events) == [(1, TriggerEvent(True))], id="success"
+        ),
+        pytest.param(
+            FailureTrigger(),
+            lambda runner: (
+                len(runner.failed_triggers) == 1
+                and runner.failed_triggers[0][0] == 1
+                and "ValueError: Deliberate trigger failure" in str(runner.failed_triggers[0][1])
+            ),
+            id="failure",
+        ),
+    ],
+)
+def test_multi_process_trigger_runner(session, trigger, check):
+    """Checks that the events and failures of triggers run in child processes reach the triggerer."""
+    create_trigger_in_db(session, trigger)
+    job = Job()
+    job_runner = TriggererJobRunner(job)
+    assert isinstance(job_runner.trigger_runner, MultiProcessTriggerRunner)
+    job_runner.trigger_runner.start()
+    try:
+        assert job_runner.trigger_runner.is_alive()
+        # Wait for up to 10 seconds for the event or failure to be sent back
+        for _ in range(20):
+            job_runner.load_triggers()
+            if job_runner.trigger_runner.events or job_runner.trigger_runner.failed_triggers:
+                assert check(job_runner.trigger_runner)
+                break
+            time.sleep(0.5)
+        else:
+            pytest.fail("The trigger runner processes never sent the trigger event or failure")
+    finally:
+        job_runner.trigger_runner.stop = True
+        job_runner.trigger_runner.join(30)
+    assert not any(process.is_alive() for process in job_runner.trigger_runner._processes)
+
+
+def test_multi_process_trigger_runner_spreads_triggers_by_id():
+    trigger_runner = MultiProcessTriggerRunner(num_processes=2)
+    trigger_runner._processes = [MagicMock(), MagicMock()]
+    trigger_runner._channels = [MagicMock(), MagicMock()]
+
+    trigger_runner.update_triggers({1, 2, 3, 4})
+
+    trigger_runner._channels[0].send.assert_called_once_with({2, 4})
+    trigger_runner._channels[1].send.assert_called_once_with({1, 3})
+
+
+def test_multi_process_trigger_runner_does_not_recreate_finished_triggers():
+    """Checks that the triggers with events or failures still to handle are not sent to the processes."""
+    trigger_runner = MultiProcessTriggerRunner(num_processes=2)
+    trigger_runner._processes = [MagicMock(), MagicMock()]
+    trigger_runner._channels = [MagicMock(), MagicMock()]
+    trigger_runner._handle_message(0, [], [], {}, [2, 4])
+    trigger_runner._handle_message(1, [], [], {}, [1, 3])
+    trigger_runner.update_triggers({1, 2, 3, 4})
+
+    # Trigger 1 fires and trigger 2 fails in between two updates, before the events are handled
+    trigger_runner._handle_message(1, [(1, TriggerEvent(1))], [], {1: 10.0}, [3])
+    trigger_runner._handle_message(0, [], [(2, None)], {}, [4])
+    for channel in trigger_runner._channels:
+        channel.reset_mock()
+    trigger_runner.update_triggers({1, 2, 3, 4})
+
+    trigger_runner._channels[0].send.assert_called_once_with({4})
+    trigger_runner._channels[1].send.assert_called_once_with({3})
+
+
+def test_multi_process_trigger_runner_handles_messages():
+    trigger_runner = MultiProcessTriggerRunner(num_processes=2)
+
+    trigger_runner._handle_message(0, [], [], {}, [2, 4])
+    assert trigger_runner.triggers == {2: 0, 4: 0}
+    assert not trigger_runner.work_available.is_set()
+
+    trigger_runner._handle_message(1, [(1, TriggerEvent(1))], [(3, None)], {1: 10.0}, [1])
+    assert trigger_runner.triggers == {2: 0, 4: 0, 1: 1}
+    assert list(trigger_runner.events) == [(1, TriggerEvent(1))]
+    assert list(trigger_runner.failed_triggers) == [(3, None)]
+    assert trigger_runner.event_times == {1: 10.0}
+    assert trigger_runner.work_available.is_set()
+
+
+def test_multi_process_trigger_runner_collects_costs():
+    trigger_runner = MultiProcessTriggerRunner(num_processes=2)
+    trigger_runner._handle_message(0, [], [], {}, [2, 4], [(2, 0.5), (4, 0.25)])
+    trigger_runner._handle_message(1, [], [], {}, [1, 3], [(1, 0.125)])
+    assert sorted(trigger_runner.collect_costs()) == [(1, 0.125), (2, 0.5), (4, 0.25)]
+
+    # The last costs of the triggers still running are kept
+    trigger_runner._handle_message(0, [], [], {}, [4], [])
+    assert sorted(trigger_runner.collect_costs()) == [(1, 0.125), (4, 0.25)]
+
+
+def test_cpu_time_meter():
+    """Checks that the CPU time of each step of a trigger coroutine is measured, and errors reach it."""
+
+    async def busy_coroutine():
+        for _ in range(3):
+            start = time.thread_time()
+            while time.thread_time() - start < 0.02:
+                pass
+            await asyncio.sleep(0)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            return "cancelled"
+
+    async def run():
+        details = {"task": None, "name": "busy", "events": 0, "cpu_time": 0.0}
+        task = asyncio.create_task(_run_metered(busy_coroutine(), details))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        return await task, details["cpu_time"]
+
+    result, cpu_time = asyncio.run(run())
+    assert result == "cancelled"
+    assert 0.06 <= cpu_time < 1
+
+
+def test_trigger_runner_collects_costs():
+    trigger_runner = TriggerRunner()
+    trigger_runner.triggers = {
+        1: {"task": MagicMock(), "name": "busy", "events": 0, "cpu_time": 2.0},
+        2: {"task": None, "name": "timer", "events": 0, "cpu_time": 0.0},
+    }
+    with patch("airflow.jobs.triggerer_job_runner.time.monotonic", side_effect=[10.0, 20.0]):
+        trigger_runner._costs_collected_at = 0.0
+        assert trigger_runner.collect_costs() == [(1, 0.2)]
+        trigger_runner.triggers[1]["cpu_time"] = 6.0
+        # The cost is smoothed with the previous one
+        assert trigger_runner.collect_costs() == [(1, pytest.approx(0.3))]
+
+
+@patch("airflow.models.trigger.Trigger.report_costs", return_value=[3])
+def test_report_costs(mock_report_costs):
+    job_runner = TriggererJobRunner(Job(id=42))
+    job_runner.trigger_runner = MagicMock()
+    job_runner.trigger_runner.collect_costs.return_value = [(1, 0.5), (3, 1.5)]
+
+    job_runner.report_costs()
+
+    mock_report_costs.assert_called_once_with(
+        42, [(1, 0.5), (3, 1.5)], job_runner.capacity, job_runner.health_check_threshold
+    )
+
+
 def test_trigger_cleanup(session):
     """
     Checks that the triggerer will correctly clean up triggers that do not
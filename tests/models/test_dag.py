@@ -441,6 +441,72 @@ class TestDag:
                 calculated_weight = task.priority_weight_total
                 assert calculated_weight == correct_weight
 
+    def test_dag_priority_weight_index(self):
+        with DAG("dag", start_date=DEFAULT_DATE) as dag:
+            start = EmptyOperator(task_id="start", priority_weight=2)
+            middle = [EmptyOperator(task_id=f"middle{i}", priority_weight=i) for i in range(3)]
+            end = EmptyOperator(task_id="end", priority_weight=7)
+            start >> middle >> end
+
+        index = dag.get_priority_weight_index()
+        assert index.topological_order[0] == "start"
+        assert index.topological_order[-1] == "end"
+        for task in dag.tasks:
+            upstream_ids = task.get_flat_relative_ids(upstream=True)
+            downstream_ids = task.get_flat_relative_ids(upstream=False)
+            assert index.upstream_count(task.task_id) == len(upstream_ids)
+            assert index.downstream_count(task.task_id) == len(downstream_ids)
+            assert index.upstream_weight(task.task_id) == sum(
+                dag.task_dict[task_id].priority_weight for task_id in upstream_ids
+            )
+            assert index.downstream_weight(task.task_id) == sum(
+                dag.task_dict[task_id].priority_weight for task_id in downstream_ids
+            )
+        assert start.priority_weight_total == 2 + 0 + 1 + 2 + 7
+
+    @pytest.mark.parametrize(
+        "weights",
+        [
+            pytest.param([5] * 8, id="equal"),
+            pytest.param([3, 1, 4, 1, 5, 9, 2, 6], id="distinct"),
+            pytest.param([1000, -3, 0, 2**40, -(2**20), 7, 7, 1], id="large-and-negative"),
+        ],
+    )
+    def test_dag_priority_weight_index_sums_weights(self, weights):
+        with DAG("dag", start_date=DEFAULT_DATE) as dag:
+            tasks = [
+                EmptyOperator(task_id=f"task{i}", priority_weight=weight) for i, weight in enumerate(weights)
+            ]
+            tasks[0] >> tasks[1:4] >> tasks[4]
+            tasks[4] >> tasks[5] >> [tasks[6], tasks[7]]
+            tasks[2] >> tasks[6]
+
+        index = dag.get_priority_weight_index()
+        for task in dag.tasks:
+            assert index.upstream_weight(task.task_id) == sum(
+                dag.task_dict[task_id].priority_weight
+                for task_id in task.get_flat_relative_ids(upstream=True)
+            )
+            assert index.downstream_weight(task.task_id) == sum(
+                dag.task_dict[task_id].priority_weight
+                for task_id in task.get_flat_relative_ids(upstream=False)
+            )
+
+    def test_dag_priority_weight_index_reset(self):
+        with DAG("dag", start_date=DEFAULT_DATE) as dag:
+            task1 = EmptyOperator(task_id="task1")
+            task2 = EmptyOperator(task_id="task2")
+            task1 >> task2
+        assert task1.priority_weight_total == 2
+
+        task3 = EmptyOperator(task_id="task3", dag=dag)
+        task2 >> task3
+        assert task1.priority_weight_total == 3
+
+        task3.priority_weight = 10
+        assert task1.priority_weight_total == 12
+        assert "task3" in dag.partial_subset("task3", include_upstream=False).get_priority_weight_index()
+
     def test_dag_task_invalid_weight_rule(self):
         # Test if we enter an invalid weight rule
         with DAG("dag", start_date=DEFAULT_DATE, default_args={"owner": "owner1"}):
@@ -36,7 +36,7 @@ from sqlalchemy.exc import OperationalError
 
 import airflow.example_dags
 from airflow import settings
-from airflow.exceptions import RemovedInAirflow3Warning, SerializationError
+from airflow.exceptions import AirflowConfigException, RemovedInAirflow3Warning, SerializationError
 from airflow.models.dag import DAG, DagModel
 from airflow.models.dagbag import DagBag
 from airflow.models.serialized_dag import SerializedDagModel
@@ -1055,6 +1055,83 @@ class TestDagBag:
         assert set(updated_ser_dag.tags) == {"example", "example2", "new_tag"}
         assert updated_ser_dag_update_time > ser_dag_update_time
 
+    @pytest.fixture
+    def serialized_dags(self):
+        for dag_id in ("dag_1", "dag_2", "dag_3"):
+            SerializedDagModel.write_dag(DAG(dag_id, schedule=None, start_date=tz.datetime(2020, 1, 1)))
+        yield
+        db.clear_db_serialized_dags()
+
+    @pytest.mark.usefixtures("serialized_dags")
+    @pytest.mark.parametrize(
+        "policy, expected_dag_ids",
+        [
+            pytest.param("lru", {"dag_1", "dag_3"}, id="lru"),
+            pytest.param("lfu", {"dag_2", "dag_3"}, id="lfu"),
+        ],
+    )
+    def test_get_dag_evicts_dags_over_max_dags(self, policy, expected_dag_ids):
+        with conf_vars({("core", "dagbag_cache_max_dags"): "2", ("core", "dagbag_cache_policy"): policy}):
+            dag_bag = DagBag(read_dags_from_db=True)
+        with patch("airflow.models.dagbag.Stats.incr") as mock_incr:
+            dag_bag.get_dag("dag_1")
+            dag_bag.get_dag("dag_2")
+            dag_bag.get_dag("dag_2")
+            dag_bag.get_dag("dag_2")
+            dag_bag.get_dag("dag_1")
+            dag_bag.get_dag("dag_3")
+
+        assert (
+            set(dag_bag.dags) == set(dag_bag.dags_hash) == set(dag_bag.dags_last_fetched) == expected_dag_ids
+        )
+        assert [call.args[0] for call in mock_incr.call_args_list] == [
+            "dagbag.cache_miss",
+            "dagbag.cache_miss",
+            "dagbag.cache_hit",
+            "dagbag.cache_hit",
+            "dagbag.cache_hit",
+            "dagbag.cache_miss",
+            "dagbag.cache_eviction",
+        ]
+
+        # Evicted DAGs are loaded again when needed
+        assert dag_bag.get_dag("dag_2").dag_id == "dag_2"
+        assert len(dag_bag.dags) == 2
+
+    @pytest.mark.usefixtures("serialized_dags")
+    def test_get_dag_evicts_dags_over_max_size(self):
+        with conf_vars({("core", "dagbag_cache_max_size"): "1"}):
+            dag_bag = DagBag(read_dags_from_db=True)
+        dag_bag.get_dag("dag_1")
+        # Pretend the DAG is 1MiB large when serialized
+        dag_bag.dags_size["dag_1"] = 1024 * 1024
+        dag_bag.get_dag("dag_2")
+        dag_bag.get_dag("dag_3")
+
+        assert set(dag_bag.dags) == {"dag_2", "dag_3"}
+        assert dag_bag.dags_size.keys() == {"dag_2", "dag_3"}
+
+    @pytest.mark.usefixtures("serialized_dags")
+    def test_get_dag_records_stored_size(self):
+        with conf_vars({("core", "dagbag_cache_max_size"): "1"}):
+            dag_bag = DagBag(read_dags_from_db=True)
+        dag_bag.get_dag("dag_1")
+
+        assert dag_bag.dags_size["dag_1"] == SerializedDagModel.get_stored_size("dag_1") > 0
+
+    @conf_vars({("core", "dagbag_cache_policy"): "fifo"})
+    def test_invalid_cache_policy(self):
+        with pytest.raises(AirflowConfigException, match="dagbag_cache_policy"):
+            DagBag(read_dags_from_db=True)
+
+    @pytest.mark.usefixtures("serialized_dags")
+    def test_get_dag_keeps_all_dags_by_default(self):
+        dag_bag = DagBag(read_dags_from_db=True)
+        for dag_id in ("dag_1", "dag_2", "dag_3"):
+            dag_bag.get_dag(dag_id)
+
+        assert set(dag_bag.dags) == {"dag_1", "dag_2", "dag_3"}
+
     def test_collect_dags_from_db(self):
         """DAGs are collected from Database"""
         db.clear_db_dags()
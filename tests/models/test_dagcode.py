@@ -161,3 +161,21 @@ class TestDagCode:
                     assert new_result.fileloc == example_dag.fileloc
                     assert new_result.source_code == "# dummy code"
                     assert new_result.last_updated > result.last_updated
+
+    def test_db_code_not_rewritten_when_touched_dag_file_is_unchanged(self):
+        """Test DagCode only records the new modification time when the DAG file content is the same"""
+        example_dag = make_example_dags(example_dags_module).get("example_bash_operator")
+        example_dag.sync_to_db()
+
+        with create_session() as session:
+            result = session.query(DagCode).filter(DagCode.fileloc == example_dag.fileloc).one()
+
+        with patch("airflow.models.dagcode.os.path.getmtime") as mock_mtime:
+            mock_mtime.return_value = (result.last_updated + timedelta(seconds=1)).timestamp()
+            example_dag.sync_to_db()
+
+        with create_session() as session:
+            new_result = session.query(DagCode).filter(DagCode.fileloc == example_dag.fileloc).one()
+
+            assert new_result.source_code == result.source_code
+            assert new_result.last_updated > result.last_updated
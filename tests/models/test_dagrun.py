@@ -33,6 +33,7 @@ from airflow.exceptions import AirflowException
 from airflow.models.baseoperator import BaseOperator
 from airflow.models.dag import DAG, DagModel
 from airflow.models.dagrun import DagRun, DagRunNote
+from airflow.models.scheduler_shard import SchedulerShard
 from airflow.models.taskinstance import TaskInstance, TaskInstanceNote, clear_task_instances
 from airflow.models.taskmap import TaskMap
 from airflow.models.taskreschedule import TaskReschedule
@@ -852,6 +853,51 @@ class TestDagRun:
         runs = DagRun.next_dagruns_to_examine(state, session).all()
         assert runs == []
 
+    def test_next_changed_dagruns_to_examine(self, session):
+        """Check that only dirty, unexamined, waiting-on-time or stale running dagruns are returned."""
+        dag = DAG(dag_id="test_changed_dagruns", start_date=DEFAULT_DATE, schedule="@daily")
+        EmptyOperator(task_id="dummy", dag=dag, owner="airflow")
+        session.add(DagModel(dag_id=dag.dag_id, has_task_concurrency_limits=False, is_active=True))
+        session.flush()
+
+        now = timezone.utcnow()
+        runs = {}
+        for i, name in enumerate(["unchanged", "dirty", "never_examined", "retrying", "stale"]):
+            execution_date = DEFAULT_DATE + datetime.timedelta(days=i)
+            runs[name] = dag.create_dagrun(
+                run_type=DagRunType.SCHEDULED,
+                state=DagRunState.RUNNING,
+                execution_date=execution_date,
+                data_interval=dag.infer_automated_data_interval(execution_date),
+                start_date=DEFAULT_DATE,
+                session=session,
+            )
+            runs[name].last_scheduling_decision = now
+        runs["never_examined"].last_scheduling_decision = None
+        runs["stale"].last_scheduling_decision = now - datetime.timedelta(hours=1)
+        runs["retrying"].get_task_instance("dummy", session=session).state = TaskInstanceState.UP_FOR_RETRY
+        session.flush()
+
+        examined = DagRun.next_changed_dagruns_to_examine(
+            [(dag.dag_id, runs["dirty"].run_id)],
+            stale_before=now - datetime.timedelta(minutes=5),
+            session=session,
+        ).all()
+
+        # dirty runs come first
+        assert examined[0] == runs["dirty"]
+        assert set(examined) == {runs["dirty"], runs["never_examined"], runs["retrying"], runs["stale"]}
+        assert DagRun.count_running_dagruns(session) == 5
+        # In sharded mode only the DagRuns of the DAGs of the shards held are counted
+        session.get(DagModel, dag.dag_id).shard_key = 0
+        session.flush()
+        assert (
+            DagRun.count_running_dagruns(session, shard_condition=SchedulerShard.dag_condition([0], 2)) == 5
+        )
+        assert (
+            DagRun.count_running_dagruns(session, shard_condition=SchedulerShard.dag_condition([1], 2)) == 0
+        )
+
     @mock.patch.object(Stats, "timing")
     def test_no_scheduling_delay_for_nonscheduled_runs(self, stats_mock, session):
         """
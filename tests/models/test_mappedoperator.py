@@ -33,6 +33,7 @@ from airflow.models.dag import DAG
 from airflow.models.mappedoperator import MappedOperator
 from airflow.models.param import ParamsDict
 from airflow.models.taskinstance import TaskInstance
+from airflow.models.taskinstancecounter import TaskInstanceCounter
 from airflow.models.taskmap import TaskMap
 from airflow.models.xcom_arg import XComArg
 from airflow.operators.python import PythonOperator
@@ -42,6 +43,7 @@ from airflow.utils.task_instance_session import set_current_task_instance_sessio
 from airflow.utils.trigger_rule import TriggerRule
 from airflow.utils.xcom import XCOM_RETURN_KEY
 from tests.models import DEFAULT_DATE
+from tests.test_utils.config import conf_vars
 from tests.test_utils.mapping import expand_mapped_task
 from tests.test_utils.mock_operators import MockOperator, MockOperatorWithNestedFields, NestedFields
 
@@ -336,6 +338,43 @@ def test_expand_mapped_task_failed_state_in_db(dag_maker, session):
     assert indices == [(0, "success"), (1, "success")]
 
 
+@conf_vars(
+    {
+        ("scheduler", "mapped_task_expansion_batch_size"): "2",
+        ("scheduler", "task_instance_counters"): "True",
+    }
+)
+def test_expand_mapped_task_instance_in_batches(dag_maker, session):
+    with dag_maker(session=session):
+        task1 = BaseOperator(task_id="op1")
+        mapped = MockOperator.partial(task_id="task_2", priority_weight=3).expand(arg2=task1.output)
+
+    dr = dag_maker.create_dagrun()
+    unmapped_ti = dr.get_task_instance(mapped.task_id, session=session)
+    unmapped_ti.state = TaskInstanceState.SCHEDULED
+    session.flush()
+    session.add(
+        TaskMap(dag_id=dr.dag_id, task_id=task1.task_id, run_id=dr.run_id, map_index=-1, length=5, keys=None)
+    )
+    session.flush()
+
+    with patch.object(TaskInstance, "insert_mapping", wraps=TaskInstance.insert_mapping) as insert_mapping:
+        expanded_tis, max_map_index = mapped.expand_mapped_task(dr.run_id, session=session)
+
+    # The built-in priority weight strategies do not depend on the map index
+    assert insert_mapping.call_count == 1
+    assert max_map_index == 4
+    assert [(ti.map_index, ti.state, ti.priority_weight) for ti in expanded_tis] == [
+        (i, TaskInstanceState.SCHEDULED, 3) for i in range(5)
+    ]
+    assert all(ti.task is mapped for ti in expanded_tis)
+    assert TaskInstanceCounter.task_counts([TaskInstanceState.SCHEDULED], session=session) == {
+        (dr.dag_id, dr.run_id, mapped.task_id): 5
+    }
+    session.flush()
+    assert TaskInstanceCounter.reconcile(session=session) == 0
+
+
 def test_expand_mapped_task_instance_skipped_on_zero(dag_maker, session):
     with dag_maker(session=session):
         task1 = BaseOperator(task_id="op1")
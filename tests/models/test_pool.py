@@ -27,6 +27,7 @@ from airflow.operators.empty import EmptyOperator
 from airflow.utils import timezone
 from airflow.utils.session import create_session
 from airflow.utils.state import State
+from tests.test_utils.config import conf_vars
 from tests.test_utils.db import clear_db_dags, clear_db_pools, clear_db_runs, set_default_pool_slots
 
 pytestmark = pytest.mark.db_test
@@ -247,6 +248,42 @@ class TestPool:
             }
         } == Pool.slots_stats()
 
+    @conf_vars({("scheduler", "task_instance_counters"): "True"})
+    def test_slots_stats_from_task_instance_counters(self, dag_maker):
+        pool = Pool(pool="test_pool", slots=5, include_deferred=True)
+        with dag_maker(dag_id="test_slots_stats_from_task_instance_counters"):
+            op1 = EmptyOperator(task_id="dummy1", pool="test_pool")
+            op2 = EmptyOperator(task_id="dummy2", pool="test_pool", pool_slots=2)
+            op3 = EmptyOperator(task_id="dummy3", pool="test_pool")
+
+        dr = dag_maker.create_dagrun()
+
+        ti1 = TI(task=op1, run_id=dr.run_id)
+        ti2 = TI(task=op2, run_id=dr.run_id)
+        ti3 = TI(task=op3, run_id=dr.run_id)
+        ti1.state = State.RUNNING
+        ti2.state = State.QUEUED
+        ti3.state = State.DEFERRED
+
+        session = settings.Session()
+        session.add(pool)
+        session.merge(ti1)
+        session.merge(ti2)
+        session.merge(ti3)
+        session.commit()
+        session.close()
+
+        assert Pool.slots_stats()["test_pool"] == {
+            "open": 1,
+            "queued": 2,
+            "total": 5,
+            "running": 1,
+            "scheduled": 0,
+            "deferred": 1,
+        }
+        with conf_vars({("scheduler", "task_instance_counters"): "False"}):
+            assert Pool.slots_stats()["test_pool"]["open"] == 1
+
     def test_get_pool(self):
         self.add_pools()
         pool = Pool.get_pool(pool_name=self.pools[0].pool)
@@ -0,0 +1,152 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from airflow.jobs.job import Job
+from airflow.models.dag import DagModel
+from airflow.models.scheduler_shard import NUM_SHARD_KEYS, SchedulerShard, dag_shard_key
+from airflow.utils import timezone
+from airflow.utils.session import create_session
+from airflow.utils.state import JobState
+from tests.test_utils.db import clear_db_dags
+
+pytestmark = pytest.mark.db_test
+
+
+@pytest.fixture
+def session():
+    with create_session() as session:
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def clear_db(session):
+    session.query(SchedulerShard).delete()
+    session.query(Job).delete()
+    clear_db_dags()
+    yield
+    session.query(SchedulerShard).delete()
+    session.query(Job).delete()
+    clear_db_dags()
+    session.commit()
+
+
+def make_scheduler_job(session, latest_heartbeat=None) -> int:
+    job = Job(job_type="SchedulerJob", state=JobState.RUNNING)
+    job.latest_heartbeat = latest_heartbeat or timezone.utcnow()
+    session.add(job)
+    session.commit()
+    return job.id
+
+
+def holders(session) -> dict[int, int | None]:
+    return dict(session.execute(select(SchedulerShard.shard, SchedulerShard.job_id)).all())
+
+
+def test_dag_shard_key_is_stable():
+    assert dag_shard_key("example_dag") == dag_shard_key("example_dag")
+    assert 0 <= dag_shard_key("example_dag") < NUM_SHARD_KEYS
+
+
+@pytest.mark.parametrize("num_shards", [1, 3, 16, NUM_SHARD_KEYS])
+def test_shard_key_ranges_cover_all_keys(num_shards):
+    keys = [
+        key
+        for shard in range(num_shards)
+        for key in range(*SchedulerShard.shard_key_range(shard, num_shards))
+    ]
+    assert keys == list(range(NUM_SHARD_KEYS))
+
+
+def test_claim_single_scheduler(session):
+    job_id = make_scheduler_job(session)
+
+    assert SchedulerShard.claim(job_id, 4, session=session) == [0, 1, 2, 3]
+    session.commit()
+    assert holders(session) == {0: job_id, 1: job_id, 2: job_id, 3: job_id}
+
+
+def test_claim_rebalances_between_schedulers(session):
+    job_1 = make_scheduler_job(session)
+    SchedulerShard.claim(job_1, 4, session=session)
+    session.commit()
+
+    # A second scheduler does not take shards still held by a running scheduler
+    job_2 = make_scheduler_job(session)
+    assert SchedulerShard.claim(job_2, 4, session=session) == []
+    session.commit()
+
+    # The first scheduler releases the shards assigned to the second one, which then claims them
+    assert SchedulerShard.claim(job_1, 4, session=session) == [0, 2]
+    session.commit()
+    assert SchedulerShard.claim(job_2, 4, session=session) == [1, 3]
+    session.commit()
+    assert holders(session) == {0: job_1, 1: job_2, 2: job_1, 3: job_2}
+
+
+def test_claim_shards_of_dead_scheduler(session):
+    dead_job = make_scheduler_job(session, latest_heartbeat=timezone.utcnow() - timedelta(hours=1))
+    session.add_all(SchedulerShard(shard=shard, job_id=dead_job) for shard in range(4))
+    session.commit()
+
+    job_id = make_scheduler_job(session)
+    assert SchedulerShard.claim(job_id, 4, session=session) == [0, 1, 2, 3]
+
+
+def test_claim_removes_shards_when_num_shards_decreases(session):
+    job_id = make_scheduler_job(session)
+    SchedulerShard.claim(job_id, 8, session=session)
+    session.commit()
+
+    assert SchedulerShard.claim(job_id, 2, session=session) == [0, 1]
+    session.commit()
+    assert holders(session) == {0: job_id, 1: job_id}
+
+
+def test_release(session):
+    job_id = make_scheduler_job(session)
+    SchedulerShard.claim(job_id, 2, session=session)
+    session.commit()
+
+    SchedulerShard.release(job_id, session=session)
+    session.commit()
+    assert holders(session) == {0: None, 1: None}
+
+
+def test_dag_condition(session):
+    dag_ids = [f"dag_{i}" for i in range(20)]
+    session.add_all(DagModel(dag_id=dag_id) for dag_id in dag_ids)
+    session.add(DagModel(dag_id="dag_without_shard_key"))
+    session.commit()
+    session.execute(
+        DagModel.__table__.update().where(DagModel.dag_id == "dag_without_shard_key").values(shard_key=None)
+    )
+
+    def dags_of(shards):
+        condition = SchedulerShard.dag_condition(shards, 2)
+        return set(session.scalars(select(DagModel.dag_id).where(condition)))
+
+    assert dags_of([]) == set()
+    shard_0 = {dag_id for dag_id in dag_ids if dag_shard_key(dag_id) < NUM_SHARD_KEYS // 2}
+    assert dags_of([0]) == shard_0 | {"dag_without_shard_key"}
+    assert dags_of([1]) == set(dag_ids) - shard_0
+    assert dags_of([0, 1]) == set(dag_ids) | {"dag_without_shard_key"}
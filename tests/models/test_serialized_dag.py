@@ -19,17 +19,19 @@
 
 from __future__ import annotations
 
+import zlib
 from unittest import mock
 
 import pendulum
 import pytest
+from sqlalchemy import insert
 
 import airflow.example_dags as example_dags_module
 from airflow.datasets import Dataset
 from airflow.models.dag import DAG
 from airflow.models.dagbag import DagBag
 from airflow.models.dagcode import DagCode
-from airflow.models.serialized_dag import SerializedDagModel as SDM
+from airflow.models.serialized_dag import SerializedDagModel as SDM, SerializedTaskModel
 from airflow.operators.bash import BashOperator
 from airflow.serialization.serialized_objects import SerializedDAG
 from airflow.settings import json
@@ -156,6 +158,44 @@ class TestSerializedDagModel:
             assert serialized_dag.dag_id == dag.dag_id
             assert set(serialized_dag.task_dict) == set(dag.task_dict)
 
+    @mock.patch("airflow.models.serialized_dag.LAZY_DESERIALIZE_DAG_TASKS", True)
+    def test_read_dags_lazily(self):
+        """DAGs read from database can have their tasks deserialized when they are accessed."""
+        example_dags = self._write_example_dags()
+        serialized_dags = SDM.read_all_dags()
+        assert len(example_dags) == len(serialized_dags)
+        for dag_id, dag in example_dags.items():
+            serialized_dag = serialized_dags[dag_id]
+
+            assert set(serialized_dag.task_dict) == set(dag.task_dict)
+            for task in dag.tasks:
+                serialized_task = serialized_dag.get_task(task.task_id)
+                assert serialized_task.upstream_task_ids == task.upstream_task_ids
+                assert serialized_task.downstream_task_ids == task.downstream_task_ids
+                assert serialized_task.task_group.group_id == task.task_group.group_id
+
+    @pytest.mark.parametrize("serialized_dag_format", ["orjson", "msgpack"])
+    def test_read_dags_written_in_another_format(self, serialized_dag_format):
+        """DAGs written in any format can be read, whatever the format configured."""
+        pytest.importorskip(serialized_dag_format)
+        with mock.patch("airflow.models.serialized_dag.SERIALIZED_DAG_FORMAT", serialized_dag_format):
+            example_dags = self._write_example_dags()
+        with create_session() as session:
+            assert session.query(SDM).filter(SDM._data_compressed.isnot(None)).count() == len(example_dags)
+        serialized_dags = SDM.read_all_dags()
+        assert set(serialized_dags) == set(example_dags)
+        for dag_id, dag in example_dags.items():
+            assert set(serialized_dags[dag_id].task_dict) == set(dag.task_dict)
+
+    @mock.patch("airflow.models.serialized_dag.COMPRESS_SERIALIZED_DAGS", True)
+    def test_compressed_dags_are_readable_by_older_versions(self):
+        """DAGs compressed with the default codec are written as before codecs existed."""
+        example_dags = self._write_example_dags()
+        for dag_id in example_dags:
+            serialized_dag = SDM.get(dag_id)
+            assert serialized_dag._data is None
+            assert json.loads(zlib.decompress(serialized_dag._data_compressed)) == serialized_dag.data
+
     def test_remove_dags_by_id(self):
         """DAGs can be removed from database."""
         example_dags_list = list(self._write_example_dags().values())
@@ -245,3 +285,145 @@ class TestSerializedDagModel:
 
             # dag hash should not change without change in structure (we're in a loop)
             assert this_dag_hash == first_dag_hash
+
+
+class TestChunkedSerializedDagModel:
+    """Unit tests for SerializedDagModel storing tasks in the serialized_task table."""
+
+    @pytest.fixture(
+        autouse=True,
+        params=[
+            pytest.param(False, id="raw-serialized_dags"),
+            pytest.param(True, id="compress-serialized_dags"),
+        ],
+    )
+    def setup_test_cases(self, request):
+        db.clear_db_serialized_dags()
+        with mock.patch("airflow.models.serialized_dag.COMPRESS_SERIALIZED_DAGS", request.param), mock.patch(
+            "airflow.models.serialized_dag.CHUNK_SERIALIZED_DAGS", True
+        ):
+            yield
+        db.clear_db_serialized_dags()
+
+    @staticmethod
+    def _make_dag(bash_commands):
+        with DAG(dag_id="chunked", start_date=pendulum.datetime(2021, 1, 1, tz="UTC"), schedule=None) as dag:
+            for task_id, bash_command in bash_commands.items():
+                BashOperator(task_id=task_id, bash_command=bash_command)
+        return dag
+
+    @staticmethod
+    def _get_task_hashes(session):
+        return dict(
+            session.query(SerializedTaskModel.task_id, SerializedTaskModel.task_hash).filter(
+                SerializedTaskModel.dag_id == "chunked"
+            )
+        )
+
+    def test_write_dag(self):
+        """DAGs written with their tasks stored separately read back the same."""
+        example_dags = make_example_dags(example_dags_module)
+        for dag in example_dags.values():
+            SDM.write_dag(dag)
+
+        with create_session() as session:
+            for dag in example_dags.values():
+                result = session.query(SDM).filter(SDM.dag_id == dag.dag_id).one()
+                assert len(result.serialized_tasks) == len(dag.tasks)
+                SerializedDAG.validate_schema(result.data)
+                # The reassembled data is the one the DAG hash was computed from
+                assert (
+                    result.dag_hash
+                    == md5(json.dumps(result.data, sort_keys=True).encode("utf-8")).hexdigest()
+                )
+                assert set(result.dag.task_dict) == set(dag.task_dict)
+
+    def test_only_changed_tasks_are_written(self):
+        SDM.write_dag(self._make_dag({"a": "echo a", "b": "echo b", "c": "echo c"}))
+        with create_session() as session:
+            first_hashes = self._get_task_hashes(session)
+        assert set(first_hashes) == {"a", "b", "c"}
+
+        with mock.patch("airflow.models.serialized_dag.insert", wraps=insert) as mock_insert:
+            assert SDM.write_dag(self._make_dag({"a": "echo a", "b": "echo changed", "d": "echo d"}))
+
+        with create_session() as session:
+            second_hashes = self._get_task_hashes(session)
+            inserted_rows = mock_insert.call_args_list
+            assert second_hashes.keys() == {"a", "b", "d"}
+            assert second_hashes["a"] == first_hashes["a"]
+            assert second_hashes["b"] != first_hashes["b"]
+            sdm = session.get(SDM, "chunked")
+            assert sdm.dag.get_task("b").bash_command == "echo changed"
+            assert set(sdm.dag.task_dict) == {"a", "b", "d"}
+        assert len(inserted_rows) == 1
+
+    def test_get_stored_size(self):
+        SDM.write_dag(self._make_dag({"a": "echo a", "b": "echo b"}))
+        with create_session() as session:
+            sdm = session.get(SDM, "chunked")
+            if sdm._data_compressed:
+                expected_size = len(sdm._data_compressed) + sum(
+                    len(task._data_compressed) for task in sdm.serialized_tasks
+                )
+                assert SDM.get_stored_size("chunked", session=session) == expected_size
+            else:
+                assert SDM.get_stored_size("chunked", session=session) > len(json.dumps(sdm._data))
+        assert SDM.get_stored_size("missing") == 0
+
+    def test_unchanged_dag_is_not_written(self):
+        assert SDM.write_dag(self._make_dag({"a": "echo a"}))
+        with mock.patch.object(SDM, "_write_serialized_tasks") as mock_write_tasks:
+            assert not SDM.write_dag(self._make_dag({"a": "echo a"}))
+        mock_write_tasks.assert_not_called()
+
+    def test_tasks_are_deleted_with_dag(self):
+        SDM.write_dag(self._make_dag({"a": "echo a", "b": "echo b"}))
+        SDM.remove_dag("chunked")
+        with create_session() as session:
+            assert self._get_task_hashes(session) == {}
+
+    @mock.patch("airflow.models.serialized_dag.LAZY_DESERIALIZE_DAG_TASKS", True)
+    def test_tasks_are_decoded_lazily(self):
+        """DAGs read lazily only decode the serialized tasks which are accessed."""
+        with DAG(dag_id="chunked", start_date=pendulum.datetime(2021, 1, 1, tz="UTC"), schedule=None) as dag:
+            BashOperator(task_id="a", bash_command="echo a") >> [
+                BashOperator(task_id="b", bash_command="echo b"),
+                BashOperator(task_id="c", bash_command="echo c"),
+            ]
+        SDM.write_dag(dag)
+
+        with create_session() as session:
+            sdm = session.get(SDM, "chunked")
+            decoded_task_ids = []
+            original_data = SerializedTaskModel.data
+
+            def data(row):
+                decoded_task_ids.append(row.task_id)
+                return original_data.fget(row)
+
+            with mock.patch.object(SerializedTaskModel, "data", property(data)):
+                lazy_dag = sdm.dag
+                assert lazy_dag.task_ids == ["a", "b", "c"]
+                assert decoded_task_ids == []
+                task = lazy_dag.get_task("b")
+                assert task.bash_command == "echo b"
+                assert task.upstream_task_ids == {"a"}
+                assert decoded_task_ids == ["b"]
+                assert lazy_dag.get_task("a").downstream_task_ids == {"b", "c"}
+                assert decoded_task_ids == ["b", "a"]
+
+    def test_blob_serialized_dag_is_still_readable(self):
+        dag = self._make_dag({"a": "echo a", "b": "echo b"})
+        with mock.patch("airflow.models.serialized_dag.CHUNK_SERIALIZED_DAGS", False):
+            SDM.write_dag(dag)
+        with create_session() as session:
+            assert self._get_task_hashes(session) == {}
+            assert set(session.get(SDM, "chunked").dag.task_dict) == {"a", "b"}
+
+        # The tasks are only moved to their own rows when the DAG changes
+        assert not SDM.write_dag(dag)
+        assert SDM.write_dag(self._make_dag({"a": "echo a", "b": "echo changed"}))
+        with create_session() as session:
+            assert self._get_task_hashes(session).keys() == {"a", "b"}
+            assert session.get(SDM, "chunked").dag.get_task("b").bash_command == "echo changed"
@@ -0,0 +1,173 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import delete, func, select, update
+
+from airflow.models.taskinstance import TaskInstance
+from airflow.models.taskinstancecounter import TaskInstanceCounter
+from airflow.operators.empty import EmptyOperator
+from airflow.utils.session import create_session
+from airflow.utils.state import TaskInstanceState
+from tests.test_utils.config import conf_vars
+from tests.test_utils.db import clear_db_dags, clear_db_runs
+
+pytestmark = pytest.mark.db_test
+
+
+@pytest.fixture
+def session():
+    with create_session() as session:
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def clear_db():
+    clear_db_runs()
+    clear_db_dags()
+    with conf_vars({("scheduler", "task_instance_counters"): "True"}):
+        yield
+    clear_db_runs()
+    clear_db_dags()
+
+
+@pytest.fixture
+def task_instances(dag_maker, session):
+    with dag_maker(dag_id="test_task_instance_counters", session=session):
+        EmptyOperator(task_id="op_1")
+        EmptyOperator(task_id="op_2", pool="test_pool", pool_slots=2)
+        EmptyOperator(task_id="op_3", pool="test_pool")
+    dag_run = dag_maker.create_dagrun(state="running")
+    return {ti.task_id: ti for ti in dag_run.get_task_instances(session=session)}
+
+
+def counters(session) -> dict[tuple[str, str, str], tuple[int, int]]:
+    return {
+        (row.task_id, row.pool, row.state): (row.count, row.slots)
+        for row in session.scalars(select(TaskInstanceCounter))
+        if row.count or row.slots
+    }
+
+
+def assert_counters_match_task_instances(session):
+    session.flush()
+    assert TaskInstanceCounter.reconcile(session=session) == 0
+
+
+def test_flushed_changes_are_counted(task_instances, session):
+    op_1, op_2 = task_instances["op_1"], task_instances["op_2"]
+    op_1.state = TaskInstanceState.SCHEDULED
+    op_2.state = TaskInstanceState.QUEUED
+    session.flush()
+    assert counters(session) == {
+        ("op_1", "default_pool", "scheduled"): (1, 1),
+        ("op_2", "test_pool", "queued"): (1, 2),
+    }
+
+    op_1.state = TaskInstanceState.QUEUED
+    op_1.pool = "test_pool"
+    op_2.state = TaskInstanceState.SUCCESS
+    session.flush()
+    assert counters(session) == {("op_1", "test_pool", "queued"): (1, 1)}
+
+    session.delete(op_1)
+    session.flush()
+    assert counters(session) == {}
+    assert_counters_match_task_instances(session)
+
+
+def test_bulk_changes_are_counted(task_instances, session):
+    session.execute(
+        update(TaskInstance)
+        .where(TaskInstance.dag_id == "test_task_instance_counters")
+        .values(state=TaskInstanceState.SCHEDULED)
+        .execution_options(synchronize_session=False)
+    )
+    assert counters(session) == {
+        ("op_1", "default_pool", "scheduled"): (1, 1),
+        ("op_2", "test_pool", "scheduled"): (1, 2),
+        ("op_3", "test_pool", "scheduled"): (1, 1),
+    }
+
+    session.query(TaskInstance).filter(TaskInstance.task_id.in_(["op_2", "op_3"])).update(
+        {TaskInstance.state: TaskInstanceState.RUNNING, TaskInstance.pool: "other_pool"},
+        synchronize_session=False,
+    )
+    assert counters(session) == {
+        ("op_1", "default_pool", "scheduled"): (1, 1),
+        ("op_2", "other_pool", "running"): (1, 2),
+        ("op_3", "other_pool", "running"): (1, 1),
+    }
+
+    session.execute(
+        delete(TaskInstance)
+        .where(TaskInstance.task_id == "op_2")
+        .execution_options(synchronize_session=False)
+    )
+    assert counters(session) == {
+        ("op_1", "default_pool", "scheduled"): (1, 1),
+        ("op_3", "other_pool", "running"): (1, 1),
+    }
+    assert_counters_match_task_instances(session)
+
+
+def test_reconcile_corrects_changes_not_counted(task_instances, session):
+    # New values computed by the database are not counted
+    session.execute(
+        update(TaskInstance)
+        .where(TaskInstance.task_id == "op_2")
+        .values(state=TaskInstanceState.QUEUED, pool_slots=TaskInstance.pool_slots + 1)
+        .execution_options(synchronize_session=False)
+    )
+    with conf_vars({("scheduler", "task_instance_counters"): "False"}):
+        task_instances["op_1"].state = TaskInstanceState.RUNNING
+        session.flush()
+    assert counters(session) == {}
+
+    assert TaskInstanceCounter.reconcile(session=session) == 2
+    assert counters(session) == {
+        ("op_1", "default_pool", "running"): (1, 1),
+        ("op_2", "test_pool", "queued"): (1, 3),
+    }
+
+    session.execute(update(TaskInstance).values(state=None).execution_options(synchronize_session=False))
+    with conf_vars({("scheduler", "task_instance_counters"): "False"}):
+        session.execute(
+            update(TaskInstance).values(state="running").execution_options(synchronize_session=False)
+        )
+        session.execute(update(TaskInstance).values(state=None).execution_options(synchronize_session=False))
+    assert TaskInstanceCounter.reconcile(session=session) == 0
+    # Empty counters are deleted
+    assert session.scalar(select(func.count()).select_from(TaskInstanceCounter)) == 0
+
+
+def test_task_counts(task_instances, session):
+    task_instances["op_1"].state = TaskInstanceState.RUNNING
+    task_instances["op_2"].state = TaskInstanceState.QUEUED
+    task_instances["op_3"].state = TaskInstanceState.SCHEDULED
+    session.flush()
+
+    run_id = task_instances["op_1"].run_id
+    counts = TaskInstanceCounter.task_counts(
+        [TaskInstanceState.RUNNING, TaskInstanceState.QUEUED], session=session
+    )
+    assert counts == {
+        ("test_task_instance_counters", run_id, "op_1"): 1,
+        ("test_task_instance_counters", run_id, "op_2"): 1,
+    }
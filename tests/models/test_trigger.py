@@ -19,17 +19,23 @@ from __future__ import annotations
 import datetime
 import json
 from typing import Any, AsyncIterator
+from unittest import mock
 
 import pytest
 import pytz
 from cryptography.fernet import Fernet
+from sqlalchemy import select
 
+from airflow.exceptions import TaskDeferred
 from airflow.jobs.job import Job
 from airflow.jobs.triggerer_job_runner import TriggererJobRunner
 from airflow.models import TaskInstance, Trigger
+from airflow.models.trigger import notify_triggerers
 from airflow.operators.empty import EmptyOperator
 from airflow.serialization.serialized_objects import BaseSerialization
 from airflow.triggers.base import BaseTrigger, TriggerEvent
+from airflow.triggers.temporal import DateTimeTrigger
+from airflow.triggers.testing import SuccessTrigger
 from airflow.utils import timezone
 from airflow.utils.session import create_session
 from airflow.utils.state import State
@@ -120,6 +126,51 @@ def test_submit_event(session, create_task_instance):
     assert updated_task_instance.next_kwargs == {"event": 42, "cheesecake": True}
 
 
+def test_submit_events(session, dag_maker):
+    """
+    Tests that a batch of events re-wakes the dependent task instances of all
+    their triggers, with the first event of each trigger.
+    """
+    triggers = [Trigger(classpath="airflow.triggers.testing.SuccessTrigger", kwargs={}) for _ in range(3)]
+    session.add_all(triggers)
+    session.flush()
+    with dag_maker(session=session):
+        for i in range(4):
+            EmptyOperator(task_id=f"task_{i}")
+    dag_run = dag_maker.create_dagrun()
+    tis = sorted(dag_run.task_instances, key=lambda ti: ti.task_id)
+    for ti, trigger in zip(tis, [triggers[0], triggers[0], triggers[1], triggers[2]]):
+        ti.state = State.DEFERRED
+        ti.trigger_id = trigger.id
+    tis[0].next_kwargs = {"cheesecake": True}
+    tis[3].state = State.SUCCESS
+    session.commit()
+
+    Trigger.submit_events(
+        [
+            (triggers[0].id, TriggerEvent(1)),
+            (triggers[1].id, TriggerEvent(2)),
+            (triggers[0].id, TriggerEvent(3)),
+            (triggers[2].id, TriggerEvent(4)),
+        ],
+        session=session,
+    )
+    session.commit()
+    session.expunge_all()
+
+    updated_tis = {
+        ti.task_id: (ti.state, ti.trigger_id, ti.next_kwargs)
+        for ti in session.scalars(select(TaskInstance).where(TaskInstance.run_id == dag_run.run_id))
+    }
+    assert updated_tis == {
+        "task_0": (State.SCHEDULED, None, {"cheesecake": True, "event": 1}),
+        "task_1": (State.SCHEDULED, None, {"event": 1}),
+        "task_2": (State.SCHEDULED, None, {"event": 2}),
+        # Only deferred task instances are resumed
+        "task_3": (State.SUCCESS, triggers[2].id, None),
+    }
+
+
 def test_submit_failure(session, create_task_instance):
     """
     Tests that failures submitted to a trigger fail their dependent
@@ -144,6 +195,69 @@ def test_submit_failure(session, create_task_instance):
     assert updated_task_instance.next_method == "__fail__"
 
 
+def test_from_object_dedup_key():
+    moment = timezone.datetime(2024, 1, 1)
+    trigger = Trigger.from_object(DateTimeTrigger(moment))
+    assert trigger.dedup_key == Trigger.from_object(DateTimeTrigger(moment)).dedup_key
+    assert trigger.dedup_key == Trigger.compute_dedup_key(
+        "airflow.triggers.temporal.DateTimeTrigger", {"moment": moment}
+    )
+    assert (
+        trigger.dedup_key
+        != Trigger.from_object(DateTimeTrigger(moment + datetime.timedelta(days=1))).dedup_key
+    )
+    # Triggers are only shared when their class allows it
+    assert Trigger.from_object(SuccessTrigger()).dedup_key is None
+
+
+def test_identical_triggers_are_shared(session, dag_maker):
+    """
+    Tests that task instances deferred on identical shareable triggers share a single trigger, whose
+    event resumes all of them.
+    """
+    with dag_maker(dag_id="test_identical_triggers_are_shared", session=session):
+        for i in range(3):
+            EmptyOperator(task_id=f"task_{i}")
+    dr = dag_maker.create_dagrun()
+    moment = timezone.datetime(2024, 1, 1)
+    tis = sorted(dr.get_task_instances(session=session), key=lambda ti: ti.task_id)
+    for ti in tis[:2]:
+        ti.defer_task(TaskDeferred(trigger=DateTimeTrigger(moment), method_name="execute"), session=session)
+    tis[2].defer_task(
+        TaskDeferred(trigger=DateTimeTrigger(moment + datetime.timedelta(days=1)), method_name="execute"),
+        session=session,
+    )
+
+    assert tis[0].trigger_id == tis[1].trigger_id
+    assert tis[2].trigger_id != tis[0].trigger_id
+    assert session.query(Trigger).count() == 2
+
+    # The trigger is fetched with one of its task instances, to run in its context
+    triggers = Trigger.bulk_fetch([tis[0].trigger_id], session=session)
+    assert triggers[tis[0].trigger_id].task_instance in tis[:2]
+
+    Trigger.submit_event(trigger_id=tis[0].trigger_id, event=TriggerEvent(True), session=session)
+    session.flush()
+    session.expire_all()
+    states = {ti.task_id: ti.state for ti in dr.get_task_instances(session=session)}
+    assert states == {"task_0": State.SCHEDULED, "task_1": State.SCHEDULED, "task_2": State.DEFERRED}
+
+
+def test_triggers_without_deferred_task_instances_are_not_shared(session, create_task_instance):
+    trigger = Trigger.from_object(DateTimeTrigger(timezone.datetime(2024, 1, 1)))
+    session.add(trigger)
+    session.flush()
+    ti = create_task_instance(session=session, state=State.DEFERRED)
+    ti.trigger_id = trigger.id
+    session.flush()
+    assert Trigger.get_shared_trigger_id(trigger.dedup_key, session=session) == trigger.id
+
+    # Once the trigger fired, new task instances are deferred on a new trigger
+    ti.state = State.SCHEDULED
+    session.flush()
+    assert Trigger.get_shared_trigger_id(trigger.dedup_key, session=session) is None
+
+
 def test_assign_unassigned(session, create_task_instance):
     """
     Tests that unassigned triggers of all appropriate states are assigned.
@@ -395,3 +509,118 @@ def test_kwargs_not_encrypted():
 
     assert trigger.kwargs["param1"] == "value1"
     assert trigger.kwargs["param2"] == "value2"
+
+
+@pytest.mark.parametrize(
+    "dialect, db_notifications, notified",
+    [
+        ("postgresql", "True", True),
+        ("postgresql", "False", False),
+        ("sqlite", "True", False),
+    ],
+)
+def test_notify_triggerers(dialect, db_notifications, notified):
+    connection = mock.MagicMock()
+    connection.dialect.name = dialect
+    with conf_vars({("triggerer", "db_notifications"): db_notifications}):
+        notify_triggerers(mock.MagicMock(), connection, mock.MagicMock())
+    if notified:
+        connection.execute.assert_called_once()
+        assert str(connection.execute.call_args.args[0]) == "NOTIFY airflow_triggers"
+    else:
+        connection.execute.assert_not_called()
+
+
+def create_triggerers(session, count: int) -> list[int]:
+    triggerers = [Job(job_type="TriggererJob", state=State.RUNNING) for _ in range(count)]
+    session.add_all(triggerers)
+    session.commit()
+    return [triggerer.id for triggerer in triggerers]
+
+
+def create_triggers_with_costs(session, create_task_instance, costs, triggerer_id=None) -> list[int]:
+    trigger_ids = []
+    for cost in costs:
+        trigger = Trigger(classpath="airflow.triggers.testing.SuccessTrigger", kwargs={})
+        trigger.cost = cost
+        trigger.triggerer_id = triggerer_id
+        session.add(trigger)
+        session.flush()
+        ti = create_task_instance(
+            task_id=f"ti_{trigger.id}", run_id=f"run_{trigger.id}", state=State.DEFERRED, session=session
+        )
+        ti.trigger_id = trigger.id
+        trigger_ids.append(trigger.id)
+    session.commit()
+    return trigger_ids
+
+
+def triggerers_of(session, trigger_ids) -> dict[int, int]:
+    session.expire_all()
+    return dict(
+        session.execute(select(Trigger.id, Trigger.triggerer_id).where(Trigger.id.in_(trigger_ids))).all()
+    )
+
+
+@conf_vars({("triggerer", "cost_imbalance_tolerance"): "0.25"})
+def test_report_costs_moves_costliest_triggers(session, create_task_instance):
+    overloaded, idle = create_triggerers(session, 2)
+    trigger_ids = create_triggers_with_costs(session, create_task_instance, [None] * 4, overloaded)
+
+    moved = Trigger.report_costs(
+        overloaded, list(zip(trigger_ids, [0.5, 0.3, 0.1, 0.1])), capacity=1000, health_check_threshold=30
+    )
+
+    # The mean load is 0.5 and the limit 0.625: moving the 0.5 trigger balances the load, the 0.3 one
+    # would not reduce the imbalance anymore
+    assert moved == [trigger_ids[0]]
+    assert triggerers_of(session, trigger_ids) == {
+        trigger_ids[0]: idle,
+        trigger_ids[1]: overloaded,
+        trigger_ids[2]: overloaded,
+        trigger_ids[3]: overloaded,
+    }
+    assert session.scalars(select(Trigger.cost).where(Trigger.id.in_(trigger_ids))).all() == [
+        0.5,
+        0.3,
+        0.1,
+        0.1,
+    ]
+
+    # Balanced triggerers do not move triggers back
+    assert Trigger.report_costs(idle, [(trigger_ids[0], 0.5)], capacity=1000, health_check_threshold=30) == []
+    assert (
+        Trigger.report_costs(
+            overloaded, list(zip(trigger_ids[1:], [0.3, 0.1, 0.1])), capacity=1000, health_check_threshold=30
+        )
+        == []
+    )
+
+
+@conf_vars({("triggerer", "cost_imbalance_tolerance"): "0.25"})
+def test_report_costs_respects_capacity(session, create_task_instance):
+    overloaded, full = create_triggerers(session, 2)
+    trigger_ids = create_triggers_with_costs(session, create_task_instance, [0.5, 0.3], overloaded)
+    create_triggers_with_costs(session, create_task_instance, [None], full)
+
+    assert Trigger.report_costs(overloaded, [], capacity=1, health_check_threshold=30) == []
+    assert set(triggerers_of(session, trigger_ids).values()) == {overloaded}
+
+
+@conf_vars({("triggerer", "cost_imbalance_tolerance"): "0.25"})
+def test_assign_unassigned_balances_costs(session, create_task_instance):
+    loaded, idle = create_triggerers(session, 2)
+    create_triggers_with_costs(session, create_task_instance, [0.4], loaded)
+    trigger_ids = create_triggers_with_costs(session, create_task_instance, [0.4, None, 0.05])
+
+    # The mean load is 0.425 and the limit 0.53: the loaded triggerer only takes the cheap triggers
+    Trigger.assign_unassigned(loaded, 100, health_check_threshold=30)
+    assert triggerers_of(session, trigger_ids) == {
+        trigger_ids[0]: None,
+        trigger_ids[1]: loaded,
+        trigger_ids[2]: loaded,
+    }
+
+    # The least loaded triggerer takes the costly trigger
+    Trigger.assign_unassigned(idle, 100, health_check_threshold=30)
+    assert triggerers_of(session, trigger_ids)[trigger_ids[0]] == idle
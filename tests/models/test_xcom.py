@@ -160,6 +160,28 @@ class TestXCom:
                     session=session,
                 )
 
+    @pytest.mark.parametrize("xcom_format", ["orjson", "msgpack"])
+    def test_xcom_deserialize_with_serialization_format_switch(self, task_instance, session, xcom_format):
+        pytest.importorskip(xcom_format)
+        ti_key = TaskInstanceKey(
+            dag_id=task_instance.dag_id,
+            task_id=task_instance.task_id,
+            run_id=task_instance.run_id,
+        )
+        value = {"key": "value", "date": timezone.datetime(2024, 1, 1), "list": [1, 2]}
+        with conf_vars({("core", "xcom_serialization_format"): xcom_format}):
+            XCom.set(
+                key="xcom_test3",
+                value=value,
+                dag_id=task_instance.dag_id,
+                task_id=task_instance.task_id,
+                run_id=task_instance.run_id,
+                session=session,
+            )
+        with conf_vars({("core", "xcom_serialization_format"): "json"}):
+            ret_value = XCom.get_value(key="xcom_test3", ti_key=ti_key, session=session)
+        assert ret_value == value
+
     @conf_vars({("core", "xcom_enable_pickling"): "False"})
     def test_xcom_disable_pickle_type_fail_on_non_json(self, task_instance, session):
         class PickleRce:
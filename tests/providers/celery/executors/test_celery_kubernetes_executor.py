@@ -265,3 +265,14 @@ class TestCeleryKubernetesExecutor:
         cel_k8s_exec.send_callback(callback)
 
         cel_k8s_exec.callback_sink.send.assert_called_once_with(callback)
+
+    def test_send_callbacks(self):
+        cel_exec = CeleryExecutor()
+        k8s_exec = KubernetesExecutor()
+        cel_k8s_exec = CeleryKubernetesExecutor(cel_exec, k8s_exec)
+        cel_k8s_exec.callback_sink = mock.MagicMock()
+
+        callbacks = [CallbackRequest(full_filepath="fake"), CallbackRequest(full_filepath="other_fake")]
+        cel_k8s_exec.send_callbacks(callbacks)
+
+        cel_k8s_exec.callback_sink.send_many.assert_called_once_with(callbacks)
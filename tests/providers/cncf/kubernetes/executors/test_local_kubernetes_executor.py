@@ -120,3 +120,14 @@ class TestLocalKubernetesExecutor:
         local_k8s_exec.send_callback(callback)
 
         local_k8s_exec.callback_sink.send.assert_called_once_with(callback)
+
+    def test_send_callbacks(self):
+        local_executor_mock = mock.MagicMock()
+        k8s_executor_mock = mock.MagicMock()
+        local_k8s_exec = LocalKubernetesExecutor(local_executor_mock, k8s_executor_mock)
+        local_k8s_exec.callback_sink = mock.MagicMock()
+
+        callbacks = [CallbackRequest(full_filepath="fake"), CallbackRequest(full_filepath="other_fake")]
+        local_k8s_exec.send_callbacks(callbacks)
+
+        local_k8s_exec.callback_sink.send_many.assert_called_once_with(callbacks)
@@ -0,0 +1,97 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import datetime
+import json
+import zlib
+
+import pytest
+
+from airflow.serialization import codec
+
+DATA = {
+    "dag": {"dag_id": "test", "tasks": [{"task_id": f"task_{i}", "retries": i} for i in range(3)]},
+    "unicode": "été",
+    "nested": [[1, 2.5], {"none": None, "bool": True}],
+}
+
+REQUIRED_PACKAGES = {"orjson": "orjson", "msgpack": "msgpack", "zstd": "zstandard"}
+
+
+@pytest.fixture(params=codec.FORMATS)
+def format(request):
+    if request.param in REQUIRED_PACKAGES:
+        pytest.importorskip(REQUIRED_PACKAGES[request.param])
+    return request.param
+
+
+@pytest.fixture(params=codec.COMPRESSIONS)
+def compression(request):
+    if request.param in REQUIRED_PACKAGES:
+        pytest.importorskip(REQUIRED_PACKAGES[request.param])
+    return request.param
+
+
+class TestCodec:
+    def test_roundtrip(self, format, compression):
+        encoded = codec.encode(DATA, format, compression)
+        assert codec.has_header(encoded)
+        assert codec.decode(encoded) == DATA
+
+    def test_default_and_object_hook(self, format):
+        def default(o):
+            if isinstance(o, datetime.datetime):
+                return {"__datetime__": o.isoformat()}
+            raise TypeError(f"cannot encode {o!r}")
+
+        def object_hook(dct):
+            if "__datetime__" in dct:
+                return datetime.datetime.fromisoformat(dct["__datetime__"])
+            return dct
+
+        data = {"dates": [datetime.datetime(2024, 1, 1, 12, 30)], "other": {"a": 1}}
+        encoded = codec.encode(data, format, default=default)
+        assert codec.decode(encoded, object_hook=object_hook) == data
+        assert codec.decode(encoded) == {
+            "dates": [{"__datetime__": "2024-01-01T12:30:00"}],
+            "other": {"a": 1},
+        }
+
+    def test_encode_error_without_default(self, format):
+        with pytest.raises(TypeError):
+            codec.encode({"date": datetime.datetime(2024, 1, 1)}, format)
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            pytest.param(json.dumps(DATA).encode(), id="json"),
+            pytest.param(zlib.compress(json.dumps(DATA).encode()), id="zlib"),
+        ],
+    )
+    def test_data_written_without_codec_has_no_header(self, data):
+        assert not codec.has_header(data)
+        with pytest.raises(ValueError, match="not encoded with a serialization codec"):
+            codec.decode(data)
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError, match="unknown serialization format"):
+            codec.encode(DATA, "yaml")
+        with pytest.raises(ValueError, match="unknown compression"):
+            codec.encode(DATA, "json", "lzma")
+        with pytest.raises(ValueError, match="unknown serialization codec"):
+            codec.decode(codec.MAGIC + b"\xff\x00{}")
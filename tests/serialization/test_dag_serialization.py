@@ -68,8 +68,9 @@ from airflow.serialization.serialized_objects import (
     DependencyDetector,
     SerializedBaseOperator,
     SerializedDAG,
+    _LazyDict,
 )
-from airflow.task.priority_strategy import _DownstreamPriorityWeightStrategy
+from airflow.task.priority_strategy import PriorityWeightIndex, _DownstreamPriorityWeightStrategy
 from airflow.ti_deps.deps.base_ti_dep import BaseTIDep
 from airflow.timetables.simple import NullTimetable, OnceTimetable
 from airflow.triggers.testing import SuccessTrigger
@@ -244,6 +245,13 @@ serialized_simple_dag_ground_truth = {
             },
         },
         "edge_info": {},
+        "priority_weight_index": {
+            "topological_order": ["custom_task", "bash_task"],
+            "upstream_counts": [0, 0],
+            "downstream_counts": [0, 0],
+            "upstream_weights": [0, 0],
+            "downstream_weights": [0, 0],
+        },
         "dag_dependencies": [],
         "params": {},
     },
@@ -1261,6 +1269,7 @@ class TestStringifiedDAGs:
             "has_on_failure_callback",
             "dag_dependencies",
             "params",
+            "priority_weight_index",
         }
 
         keys_for_backwards_compat: set = {
@@ -1442,6 +1451,78 @@ class TestStringifiedDAGs:
 
         check_task_group(serialized_dag.task_group)
 
+    def test_lazy_deserialization(self):
+        """
+        Test tasks deserialized lazily are only loaded when accessed, and match eagerly deserialized tasks.
+        """
+        execution_date = datetime(2020, 1, 1)
+        with DAG("test_lazy_deserialization", start_date=execution_date) as dag:
+            task1 = BashOperator(task_id="task1", bash_command="echo 1")
+            with TaskGroup("group23") as group23:
+                task2 = EmptyOperator(task_id="task2")
+                task3 = MockOperator.partial(task_id="task3").expand(arg1=task1.output)
+                task2 >> task3
+            task4 = EmptyOperator(task_id="task4", start_date=datetime(2021, 1, 1))
+            task1 >> group23 >> task4
+
+        serialized = SerializedDAG.to_dict(dag)
+        eager_dag = SerializedDAG.from_dict(copy.deepcopy(serialized))
+        lazy_dag = SerializedDAG.from_dict(copy.deepcopy(serialized), lazy=True)
+
+        assert lazy_dag.task_ids == eager_dag.task_ids
+        assert lazy_dag.task_group.children.keys() == {"task1", "group23", "task4"}
+        assert not any(lazy_dag.task_dict.is_loaded(task_id) for task_id in lazy_dag.task_ids)
+
+        task = lazy_dag.get_task("group23.task2")
+        assert isinstance(task, SerializedBaseOperator)
+        assert task.upstream_task_ids == {"task1"}
+        assert task.downstream_task_ids == {"group23.task3"}
+        assert task.task_group.group_id == "group23"
+        assert task.dag is lazy_dag
+        assert [task_id for task_id in lazy_dag.task_ids if lazy_dag.task_dict.is_loaded(task_id)] == [
+            "group23.task2"
+        ]
+
+        # Loading a mapped task loads the tasks its expand input references
+        assert lazy_dag.get_task("group23.task3").expand_input.value["arg1"].operator is lazy_dag.get_task(
+            "task1"
+        )
+
+        for task_id in eager_dag.task_ids:
+            lazy_task, eager_task = lazy_dag.get_task(task_id), eager_dag.get_task(task_id)
+            assert lazy_task.upstream_task_ids == eager_task.upstream_task_ids
+            assert lazy_task.downstream_task_ids == eager_task.downstream_task_ids
+            assert lazy_task.task_group.group_id == eager_task.task_group.group_id
+            assert lazy_task.start_date == eager_task.start_date
+            assert SerializedBaseOperator.serialize_operator(
+                lazy_task
+            ) == SerializedBaseOperator.serialize_operator(eager_task)
+        assert lazy_dag.task_group.get_task_group_dict().keys() == {None, "group23"}
+        assert SerializedDAG.to_dict(lazy_dag) == SerializedDAG.to_dict(eager_dag)
+
+        # Copies hold the loaded tasks
+        assert not isinstance(copy.deepcopy(lazy_dag).task_dict, _LazyDict)
+        assert set(lazy_dag.partial_subset("task4", include_upstream=True).task_ids) == set(lazy_dag.task_ids)
+
+    def test_lazy_deserialization_failure_is_raised_again(self):
+        """Test a task which failed to be deserialized lazily raises the same error when accessed again."""
+        with DAG("test_lazy_deserialization_failure", start_date=datetime(2020, 1, 1)) as dag:
+            EmptyOperator(task_id="task1") >> EmptyOperator(task_id="task2")
+
+        lazy_dag = SerializedDAG.from_dict(SerializedDAG.to_dict(dag), lazy=True)
+
+        with mock.patch.object(
+            SerializedBaseOperator, "deserialize_operator", side_effect=ImportError("missing plugin")
+        ):
+            for _ in range(2):
+                with pytest.raises(ImportError, match="missing plugin"):
+                    lazy_dag.get_task("task2")
+        assert not lazy_dag.task_dict.is_loaded("task2")
+
+        task = lazy_dag.get_task("task2")
+        assert task.upstream_task_ids == {"task1"}
+        assert task.dag is lazy_dag
+
     @staticmethod
     def assert_taskgroup_children(se_task_group, dag_task_group, expected_children):
         assert se_task_group.children.keys() == dag_task_group.children.keys() == expected_children
@@ -1924,6 +2005,47 @@ class TestStringifiedDAGs:
 
         assert serialized_dag.edge_info == dag.edge_info
 
+    def test_priority_weight_index_serialization(self):
+        from airflow.operators.empty import EmptyOperator
+
+        with DAG("test_priority_weight_index_serialization", start_date=datetime(2020, 1, 1)) as dag:
+            task1 = EmptyOperator(task_id="task1", priority_weight=3)
+            task2 = EmptyOperator(task_id="task2", weight_rule="upstream")
+            task3 = EmptyOperator(task_id="task3")
+            task1 >> [task2, task3]
+
+        dag_dict = SerializedDAG.to_dict(dag)
+        SerializedDAG.validate_schema(dag_dict)
+        assert dag_dict["dag"]["priority_weight_index"]["downstream_weights"] == [2, 0, 0]
+
+        serialized_dag = SerializedDAG.from_dict(dag_dict)
+        index = serialized_dag._priority_weight_index
+        assert index is not None
+        assert index.serialize() == dag.get_priority_weight_index().serialize()
+        assert serialized_dag.task_dict["task1"].priority_weight_total == 5
+        assert serialized_dag.task_dict["task2"].priority_weight_total == 4
+
+    def test_priority_weight_index_not_serialized_for_absolute_weights(self):
+        from airflow.operators.empty import EmptyOperator
+
+        with DAG(
+            "test_priority_weight_index_not_serialized_for_absolute_weights",
+            start_date=datetime(2020, 1, 1),
+            default_args={"weight_rule": "absolute"},
+        ) as dag:
+            task1 = EmptyOperator(task_id="task1", priority_weight=3)
+            task2 = EmptyOperator(task_id="task2")
+            task1 >> task2
+
+        with mock.patch.object(PriorityWeightIndex, "build") as mock_build:
+            dag_dict = SerializedDAG.to_dict(dag)
+        mock_build.assert_not_called()
+        SerializedDAG.validate_schema(dag_dict)
+        assert "priority_weight_index" not in dag_dict["dag"]
+
+        serialized_dag = SerializedDAG.from_dict(dag_dict)
+        assert serialized_dag.task_dict["task1"].priority_weight_total == 3
+
     @pytest.mark.db_test
     @pytest.mark.parametrize("mode", ["poke", "reschedule"])
     def test_serialize_sensor(self, mode):
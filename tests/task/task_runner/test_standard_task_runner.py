@@ -32,8 +32,10 @@ from airflow.exceptions import AirflowTaskTimeout
 from airflow.jobs.job import Job
 from airflow.jobs.local_task_job_runner import LocalTaskJobRunner
 from airflow.listeners.listener import get_listener_manager
+from airflow.models.dag import DAG
 from airflow.models.dagbag import DagBag
 from airflow.models.taskinstance import TaskInstance
+from airflow.serialization.serialized_objects import SerializedDAG
 from airflow.task.task_runner.standard_task_runner import StandardTaskRunner
 from airflow.utils import timezone
 from airflow.utils.log.file_task_handler import FileTaskHandler
@@ -135,6 +137,21 @@ class TestStandardTaskRunner:
         assert task_runner.return_code() is not None
         mock_read_task_utilization.assert_called()
 
+    @pytest.mark.parametrize("serialized", [True, False])
+    @patch("airflow.utils.log.file_task_handler.FileTaskHandler._init_file")
+    def test_forked_process_parses_serialized_dag(self, mock_init, serialized):
+        mock_init.return_value = "/tmp/any"
+        Job = mock.Mock()
+        Job.job_type = None
+        Job.task_instance = mock.MagicMock()
+        Job.task_instance.run_as_user = None
+        Job.task_instance.task.dag = (SerializedDAG if serialized else DAG)(dag_id="test_dag")
+        job_runner = LocalTaskJobRunner(job=Job, task_instance=Job.task_instance)
+        task_runner = StandardTaskRunner(job_runner)
+
+        # The serialized DAG is not passed to the forked process, which parses the DAG file instead
+        assert (task_runner.dag is None) == serialized
+
     @pytest.mark.db_test
     def test_notifies_about_start_and_stop(self, tmp_path):
         path_listener_writer = tmp_path / "test_notifies_about_start_and_stop"
@@ -1644,3 +1644,103 @@ def _test_trigger_rule(
     else:
         assert not dep_statuses
     assert ti.state == expected_ti_state
+
+
+@pytest.mark.parametrize("flag_upstream_failed", [True, False])
+@pytest.mark.parametrize(
+    "trigger_rule",
+    [
+        rule
+        for rule in TriggerRule
+        # Deprecated, or only for teardown tasks
+        if rule
+        not in (TriggerRule.DUMMY, TriggerRule.NONE_FAILED_OR_SKIPPED, TriggerRule.ALL_DONE_SETUP_SUCCESS)
+    ],
+)
+def test_cached_dep_context_matches_uncached(dag_maker, session, trigger_rule, flag_upstream_failed):
+    """
+    Evaluating the trigger rules with the caches of a DepContext shared by all the task instances of a run
+    gives the same result as evaluating them with a new DepContext per task instance.
+    """
+    with dag_maker(session=session):
+
+        @task
+        def t(x=None):
+            return x
+
+        setup = t.override(task_id="setup")().as_setup()
+        success = t.override(task_id="success")()
+        failed = t.override(task_id="failed")()
+        skipped = t.override(task_id="skipped")()
+        upstream_failed = t.override(task_id="upstream_failed")()
+        running = t.override(task_id="running")()
+        mapped = t.override(task_id="mapped").expand(x=[1, 2, 3])
+
+        @task_group
+        def group(x):
+            first = t.override(task_id="first")(x)
+            return t.override(task_id="second", trigger_rule=trigger_rule)(first)
+
+        setup >> success
+
+        def downstream(task_id):
+            return t.override(task_id=task_id, trigger_rule=trigger_rule)()
+
+        all_upstreams = downstream("all_upstreams")
+        mapped_upstream = downstream("mapped_upstream")
+        [success, failed, skipped, upstream_failed, running] >> all_upstreams
+        [success, mapped] >> mapped_upstream
+        skipped >> downstream("skipped_upstream")
+        [failed, upstream_failed] >> downstream("failed_upstreams")
+        group.expand(x=[1, 2, 3]) >> downstream("group_upstream")
+        # The setup is an indirect upstream setup of the tasks upstream of its teardown
+        [all_upstreams, mapped_upstream] >> t.override(task_id="teardown")().as_teardown(setups=setup)
+
+    dr: DagRun = dag_maker.create_dagrun()
+    states = {
+        "setup": FAILED,
+        "success": SUCCESS,
+        "failed": FAILED,
+        "skipped": SKIPPED,
+        "upstream_failed": UPSTREAM_FAILED,
+        "running": TaskInstanceState.RUNNING,
+    }
+    mapped_states = [SUCCESS, FAILED, SKIPPED]
+    for ti in dr.get_task_instances(session=session):
+        if ti.task_id in states:
+            ti.state = states[ti.task_id]
+        elif ti.task_id in ("mapped", "group.first"):
+            ti.state = mapped_states[ti.map_index]
+    session.flush()
+    tis = [ti for ti in dr.get_task_instances(session=session) if ti.state is None]
+    for ti in tis:
+        ti.task = dag_maker.dag.get_task(ti.task_id)
+    assert {ti.task_id for ti in tis} == {
+        "all_upstreams",
+        "mapped_upstream",
+        "skipped_upstream",
+        "failed_upstreams",
+        "group.second",
+        "group_upstream",
+        "teardown",
+    }
+
+    def evaluate(ti: TaskInstance, dep_context: DepContext):
+        statuses = [
+            (status.passed, status.reason)
+            for status in TriggerRuleDep()._get_dep_statuses(ti=ti, dep_context=dep_context, session=session)
+        ]
+        result = statuses, ti.state
+        ti.set_state(None, session=session)
+        return result
+
+    # A new DepContext per task instance, walking the relatives of every task to look for setups
+    with mock.patch.object(DepContext, "dag_has_setup_tasks", return_value=True):
+        uncached = {ti.key: evaluate(ti, DepContext(flag_upstream_failed=flag_upstream_failed)) for ti in tis}
+
+    # A DepContext shared by all the task instances, as in DagRun.task_instance_scheduling_decisions
+    dep_context = DepContext(flag_upstream_failed=flag_upstream_failed)
+    dep_context.ensure_finished_tis(dr, session)
+    cached = {ti.key: evaluate(ti, dep_context) for ti in tis}
+
+    assert cached == uncached
@@ -0,0 +1,76 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import pytest
+
+from airflow.models.taskinstance import TaskInstance
+from airflow.operators.empty import EmptyOperator
+from airflow.ti_deps.dep_context import DepContext
+from airflow.utils.state import TaskInstanceState
+
+pytestmark = pytest.mark.db_test
+
+
+class TestDepContext:
+    def test_ensure_finished_tis_by_task(self, dag_maker, session):
+        with dag_maker(session=session):
+            EmptyOperator(task_id="a") >> EmptyOperator(task_id="b") >> EmptyOperator(task_id="c")
+        dr = dag_maker.create_dagrun()
+        for ti in dr.get_task_instances(session=session):
+            if ti.task_id != "c":
+                ti.state = TaskInstanceState.SUCCESS
+        session.flush()
+
+        dep_context = DepContext()
+        finished_tis_by_task = dep_context.ensure_finished_tis_by_task(dr, session)
+        assert {task_id: [ti.task_id for ti in tis] for task_id, tis in finished_tis_by_task.items()} == {
+            "a": ["a"],
+            "b": ["b"],
+        }
+        assert dep_context.ensure_finished_tis_by_task(dr, session) is finished_tis_by_task
+
+        # Replacing the finished tis regroups them
+        dep_context.finished_tis = []
+        assert dep_context.ensure_finished_tis_by_task(dr, session) == {}
+
+    def test_ensure_ti_counts_by_task(self, dag_maker, session):
+        with dag_maker(session=session):
+            task_a = EmptyOperator(task_id="a")
+            task_a >> EmptyOperator(task_id="b")
+        dr = dag_maker.create_dagrun()
+
+        dep_context = DepContext()
+        assert dep_context.ensure_ti_counts_by_task(dr, session) == {"a": 1, "b": 1}
+
+        session.add(TaskInstance(task_a, run_id=dr.run_id, map_index=1))
+        session.flush()
+        # Cached until reset
+        assert dep_context.ensure_ti_counts_by_task(dr, session) == {"a": 1, "b": 1}
+        dep_context.reset_ti_counts_by_task()
+        assert dep_context.ensure_ti_counts_by_task(dr, session) == {"a": 2, "b": 1}
+
+    def test_dag_has_setup_tasks(self, dag_maker):
+        with dag_maker("without_setups") as dag_without_setups:
+            EmptyOperator(task_id="a")
+        with dag_maker("with_setups") as dag_with_setups:
+            EmptyOperator(task_id="a").as_setup() >> EmptyOperator(task_id="b")
+
+        dep_context = DepContext()
+        assert not dep_context.dag_has_setup_tasks(dag_without_setups)
+        assert dep_context.dag_has_setup_tasks(dag_with_setups)
@@ -211,3 +211,60 @@ class TestListPyFilesPath:
         modules = list(file_utils.iter_airflow_imports(file_path))
 
         assert len(modules) == 0
+
+
+class TestGetDagFileFingerprint:
+    @pytest.fixture
+    def dag_folder(self, tmp_path):
+        (tmp_path / "common").mkdir()
+        (tmp_path / "common" / "__init__.py").write_text("")
+        (tmp_path / "common" / "defaults.py").write_text("RETRIES = 1\n")
+        (tmp_path / "dag.py").write_text("from common.defaults import RETRIES\nimport airflow\n")
+        return tmp_path
+
+    def test_fingerprint_changes_with_local_imports(self, dag_folder):
+        dag_file = os.fspath(dag_folder / "dag.py")
+        search_paths = [os.fspath(dag_folder)]
+        cache: dict = {}
+
+        fingerprint = file_utils.get_dag_file_fingerprint(dag_file, search_paths, cache)
+        assert fingerprint is not None
+        assert set(cache) == {
+            dag_file,
+            os.fspath(dag_folder / "common" / "__init__.py"),
+            os.fspath(dag_folder / "common" / "defaults.py"),
+        }
+        assert file_utils.get_dag_file_fingerprint(dag_file, search_paths, cache) == fingerprint
+
+        (dag_folder / "common" / "defaults.py").write_text("RETRIES = 2\n")
+        assert file_utils.get_dag_file_fingerprint(dag_file, search_paths, cache) != fingerprint
+
+    def test_fingerprint_follows_relative_imports(self, dag_folder):
+        (dag_folder / "common" / "dag.py").write_text("from .defaults import RETRIES\n")
+        dag_file = os.fspath(dag_folder / "common" / "dag.py")
+
+        fingerprint = file_utils.get_dag_file_fingerprint(dag_file, [])
+        (dag_folder / "common" / "defaults.py").write_text("RETRIES = 2\n")
+        assert file_utils.get_dag_file_fingerprint(dag_file, []) != fingerprint
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param("from airflow.models import Variable\nVariable.get('a')\n", id="variable"),
+            pytest.param("import os\nos.environ['A']\n", id="environ"),
+            pytest.param("import pendulum\npendulum.now()\n", id="now"),
+            pytest.param("config = open('config.yaml').read()\n", id="open"),
+        ],
+    )
+    def test_no_fingerprint_with_dynamic_inputs(self, dag_folder, content):
+        (dag_folder / "common" / "defaults.py").write_text(content)
+        assert (
+            file_utils.get_dag_file_fingerprint(os.fspath(dag_folder / "dag.py"), [os.fspath(dag_folder)])
+            is None
+        )
+
+    def test_no_fingerprint_for_zip_files(self, tmp_path):
+        zip_path = tmp_path / "dags.zip"
+        with zipfile.ZipFile(zip_path, "w") as zip_file:
+            zip_file.writestr("dag.py", "import airflow\n")
+        assert file_utils.get_dag_file_fingerprint(os.fspath(zip_path), [os.fspath(tmp_path)]) is None